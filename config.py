@@ -30,6 +30,7 @@ class Config:
     
     # Model IDs
     CLAUDE_MODEL_ID = os.getenv("CLAUDE_MODEL_ID")
+    FAST_CLAUDE_MODEL_ID = os.getenv("FAST_CLAUDE_MODEL_ID")  # 번역/요약 등 가벼운 작업용 (미설정 시 CLAUDE_MODEL_ID)
     IMAGE_GENERATION_MODEL_ID = os.getenv("IMAGE_GENERATION_MODEL_ID")
     EMBEDDING_MODEL_ID = os.getenv("EMBEDDING_MODEL_ID")
     
@@ -98,4 +98,85 @@ class Content(db.Model):
             "aspect_ratio_sns": self.aspect_ratio_sns,
             "other_requirements": self.other_requirements,
             "generated_image_url": self.generated_image_url,
-        }
\ No newline at end of file
+        }
+
+class GenerationJob(db.Model):
+    __tablename__ = 'generation_jobs'
+
+    # ----------------------------------------------------------------------
+    # 비동기 생성 작업 큐: 요청 스레드는 작업만 등록하고, 워커 풀이 상태를 갱신합니다.
+    # 상태 흐름: queued → running → succeeded | failed (heartbeat_at이 끊긴 running → queued 복구)
+    # ----------------------------------------------------------------------
+    id = db.Column(db.String(32), primary_key=True) # 작업 ID (uuid4 hex)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    job_type = db.Column(db.String(20), nullable=False) # 작업 종류: 'text', 'image'
+    status = db.Column(db.String(20), nullable=False, default='queued', index=True)
+    payload = db.Column(db.JSON, nullable=False) # 생성 요청 입력값
+    result = db.Column(db.JSON, nullable=True) # 생성 결과 (API 응답과 같은 형식)
+    error = db.Column(db.Text, nullable=True) # 실패 사유
+    content_id = db.Column(db.Integer, db.ForeignKey('contents.id'), nullable=True) # 저장된 콘텐츠 ID
+    attempts = db.Column(db.Integer, nullable=False, default=0) # 실행 시도 횟수
+    worker_id = db.Column(db.String(128), nullable=True) # 작업을 가져간 워커 (호스트:PID)
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), index=True)
+    started_at = db.Column(db.DateTime, nullable=True)
+    heartbeat_at = db.Column(db.DateTime, nullable=True) # 실행 중인 워커가 주기적으로 갱신하는 생존 신호 시각
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f'<GenerationJob {self.id} {self.status}>'
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "job_type": self.job_type,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "content_id": self.content_id,
+            "attempts": self.attempts,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+class LLMUsage(db.Model):
+    __tablename__ = 'llm_usage'
+
+    # ----------------------------------------------------------------------
+    # LLM 호출별 토큰 사용량: 생성 결과를 저장할 때 같은 트랜잭션으로 기록합니다.
+    # 콘텐츠가 삭제되어도 집계가 유지되도록 콘텐츠 종류/업종/사용자를 함께 저장합니다.
+    # ----------------------------------------------------------------------
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True, index=True)
+    content_id = db.Column(db.Integer, db.ForeignKey('contents.id'), nullable=True, index=True) # 콘텐츠 삭제 시 NULL
+    content = db.relationship('Content', backref='llm_usage', lazy=True)
+    content_type = db.Column(db.String(50), nullable=True) # 콘텐츠 종류: 'blog', 'email', 'sns'
+    industry = db.Column(db.String(100), nullable=True)
+    route = db.Column(db.String(50), nullable=True) # LLM 경로 (long_form, short_form, translation 등)
+    model_id = db.Column(db.String(200), nullable=False)
+    input_tokens = db.Column(db.Integer, nullable=False, default=0)
+    output_tokens = db.Column(db.Integer, nullable=False, default=0)
+    cache_read_input_tokens = db.Column(db.Integer, nullable=False, default=0)
+    cache_creation_input_tokens = db.Column(db.Integer, nullable=False, default=0)
+    latency_ms = db.Column(db.Float, nullable=False, default=0.0)
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), index=True)
+
+    def __repr__(self):
+        return f'<LLMUsage {self.model_id} {self.input_tokens}/{self.output_tokens}>'
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "user_id": self.user_id,
+            "content_id": self.content_id,
+            "content_type": self.content_type,
+            "industry": self.industry,
+            "route": self.route,
+            "model_id": self.model_id,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cache_read_input_tokens": self.cache_read_input_tokens,
+            "cache_creation_input_tokens": self.cache_creation_input_tokens,
+            "latency_ms": self.latency_ms,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
@@ -0,0 +1,81 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from flask import request, jsonify, Blueprint, current_app
+from flask_login import login_required, current_user
+from typing import Any
+from services.content_service import aggregate_llm_usage, LLM_USAGE_GROUP_COLUMNS
+from services.utils.bedrock_gateway import get_bedrock_call_stats
+from services.utils.llm_invoker import get_llm_usage_stats
+from services.utils.resilience import get_resilience_stats
+from services.utils.prompt_manager import get_prompt_template_stats
+from services.utils.single_flight import get_single_flight_stats
+from services.web_crawling.http_fetcher import get_http_fetcher_stats
+from services.web_crawling.driver_manager import get_driver_pool_stats
+from services.web_crawling.fetch_strategy import get_fetch_strategy_stats
+
+logger = logging.getLogger(__name__)
+admin_bp = Blueprint('admin_routes', __name__)
+
+def _is_admin() -> bool:
+    """현재 사용자가 관리자(ADMIN_USERNAME)인지 확인합니다."""
+    return current_user.username == current_app.config.get('ADMIN_USERNAME')
+
+@admin_bp.route('/llm_usage', methods=['GET'])
+@login_required
+def get_llm_usage() -> Any:
+    """
+    저장된 LLM 토큰 사용량을 집계해 반환합니다. (관리자 전용)
+    쿼리: group_by(content_type | industry | user | route | model, 기본 content_type), days(최근 N일, 생략 시 전체)
+    Returns:
+        Response: 기준값별 호출 수, 콘텐츠 수, 입력/출력/캐시 토큰 합계, 호출당 평균 토큰 수와 평균 지연 시간
+    """
+    if not _is_admin():
+        return jsonify({"error": "접근 권한이 없습니다."}), 403
+    group_by = request.args.get('group_by', 'content_type')
+    if group_by not in LLM_USAGE_GROUP_COLUMNS:
+        return jsonify({"error": f"group_by는 {', '.join(LLM_USAGE_GROUP_COLUMNS)} 중 하나여야 합니다."}), 400
+    days = request.args.get('days', type=int)
+    if days is not None and days <= 0:
+        return jsonify({"error": "days는 1 이상이어야 합니다."}), 400
+    since = datetime.now(timezone.utc) - timedelta(days=days) if days else None
+    try:
+        groups = aggregate_llm_usage(group_by, since)
+    except Exception as e:
+        logger.error(f"LLM usage aggregation failed: {e}", exc_info=True)
+        return jsonify({"error": "토큰 사용량 집계 중 오류가 발생했습니다."}), 500
+    return jsonify({"group_by": group_by, "days": days, "groups": groups}), 200
+
+@admin_bp.route('/diagnostics', methods=['GET'])
+@login_required
+def get_diagnostics() -> Any:
+    """
+    이 워커 프로세스의 운영 지표를 반환합니다. (관리자 전용, /readyz에서 분리)
+    Returns:
+        Response: (활성화 시) 응답/번역 캐시 적중률, 모델별 Bedrock 호출 지표, 회로 차단기 상태, 프롬프트 템플릿 지표,
+                  모델별 토큰/프롬프트 캐시 사용량, LLM 경로별 지연 시간, Bedrock 호출 한도 상태, 동일 요청 합치기 지표,
+                  크롤러 HTTP 조건부 요청 지표, Selenium 드라이버 풀 상태, 도메인별 크롤링 전략 결과
+    """
+    if not _is_admin():
+        return jsonify({"error": "접근 권한이 없습니다."}), 403
+    body = {}
+    response_cache = current_app.extensions.get('text_response_cache')
+    if response_cache is not None:
+        body["text_response_cache"] = response_cache.snapshot()
+    translation_cache = current_app.extensions.get('translation_cache')
+    if translation_cache is not None:
+        body["translation_cache"] = translation_cache.snapshot()
+    body["bedrock"] = get_bedrock_call_stats()
+    body["circuits"] = get_resilience_stats()
+    body["prompt_templates"] = get_prompt_template_stats()
+    body["llm_usage"] = get_llm_usage_stats()
+    body["single_flight"] = get_single_flight_stats()
+    body["crawler_http"] = get_http_fetcher_stats()
+    body["crawler_selenium"] = get_driver_pool_stats()
+    body["crawler_strategies"] = get_fetch_strategy_stats()
+    text_generator = current_app.extensions.get('text_generator')
+    if text_generator is not None:
+        body["llm_routes"] = text_generator.model_router.snapshot()
+    rate_limiter = current_app.extensions.get('bedrock_rate_limiter')
+    if rate_limiter is not None:
+        body["bedrock_rate_limiter"] = rate_limiter.snapshot()
+    return jsonify(body), 200
@@ -1,16 +1,25 @@
 import os
-from flask import render_template, request, jsonify, Blueprint, current_app, send_from_directory, flash
+import json
+import time
+from flask import render_template, request, jsonify, Blueprint, current_app, send_from_directory, send_file, abort, flash, Response, stream_with_context, url_for
 from flask_login import login_required, current_user
+from botocore.exceptions import ClientError
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Iterator
 
-from models import Content
+from models import Content, GenerationJob
 from extensions import db
-from services.utils.constants import IMAGE_SAVE_PATH
-from services.generation.translation_generator import TranslationPromptInput
-from services.generation.image_generator import ImageGenerationInput
-from services.generation.text_generator import TextGenerationInput
-from services.content_service import create_text_content, create_image_content
+from services.utils.constants import IMAGE_SAVE_PATH, IMAGE_CACHE_MAX_AGE, TEXT_BATCH_MAX_ITEMS
+from services.content_service import (
+    build_text_generation_input,
+    create_text_content,
+    generate_text_batch_for_user
+)
+from services.app_core.readiness import ai_services_required
+from services.app_core.job_queue import get_generation_job_queue
+from services.generation.image_storage import resolve_image_urls, read_image_bytes, split_image_refs
+from services.generation.image_derivatives import IMAGE_VARIANTS, ImageDerivativeError
+from services.utils.llm_invoker import collect_llm_usage
 
 logger = logging.getLogger(__name__)
 content_bp = Blueprint('content_routes', __name__)
@@ -18,14 +27,63 @@ content_bp = Blueprint('content_routes', __name__)
 @content_bp.route('/generated_images/<path:filename>')
 def serve_generated_image(filename: str):
     """
-    생성된 이미지를 정적 파일로 서빙합니다.
+    이전 방식(로컬 디스크)으로 저장된 생성 이미지를 정적 파일로 서빙합니다.
+    새 이미지는 S3에 저장되며 브라우저가 presigned URL로 직접 받습니다.
     Args:
         filename (str): 이미지 파일명
     Returns:
         Response: 이미지 파일 응답
     """
     image_dir = os.path.join(current_app.root_path, IMAGE_SAVE_PATH)
-    return send_from_directory(image_dir, filename)
+    # 파일명에 UUID가 포함되어 내용이 바뀌지 않으므로 오래 캐시합니다.
+    response = send_from_directory(image_dir, filename, max_age=IMAGE_CACHE_MAX_AGE)
+    response.cache_control.immutable = True
+    return response
+
+@content_bp.route('/images/<variant>/<path:image_ref>')
+@login_required
+def serve_image_derivative(variant: str, image_ref: str):
+    """
+    생성 이미지의 WebP 파생본(thumb, w640, w1280)을 반환합니다. 처음 요청될 때 만들어 디스크에 캐시합니다.
+    강한 ETag와 Cache-Control(immutable)을 설정하며, If-None-Match가 일치하면 304를 반환합니다.
+    Args:
+        variant (str): 파생 이미지 종류
+        image_ref (str): 원본 이미지 참조 (S3 키 또는 이전 방식 로컬 URL에서 앞의 '/'를 뺀 값)
+    Returns:
+        Response: WebP 이미지 응답 또는 404
+    """
+    store = current_app.extensions.get('image_derivative_store')
+    if store is None or variant not in IMAGE_VARIANTS:
+        abort(404)
+    stored_ref = f"/{image_ref}" if image_ref.startswith(f"content/{IMAGE_SAVE_PATH}/") else image_ref
+    # 본인 콘텐츠에 저장된 이미지 참조와 정확히 일치할 때만 제공합니다.
+    # 참조를 포함할 수 있는 행만 DB에서 좁힌 뒤(LIKE 와일드카드는 이스케이프) 쉼표로 나눈 참조와 정확히 비교합니다.
+    stored_values = db.session.query(Content.generated_image_url).filter(
+        Content.user_id == current_user.id,
+        Content.generated_image_url.contains(stored_ref, autoescape=True)
+    ).all()
+    if not any(stored_ref in split_image_refs(value) for (value,) in stored_values):
+        abort(404)
+    local_image_dir = os.path.join(current_app.root_path, IMAGE_SAVE_PATH)
+    try:
+        path, etag = store.get_or_create(
+            stored_ref,
+            variant,
+            lambda: read_image_bytes(
+                stored_ref,
+                current_app.extensions.get('s3_client'),
+                current_app.config.get('S3_BUCKET_NAME'),
+                local_image_dir
+            )
+        )
+    except (ImageDerivativeError, FileNotFoundError, ClientError) as e:
+        logger.warning(f"Image derivative unavailable ({image_ref} [{variant}]): {e}")
+        abort(404)
+    response = send_file(path, mimetype='image/webp', etag=etag, conditional=True, max_age=IMAGE_CACHE_MAX_AGE)
+    response.cache_control.public = False
+    response.cache_control.private = True
+    response.cache_control.immutable = True
+    return response
 
 @content_bp.route('/content')
 @login_required
@@ -39,11 +97,34 @@ def content_page():
 
 @content_bp.route('/generate_content', methods=['POST'])
 @login_required
+@ai_services_required
 def generate_text_content() -> Any:
     """
-    텍스트 콘텐츠(블로그, 이메일)를 생성합니다.
+    텍스트 콘텐츠(블로그, 이메일) 생성 작업을 대기열에 등록하고 즉시 작업 ID를 반환합니다.
+    생성은 작업 워커가 실행하므로 웹 워커는 Bedrock 호출 동안 묶이지 않습니다.
+    결과는 status_url을 조회해 받으며, 생성 중에는 지금까지의 텍스트가 result({"content", "partial": true})에 담깁니다.
+    응답 캐시가 활성화되어 있으면 같은 사용자의 동일 요청에 이전 결과를 사용합니다. ("use_cache": false로 건너뛰기)
     Returns:
-        Response: 생성된 콘텐츠 또는 오류 메시지
+        Response: 202 {"job_id", "status", "status_url"} 또는 오류 메시지
+    """
+    return _enqueue_generation_job(request.json, 'text')
+
+def _sse_event(event: str, payload: Dict[str, Any]) -> str:
+    """
+    Server-Sent Events 형식의 메시지 문자열을 생성합니다.
+    """
+    return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+@content_bp.route('/generate_content_stream', methods=['POST'])
+@login_required
+@ai_services_required
+def generate_text_content_stream() -> Any:
+    """
+    텍스트 콘텐츠(블로그, 이메일)를 생성하면서 토큰을 SSE(text/event-stream)로 즉시 전송합니다.
+    이벤트: delta({"text": ...}) → done({"content_id": ...}) 또는 error({"error": ...})
+    스트림이 끝나면 전체 텍스트를 Content로 저장합니다.
+    Returns:
+        Response: text/event-stream 응답 또는 오류 메시지
     """
     data: Dict[str, Any] = request.json
     required_fields = ['topic', 'industry', 'content_type']
@@ -51,69 +132,171 @@ def generate_text_content() -> Any:
     for field in required_fields:
         if not data.get(field):
             return jsonify({"error": f"{field}는 필수 입력값입니다."}), 400
+    text_generator = current_app.extensions.get('text_generator')
+    if not text_generator:
+        logger.error("TextGenerator 서비스가 초기화되지 않았습니다.")
+        return jsonify({"error": "텍스트 콘텐츠 생성 중 오류가 발생했습니다."}), 500
     try:
-        text_generator = current_app.extensions.get('text_generator')
-        if not text_generator:
-            raise RuntimeError("TextGenerator 서비스가 초기화되지 않았습니다.")
-        input_data = TextGenerationInput(**data)
-        generated_text = text_generator.generate_content(input_data)
-        create_text_content(current_user.id, generated_text, data)
-        return jsonify({"content": generated_text})
-    except Exception as e:
-        db.session.rollback()
-        logger.error(f"Text content generation failed: {e}", exc_info=True)
+        input_data, use_cache = build_text_generation_input(data)
+    except TypeError as e:
+        return jsonify({"error": f"잘못된 입력값입니다: {e}"}), 400
+    user_id = current_user.id
+
+    def event_stream() -> Iterator[str]:
+        generated_parts: List[str] = []
+        try:
+            with collect_llm_usage() as usage:
+                for text_delta in text_generator.generate_content_stream(input_data, user_id=user_id, use_cache=use_cache):
+                    generated_parts.append(text_delta)
+                    yield _sse_event("delta", {"text": text_delta})
+            generated_text = "".join(generated_parts)
+            new_content = create_text_content(user_id, generated_text, data, usage)
+            yield _sse_event("done", {"content_id": new_content.id})
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Streaming text content generation failed: {e}", exc_info=True)
+            yield _sse_event("error", {"error": "텍스트 콘텐츠 생성 중 오류가 발생했습니다."})
+
+    return Response(
+        stream_with_context(event_stream()),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'  # 프록시(nginx) 버퍼링 비활성화
+        }
+    )
+
+@content_bp.route('/generate_batch', methods=['POST'])
+@login_required
+@ai_services_required
+def generate_text_content_batch() -> Any:
+    """
+    캠페인용 텍스트 콘텐츠(블로그, 이메일) 여러 개를 한 번에 생성하고, 항목이 끝나는 순서대로 NDJSON으로 전송합니다.
+    요청: {"items": [생성 입력, ...], "use_cache": true}
+    각 줄: item({"index", "content", "cached"}) 또는 item_error({"index", "error"}) → done({"content_ids", "failed", "elapsed_ms"})
+    Returns:
+        Response: application/x-ndjson 응답 또는 오류 메시지
+    """
+    data: Dict[str, Any] = request.json or {}
+    items = data.get('items')
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "items는 비어 있지 않은 목록이어야 합니다."}), 400
+    if len(items) > TEXT_BATCH_MAX_ITEMS:
+        return jsonify({"error": f"한 번에 최대 {TEXT_BATCH_MAX_ITEMS}개까지 생성할 수 있습니다."}), 400
+    required_fields = ['topic', 'industry', 'content_type']
+    # 필수 입력값 검증 (스트림을 시작하기 전에 모든 항목을 확인합니다)
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            return jsonify({"error": f"items[{index}]는 객체여야 합니다."}), 400
+        for field in required_fields:
+            if not item.get(field):
+                return jsonify({"error": f"items[{index}]: {field}는 필수 입력값입니다."}), 400
+        try:
+            build_text_generation_input(item)
+        except TypeError as e:
+            return jsonify({"error": f"items[{index}]: 잘못된 입력값입니다: {e}"}), 400
+    text_generator = current_app.extensions.get('text_generator')
+    if not text_generator:
+        logger.error("TextGenerator 서비스가 초기화되지 않았습니다.")
         return jsonify({"error": "텍스트 콘텐츠 생성 중 오류가 발생했습니다."}), 500
+    use_cache = data.get('use_cache', True) is not False
+    user_id = current_user.id
+
+    def ndjson_stream() -> Iterator[str]:
+        started = time.monotonic()
+        try:
+            for event in generate_text_batch_for_user(user_id, items, text_generator, use_cache=use_cache):
+                if event["event"] == "done":
+                    event["elapsed_ms"] = round((time.monotonic() - started) * 1000)
+                yield json.dumps(event, ensure_ascii=False) + "\n"
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Batch text content generation failed: {e}", exc_info=True)
+            yield json.dumps({"event": "error", "error": "텍스트 콘텐츠 일괄 생성 중 오류가 발생했습니다."}, ensure_ascii=False) + "\n"
+
+    return Response(
+        stream_with_context(ndjson_stream()),
+        mimetype='application/x-ndjson',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'  # 프록시(nginx) 버퍼링 비활성화
+        }
+    )
 
 @content_bp.route('/generate-image', methods=['POST'])
 @login_required
+@ai_services_required
 def generate_image_content() -> Any:
     """
-    SNS 콘텐츠(이미지)를 생성합니다. (번역 기능 포함)
+    SNS 콘텐츠(이미지) 생성 작업(번역 포함)을 대기열에 등록하고 즉시 작업 ID를 반환합니다.
+    여러 컷은 동시에 생성되며, 작업 결과에 이미지 URL과 실패한 컷 번호(failed_cuts), 번역 프롬프트가 담깁니다.
     Returns:
-        Response: 생성된 이미지 URL, 번역 프롬프트 또는 오류 메시지
+        Response: 202 {"job_id", "status", "status_url"} 또는 오류 메시지
     """
-    data: Dict[str, Any] = request.json
+    return _enqueue_generation_job(request.json, 'image')
+
+def _enqueue_generation_job(data: Optional[Dict[str, Any]], job_type: str) -> Any:
+    """
+    입력값을 검증하고 생성 작업을 대기열에 등록합니다.
+    Returns:
+        Response: 202 {"job_id", "status", "status_url"} 또는 오류 메시지
+    """
+    data = data or {}
     required_fields = ['topic', 'industry', 'content_type']
     # 필수 입력값 검증
     for field in required_fields:
         if not data.get(field):
             return jsonify({"error": f"{field}는 필수 입력값입니다."}), 400
+    job_queue = get_generation_job_queue()
+    if not job_queue:
+        logger.error("GenerationJobQueue가 초기화되지 않았습니다.")
+        return jsonify({"error": "작업 등록 중 오류가 발생했습니다."}), 500
     try:
-        translation_generator = current_app.extensions.get('translation_generator')
-        if not translation_generator:
-            raise RuntimeError("TranslationGenerator 서비스가 초기화되지 않았습니다.")
-        # 번역 프롬프트 입력값 구성
-        translation_keys = [
-            "topic", "brand_style_tone", "product_category", "target_audience",
-            "ad_purpose", "key_points", "other_requirements"
-        ]
-        translation_input_dict = {key: data.get(key, "") for key in translation_keys}
-        translation_input = TranslationPromptInput(**translation_input_dict)
-        translation_result = translation_generator.translate_for_image_prompt(translation_input)
-        image_prompt = translation_result['image_prompt']
-        image_generator = current_app.extensions.get('image_generator')
-        if not image_generator:
-            raise RuntimeError("ImageGenerator 서비스가 초기화되지 않았습니다.")
-        # 이미지 생성 입력값 구성
-        image_request_data = data.copy()
-        image_request_data['topic'] = image_prompt
-        image_input = ImageGenerationInput(
-            topic=image_request_data['topic'],
-            cut_count=int(image_request_data.get('cut_count', 1))
-        )
-        image_urls: Optional[List[str]] = image_generator.create_image(image_input)
-        if not image_urls:
-            return jsonify({
-                "status": "error",
-                "message": "일시적인 오류가 발생했습니다. 잠시 후 다시 시도해 주세요."
-            }), 500
-        create_image_content(current_user.id, image_urls, data)
-        return jsonify({
-            "status": "success",
-            "image_urls": image_urls,
-            "translated_prompt": translation_result
-        })
+        job = job_queue.submit(current_user.id, job_type, data)
     except Exception as e:
         db.session.rollback()
-        logger.error(f"Image content generation failed: {e}", exc_info=True)
-        return jsonify({"status": "error", "message": "이미지 생성 중 오류가 발생했습니다."}), 500
+        logger.error(f"Generation job submit failed: {e}", exc_info=True)
+        return jsonify({"error": "작업 등록 중 오류가 발생했습니다."}), 500
+    return jsonify({
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": url_for('content_routes.get_generation_job', job_id=job.id)
+    }), 202
+
+@content_bp.route('/jobs', methods=['POST'])
+@login_required
+def submit_generation_job() -> Any:
+    """
+    콘텐츠 생성 작업을 대기열에 등록하고 즉시 작업 ID를 반환합니다.
+    content_type이 'sns'이면 이미지 작업, 그 외(blog, email)는 텍스트 작업으로 실행됩니다.
+    Returns:
+        Response: 202 {"job_id", "status", "status_url"} 또는 오류 메시지
+    """
+    data: Dict[str, Any] = request.json or {}
+    return _enqueue_generation_job(data, 'image' if data.get('content_type') == 'sns' else 'text')
+
+@content_bp.route('/jobs/<job_id>', methods=['GET'])
+@login_required
+def get_generation_job(job_id: str) -> Any:
+    """
+    생성 작업의 상태와 결과를 반환합니다. (본인 작업만 조회 가능)
+    Returns:
+        Response: 작업 상태(queued, running, succeeded, failed)와 결과 또는 404
+    """
+    job = db.session.get(GenerationJob, job_id)
+    if job is None or job.user_id != current_user.id:
+        return jsonify({"error": "작업을 찾을 수 없습니다."}), 404
+    job_dict = job.to_dict()
+    # 작업 결과의 presigned URL은 만료되므로 저장된 이미지 참조로 조회 시점에 다시 만듭니다.
+    if job.job_type == 'image' and job.content_id and job_dict.get('result'):
+        content = db.session.get(Content, job.content_id)
+        if content is not None:
+            job_dict['result'] = {
+                **job_dict['result'],
+                "image_urls": resolve_image_urls(
+                    content.generated_image_url,
+                    current_app.extensions.get('s3_client'),
+                    current_app.config.get('S3_BUCKET_NAME')
+                )
+            }
+    return jsonify(job_dict)
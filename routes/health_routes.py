@@ -0,0 +1,44 @@
+import logging
+from flask import Blueprint, Response, jsonify, current_app
+from typing import Any
+from services.utils.metrics import render_metrics
+
+logger = logging.getLogger(__name__)
+health_bp = Blueprint('health_routes', __name__)
+
+@health_bp.route('/healthz', methods=['GET'])
+def healthz() -> Any:
+    """
+    Liveness 체크. 프로세스가 요청을 받을 수 있으면 항상 200을 반환합니다.
+    Returns:
+        Response: {"status": "ok"}
+    """
+    return jsonify({"status": "ok"}), 200
+
+@health_bp.route('/readyz', methods=['GET'])
+def readyz() -> Any:
+    """
+    Readiness 체크. AI 서비스 워밍업 상태와 RAG 인덱스 정보를 반환합니다.
+    준비가 끝나지 않았으면 503을 반환합니다. 캐시/호출/크롤러 지표는 /admin/diagnostics(관리자 전용)에서 확인합니다.
+    Returns:
+        Response: 워밍업 상태, 인덱스 로드 여부, 인덱스 세대, 벡터 수
+    """
+    readiness = current_app.extensions.get('service_readiness')
+    rag_system = current_app.extensions.get('rag_system')
+    body = readiness.snapshot() if readiness else {"state": "ready", "error": None, "warmup_seconds": None}
+    body.update({
+        "index_loaded": bool(rag_system and rag_system.is_index_loaded),
+        "index_generation": rag_system.index_generation if rag_system else 0,
+        "vector_count": rag_system.vector_count if rag_system else 0,
+    })
+    is_ready = body["state"] == "ready" and body["index_loaded"]
+    return jsonify(body), 200 if is_ready else 503
+
+@health_bp.route('/metrics', methods=['GET'])
+def metrics() -> Any:
+    """
+    Prometheus 지표 엔드포인트. 단계별 소요 시간, 엔드포인트별 요청 수/지연 시간, 크롤링 결과 수를 반환합니다.
+    PROMETHEUS_MULTIPROC_DIR이 설정되어 있으면 모든 워커 프로세스의 지표를 합쳐서 반환합니다.
+    """
+    payload, content_type = render_metrics()
+    return Response(payload, content_type=content_type)
@@ -1,9 +1,10 @@
 import logging
-from flask import render_template, request, jsonify, Blueprint, flash
+from flask import render_template, request, jsonify, Blueprint, flash, current_app
 from flask_login import login_required, current_user
 from typing import Any
 from models import Content
 from extensions import db
+from services.content_service import content_to_response
 
 logger = logging.getLogger(__name__)
 history_bp = Blueprint('history_routes', __name__)
@@ -24,18 +25,21 @@ def get_history_page() -> str:
 def get_history_api() -> Any:
     """
     현재 사용자의 모든 콘텐츠 기록을 JSON 형태로 반환합니다.
+    이미지 콘텐츠는 image_urls에 presigned URL을 담아 브라우저가 S3에서 직접 받도록 합니다.
     Returns:
         Response: 콘텐츠 기록 리스트(JSON)
     """
     contents = db.session.query(Content).filter_by(user_id=current_user.id).order_by(Content.timestamp.desc()).all()
-    return jsonify([content.to_dict() for content in contents])
+    s3_client = current_app.extensions.get('s3_client')
+    bucket_name = current_app.config.get('S3_BUCKET_NAME')
+    return jsonify([content_to_response(content, s3_client, bucket_name) for content in contents])
 
 # 개별 콘텐츠 상세 조회
 @history_bp.route('/history-api/<int:content_id>', methods=['GET'])
 @login_required
 def get_history_detail_api(content_id: int) -> Any:
     content = db.session.query(Content).filter_by(id=content_id, user_id=current_user.id).first_or_404()
-    return jsonify(content.to_dict())
+    return jsonify(content_to_response(content, current_app.extensions.get('s3_client'), current_app.config.get('S3_BUCKET_NAME')))
 
 @history_bp.route('/history/<int:content_id>', methods=['GET'])
 @login_required
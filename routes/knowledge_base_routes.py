@@ -11,6 +11,7 @@ from services.web_crawling.web_content_extractor import extract_text_from_url
 from services.web_crawling.web_utils import sanitize_filename
 from services.utils.constants import INDUSTRIES
 from services.ai_rag.pgvector_store import PgVectorStore
+from services.app_core.readiness import ai_services_required
 
 logger = logging.getLogger(__name__)
 
@@ -112,6 +113,7 @@ def list_knowledge_base_files():
 
 @knowledge_base_bp.route('/delete/<path:s3_key>', methods=['DELETE'])
 @login_required
+@ai_services_required
 def delete_knowledge_base_file(s3_key):
     # 파일 삭제 (권한 체크)
     is_admin = current_user.username == current_app.config.get('ADMIN_USERNAME')
@@ -133,6 +135,7 @@ def delete_knowledge_base_file(s3_key):
 
 @knowledge_base_bp.route('/add_from_url', methods=['POST'])
 @login_required
+@ai_services_required
 def add_knowledge_base_from_url():
     # URL에서 콘텐츠 추출 후 S3 업로드 및 벡터DB 반영
     s3_client, bucket_name = get_s3_info()
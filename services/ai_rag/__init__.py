@@ -15,13 +15,16 @@ RAG (Retrieval-Augmented Generation) 시스템 모듈들
 from .rag_system import RAGSystem
 from .pgvector_store import PgVectorStore
 from .chunker import chunk_text
-from .embedding_generator import EmbeddingManager
-from .faiss_indexer import FaissIndexer
+from .embedding_generator import EmbeddingManager, init_embedding_manager, get_embedding_manager
+from .faiss_indexer import FaissIndexer, IndexSnapshot
 
 __all__ = [
     'RAGSystem',
     'PgVectorStore',
     'chunk_text',
     'EmbeddingManager',
-    'FaissIndexer'
+    'init_embedding_manager',
+    'get_embedding_manager',
+    'FaissIndexer',
+    'IndexSnapshot'
 ]
@@ -1,11 +1,26 @@
 # ai-content-marketing-tool/services/utils/embedding_generator.py
 
+import os
+import re
 import boto3
 import json
+import threading
 import numpy as np
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Union, Dict, List
 from config import config
+from services.utils.constants import (
+    EMBEDDING_CACHE_DIR,
+    EMBEDDING_BATCH_MAX_CONCURRENCY,
+    EMBEDDING_CALL_TIMEOUT,
+    EMBEDDING_HEDGE_ENABLED,
+    EMBEDDING_HEDGE_MIN_DELAY
+)
+from services.utils.resilience import get_resilient_invoker, CircuitOpenError
+from services.utils.bedrock_gateway import bedrock_call_slot
+from services.utils.single_flight import get_single_flight, make_flight_key
+from services.utils.metrics import observe_stage, STAGE_EMBEDDING
 
 logger = logging.getLogger(__name__)
 
@@ -15,17 +30,34 @@ class EmbeddingManager:
     Bedrock Titan Text Embeddings v2 기반.
     """
 
-    def __init__(self, bedrock_runtime_client: boto3.client):
+    def __init__(self, bedrock_runtime_client: boto3.client, cache_dir: Optional[str] = None):
         """
         EmbeddingManager를 초기화합니다.
         bedrock_runtime_client: Bedrock API 호출용 boto3 클라이언트
+        cache_dir: 업종/카테고리 임베딩을 저장할 디렉토리 (None이면 메모리에만 캐시)
         """
         self.bedrock_runtime_client = bedrock_runtime_client
+        self.model_id = config.EMBEDDING_MODEL_ID
+        self.cache_dir = cache_dir
         self.industry_embeddings: Dict[str, np.ndarray] = {}  # 업종별 임베딩 캐시
+        self._cache_lock = threading.Lock()
+        # 임베딩 호출은 멱등이므로 데드라인과 함께 헤징을 적용합니다.
+        self.invoker = get_resilient_invoker(
+            f"embedding:{self.model_id}", EMBEDDING_CALL_TIMEOUT,
+            hedge=EMBEDDING_HEDGE_ENABLED, hedge_min_delay=EMBEDDING_HEDGE_MIN_DELAY
+        )
+        # 같은 텍스트의 임베딩 호출이 동시에 들어오면 한 번만 호출합니다.
+        self.single_flight = get_single_flight("embedding")
+
+    @property
+    def is_degraded(self) -> bool:
+        """임베딩 회로가 열려 있어 임베딩(RAG 검색)을 사용할 수 없는 상태인지 반환합니다."""
+        return self.invoker.breaker.is_open
 
     def _get_embedding(self, text: Union[str, Dict, List, None]) -> Optional[np.ndarray]:
         """
         텍스트(또는 JSON)를 받아 Bedrock Titan Text Embeddings v2로 임베딩 벡터를 생성합니다.
+        같은 입력의 호출이 처리 중이면 새로 호출하지 않고 그 결과를 기다립니다.
         """
         if not text:
             logger.warning("_get_embedding: Input text is empty or None.")
@@ -34,34 +66,160 @@ class EmbeddingManager:
         final_input_text = text if isinstance(text, str) else json.dumps(text, ensure_ascii=False)
         body = json.dumps({"inputText": final_input_text})
         try:
-            response = self.bedrock_runtime_client.invoke_model(
-                body=body,
-                modelId=config.EMBEDDING_MODEL_ID,
-                accept="application/json",
-                contentType="application/json"
-            )
-            response_body = json.loads(response.get('body').read())
+            with observe_stage(STAGE_EMBEDDING):
+                response_body, _ = self.single_flight.do(make_flight_key(self.model_id, body), self._call_embedding_model, body)
             return np.array(response_body.get("embedding"), dtype=np.float32)
+        except CircuitOpenError:
+            logger.warning("임베딩 회로가 열려 있어 임베딩을 건너뜁니다.")
+            return None
         except Exception as e:
             logger.error(f"Error getting embedding for text: '{str(text)[:50]}'... Error: {e}", exc_info=True)
             return None
 
+    def _call_embedding_model(self, body: str) -> Dict:
+        """
+        호출 한도와 동시 호출 슬롯을 먼저 얻은 뒤, 실제 모델 호출에만 데드라인/헤징/회로 차단기를 적용합니다.
+        (batch 우선순위의 한도 대기가 데드라인 초과나 회로 차단기 실패로 집계되지 않도록)
+        """
+        self.invoker.ensure_closed()
+        with bedrock_call_slot(self.bedrock_runtime_client, self.model_id, body):
+            return self.invoker.call(self._invoke_embedding_model, body)
+
+    def _invoke_embedding_model(self, body: str) -> Dict:
+        """Titan 임베딩 모델을 한 번 호출하고 응답 본문을 반환합니다. (헤징 시 두 번 호출될 수 있음)"""
+        response = self.bedrock_runtime_client.invoke_model(
+            body=body,
+            modelId=self.model_id,
+            accept="application/json",
+            contentType="application/json"
+        )
+        return json.loads(response.get('body').read())
+
+    def get_embeddings(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """
+        여러 텍스트의 임베딩을 입력 순서대로 반환합니다. (실패한 항목은 None)
+        중복 텍스트는 한 번만 계산하며, Titan 임베딩 API는 요청당 한 건만 받으므로 고유 텍스트를 병렬로 호출합니다.
+        """
+        unique_texts = list(dict.fromkeys(text for text in texts if text))
+        if not unique_texts:
+            return [None for _ in texts]
+        max_workers = max(1, min(EMBEDDING_BATCH_MAX_CONCURRENCY, len(unique_texts)))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="embedding-batch") as executor:
+            embeddings = dict(zip(unique_texts, executor.map(self._get_embedding, unique_texts)))
+        return [embeddings.get(text) if text else None for text in texts]
+
+    def _cache_file_path(self) -> Optional[str]:
+        """모델 ID별 라벨 임베딩 캐시 파일 경로를 반환합니다."""
+        if not self.cache_dir:
+            return None
+        safe_model_id = re.sub(r'[^a-zA-Z0-9._-]', '_', self.model_id or 'default')
+        return os.path.join(self.cache_dir, f"label_embeddings_{safe_model_id}.npz")
+
+    def load_persisted_embeddings(self) -> int:
+        """
+        디스크에 저장된 업종/카테고리 임베딩을 메모리 캐시로 로드합니다.
+        Bedrock 호출 없이 동작하며, 로드된 임베딩 수를 반환합니다.
+        """
+        cache_path = self._cache_file_path()
+        if not cache_path or not os.path.exists(cache_path):
+            return 0
+        try:
+            with np.load(cache_path, allow_pickle=False) as data:
+                labels = [str(label) for label in data["labels"]]
+                vectors = data["vectors"]
+            with self._cache_lock:
+                for label, vector in zip(labels, vectors):
+                    self.industry_embeddings.setdefault(label, vector.astype(np.float32))
+            logger.info(f"Loaded {len(labels)} cached label embeddings from {cache_path}.")
+            return len(labels)
+        except Exception as e:
+            logger.warning(f"임베딩 캐시 파일 로드 실패 ({cache_path}): {e}")
+            return 0
+
+    def _persist_embeddings(self) -> None:
+        """메모리 캐시의 업종/카테고리 임베딩을 디스크에 저장합니다. (임시 파일 작성 후 교체)"""
+        cache_path = self._cache_file_path()
+        if not cache_path:
+            return
+        with self._cache_lock:
+            if not self.industry_embeddings:
+                return
+            labels = list(self.industry_embeddings.keys())
+            vectors = np.vstack([self.industry_embeddings[label] for label in labels])
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, labels=np.array(labels), vectors=vectors)
+            os.replace(tmp_path, cache_path)
+            logger.info(f"Persisted {len(labels)} label embeddings to {cache_path}.")
+        except Exception as e:
+            logger.warning(f"임베딩 캐시 파일 저장 실패 ({cache_path}): {e}")
+
     def precompute_industry_embeddings(self, industries: List[str]):
         """
-        사전 정의된 업종 목록에 대한 임베딩을 미리 계산하여 캐시합니다.
+        사전 정의된 업종 목록 중 캐시에 없는 항목만 임베딩을 계산하여 캐시하고 디스크에 저장합니다.
         (예: RAG에서 업종별 유사도 검색에 활용)
         """
-        logger.info("Precomputing industry embeddings...")
-        for industry in industries:
+        missing = [industry for industry in industries if industry not in self.industry_embeddings]
+        if not missing:
+            logger.info("All industry embeddings are already cached. Skipping precompute.")
+            return
+        logger.info(f"Precomputing {len(missing)} industry embeddings...")
+        for industry in missing:
             embedding = self._get_embedding(industry)
             if embedding is not None:
-                self.industry_embeddings[industry] = embedding
+                with self._cache_lock:
+                    self.industry_embeddings[industry] = embedding
             else:
                 logger.warning(f"업종 '{industry}'에 대한 임베딩 생성 실패.")
-        logger.info(f"Finished precomputing {len(self.industry_embeddings)} industry embeddings.")
+        self._persist_embeddings()
+        logger.info(f"Finished precomputing. {len(self.industry_embeddings)} industry embeddings cached.")
+
+    def get_label_embedding(self, label: str) -> Optional[np.ndarray]:
+        """
+        업종/카테고리 등 라벨 임베딩을 반환합니다.
+        캐시에 없으면 한 번만 계산하여 캐시와 디스크에 저장합니다.
+        """
+        cached = self.industry_embeddings.get(label)
+        if cached is not None:
+            return cached
+        embedding = self._get_embedding(label)
+        if embedding is None:
+            return None
+        with self._cache_lock:
+            self.industry_embeddings[label] = embedding
+        self._persist_embeddings()
+        return embedding
 
     def get_industry_embedding(self, industry: str) -> Optional[np.ndarray]:
         """
-        캐시된 업종 임베딩을 반환합니다. (없으면 None)
+        업종 임베딩을 반환합니다. (캐시에 없으면 계산 후 저장, 실패 시 None)
         """
-        return self.industry_embeddings.get(industry)
\ No newline at end of file
+        return self.get_label_embedding(industry)
+
+
+# 프로세스당 하나의 EmbeddingManager를 공유합니다. (RAGSystem, TextGenerator 등)
+_embedding_manager_instance: Optional[EmbeddingManager] = None
+_embedding_manager_lock = threading.Lock()
+
+
+def init_embedding_manager(bedrock_runtime_client: boto3.client, cache_dir: Optional[str] = EMBEDDING_CACHE_DIR) -> EmbeddingManager:
+    """
+    공유 EmbeddingManager 인스턴스를 초기화합니다. 이미 존재하면 기존 인스턴스를 반환합니다.
+    생성 시 디스크에 저장된 라벨 임베딩을 로드하므로 부팅 시 Bedrock 호출이 발생하지 않습니다.
+    """
+    global _embedding_manager_instance
+    with _embedding_manager_lock:
+        if _embedding_manager_instance is None:
+            _embedding_manager_instance = EmbeddingManager(bedrock_runtime_client, cache_dir=cache_dir)
+            _embedding_manager_instance.load_persisted_embeddings()
+            logger.info("Shared EmbeddingManager 인스턴스가 초기화되었습니다.")
+        return _embedding_manager_instance
+
+
+def get_embedding_manager() -> Optional[EmbeddingManager]:
+    """초기화된 공유 EmbeddingManager 인스턴스를 반환합니다."""
+    if _embedding_manager_instance is None:
+        logger.warning("EmbeddingManager가 초기화되지 않았습니다. init_embedding_manager를 먼저 호출하세요.")
+    return _embedding_manager_instance
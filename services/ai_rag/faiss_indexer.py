@@ -3,39 +3,193 @@
 import faiss
 import numpy as np
 import logging
-from typing import List, Optional, Tuple # 타입 힌트를 위한 임포트
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple # 타입 힌트를 위한 임포트
 
 logger = logging.getLogger(__name__)
 
+
+@dataclass(frozen=True)
+class IndexSnapshot:
+    """
+    한 번의 build_index로 만든 검색 구조 묶음. 만든 뒤에는 바꾸지 않습니다.
+    검색은 시작할 때 스냅샷 참조를 한 번만 읽으므로, 도중에 인덱스가 다시 구축되어도 한 세대의 구조만 봅니다.
+    """
+    # FAISS 인덱스 객체 (비어 있으면 None)
+    index: Optional[faiss.IndexFlatL2] = None
+    # 인덱싱된 청크 텍스트 (FAISS 인덱스의 벡터와 1:1 매핑)
+    documents: Tuple[str, ...] = ()
+    # 각 청크의 메타데이터 (s3_key, industry, chunk_index 등, documents와 1:1 매핑)
+    metadatas: Tuple[dict, ...] = ()
+    # 업종별 서브 인덱스: 업종 → (서브 인덱스, 전체 인덱스 기준 문서 위치 리스트)
+    partitions: Mapping[str, Tuple[faiss.IndexFlatL2, Sequence[int]]] = field(default_factory=lambda: MappingProxyType({}))
+    # 업종별 정규화된 중심 벡터 (쿼리 라우팅용)
+    centroids: Mapping[str, np.ndarray] = field(default_factory=lambda: MappingProxyType({}))
+
+
 class FaissIndexer:
     """FAISS 인덱스를 관리하고 벡터 검색을 수행하는 유틸리티 클래스."""
 
     def __init__(self):
-        # FAISS 인덱스 객체, 초기에는 None
-        self.index: Optional[faiss.IndexFlatL2] = None
-        # 인덱싱된 청크 텍스트 리스트 (FAISS 인덱스의 벡터와 1:1 매핑)
-        self.documents: List[str] = []
+        # 현재 검색 구조. build_index가 새 스냅샷을 만든 뒤 이 참조 하나만 교체합니다.
+        self._snapshot = IndexSnapshot()
+
+    @property
+    def snapshot(self) -> IndexSnapshot:
+        """현재 검색 구조 스냅샷"""
+        return self._snapshot
+
+    @property
+    def index(self) -> Optional[faiss.IndexFlatL2]:
+        return self._snapshot.index
+
+    @property
+    def documents(self) -> Tuple[str, ...]:
+        return self._snapshot.documents
+
+    @property
+    def metadatas(self) -> Tuple[dict, ...]:
+        return self._snapshot.metadatas
 
-    def build_index(self, document_chunks: List[str], embeddings: np.ndarray):
+    @property
+    def partitions(self) -> Mapping[str, Tuple[faiss.IndexFlatL2, Sequence[int]]]:
+        return self._snapshot.partitions
+
+    @property
+    def centroids(self) -> Mapping[str, np.ndarray]:
+        return self._snapshot.centroids
+
+    def build_index(self, document_chunks: List[str], embeddings: np.ndarray, metadatas: Optional[List[dict]] = None):
         """
         주어진 문서 청크와 해당 임베딩으로 FAISS 인덱스를 구축합니다.
+        메타데이터에 업종(industry)이 있으면 업종별 서브 인덱스와 중심 벡터도 함께 구축합니다.
         Args:
             document_chunks: 인덱싱할 텍스트 청크들의 리스트.
             embeddings: 각 청크에 해당하는 임베딩 벡터들의 NumPy 배열.
+            metadatas: 각 청크의 메타데이터 리스트 (선택).
         """
         # 입력 데이터가 없으면 인덱스 구축을 건너뛰고 경고를 남깁니다.
         if not document_chunks or embeddings is None or embeddings.size == 0:
             logger.warning("No document chunks or embeddings provided to build FAISS index. Index will be empty.")
-            self.index = None
-            self.documents = []
+            self._snapshot = IndexSnapshot()
             return
 
-        self.documents = document_chunks
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
         d = embeddings.shape[1]  # 임베딩 벡터의 차원 (예: 1024, 512, 256 등)
         # L2(유클리드) 거리 기반의 평면 인덱스 생성
-        self.index = faiss.IndexFlatL2(d)
-        self.index.add(embeddings)
-        logger.info(f"FAISS index built. Total indexed chunks: {len(self.documents)}, Embedding dimension: {d}")
+        index = faiss.IndexFlatL2(d)
+        index.add(embeddings)
+        metadatas = metadatas if metadatas is not None else [{} for _ in document_chunks]
+        partitions, centroids = self._build_partitions(embeddings, metadatas)
+
+        # 검색 중인 요청이 반쯤 구축된 상태나 서로 다른 세대가 섞인 상태를 보지 않도록 스냅샷 참조 하나만 교체합니다.
+        self._snapshot = IndexSnapshot(
+            index=index,
+            documents=tuple(document_chunks),
+            metadatas=tuple(metadatas),
+            partitions=MappingProxyType({industry: (sub_index, tuple(positions))
+                                         for industry, (sub_index, positions) in partitions.items()}),
+            centroids=MappingProxyType(centroids)
+        )
+        logger.info(f"FAISS index built. Total indexed chunks: {len(document_chunks)}, Embedding dimension: {d}, Partitions: {len(partitions)}")
+
+    def _build_partitions(self, embeddings: np.ndarray, metadatas: List[dict]) -> Tuple[Dict[str, Tuple[faiss.IndexFlatL2, List[int]]], Dict[str, np.ndarray]]:
+        """업종별 서브 인덱스와 정규화된 중심 벡터를 계산합니다."""
+        positions_by_industry: Dict[str, List[int]] = {}
+        for position, metadata in enumerate(metadatas):
+            industry = (metadata or {}).get('industry') or 'unspecified'
+            positions_by_industry.setdefault(industry, []).append(position)
+
+        partitions: Dict[str, Tuple[faiss.IndexFlatL2, List[int]]] = {}
+        centroids: Dict[str, np.ndarray] = {}
+        for industry, positions in positions_by_industry.items():
+            partition_vectors = embeddings[positions]
+            sub_index = faiss.IndexFlatL2(embeddings.shape[1])
+            sub_index.add(partition_vectors)
+            partitions[industry] = (sub_index, positions)
+            centroid = partition_vectors.mean(axis=0)
+            norm = np.linalg.norm(centroid)
+            centroids[industry] = centroid / norm if norm > 0 else centroid
+        return partitions, centroids
+
+    def route(self, query_embedding: np.ndarray, top_n: int = 2, snapshot: Optional[IndexSnapshot] = None) -> List[str]:
+        """
+        쿼리 임베딩과 코사인 유사도가 가장 높은 업종 중심 벡터 top_n개를 반환합니다.
+        """
+        centroids = (snapshot or self._snapshot).centroids
+        if not centroids:
+            return []
+        query = np.asarray(query_embedding, dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(query)
+        if norm > 0:
+            query = query / norm
+        scored = sorted(centroids.items(), key=lambda item: -float(np.dot(item[1], query)))
+        return [industry for industry, _ in scored[:top_n]]
+
+    def search_with_distance(self, query_embedding: np.ndarray, k: int = 3, partitions: Optional[List[str]] = None,
+                             snapshot: Optional[IndexSnapshot] = None) -> List[Tuple[str, float, dict]]:
+        """
+        쿼리 임베딩과 가장 가까운 상위 K개 청크를 (청크, L2 거리, 메타데이터) 형태로 반환합니다.
+        partitions가 주어지면 해당 업종 서브 인덱스들만 검색한 뒤 거리순으로 병합합니다.
+        """
+        query = np.asarray(query_embedding, dtype=np.float32).reshape(1, -1)
+        return self.search_batch_with_distance(query, k, [partitions], snapshot=snapshot)[0]
+
+    def search_batch_with_distance(self, query_embeddings: np.ndarray, k: int = 3,
+                                   partitions_per_query: Optional[List[Optional[List[str]]]] = None,
+                                   snapshot: Optional[IndexSnapshot] = None) -> List[List[Tuple[str, float, dict]]]:
+        """
+        여러 쿼리 임베딩을 한 번에 검색합니다. 같은 (서브) 인덱스를 검색하는 쿼리들은 한 번의 FAISS 호출로 묶습니다.
+        Args:
+            query_embeddings: (쿼리 수, 차원) 형태의 임베딩 배열
+            k: 쿼리별 반환할 청크 수
+            partitions_per_query: 쿼리별 검색할 업종 파티션 목록 (None이거나 해당 파티션이 없으면 전체 인덱스 검색)
+            snapshot: 검색할 스냅샷 (여러 호출을 같은 세대로 묶을 때 지정, 없으면 현재 스냅샷)
+        Returns:
+            쿼리 순서대로 (청크, L2 거리, 메타데이터) 목록
+        """
+        snapshot = snapshot or self._snapshot
+        queries = np.ascontiguousarray(query_embeddings, dtype=np.float32)
+        if queries.ndim == 1:
+            queries = queries.reshape(1, -1)
+        num_queries = queries.shape[0]
+        if snapshot.index is None or not snapshot.documents:
+            logger.warning("FAISS index is not initialized. Cannot perform search.")
+            return [[] for _ in range(num_queries)]
+        if partitions_per_query is None:
+            partitions_per_query = [None] * num_queries
+
+        # 검색 대상 인덱스별로 쿼리 번호를 모읍니다. (None = 전체 인덱스)
+        queries_by_target: Dict[Optional[str], List[int]] = {}
+        for query_idx, partitions in enumerate(partitions_per_query):
+            selected = [name for name in (partitions or []) if name in snapshot.partitions]
+            for target in (selected or [None]):
+                queries_by_target.setdefault(target, []).append(query_idx)
+
+        candidates: List[List[Tuple[float, int]]] = [[] for _ in range(num_queries)]
+        for target, query_indices in queries_by_target.items():
+            sub_index, positions = (snapshot.index, None) if target is None else snapshot.partitions[target]
+            D, I = sub_index.search(queries[query_indices], min(k, sub_index.ntotal))
+            for row, query_idx in enumerate(query_indices):
+                for dist, local_idx in zip(D[row], I[row]):
+                    if local_idx < 0:
+                        continue
+                    position = positions[local_idx] if positions is not None else int(local_idx)
+                    candidates[query_idx].append((float(dist), position))
+
+        results: List[List[Tuple[str, float, dict]]] = []
+        for query_candidates in candidates:
+            query_candidates.sort(key=lambda item: item[0])
+            query_results: List[Tuple[str, float, dict]] = []
+            for dist, position in query_candidates[:k]:
+                if 0 <= position < len(snapshot.documents):
+                    metadata = snapshot.metadatas[position] if position < len(snapshot.metadatas) else {}
+                    query_results.append((snapshot.documents[position], dist, metadata))
+                else:
+                    logger.warning(f"Warning: Invalid index {position} found during FAISS search. Index out of bounds.")
+            results.append(query_results)
+        return results
 
     def search(self, query_embedding: np.ndarray, k: int = 3) -> List[str]:
         """
@@ -46,11 +200,13 @@ class FaissIndexer:
         Returns:
             쿼리와 유사한 문서 청크 텍스트들의 리스트.
         """
+        # 인덱스와 문서가 같은 세대이도록 스냅샷을 한 번만 읽습니다.
+        snapshot = self._snapshot
         # 인덱스가 초기화되지 않았거나 문서가 로드되지 않았으면 검색 불가능
-        if self.index is None:
+        if snapshot.index is None:
             logger.warning("FAISS index is not initialized. Cannot perform search.")
             return []
-        if not self.documents:
+        if not snapshot.documents:
             logger.warning("No documents loaded into FAISS index. Cannot perform search.")
             return []
 
@@ -59,12 +215,12 @@ class FaissIndexer:
             query_embedding = query_embedding.reshape(1, -1)
 
         # FAISS 인덱스에서 유사한 벡터 검색
-        D, I = self.index.search(query_embedding, k)
+        D, I = snapshot.index.search(query_embedding, k)
         retrieved_docs: List[str] = []
         # 검색된 인덱스(I)를 사용하여 실제 문서 청크를 가져옴
         for i in I[0]:
-            if 0 <= i < len(self.documents):
-                retrieved_docs.append(self.documents[i])
+            if 0 <= i < len(snapshot.documents):
+                retrieved_docs.append(snapshot.documents[i])
             else:
                 logger.warning(f"Warning: Invalid index {i} found during FAISS search. Index out of bounds.")
         return retrieved_docs
\ No newline at end of file
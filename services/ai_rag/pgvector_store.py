@@ -177,10 +177,11 @@ class PgVectorStore:
             logger.error(f"Failed to retrieve all vectors from PgVector DB: {e}", exc_info=True)
             return []
         
-    def search(self, query_embedding: List[float], k: int = 3, user_id: int = None) -> List[Tuple[str, float, dict]]:
+    def search(self, query_embedding: List[float], k: int = 3, user_id: int = None, industry: Optional[str] = None) -> List[Tuple[str, float, dict]]:
         """
         PgVector DB에서 쿼리 임베딩과 가장 유사한 k개의 벡터를 검색합니다.
         user_id가 제공되면 해당 user_id와 연결된 문서만 검색합니다.
+        industry가 제공되면 해당 업종 문서만 검색합니다.
         정렬 및 유사도 계산에는 코사인 유사도를 사용합니다.
         """
         from extensions import db
@@ -196,6 +197,10 @@ class PgVectorStore:
             else:
                 logger.debug("PgVector 검색 시 user_id 필터링 없음.")
 
+            if industry is not None:
+                query = query.filter(KnowledgeBaseVector.industry == industry)
+                logger.debug(f"PgVector 검색 시 industry 필터링 적용: {industry}")
+
             # 코사인 유사도(cosine_distance)를 기준으로 정렬
             # cosine_distance는 0에 가까울수록 유사함 (0: 동일, 1: 직교, 2: 반대).
             # 따라서 order_by에서 distance를 오름차순으로 정렬하면 가장 유사한 결과가 나옵니다.
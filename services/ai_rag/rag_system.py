@@ -3,13 +3,18 @@
 import numpy as np
 import logging
 import re
+from datetime import datetime, timezone
 from typing import List, Tuple, Optional, Any
 from flask import current_app
 
-from .embedding_generator import EmbeddingManager
+from .embedding_generator import init_embedding_manager
 from .chunker import chunk_text
-from .faiss_indexer import FaissIndexer
+from .faiss_indexer import FaissIndexer, IndexSnapshot
 from .pgvector_store import PgVectorStore
+from services.utils.constants import RAG_ROUTING_TOP_N, RAG_FAISS_MAX_DISTANCE
+from services.utils.rate_limiter import rate_limit_priority, PRIORITY_BATCH
+from services.utils.metrics import observe_stage, STAGE_RETRIEVAL_FAISS, STAGE_RETRIEVAL_PGVECTOR, STAGE_RAG_INGEST
+from services.utils.single_flight import get_single_flight, make_flight_key
 
 logger = logging.getLogger(__name__)
 
@@ -39,9 +44,16 @@ class RAGSystem:
         self.s3_bucket_name = s3_bucket_name
         
         # 핵심 컴포넌트 초기화
-        self.embedding_manager = EmbeddingManager(self.bedrock_runtime)
+        self.embedding_manager = init_embedding_manager(self.bedrock_runtime)
         self.faiss_indexer = FaissIndexer()
         self.pgvector_store = PgVectorStore()
+        # 같은 검색 요청이 동시에 들어오면 한 번만 검색합니다.
+        self.single_flight = get_single_flight("rag_retrieve")
+
+        # 인덱스 재구성 횟수 (0이면 아직 한 번도 로드되지 않음)
+        self.index_generation = 0
+        # 마지막으로 인덱스를 로드한 시각 (UTC)
+        self.index_loaded_at: Optional[datetime] = None
         
         # 데이터베이스 및 인덱스 초기화
         self._initialize_database()
@@ -71,19 +83,44 @@ class RAGSystem:
             if not all_vectors:
                 logger.warning("PgVector DB에 벡터가 없습니다. 빈 FAISS 인덱스를 생성합니다.")
                 self.faiss_indexer.build_index([], np.array([]))
+                self.index_generation += 1
+                self.index_loaded_at = datetime.now(timezone.utc)
                 return
 
             # 벡터 데이터 추출 및 변환
             chunks = [vector.text_content for vector in all_vectors]
             embeddings = np.vstack([vector.embedding for vector in all_vectors])
+            metadatas = [
+                {
+                    "s3_key": vector.s3_key,
+                    "user_id": vector.user_id,
+                    "industry": vector.industry,
+                    "original_filename": vector.original_filename,
+                    "chunk_index": vector.chunk_index,
+                }
+                for vector in all_vectors
+            ]
             
-            self.faiss_indexer.build_index(chunks, embeddings)
-            logger.info(f"FAISS 인덱스 구축 완료. 총 청크 수: {len(chunks)}")
+            self.faiss_indexer.build_index(chunks, embeddings, metadatas)
+            self.index_generation += 1
+            self.index_loaded_at = datetime.now(timezone.utc)
+            logger.info(f"FAISS 인덱스 구축 완료. 총 청크 수: {len(chunks)}, 세대: {self.index_generation}")
             
         except Exception as e:
             logger.error(f"PgVector DB에서 FAISS 인덱스 로드 실패: {e}", exc_info=True)
             self.faiss_indexer.build_index([], np.array([]))
 
+    @property
+    def vector_count(self) -> int:
+        """현재 FAISS 인덱스에 적재된 벡터 수를 반환합니다."""
+        index = self.faiss_indexer.snapshot.index
+        return int(index.ntotal) if index is not None else 0
+
+    @property
+    def is_index_loaded(self) -> bool:
+        """FAISS 인덱스가 한 번 이상 로드되었는지 여부를 반환합니다."""
+        return self.index_generation > 0
+
     def get_embedding(self, text: str) -> Optional[List[float]]:
         """텍스트의 임베딩을 생성합니다."""
         return self.embedding_manager._get_embedding(text)
@@ -155,11 +192,20 @@ class RAGSystem:
             logger.error(f"문서 '{s3_key}' 처리 실패: {e}", exc_info=True)
             raise
 
-    def add_document_to_rag_system(self, s3_key: str, user_id: int) -> None:
-        """새로운 문서를 RAG 시스템에 추가하고 인덱스를 재구성합니다."""
-        self._process_document_for_vector_db(s3_key, user_id)
-        self._load_faiss_from_pgvector()
-        logger.info(f"문서 '{s3_key}'이 추가되고 FAISS 인덱스가 재로드되었습니다.")
+    def add_document_to_rag_system(self, s3_key: str, user_id: int, reload_index: bool = True) -> None:
+        """
+        새로운 문서를 RAG 시스템에 추가하고 인덱스를 재구성합니다.
+        문서 적재의 임베딩 호출은 batch 우선순위로 실행되어 사용자 생성 요청에 Bedrock 한도를 양보합니다.
+        reload_index=False이면 PgVector에만 저장하고, 호출자가 여러 문서를 적재한 뒤 인덱스를 한 번 재로드합니다.
+        """
+        with observe_stage(STAGE_RAG_INGEST), rate_limit_priority(PRIORITY_BATCH):
+            self._process_document_for_vector_db(s3_key, user_id)
+            if reload_index:
+                self._load_faiss_from_pgvector()
+        if reload_index:
+            logger.info(f"문서 '{s3_key}'이 추가되고 FAISS 인덱스가 재로드되었습니다.")
+        else:
+            logger.info(f"문서 '{s3_key}'이 PgVector DB에 추가되었습니다. (인덱스 재로드 보류)")
 
     def remove_document_from_rag_system(self, s3_key: str) -> None:
         """RAG 시스템에서 문서를 제거하고 인덱스를 재구성합니다."""
@@ -175,39 +221,113 @@ class RAGSystem:
             logger.error(f"문서 '{s3_key}' 제거 실패: {e}", exc_info=True)
             raise
 
+    def _route_query(self, query_embedding: np.ndarray, industry: Optional[str] = None,
+                     snapshot: Optional[IndexSnapshot] = None) -> List[str]:
+        """
+        쿼리를 검색할 업종 파티션을 결정합니다.
+        업종 힌트가 인덱스에 있으면 우선 포함하고, 나머지는 업종 중심 벡터와의 유사도로 채웁니다.
+        """
+        snapshot = snapshot or self.faiss_indexer.snapshot
+        routed: List[str] = []
+        if industry and industry in snapshot.partitions:
+            routed.append(industry)
+        for candidate in self.faiss_indexer.route(query_embedding, top_n=RAG_ROUTING_TOP_N, snapshot=snapshot):
+            if len(routed) >= RAG_ROUTING_TOP_N:
+                break
+            if candidate not in routed:
+                routed.append(candidate)
+        return routed
+
     def retrieve(self, query_text: str, k: int = 3, user_id: Optional[int] = None, industry: Optional[str] = None) -> List[Tuple[str, float, dict]]:
         """
-        쿼리 텍스트에 대해 FAISS → PgVector(user_id → industry → 전체) 순서로 관련 문서를 검색합니다.
+        쿼리 텍스트에 대해 FAISS(업종 라우팅) → PgVector(user_id → industry → 전체) 순서로 관련 문서를 검색합니다.
+        FAISS 검색은 쿼리와 가까운 상위 업종 파티션만 탐색하므로 검색량이 전체 코퍼스가 아닌 파티션 크기에 비례합니다.
+        같은 인덱스 세대에서 같은 검색이 처리 중이면 새로 검색하지 않고 그 결과를 공유합니다. (결과 목록은 복사해서 반환)
         """
+        key = make_flight_key(query_text, k, user_id, industry, self.index_generation)
+        results, shared = self.single_flight.do(key, self._retrieve, query_text, k, user_id, industry)
+        return list(results) if shared else results
+
+    def _retrieve(self, query_text: str, k: int, user_id: Optional[int], industry: Optional[str]) -> List[Tuple[str, float, dict]]:
         query_embedding = self.get_embedding(query_text)
         if query_embedding is None:
             return []
 
-        # 1. FAISS에서 먼저 검색 (임계값 적용)
-        if hasattr(self.faiss_indexer, 'search_with_distance'):
-            faiss_results = self.faiss_indexer.search_with_distance(query_embedding, k)
-            filtered_faiss = [(chunk, dist, {}) for chunk, dist in faiss_results if dist < 0.5]
-        else:
-            faiss_results = self.faiss_indexer.search(query_embedding, k)
-            filtered_faiss = [(chunk, 0.0, {}) for chunk in faiss_results]
-        if filtered_faiss:
-            return filtered_faiss
+        # 1. 업종 파티션으로 라우팅한 뒤 FAISS에서 먼저 검색 (라우팅 결과가 부족하면 전체 인덱스 검색)
+        with observe_stage(STAGE_RETRIEVAL_FAISS):
+            # 라우팅과 검색이 같은 인덱스 세대를 보도록 스냅샷을 한 번만 읽습니다.
+            snapshot = self.faiss_indexer.snapshot
+            routed_partitions = self._route_query(query_embedding, industry, snapshot)
+            faiss_results = self.faiss_indexer.search_with_distance(query_embedding, k, partitions=routed_partitions,
+                                                                    snapshot=snapshot)
+            if routed_partitions and len(faiss_results) < k:
+                logger.debug(f"업종 파티션 {routed_partitions}의 결과가 부족하여 전체 FAISS 인덱스를 검색합니다.")
+                faiss_results = self.faiss_indexer.search_with_distance(query_embedding, k, snapshot=snapshot)
+            faiss_results = self._filter_faiss_results(faiss_results)
+        if faiss_results:
+            return faiss_results
 
         # 2. PgVector DB에서 user_id → industry → 전체 순서로 검색
-        pgvector_results = self.pgvector_store.search(query_embedding, k, user_id=user_id)
-        if pgvector_results:
-            return [(chunk, score, metadata) for chunk, score, metadata in pgvector_results]
+        return self._search_pgvector(query_embedding, k, user_id, industry)
 
-        if industry is not None:
-            pgvector_results = self.pgvector_store.search(query_embedding, k, industry=industry)
+    def retrieve_many(self, queries: List[Tuple[str, Optional[str]]], k: int = 3,
+                      user_id: Optional[int] = None) -> List[List[Tuple[str, float, dict]]]:
+        """
+        여러 (쿼리 텍스트, 업종) 쌍을 한 번에 검색합니다. (캠페인 일괄 생성용)
+        중복 쿼리는 한 번만 처리하고, 임베딩을 묶어서 계산한 뒤 FAISS 다중 쿼리 검색을 한 번 수행합니다.
+        FAISS 결과가 없는 쿼리만 retrieve()와 같은 순서로 PgVector에서 검색합니다.
+        Returns:
+            queries 순서대로 검색 결과 목록
+        """
+        unique_queries = list(dict.fromkeys(queries))
+        embeddings = self.embedding_manager.get_embeddings([query_text for query_text, _ in unique_queries])
+        results_by_query = {query: [] for query in unique_queries}
+        valid = [i for i, embedding in enumerate(embeddings) if embedding is not None]
+        if valid:
+            with observe_stage(STAGE_RETRIEVAL_FAISS):
+                snapshot = self.faiss_indexer.snapshot
+                matrix = np.vstack([embeddings[i] for i in valid]).astype(np.float32)
+                routed = [self._route_query(embeddings[i], unique_queries[i][1], snapshot) for i in valid]
+                batch_results = self.faiss_indexer.search_batch_with_distance(matrix, k, routed, snapshot=snapshot)
+                # 라우팅한 파티션의 결과가 부족한 쿼리는 전체 인덱스에서 다시 한 번에 검색합니다.
+                short = [row for row, results in enumerate(batch_results) if routed[row] and len(results) < k]
+                if short:
+                    full_results = self.faiss_indexer.search_batch_with_distance(matrix[short], k, snapshot=snapshot)
+                    for row, results in zip(short, full_results):
+                        batch_results[row] = results
+            for row, i in enumerate(valid):
+                query_text, industry = unique_queries[i]
+                results = self._filter_faiss_results(batch_results[row])
+                if not results:
+                    results = self._search_pgvector(embeddings[i], k, user_id, industry)
+                results_by_query[unique_queries[i]] = results
+        logger.info(f"Batch retrieval completed: {len(queries)} queries ({len(unique_queries)} unique).")
+        return [results_by_query[query] for query in queries]
+
+    def _filter_faiss_results(self, faiss_results: List[Tuple[str, float, dict]]) -> List[Tuple[str, float, dict]]:
+        """RAG_FAISS_MAX_DISTANCE가 설정되어 있으면 그보다 먼 결과를 제외합니다."""
+        if RAG_FAISS_MAX_DISTANCE is None:
+            return faiss_results
+        return [result for result in faiss_results if result[1] < RAG_FAISS_MAX_DISTANCE]
+
+    def _search_pgvector(self, query_embedding: np.ndarray, k: int, user_id: Optional[int] = None,
+                         industry: Optional[str] = None) -> List[Tuple[str, float, dict]]:
+        """PgVector DB에서 user_id → industry → 전체 순서로 검색합니다."""
+        with observe_stage(STAGE_RETRIEVAL_PGVECTOR):
+            pgvector_results = self.pgvector_store.search(query_embedding, k, user_id=user_id)
             if pgvector_results:
                 return [(chunk, score, metadata) for chunk, score, metadata in pgvector_results]
 
-        pgvector_results = self.pgvector_store.search(query_embedding, k)
-        if pgvector_results:
-            return [(chunk, score, metadata) for chunk, score, metadata in pgvector_results]
+            if industry is not None:
+                pgvector_results = self.pgvector_store.search(query_embedding, k, industry=industry)
+                if pgvector_results:
+                    return [(chunk, score, metadata) for chunk, score, metadata in pgvector_results]
 
-        return []
+            pgvector_results = self.pgvector_store.search(query_embedding, k)
+            if pgvector_results:
+                return [(chunk, score, metadata) for chunk, score, metadata in pgvector_results]
+
+            return []
 
 
 # 싱글톤 인스턴스 관리
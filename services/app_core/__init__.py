@@ -7,6 +7,8 @@
 
 - app_factory_utils.py: Flask 앱 팩토리 및 확장 초기화 유틸리티
 - scheduler.py: 백그라운드 작업 스케줄러
+- readiness.py: AI 서비스 워밍업 상태 추적 (/healthz, /readyz)
+- job_queue.py: DB 기반 비동기 생성 작업 큐와 워커 풀
 """
 
 from .app_factory_utils import (
@@ -15,9 +17,12 @@ from .app_factory_utils import (
     initialize_translation_generator,
     initialize_image_generator,
     initialize_ai_services,
+    start_ai_services_warmup,
     initialize_full_app
 )
 from .scheduler import initialize_scheduler_tasks
+from .readiness import ServiceReadiness, ai_services_required
+from .job_queue import GenerationJobQueue, init_generation_job_queue, get_generation_job_queue
 
 __all__ = [
     'initialize_rag_system',
@@ -25,6 +30,12 @@ __all__ = [
     'initialize_translation_generator',
     'initialize_image_generator',
     'initialize_ai_services',
+    'start_ai_services_warmup',
     'initialize_full_app',
-    'initialize_scheduler_tasks'
+    'initialize_scheduler_tasks',
+    'ServiceReadiness',
+    'ai_services_required',
+    'GenerationJobQueue',
+    'init_generation_job_queue',
+    'get_generation_job_queue'
 ]
@@ -1,15 +1,21 @@
 # ai-content-marketing-tool/services/app_core/app_factory_utils.py
 
 import os
+import time
 import logging
+import threading
 import boto3
 from flask import Flask
 from flask_apscheduler import APScheduler
 from .scheduler import initialize_scheduler_tasks
+from .readiness import init_service_readiness
+from .job_queue import init_generation_job_queue
 from extensions import db, login_manager, migrate, scheduler
 from models import User
+from services.utils.bedrock_gateway import BedrockGateway, build_bedrock_client_config
+from services.utils.rate_limiter import create_bedrock_rate_limiter
 from config import Config
-from services.utils.constants import PROMPT_TEMPLATE_RELATIVE_PATH, IMAGE_SAVE_PATH
+from services.utils.constants import PROMPT_TEMPLATE_RELATIVE_PATH, IMAGE_SAVE_PATH, BEDROCK_RATE_LIMIT_PATH
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +43,22 @@ def load_app_config(app: Flask):
         exit(1)
 
 # -------------------- 외부 서비스 클라이언트 --------------------
+def init_bedrock_rate_limiter(app: Flask):
+    """
+    BEDROCK_RATE_LIMITS가 설정되어 있으면 워커 간 공유 Bedrock 한도 제한기를 만들고 app.extensions에 등록합니다.
+    토큰 버킷 파일은 app.root_path 기준이므로 작업 디렉토리가 다른 워커/스케줄러/CLI 프로세스도 같은 파일을 공유합니다.
+    """
+    if 'bedrock_rate_limiter' not in app.extensions:
+        try:
+            rate_limiter = create_bedrock_rate_limiter(db_path=os.path.join(app.root_path, BEDROCK_RATE_LIMIT_PATH))
+        except Exception as e:
+            logger.warning(f"Bedrock 한도 제한기 초기화 실패, 제한 없이 동작합니다: {e}")
+            rate_limiter = None
+        app.extensions['bedrock_rate_limiter'] = rate_limiter
+        if rate_limiter is not None:
+            logger.info(f"Bedrock rate limiter enabled for models: {sorted(rate_limiter.quotas)}")
+    return app.extensions['bedrock_rate_limiter']
+
 def init_s3_client(app: Flask):
     """S3 클라이언트를 초기화하고 app.extensions에 등록합니다."""
     try:
@@ -54,14 +76,18 @@ def init_s3_client(app: Flask):
         raise
 
 def init_bedrock_client(app: Flask):
-    """텍스트 생성용 Bedrock 클라이언트를 초기화하고 app.extensions에 등록합니다."""
+    """
+    텍스트 생성/임베딩용 Bedrock 클라이언트를 초기화하고 app.extensions에 등록합니다.
+    클라이언트는 BedrockGateway로 감싸 모델별 동시 호출 상한과 호출 지표를 적용합니다.
+    """
     try:
-        bedrock_runtime = boto3.client(
+        bedrock_runtime = BedrockGateway(boto3.client(
             service_name='bedrock-runtime',
             region_name=app.config['AWS_REGION_NAME'],
             aws_access_key_id=app.config['AWS_ACCESS_KEY_ID'],
-            aws_secret_access_key=app.config['AWS_SECRET_ACCESS_KEY']
-        )
+            aws_secret_access_key=app.config['AWS_SECRET_ACCESS_KEY'],
+            config=build_bedrock_client_config()
+        ), rate_limiter=init_bedrock_rate_limiter(app))
         app.extensions['rag_bedrock_runtime'] = bedrock_runtime
         logger.info("Bedrock (text) client initialized successfully!")
         return bedrock_runtime
@@ -71,14 +97,15 @@ def init_bedrock_client(app: Flask):
         return None
 
 def init_image_bedrock_client(app: Flask):
-    """이미지 생성용 Bedrock 클라이언트를 별도 리전으로 초기화하고 app.extensions에 등록합니다."""
+    """이미지 생성용 Bedrock 클라이언트를 별도 리전으로 초기화하고 (BedrockGateway로 감싸) app.extensions에 등록합니다."""
     try:
-        image_bedrock_client = boto3.client(
+        image_bedrock_client = BedrockGateway(boto3.client(
             service_name='bedrock-runtime',
             region_name=app.config['IMAGE_GENERATION_REGION_NAME'],
             aws_access_key_id=app.config['AWS_ACCESS_KEY_ID'],
-            aws_secret_access_key=app.config['AWS_SECRET_ACCESS_KEY']
-        )
+            aws_secret_access_key=app.config['AWS_SECRET_ACCESS_KEY'],
+            config=build_bedrock_client_config()
+        ), rate_limiter=init_bedrock_rate_limiter(app))
         app.extensions['image_bedrock_client'] = image_bedrock_client
         logger.info("Bedrock (image) client initialized successfully!")
         return image_bedrock_client
@@ -102,6 +129,15 @@ def init_app_extensions(app: Flask):
     logger.info("Flask extensions initialized (including multiple DB binds).")
 
 # -------------------- AI 서비스별 초기화 --------------------
+def initialize_embedding_manager(app: Flask):
+    """공유 EmbeddingManager를 app.root_path 기준 라벨 임베딩 캐시 디렉토리로 초기화합니다. (RAG 시스템보다 먼저 호출)"""
+    from services.ai_rag.embedding_generator import init_embedding_manager
+    from services.utils.constants import EMBEDDING_CACHE_DIR
+    cache_dir = os.path.join(app.root_path, EMBEDDING_CACHE_DIR)
+    embedding_manager = init_embedding_manager(app.extensions.get('rag_bedrock_runtime'), cache_dir=cache_dir)
+    logger.info(f"Embedding cache directory: {cache_dir}")
+    return embedding_manager
+
 def initialize_rag_system(app: Flask):
     """RAG 시스템을 초기화하고 app.extensions에 등록합니다."""
     from services.ai_rag.rag_system import init_rag_system
@@ -112,6 +148,26 @@ def initialize_rag_system(app: Flask):
         logger.info("RAG system initialized.")
     return rag_system
 
+def create_text_response_cache(app: Flask):
+    """
+    TEXT_RESPONSE_CACHE_ENABLED일 때 텍스트 생성 응답 캐시를 만들고 app.extensions에 등록합니다.
+    임베딩 유사도 조회는 TEXT_RESPONSE_CACHE_SIMILARITY가 설정된 경우에만 사용합니다.
+    """
+    from services.generation.response_cache import TextResponseCache
+    from services.ai_rag.embedding_generator import get_embedding_manager
+    from services.content_service import find_recent_text_content
+    from services.utils.constants import TEXT_RESPONSE_CACHE_ENABLED
+    if not TEXT_RESPONSE_CACHE_ENABLED:
+        return None
+    embedding_manager = get_embedding_manager()
+    response_cache = TextResponseCache(
+        embed_fn=embedding_manager._get_embedding if embedding_manager else None,
+        history_loader=find_recent_text_content
+    )
+    app.extensions['text_response_cache'] = response_cache
+    logger.info("Text response cache enabled.")
+    return response_cache
+
 def initialize_text_generator(app: Flask):
     """
     텍스트 생성기를 초기화하고 app.extensions에 등록합니다.
@@ -121,25 +177,48 @@ def initialize_text_generator(app: Flask):
     rag_system = app.extensions.get('rag_system')
     bedrock_runtime_client = app.extensions.get('rag_bedrock_runtime')
     with app.app_context():
-        text_generator = create_text_generator(bedrock_runtime_client, rag_system, app.root_path, config.CLAUDE_MODEL_ID)
+        text_generator = create_text_generator(
+            bedrock_runtime_client, rag_system, app.root_path, config.CLAUDE_MODEL_ID,
+            response_cache=create_text_response_cache(app), fast_model_id=config.FAST_CLAUDE_MODEL_ID
+        )
         app.extensions['text_generator'] = text_generator
         logger.info("Text generator initialized.")
     return text_generator
 
+def create_translation_cache(app: Flask):
+    """
+    TRANSLATION_CACHE_ENABLED일 때 이미지 프롬프트 번역 캐시(app.root_path 기준 SQLite 파일)를 만들고 app.extensions에 등록합니다.
+    캐시 파일을 열 수 없으면 캐시 없이 동작합니다.
+    """
+    from services.generation.translation_cache import TranslationCache
+    from services.utils.constants import TRANSLATION_CACHE_ENABLED, TRANSLATION_CACHE_PATH
+    if not TRANSLATION_CACHE_ENABLED:
+        return None
+    try:
+        translation_cache = TranslationCache(db_path=os.path.join(app.root_path, TRANSLATION_CACHE_PATH))
+    except Exception as e:
+        logger.warning(f"번역 캐시 초기화 실패, 캐시 없이 동작합니다: {e}")
+        return None
+    app.extensions['translation_cache'] = translation_cache
+    logger.info(f"Translation cache enabled: {translation_cache.db_path}")
+    return translation_cache
+
 def initialize_translation_generator(app: Flask):
     """
     번역 생성기를 초기화하고 app.extensions에 등록합니다.
     """
     from services.generation.translation_generator import create_translation_generator
     from services.utils.prompt_manager import PromptManager
+    from services.utils.llm_invoker import ROUTE_TRANSLATION
     from services.utils.constants import PROMPT_TEMPLATE_RELATIVE_PATH
-    from config import config
     text_generator = app.extensions.get('text_generator')
     with app.app_context():
         prompt_manager = PromptManager(app.root_path, PROMPT_TEMPLATE_RELATIVE_PATH)
-        # text_provider는 이미 TextGenerator에서 config.CLAUDE_MODEL_ID로 생성됨
-        text_provider = text_generator.provider_instances['text']
-        translation_generator = create_translation_generator(prompt_manager, text_provider)
+        # 번역은 TextGenerator의 모델 라우터에서 translation 경로(기본 fast 티어)로 호출합니다.
+        text_provider = text_generator.model_router.provider(ROUTE_TRANSLATION)
+        translation_generator = create_translation_generator(
+            prompt_manager, text_provider, translation_cache=create_translation_cache(app)
+        )
         app.extensions['translation_generator'] = translation_generator
         logger.info("Translation generator initialized.")
     return translation_generator
@@ -156,7 +235,10 @@ def initialize_image_generator(app: Flask):
     s3_client = app.extensions.get('s3_client')
     with app.app_context():
         prompt_manager = PromptManager(app.root_path, PROMPT_TEMPLATE_RELATIVE_PATH)
-        image_generator = create_image_generator(prompt_manager, image_bedrock_client, s3_client, config.IMAGE_GENERATION_MODEL_ID)
+        image_generator = create_image_generator(
+            prompt_manager, image_bedrock_client, s3_client, config.IMAGE_GENERATION_MODEL_ID,
+            s3_bucket_name=app.config.get('S3_BUCKET_NAME')
+        )
         app.extensions['image_generator'] = image_generator
         logger.info("Image generator initialized.")
     return image_generator
@@ -167,6 +249,7 @@ def initialize_ai_services(app: Flask):
     각 서비스는 app.extensions에 등록됩니다.
     반환값: dict (각 서비스 인스턴스)
     """
+    initialize_embedding_manager(app)
     rag_system = initialize_rag_system(app)
     text_generator = initialize_text_generator(app)
     translation_generator = initialize_translation_generator(app)
@@ -179,6 +262,36 @@ def initialize_ai_services(app: Flask):
         'image_generator': image_generator
     }
 
+def _warm_up_ai_services(app: Flask):
+    """백그라운드 스레드에서 AI 서비스를 초기화하고 준비 상태를 갱신합니다."""
+    readiness = app.extensions['service_readiness']
+    readiness.mark_warming()
+    try:
+        services = initialize_ai_services(app)
+        if not services.get('rag_system') or not services.get('text_generator'):
+            raise RuntimeError("RAG 시스템 또는 텍스트 생성기 초기화에 실패했습니다.")
+        readiness.mark_ready()
+        logger.info(f"AI services warmed up in background: {readiness.snapshot()}")
+    except Exception as e:
+        logger.critical(f"AI 서비스 백그라운드 워밍업 실패: {e}", exc_info=True)
+        readiness.mark_failed(str(e))
+
+def start_ai_services_warmup(app: Flask) -> threading.Thread:
+    """
+    AI 서비스(FAISS 인덱스 로드, 생성기 초기화) 워밍업을 백그라운드 스레드로 시작합니다.
+    앱은 워밍업 완료를 기다리지 않고 즉시 요청을 받을 수 있습니다.
+    """
+    init_service_readiness(app)
+    warmup_thread = threading.Thread(
+        target=_warm_up_ai_services,
+        args=(app,),
+        name='ai-services-warmup',
+        daemon=True
+    )
+    warmup_thread.start()
+    logger.info("AI services warm-up started in background thread.")
+    return warmup_thread
+
 # -------------------- 기타 앱 초기화 --------------------
 def register_app_blueprints(app: Flask):
     """애플리케이션 블루프린트들을 등록합니다."""
@@ -186,32 +299,79 @@ def register_app_blueprints(app: Flask):
     from routes.content_routes import content_bp
     from routes.knowledge_base_routes import knowledge_base_bp
     from routes.history_routes import history_bp
+    from routes.health_routes import health_bp
+    from routes.admin_routes import admin_bp
     app.register_blueprint(auth_bp)
     app.register_blueprint(content_bp, url_prefix='/content')
     app.register_blueprint(knowledge_base_bp, url_prefix='/knowledge_base')
     app.register_blueprint(history_bp)
+    app.register_blueprint(health_bp)
+    app.register_blueprint(admin_bp, url_prefix='/admin')
     logger.info("Blueprints registered.")
 
+def init_request_metrics(app: Flask):
+    """
+    요청마다 엔드포인트(URL 규칙)별 처리 시간과 상태 코드 수를 Prometheus 지표로 기록합니다.
+    스트리밍 응답은 본문 전송 전 뷰가 응답을 반환한 시점까지를 기록합니다.
+    """
+    from flask import g, request
+    from services.utils.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS
+
+    @app.before_request
+    def _start_request_timer():
+        g.request_started_at = time.perf_counter()
+
+    @app.after_request
+    def _record_request_metrics(response):
+        started = g.pop('request_started_at', None)
+        # 경로 파라미터로 레이블 수가 늘지 않도록 URL 대신 URL 규칙을 사용합니다.
+        endpoint = request.url_rule.rule if request.url_rule is not None else "unmatched"
+        if started is not None:
+            HTTP_REQUEST_DURATION.labels(request.method, endpoint).observe(time.perf_counter() - started)
+        HTTP_REQUESTS.labels(request.method, endpoint, str(response.status_code)).inc()
+        return response
+
 def create_image_dir_at_app_start(app: Flask):
     """애플리케이션 시작 시 이미지 저장 디렉토리를 생성합니다."""
     image_path = os.path.join(app.root_path, IMAGE_SAVE_PATH)
     os.makedirs(image_path, exist_ok=True)
     logger.info(f"Image save directory created at app start: {image_path}")
 
+def init_image_derivative_store(app: Flask):
+    """WebP 썸네일/축소본 디스크 캐시를 초기화하고 app.extensions에 등록합니다."""
+    from services.generation.image_derivatives import ImageDerivativeStore
+    from services.utils.constants import IMAGE_DERIVATIVE_CACHE_DIR
+    cache_dir = os.path.join(app.root_path, IMAGE_DERIVATIVE_CACHE_DIR)
+    os.makedirs(cache_dir, exist_ok=True)
+    app.extensions['image_derivative_store'] = ImageDerivativeStore(cache_dir)
+    logger.info(f"Image derivative cache directory: {cache_dir}")
+
+def init_crawler_http_fetcher(app: Flask):
+    """크롤러 공용 HTTP 가져오기 계층을 app.root_path 기준 응답 캐시 디렉토리로 초기화합니다."""
+    from services.web_crawling.http_fetcher import init_http_fetcher
+    from services.utils.constants import CRAWLER_HTTP_CACHE_ENABLED, CRAWLER_HTTP_CACHE_DIR
+    cache_dir = os.path.join(app.root_path, CRAWLER_HTTP_CACHE_DIR) if CRAWLER_HTTP_CACHE_ENABLED else None
+    init_http_fetcher(cache_dir)
+
 # -------------------- 전체 초기화 통합 함수 --------------------
 def initialize_full_app(app: Flask):
     """
     Flask 애플리케이션의 모든 필수 초기화 단계를 순서대로 수행합니다.
     이 함수는 run.py와 같은 메인 진입점에서 create_app() 호출 후에 호출되어야 합니다.
+    AI 서비스 워밍업은 백그라운드에서 진행되며, 준비 상태는 /readyz로 확인할 수 있습니다.
+    생성 작업 워커 풀은 워밍업이 끝난 뒤부터 대기열의 작업을 처리합니다.
     """
     configure_logging(app)
     logger_instance = app.logger
     init_s3_client(app)
     init_bedrock_client(app)
     init_image_bedrock_client(app)
-    bedrock_runtime_client = app.extensions.get('rag_bedrock_runtime')
-    initialize_ai_services(app)
     register_app_blueprints(app)
+    init_request_metrics(app)
+    init_crawler_http_fetcher(app)
     initialize_scheduler_tasks(app)
     create_image_dir_at_app_start(app)
-    logger_instance.info("Flask application fully initialized and ready to serve!")
\ No newline at end of file
+    init_image_derivative_store(app)
+    start_ai_services_warmup(app)
+    init_generation_job_queue(app)
+    logger_instance.info("Flask application initialized and accepting requests (AI services warming up).")
\ No newline at end of file
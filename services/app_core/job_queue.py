@@ -0,0 +1,381 @@
+# ai-content-marketing-tool/services/app_core/job_queue.py
+
+import os
+import time
+import uuid
+import socket
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+from flask import Flask, current_app
+
+from extensions import db
+from models import GenerationJob
+from services.content_service import (
+    ContentGenerationError,
+    generate_text_content_for_user,
+    generate_image_content_for_user
+)
+from services.utils.constants import (
+    JOB_WORKER_ENABLED,
+    JOB_WORKER_COUNT,
+    JOB_POLL_INTERVAL,
+    JOB_HEARTBEAT_INTERVAL,
+    JOB_STALE_SECONDS,
+    JOB_MAX_ATTEMPTS
+)
+
+logger = logging.getLogger(__name__)
+
+JOB_STATUS_QUEUED = 'queued'
+JOB_STATUS_RUNNING = 'running'
+JOB_STATUS_SUCCEEDED = 'succeeded'
+JOB_STATUS_FAILED = 'failed'
+
+JobHandler = Callable[[GenerationJob], Dict[str, Any]]
+
+# 현재 스레드에서 실행 중인 작업 (큐, 작업 ID, 가져간 시도 번호). report_job_progress가 사용합니다.
+_current_job: ContextVar[Optional[Tuple['GenerationJobQueue', str, int]]] = ContextVar("current_generation_job", default=None)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def report_job_progress(partial_result: Dict[str, Any]) -> bool:
+    """
+    실행 중인 작업의 중간 결과를 result에 기록합니다. (작업 핸들러 안에서 호출)
+    작업 밖에서 호출했거나 작업이 복구되어 다른 워커가 가져갔으면 기록하지 않고 False를 반환합니다.
+    """
+    current = _current_job.get()
+    if current is None:
+        return False
+    job_queue, job_id, claim_attempt = current
+    updated = db.session.query(GenerationJob).filter(
+        *job_queue._owned_filter(job_id, claim_attempt)
+    ).update({GenerationJob.result: partial_result}, synchronize_session=False)
+    db.session.commit()
+    return updated == 1
+
+
+def _run_text_job(job: GenerationJob) -> Dict[str, Any]:
+    """
+    텍스트 생성 작업 핸들러. API 응답과 같은 형식의 결과를 반환합니다.
+    생성 중에는 지금까지의 텍스트를 {"content", "partial": true}로 기록해 상태 조회로 점진적으로 보여 줄 수 있습니다.
+    """
+    new_content, cache_source = generate_text_content_for_user(
+        job.user_id, job.payload, current_app.extensions.get('text_generator'),
+        on_progress=lambda text: report_job_progress({"content": text, "partial": True})
+    )
+    return {"content": new_content.generated_text, "cached": cache_source, "content_id": new_content.id}
+
+
+def _run_image_job(job: GenerationJob) -> Dict[str, Any]:
+    """이미지 생성 작업 핸들러. API 응답과 같은 형식의 결과를 반환합니다."""
+    new_content, image_result, translation_result = generate_image_content_for_user(
+        job.user_id,
+        job.payload,
+        current_app.extensions.get('translation_generator'),
+        current_app.extensions.get('image_generator')
+    )
+    return {
+        "status": "success",
+        "image_urls": image_result.image_urls,
+        "failed_cuts": image_result.failed_cuts,
+        "translated_prompt": translation_result,
+        "content_id": new_content.id
+    }
+
+
+class GenerationJobQueue:
+    """
+    generation_jobs 테이블 기반의 생성 작업 큐와 워커 풀.
+    - submit(): 요청 스레드는 작업을 등록만 하고 즉시 반환합니다.
+    - 디스패처 스레드가 빈 워커 슬롯만큼 작업을 원자적으로 가져가(queued → running) 스레드 풀에서 실행합니다.
+    - 여러 프로세스가 같은 테이블을 공유해도 조건부 UPDATE로 한 작업은 한 워커만 실행합니다.
+    - 하트비트 스레드가 이 프로세스에서 실행 중인 작업의 heartbeat_at을 heartbeat_interval초마다 갱신합니다.
+    - heartbeat_at이 stale_after초 이상 갱신되지 않은 running 작업(워커 중단 등)은 recover_stale_jobs()로 다시 대기열에 넣습니다.
+      오래 걸리는 작업이라도 워커가 살아 있으면 복구되지 않습니다.
+    """
+
+    def __init__(self, app: Flask, max_workers: int = JOB_WORKER_COUNT, poll_interval: float = JOB_POLL_INTERVAL,
+                 stale_after: float = JOB_STALE_SECONDS, max_attempts: int = JOB_MAX_ATTEMPTS,
+                 heartbeat_interval: float = JOB_HEARTBEAT_INTERVAL):
+        self.app = app
+        self.max_workers = max_workers
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.max_attempts = max_attempts
+        self.heartbeat_interval = heartbeat_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._handlers: Dict[str, JobHandler] = {}
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._dispatcher: Optional[threading.Thread] = None
+        self._heartbeat: Optional[threading.Thread] = None
+        self._running_ids: Set[str] = set()
+        self._running_lock = threading.Lock()
+        self._last_recovery = 0.0
+
+    def register_handler(self, job_type: str, handler: JobHandler) -> None:
+        """작업 종류별 실행 함수를 등록합니다."""
+        self._handlers[job_type] = handler
+
+    @property
+    def is_running(self) -> bool:
+        return self._dispatcher is not None and self._dispatcher.is_alive()
+
+    def submit(self, user_id: int, job_type: str, payload: Dict[str, Any]) -> GenerationJob:
+        """
+        생성 작업을 대기열에 등록하고 GenerationJob을 반환합니다. (요청 스레드에서 호출)
+        """
+        if job_type not in self._handlers:
+            raise ValueError(f"지원하지 않는 작업 종류입니다: {job_type}")
+        job = GenerationJob(
+            id=uuid.uuid4().hex,
+            user_id=user_id,
+            job_type=job_type,
+            status=JOB_STATUS_QUEUED,
+            payload=payload,
+            attempts=0
+        )
+        db.session.add(job)
+        db.session.commit()
+        self._wakeup.set()
+        logger.info(f"Generation job queued: {job.id} (type={job_type}, user={user_id})")
+        return job
+
+    def _claim_next_job(self) -> Optional[str]:
+        """가장 오래된 queued 작업을 running으로 바꾸며 가져갑니다. 가져온 작업 ID를 반환합니다."""
+        candidate_ids = [
+            row[0] for row in db.session.query(GenerationJob.id)
+            .filter(GenerationJob.status == JOB_STATUS_QUEUED)
+            .order_by(GenerationJob.created_at)
+            .limit(self.max_workers)
+            .all()
+        ]
+        for job_id in candidate_ids:
+            # 다른 워커(프로세스)가 먼저 가져갔으면 rowcount가 0입니다.
+            now = _utcnow()
+            claimed = db.session.query(GenerationJob).filter(
+                GenerationJob.id == job_id,
+                GenerationJob.status == JOB_STATUS_QUEUED
+            ).update({
+                GenerationJob.status: JOB_STATUS_RUNNING,
+                GenerationJob.worker_id: self.worker_id,
+                GenerationJob.started_at: now,
+                GenerationJob.heartbeat_at: now,
+                GenerationJob.attempts: GenerationJob.attempts + 1
+            }, synchronize_session=False)
+            db.session.commit()
+            if claimed == 1:
+                return job_id
+        return None
+
+    def send_heartbeat(self) -> int:
+        """이 프로세스에서 실행 중인 작업의 heartbeat_at을 현재 시각으로 갱신합니다. 갱신한 작업 수를 반환합니다."""
+        with self._running_lock:
+            job_ids = list(self._running_ids)
+        if not job_ids:
+            return 0
+        updated = db.session.query(GenerationJob).filter(
+            GenerationJob.id.in_(job_ids),
+            GenerationJob.status == JOB_STATUS_RUNNING,
+            GenerationJob.worker_id == self.worker_id
+        ).update({GenerationJob.heartbeat_at: _utcnow()}, synchronize_session=False)
+        db.session.commit()
+        return updated
+
+    def recover_stale_jobs(self) -> int:
+        """
+        heartbeat_at이 stale_after초 이상 갱신되지 않은 running 작업(워커 중단 등)을 복구합니다.
+        (heartbeat_at이 없는 이전 작업은 started_at 기준)
+        시도 횟수가 남아 있으면 다시 queued로, 아니면 failed로 바꿉니다. 복구한 작업 수를 반환합니다.
+        """
+        cutoff = _utcnow() - timedelta(seconds=self.stale_after)
+        last_seen = db.func.coalesce(GenerationJob.heartbeat_at, GenerationJob.started_at)
+        stale_filter = (GenerationJob.status == JOB_STATUS_RUNNING, last_seen < cutoff)
+        requeued = db.session.query(GenerationJob).filter(
+            *stale_filter, GenerationJob.attempts < self.max_attempts
+        ).update({
+            GenerationJob.status: JOB_STATUS_QUEUED,
+            GenerationJob.worker_id: None,
+            GenerationJob.started_at: None,
+            GenerationJob.heartbeat_at: None,
+            GenerationJob.result: None
+        }, synchronize_session=False)
+        failed = db.session.query(GenerationJob).filter(
+            *stale_filter, GenerationJob.attempts >= self.max_attempts
+        ).update({
+            GenerationJob.status: JOB_STATUS_FAILED,
+            GenerationJob.error: "작업 처리 중 워커가 중단되었습니다.",
+            GenerationJob.finished_at: _utcnow()
+        }, synchronize_session=False)
+        db.session.commit()
+        if requeued or failed:
+            logger.warning(f"Recovered stale generation jobs: {requeued} requeued, {failed} failed.")
+            self._wakeup.set()
+        return requeued + failed
+
+    def _owned_filter(self, job_id: str, claim_attempt: int) -> tuple:
+        """이 워커가 claim_attempt번째 시도로 가져간 running 작업인지 확인하는 조건"""
+        return (
+            GenerationJob.id == job_id,
+            GenerationJob.status == JOB_STATUS_RUNNING,
+            GenerationJob.worker_id == self.worker_id,
+            GenerationJob.attempts == claim_attempt
+        )
+
+    def run_job(self, job_id: str) -> None:
+        """
+        가져온 작업 하나를 실행하고 결과/오류를 기록합니다. (워커 스레드에서 호출)
+        실행 중 하트비트가 끊겨 작업이 복구되고 다른 워커가 다시 가져갔으면 결과를 기록하지 않습니다.
+        (시도 횟수를 가져간 시점의 값과 비교하므로 같은 프로세스의 다른 스레드가 다시 가져간 경우도 구분합니다)
+        """
+        with self.app.app_context():
+            job = db.session.get(GenerationJob, job_id)
+            if job is None:
+                logger.warning(f"Generation job {job_id} not found.")
+                return
+            claim_attempt = job.attempts
+            if job.status != JOB_STATUS_RUNNING or job.worker_id != self.worker_id:
+                logger.warning(f"Generation job {job_id} is not claimed by this worker ({job.status}, {job.worker_id}); skipping.")
+                return
+            started = time.perf_counter()
+            token = _current_job.set((self, job_id, claim_attempt))
+            try:
+                handler = self._handlers.get(job.job_type)
+                if handler is None:
+                    raise ValueError(f"지원하지 않는 작업 종류입니다: {job.job_type}")
+                result = handler(job)
+                values = {
+                    GenerationJob.status: JOB_STATUS_SUCCEEDED,
+                    GenerationJob.result: result,
+                    GenerationJob.content_id: result.get('content_id'),
+                    GenerationJob.error: None
+                }
+            except Exception as e:
+                db.session.rollback()
+                if isinstance(e, ContentGenerationError):
+                    logger.warning(f"Generation job {job_id} failed: {e}")
+                    error = str(e)
+                else:
+                    logger.error(f"Generation job {job_id} failed: {e}", exc_info=True)
+                    error = "콘텐츠 생성 중 오류가 발생했습니다."
+                values = {GenerationJob.status: JOB_STATUS_FAILED, GenerationJob.result: None, GenerationJob.error: error}
+            finally:
+                _current_job.reset(token)
+            values[GenerationJob.finished_at] = _utcnow()
+            # 조건부 UPDATE로 아직 이 워커의 시도일 때만 기록합니다.
+            finished = db.session.query(GenerationJob).filter(
+                *self._owned_filter(job_id, claim_attempt)
+            ).update(values, synchronize_session=False)
+            db.session.commit()
+            if finished != 1:
+                logger.warning(
+                    f"Generation job {job_id} was reclaimed while running (attempt {claim_attempt}); "
+                    f"discarding this run's {values[GenerationJob.status]} result "
+                    f"(content_id={values.get(GenerationJob.content_id)})."
+                )
+                return
+            logger.info(f"Generation job {job_id} {values[GenerationJob.status]} in {time.perf_counter() - started:.2f}s.")
+
+    def _run_job_and_release(self, job_id: str) -> None:
+        with self._running_lock:
+            self._running_ids.add(job_id)
+        try:
+            self.run_job(job_id)
+        except Exception as e:
+            logger.error(f"Generation job {job_id} could not be finalized: {e}", exc_info=True)
+        finally:
+            with self._running_lock:
+                self._running_ids.discard(job_id)
+            self._slots.release()
+            self._wakeup.set()
+
+    def _heartbeat_loop(self) -> None:
+        # 작업 실행 스레드와 별도로 돌아 오래 걸리는 생성 중에도 heartbeat_at이 갱신됩니다.
+        while not self._stop.wait(self.heartbeat_interval):
+            try:
+                with self.app.app_context():
+                    self.send_heartbeat()
+            except Exception as e:
+                logger.warning(f"Generation job heartbeat failed: {e}")
+
+    def _services_available(self) -> bool:
+        """AI 서비스 워밍업이 끝났는지(성공/실패) 확인합니다. 워밍업 중에는 작업을 가져가지 않습니다."""
+        readiness = self.app.extensions.get('service_readiness')
+        if readiness is None:
+            return True
+        return readiness.wait(self.poll_interval) or readiness.state == 'failed'
+
+    def _dispatch_loop(self) -> None:
+        logger.info(f"Generation job dispatcher started (worker={self.worker_id}, max_workers={self.max_workers}).")
+        while not self._stop.is_set():
+            if not self._services_available():
+                continue
+            if not self._slots.acquire(timeout=self.poll_interval):
+                continue
+            job_id = None
+            try:
+                with self.app.app_context():
+                    if time.monotonic() - self._last_recovery >= min(self.stale_after, 60):
+                        self._last_recovery = time.monotonic()
+                        self.recover_stale_jobs()
+                    job_id = self._claim_next_job()
+            except Exception as e:
+                logger.error(f"Generation job dispatch failed: {e}", exc_info=True)
+            if job_id is None:
+                self._slots.release()
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+            self._executor.submit(self._run_job_and_release, job_id)
+        logger.info("Generation job dispatcher stopped.")
+
+    def start(self) -> None:
+        """워커 풀과 디스패처 스레드를 시작합니다."""
+        if self.is_running:
+            return
+        self._stop.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='generation-job')
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name='generation-job-dispatcher', daemon=True)
+        self._dispatcher.start()
+        self._heartbeat = threading.Thread(target=self._heartbeat_loop, name='generation-job-heartbeat', daemon=True)
+        self._heartbeat.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """디스패처를 멈추고 실행 중인 작업이 끝날 때까지 기다립니다."""
+        self._stop.set()
+        self._wakeup.set()
+        if self._dispatcher is not None:
+            self._dispatcher.join(timeout)
+        if self._heartbeat is not None:
+            self._heartbeat.join(timeout)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+
+def init_generation_job_queue(app: Flask, start_workers: bool = JOB_WORKER_ENABLED) -> GenerationJobQueue:
+    """
+    GenerationJobQueue를 생성해 app.extensions에 등록하고, 설정에 따라 워커 풀을 시작합니다.
+    JOB_WORKER_ENABLED=false인 프로세스는 작업 등록만 하고 실행은 다른 프로세스에 맡깁니다.
+    """
+    job_queue = GenerationJobQueue(app)
+    job_queue.register_handler('text', _run_text_job)
+    job_queue.register_handler('image', _run_image_job)
+    app.extensions['generation_job_queue'] = job_queue
+    if start_workers:
+        job_queue.start()
+        logger.info("Generation job workers started.")
+    return job_queue
+
+
+def get_generation_job_queue() -> Optional[GenerationJobQueue]:
+    """현재 앱에 등록된 GenerationJobQueue 인스턴스를 반환합니다."""
+    return current_app.extensions.get('generation_job_queue')
@@ -0,0 +1,102 @@
+# ai-content-marketing-tool/services/app_core/readiness.py
+
+import time
+import logging
+import threading
+from functools import wraps
+from typing import Optional, Dict, Any
+from flask import Flask, current_app, jsonify
+
+from services.utils.constants import AI_SERVICES_READY_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceReadiness:
+    """
+    AI 서비스(RAG 인덱스, 텍스트/번역/이미지 생성기)의 워밍업 상태를 추적하는 클래스.
+    상태 흐름: pending → warming → ready | failed
+    """
+
+    def __init__(self):
+        self._ready_event = threading.Event()
+        self._lock = threading.Lock()
+        self.state = "pending"
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def mark_warming(self) -> None:
+        with self._lock:
+            self.state = "warming"
+            self.error = None
+            self.started_at = time.time()
+            self.finished_at = None
+
+    def mark_ready(self) -> None:
+        with self._lock:
+            self.state = "ready"
+            self.finished_at = time.time()
+        self._ready_event.set()
+
+    def mark_failed(self, error: str) -> None:
+        with self._lock:
+            self.state = "failed"
+            self.error = error
+            self.finished_at = time.time()
+        # 실패 시에도 대기 중인 요청이 타임아웃까지 붙잡혀 있지 않도록 이벤트를 해제합니다.
+        self._ready_event.set()
+
+    @property
+    def is_ready(self) -> bool:
+        return self.state == "ready"
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """서비스가 준비될 때까지 최대 timeout초 대기합니다. 준비 완료 여부를 반환합니다."""
+        self._ready_event.wait(timeout)
+        return self.is_ready
+
+    def snapshot(self) -> Dict[str, Any]:
+        """현재 워밍업 상태를 dict로 반환합니다."""
+        with self._lock:
+            warmup_seconds = None
+            if self.started_at is not None:
+                end = self.finished_at if self.finished_at is not None else time.time()
+                warmup_seconds = round(end - self.started_at, 3)
+            return {
+                "state": self.state,
+                "error": self.error,
+                "warmup_seconds": warmup_seconds,
+            }
+
+
+def init_service_readiness(app: Flask) -> ServiceReadiness:
+    """ServiceReadiness 인스턴스를 생성하고 app.extensions에 등록합니다."""
+    readiness = ServiceReadiness()
+    app.extensions['service_readiness'] = readiness
+    return readiness
+
+
+def get_service_readiness() -> Optional[ServiceReadiness]:
+    """현재 앱에 등록된 ServiceReadiness 인스턴스를 반환합니다."""
+    return current_app.extensions.get('service_readiness')
+
+
+def ai_services_required(view_func):
+    """
+    AI 서비스 워밍업이 끝날 때까지 최대 AI_SERVICES_READY_TIMEOUT초 대기하는 라우트 데코레이터.
+    준비되지 않으면 503을 반환합니다.
+    """
+    @wraps(view_func)
+    def wrapper(*args, **kwargs):
+        readiness = get_service_readiness()
+        # readiness가 등록되지 않은 경우(동기 초기화 등)에는 기존 동작을 유지합니다.
+        if readiness is not None and not readiness.wait(AI_SERVICES_READY_TIMEOUT):
+            logger.warning(f"AI services not ready (state={readiness.state}). Rejecting request.")
+            return jsonify({
+                "status": "error",
+                "error": "AI 서비스가 아직 준비 중입니다. 잠시 후 다시 시도해 주세요.",
+                "readiness": readiness.snapshot()
+            }), 503
+        return view_func(*args, **kwargs)
+    return wrapper
@@ -6,6 +6,7 @@ from extensions import scheduler
 from models import User
 from services.web_crawling.crawler_tasks import perform_marketing_crawl_task
 from services.ai_rag.rag_system import get_rag_system
+from services.utils.rate_limiter import rate_limit_priority, PRIORITY_BATCH
 
 logger = logging.getLogger(__name__)
 
@@ -42,7 +43,8 @@ def _get_system_crawler_user(app: Flask) -> User | None:
     return user
 
 def _marketing_crawl_job(user_id: int):
-    with scheduler.app.app_context():
+    # 크롤링 중 Bedrock 호출은 batch 우선순위로 실행합니다.
+    with scheduler.app.app_context(), rate_limit_priority(PRIORITY_BATCH):
         perform_marketing_crawl_task(system_user_id=user_id)
 
 def _faiss_reload_job():
@@ -1,12 +1,54 @@
+import time
 from extensions import db
-from models import Content
-from typing import List, Dict
+from models import Content, LLMUsage, User
+from datetime import datetime
+from typing import Any, Callable, Iterator, List, Dict, Optional, Sequence, Tuple
+from sqlalchemy import func
+from services.generation.text_generator import TextGenerationInput
+from services.generation.response_cache import canonicalize_request
+from services.generation.image_storage import resolve_image_urls, split_image_refs
+from services.generation.image_derivatives import image_variant_urls
+from services.generation.translation_generator import TranslationPromptInput
+from services.generation.image_generator import ImageGenerationInput, ImageGenerationResult
+from services.utils.llm_invoker import LLMCallUsage, collect_llm_usage
+from services.utils.metrics import observe_stage, STAGE_DB_COMMIT
+from services.utils.constants import JOB_PROGRESS_INTERVAL
 
-def create_text_content(user_id: int, generated_text: str, data: Dict) -> Content:
+# 토큰 사용량 집계 기준 (group_by 값 → 집계 컬럼)
+LLM_USAGE_GROUP_COLUMNS = {
+    'content_type': LLMUsage.content_type,
+    'industry': LLMUsage.industry,
+    'user': LLMUsage.user_id,
+    'route': LLMUsage.route,
+    'model': LLMUsage.model_id,
+}
+
+def build_llm_usage_records(content: Content, usage: Optional[Sequence[LLMCallUsage]]) -> List[LLMUsage]:
     """
-    텍스트 콘텐츠를 DB에 저장하고 Content 인스턴스를 반환합니다.
+    콘텐츠 생성에 사용한 LLM 호출별 사용량으로 LLMUsage 인스턴스를 만듭니다. (DB에는 저장하지 않습니다)
     """
-    new_content = Content(
+    return [
+        LLMUsage(
+            user_id=content.user_id,
+            content=content,
+            content_type=content.content_type,
+            industry=content.industry,
+            route=call.route,
+            model_id=call.model_id,
+            input_tokens=call.input_tokens,
+            output_tokens=call.output_tokens,
+            cache_read_input_tokens=call.cache_read_input_tokens,
+            cache_creation_input_tokens=call.cache_creation_input_tokens,
+            latency_ms=call.latency_ms
+        )
+        for call in usage or []
+    ]
+
+def build_text_content(user_id: int, generated_text: str, data: Dict) -> Content:
+    """
+    텍스트 콘텐츠 Content 인스턴스를 만듭니다. (DB에는 저장하지 않습니다)
+    """
+    return Content(
         user_id=user_id,
         generated_text=generated_text,
         topic=data.get('topic'),
@@ -25,13 +67,41 @@ def create_text_content(user_id: int, generated_text: str, data: Dict) -> Conten
         product_category=data.get('product_category'),
         ad_purpose=data.get('ad_purpose')
     )
+
+def create_text_content(user_id: int, generated_text: str, data: Dict,
+                        usage: Optional[Sequence[LLMCallUsage]] = None) -> Content:
+    """
+    텍스트 콘텐츠를 DB에 저장하고 Content 인스턴스를 반환합니다.
+    usage가 있으면 LLM 토큰 사용량도 같은 트랜잭션으로 저장합니다.
+    """
+    new_content = build_text_content(user_id, generated_text, data)
     db.session.add(new_content)
-    db.session.commit()
+    db.session.add_all(build_llm_usage_records(new_content, usage))
+    with observe_stage(STAGE_DB_COMMIT):
+        db.session.commit()
     return new_content
 
-def create_image_content(user_id: int, image_urls: List[str], data: Dict) -> Content:
+def create_text_contents(user_id: int, items: List[Tuple[str, Dict]],
+                         usages: Optional[List[Sequence[LLMCallUsage]]] = None) -> List[Content]:
+    """
+    여러 텍스트 콘텐츠를 하나의 트랜잭션으로 저장합니다.
+    items: (생성된 텍스트, 요청 데이터) 목록
+    usages: items와 같은 순서의 항목별 LLM 토큰 사용량 (생략 가능)
+    """
+    new_contents = [build_text_content(user_id, generated_text, data) for generated_text, data in items]
+    db.session.add_all(new_contents)
+    for new_content, usage in zip(new_contents, usages or []):
+        db.session.add_all(build_llm_usage_records(new_content, usage))
+    with observe_stage(STAGE_DB_COMMIT):
+        db.session.commit()
+    return new_contents
+
+def create_image_content(user_id: int, image_urls: List[str], data: Dict,
+                         usage: Optional[Sequence[LLMCallUsage]] = None) -> Content:
     """
     이미지 콘텐츠를 DB에 저장하고 Content 인스턴스를 반환합니다.
+    image_urls: 이미지 참조 목록 (S3 객체 키 또는 이전 방식의 로컬 URL)
+    usage: 프롬프트 번역에 사용한 LLM 토큰 사용량 (같은 트랜잭션으로 저장)
     """
     new_content = Content(
         user_id=user_id,
@@ -49,5 +119,192 @@ def create_image_content(user_id: int, image_urls: List[str], data: Dict) -> Con
         other_requirements=data.get('other_requirements')
     )
     db.session.add(new_content)
-    db.session.commit()
-    return new_content 
\ No newline at end of file
+    db.session.add_all(build_llm_usage_records(new_content, usage))
+    with observe_stage(STAGE_DB_COMMIT):
+        db.session.commit()
+    return new_content 
+
+class ContentGenerationError(Exception):
+    """생성 결과가 비어 있는 등 사용자에게 안내할 수 있는 콘텐츠 생성 실패"""
+    pass
+
+def find_recent_text_content(user_id: int, canonical: Dict[str, Optional[str]], since: datetime, limit: int = 50) -> Optional[Content]:
+    """
+    since 이후 같은 사용자가 생성한 텍스트 콘텐츠 중 정규화된 요청이 canonical과 같은 최신 항목을 찾습니다.
+    (텍스트 응답 캐시의 이력 조회용)
+    """
+    candidates = (
+        Content.query
+        .filter(
+            Content.user_id == user_id,
+            Content.content_type == canonical.get('content_type'),
+            Content.timestamp >= since,
+            Content.generated_text.isnot(None)
+        )
+        .order_by(Content.timestamp.desc())
+        .limit(limit)
+        .all()
+    )
+    for content in candidates:
+        if canonicalize_request(content) == canonical:
+            return content
+    return None
+
+def build_text_generation_input(data: Dict) -> Tuple[TextGenerationInput, bool]:
+    """
+    요청 데이터로 TextGenerationInput을 만들고 캐시 사용 여부를 반환합니다.
+    ("use_cache": false이면 캐시를 건너뛰고 새로 생성합니다.)
+    """
+    use_cache = data.get('use_cache', True) is not False
+    input_fields = {key: value for key, value in data.items() if key != 'use_cache'}
+    return TextGenerationInput(**input_fields), use_cache
+
+def generate_text_content_for_user(user_id: int, data: Dict, text_generator,
+                                   on_progress: Optional[Callable[[str], Any]] = None) -> Tuple[Content, Optional[str]]:
+    """
+    텍스트 콘텐츠(블로그, 이메일)를 생성하고 DB에 저장합니다.
+    on_progress가 주어지면 스트리밍으로 생성하면서 지금까지의 텍스트를 JOB_PROGRESS_INTERVAL초마다 전달합니다. (작업 워커용)
+    Returns:
+        Tuple[Content, Optional[str]]: 저장된 콘텐츠, 캐시 적중 유형 (새로 생성했으면 None)
+    """
+    if not text_generator:
+        raise RuntimeError("TextGenerator 서비스가 초기화되지 않았습니다.")
+    input_data, use_cache = build_text_generation_input(data)
+    if on_progress is None:
+        result = text_generator.generate_content_result(input_data, user_id=user_id, use_cache=use_cache)
+        return create_text_content(user_id, result.text, data, result.usage), result.cache_source
+    cached = text_generator.lookup_cached_content(input_data, user_id) if use_cache else None
+    if cached is not None:
+        return create_text_content(user_id, cached.text, data), cached.source
+    generated_parts: List[str] = []
+    last_reported = time.monotonic()
+    with collect_llm_usage() as usage:
+        for text_delta in text_generator.generate_content_stream(input_data, user_id=user_id, use_cache=False):
+            generated_parts.append(text_delta)
+            if time.monotonic() - last_reported >= JOB_PROGRESS_INTERVAL:
+                on_progress("".join(generated_parts))
+                last_reported = time.monotonic()
+    return create_text_content(user_id, "".join(generated_parts), data, usage), None
+
+def generate_text_batch_for_user(user_id: int, items: List[Dict], text_generator, use_cache: bool = True) -> Iterator[Dict]:
+    """
+    캠페인용 텍스트 콘텐츠 여러 개를 한 번에 생성하고, 항목이 끝나는 순서대로 이벤트(dict)를 반환합니다.
+    이벤트: item({"index", "content", "cached"}) 또는 item_error({"index", "error"}) → done({"content_ids", "failed"})
+    성공한 항목은 모두 끝난 뒤 하나의 트랜잭션으로 저장하며, content_ids는 요청 순서를 따릅니다. (실패 항목은 None)
+    """
+    if not text_generator:
+        raise RuntimeError("TextGenerator 서비스가 초기화되지 않았습니다.")
+    inputs = [build_text_generation_input(data)[0] for data in items]
+    generated: Dict[int, str] = {}
+    usages: Dict[int, List[LLMCallUsage]] = {}
+    failed: List[int] = []
+    for item_result in text_generator.generate_batch(inputs, user_id=user_id, use_cache=use_cache):
+        if item_result.error is not None:
+            failed.append(item_result.index)
+            yield {"event": "item_error", "index": item_result.index, "error": "텍스트 콘텐츠 생성 중 오류가 발생했습니다."}
+            continue
+        generated[item_result.index] = item_result.result.text
+        usages[item_result.index] = item_result.result.usage
+        yield {
+            "event": "item",
+            "index": item_result.index,
+            "content": item_result.result.text,
+            "cached": item_result.result.cache_source
+        }
+    saved_indices = sorted(generated)
+    new_contents = create_text_contents(
+        user_id,
+        [(generated[index], items[index]) for index in saved_indices],
+        [usages[index] for index in saved_indices]
+    )
+    content_ids: List[Optional[int]] = [None] * len(items)
+    for index, content in zip(saved_indices, new_contents):
+        content_ids[index] = content.id
+    yield {"event": "done", "content_ids": content_ids, "failed": sorted(failed)}
+
+def generate_image_content_for_user(user_id: int, data: Dict, translation_generator, image_generator) -> Tuple[Content, ImageGenerationResult, Dict]:
+    """
+    SNS 이미지 콘텐츠를 생성(프롬프트 번역 → 이미지 생성)하고 DB에 저장합니다.
+    일부 컷만 성공한 경우 성공한 컷만 저장하고, 실패한 컷 번호는 결과에 담아 반환합니다.
+    Returns:
+        Tuple[Content, ImageGenerationResult, Dict]: 저장된 콘텐츠, 이미지 생성 결과, 번역 결과
+    """
+    if not translation_generator:
+        raise RuntimeError("TranslationGenerator 서비스가 초기화되지 않았습니다.")
+    if not image_generator:
+        raise RuntimeError("ImageGenerator 서비스가 초기화되지 않았습니다.")
+    # 번역 프롬프트 입력값 구성
+    translation_keys = [
+        "topic", "brand_style_tone", "product_category", "target_audience",
+        "ad_purpose", "key_points", "other_requirements"
+    ]
+    translation_input = TranslationPromptInput(**{key: data.get(key, "") for key in translation_keys})
+    with collect_llm_usage() as translation_usage:
+        translation_result = translation_generator.translate_for_image_prompt(translation_input)
+    image_input = ImageGenerationInput(
+        topic=translation_result['image_prompt'],
+        cut_count=int(data.get('cut_count', 1))
+    )
+    image_result = image_generator.generate_images(image_input)
+    if not image_result.image_urls:
+        raise ContentGenerationError("일시적인 오류가 발생했습니다. 잠시 후 다시 시도해 주세요.")
+    # DB에는 S3 객체 키(또는 로컬 URL)를 저장하고, 응답에는 image_result.image_urls를 사용합니다.
+    new_content = create_image_content(user_id, image_result.image_refs, data, translation_usage)
+    return new_content, image_result, translation_result
+
+
+def content_to_response(content: Content, s3_client, bucket_name: Optional[str]) -> Dict:
+    """
+    Content를 API 응답용 dict로 변환합니다.
+    저장된 이미지 참조(S3 키)는 image_urls에 짧은 유효기간의 presigned(또는 CDN) URL로 변환해 담고,
+    image_variants에는 이미지별 WebP 썸네일/축소본 URL을 담습니다.
+    """
+    content_dict = content.to_dict()
+    content_dict["image_urls"] = resolve_image_urls(content.generated_image_url, s3_client, bucket_name)
+    content_dict["image_variants"] = image_variant_urls(split_image_refs(content.generated_image_url))
+    return content_dict
+
+def aggregate_llm_usage(group_by: str, since: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """
+    since 이후 저장된 LLM 토큰 사용량을 group_by(content_type, industry, user, route, model) 기준으로 집계합니다.
+    user 기준이면 사용자 이름을 함께 반환합니다. 알 수 없는 기준이면 ValueError를 발생시킵니다.
+    """
+    group_column = LLM_USAGE_GROUP_COLUMNS.get(group_by)
+    if group_column is None:
+        raise ValueError(f"지원하지 않는 집계 기준입니다: {group_by}")
+    query = db.session.query(
+        group_column.label('key'),
+        func.count(LLMUsage.id).label('calls'),
+        func.coalesce(func.sum(LLMUsage.input_tokens), 0).label('input_tokens'),
+        func.coalesce(func.sum(LLMUsage.output_tokens), 0).label('output_tokens'),
+        func.coalesce(func.sum(LLMUsage.cache_read_input_tokens), 0).label('cache_read_input_tokens'),
+        func.coalesce(func.sum(LLMUsage.cache_creation_input_tokens), 0).label('cache_creation_input_tokens'),
+        func.avg(LLMUsage.latency_ms).label('avg_latency_ms'),
+        func.count(func.distinct(LLMUsage.content_id)).label('contents')
+    )
+    if since is not None:
+        query = query.filter(LLMUsage.created_at >= since)
+    rows = query.group_by(group_column).order_by(func.sum(LLMUsage.input_tokens + LLMUsage.output_tokens).desc()).all()
+    usernames: Dict[int, str] = {}
+    if group_by == 'user':
+        user_ids = [row.key for row in rows if row.key is not None]
+        if user_ids:
+            usernames = dict(db.session.query(User.id, User.username).filter(User.id.in_(user_ids)).all())
+    groups = []
+    for row in rows:
+        group = {
+            "key": row.key,
+            "calls": row.calls,
+            "contents": row.contents,
+            "input_tokens": int(row.input_tokens),
+            "output_tokens": int(row.output_tokens),
+            "cache_read_input_tokens": int(row.cache_read_input_tokens),
+            "cache_creation_input_tokens": int(row.cache_creation_input_tokens),
+            "avg_input_tokens": round(int(row.input_tokens) / row.calls, 1) if row.calls else 0.0,
+            "avg_output_tokens": round(int(row.output_tokens) / row.calls, 1) if row.calls else 0.0,
+            "avg_latency_ms": round(float(row.avg_latency_ms or 0.0), 1),
+        }
+        if group_by == 'user':
+            group["username"] = usernames.get(row.key)
+        groups.append(group)
+    return groups
@@ -0,0 +1,152 @@
+# ai-content-marketing-tool/services/generation/context_builder.py
+
+import logging
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+
+from services.utils.constants import ENCODER, RAG_CONTEXT_TOKEN_BUDGET
+
+logger = logging.getLogger(__name__)
+
+CONTEXT_LINE_PREFIX = "관련 문서 {index}: "
+
+
+@lru_cache(maxsize=8192)
+def count_tokens(text: str) -> int:
+    """공유 tiktoken 인코더로 토큰 수를 계산합니다. (청크 텍스트별로 캐시)"""
+    return len(ENCODER.encode(text))
+
+
+@dataclass
+class ContextChunk:
+    """컨텍스트에 들어갈 검색 결과 한 조각"""
+    text: str
+    rank: int
+    s3_key: Optional[str] = None
+    chunk_index: Optional[int] = None
+
+
+@dataclass
+class BuiltContext:
+    """컨텍스트 조립 결과"""
+    text: str
+    used_tokens: int
+    token_budget: int
+    chunk_count: int
+    dropped_count: int = 0
+    sources: List[str] = field(default_factory=list)
+
+
+def _merge_overlapping_text(left: str, right: str, max_overlap_chars: int) -> str:
+    """
+    같은 문서의 인접 청크를 이어 붙입니다.
+    청킹 시 생긴 겹침(CHUNK_OVERLAP)을 찾아 한 번만 포함시키고, 겹침이 없으면 줄바꿈으로 연결합니다.
+    """
+    tail = left[-max_overlap_chars:]
+    probe = right[:min(8, len(right))]
+    start = tail.find(probe) if probe else -1
+    while start != -1:
+        overlap = tail[start:]
+        if right.startswith(overlap):
+            return left + right[len(overlap):]
+        start = tail.find(probe, start + 1)
+    return f"{left}\n{right}"
+
+
+class ContextBuilder:
+    """
+    RAG 검색 결과를 토큰 예산 안에서 프롬프트 컨텍스트로 조립하는 클래스.
+    - (청크, 점수, 메타데이터) 튜플과 문자열 결과를 모두 처리합니다.
+    - 같은 s3_key의 인접 청크(chunk_index 연속)는 겹침을 제거하고 하나로 합칩니다.
+    - 검색 순위가 높은 조각부터 예산에 들어가는 만큼만 담습니다.
+    """
+
+    def __init__(self, token_budget: int = RAG_CONTEXT_TOKEN_BUDGET, max_overlap_chars: int = 2000):
+        self.token_budget = token_budget
+        self.max_overlap_chars = max_overlap_chars
+
+    def _normalize(self, retrieved: Sequence[Any]) -> List[ContextChunk]:
+        """검색 결과를 ContextChunk 리스트로 변환합니다. (중복 텍스트 제거, 검색 순위 유지)"""
+        chunks: List[ContextChunk] = []
+        seen_texts = set()
+        for rank, item in enumerate(retrieved):
+            if isinstance(item, (tuple, list)):
+                text = item[0] if item else None
+                metadata: Dict[str, Any] = item[2] if len(item) > 2 and isinstance(item[2], dict) else {}
+            else:
+                text, metadata = item, {}
+            if not isinstance(text, str) or not text.strip() or text in seen_texts:
+                continue
+            seen_texts.add(text)
+            chunks.append(ContextChunk(
+                text=text,
+                rank=rank,
+                s3_key=metadata.get('s3_key'),
+                chunk_index=metadata.get('chunk_index'),
+            ))
+        return chunks
+
+    def _merge_adjacent(self, chunks: List[ContextChunk]) -> List[ContextChunk]:
+        """같은 문서의 연속된 청크를 합치고, 합쳐진 조각은 가장 높은 순위를 따릅니다."""
+        by_key: Dict[str, List[ContextChunk]] = {}
+        standalone: List[ContextChunk] = []
+        for chunk in chunks:
+            if chunk.s3_key is None or chunk.chunk_index is None:
+                standalone.append(chunk)
+            else:
+                by_key.setdefault(chunk.s3_key, []).append(chunk)
+
+        merged: List[ContextChunk] = list(standalone)
+        for s3_key, group in by_key.items():
+            group.sort(key=lambda c: c.chunk_index)
+            current = group[0]
+            for nxt in group[1:]:
+                if nxt.chunk_index == current.chunk_index + 1:
+                    current = ContextChunk(
+                        text=_merge_overlapping_text(current.text, nxt.text, self.max_overlap_chars),
+                        rank=min(current.rank, nxt.rank),
+                        s3_key=s3_key,
+                        chunk_index=nxt.chunk_index,
+                    )
+                else:
+                    merged.append(current)
+                    current = nxt
+            merged.append(current)
+        merged.sort(key=lambda c: c.rank)
+        return merged
+
+    def build(self, retrieved: Sequence[Any], token_budget: Optional[int] = None) -> BuiltContext:
+        """
+        검색 결과를 토큰 예산 안에서 "관련 문서 {i}: ..." 형식의 컨텍스트 문자열로 조립합니다.
+        Returns:
+            BuiltContext: 컨텍스트 문자열, 사용 토큰 수, 포함/제외된 조각 수
+        """
+        budget = token_budget if token_budget is not None else self.token_budget
+        candidates = self._merge_adjacent(self._normalize(retrieved or []))
+
+        lines: List[str] = []
+        sources: List[str] = []
+        used_tokens = 0
+        dropped = 0
+        for chunk in candidates:
+            prefix = CONTEXT_LINE_PREFIX.format(index=len(lines) + 1)
+            # 줄바꿈 구분자 1토큰을 포함해 계산합니다.
+            cost = count_tokens(prefix) + count_tokens(chunk.text) + (1 if lines else 0)
+            if used_tokens + cost > budget:
+                dropped += 1
+                continue
+            lines.append(prefix + chunk.text)
+            used_tokens += cost
+            if chunk.s3_key:
+                sources.append(chunk.s3_key)
+
+        logger.info(f"RAG context built: {len(lines)} chunks, {used_tokens}/{budget} tokens, {dropped} dropped.")
+        return BuiltContext(
+            text="\n".join(lines),
+            used_tokens=used_tokens,
+            token_budget=budget,
+            chunk_count=len(lines),
+            dropped_count=dropped,
+            sources=sources,
+        )
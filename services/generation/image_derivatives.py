@@ -0,0 +1,103 @@
+# ai-content-marketing-tool/services/generation/image_derivatives.py
+
+import io
+import os
+import hashlib
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from PIL import Image
+from flask import url_for
+
+from services.utils.constants import IMAGE_DERIVATIVE_CACHE_DIR, IMAGE_WEBP_QUALITY
+
+logger = logging.getLogger(__name__)
+
+# 파생 이미지 종류별 최대 너비(px). 원본보다 크게 늘리지는 않습니다.
+IMAGE_VARIANTS: Dict[str, int] = {
+    "thumb": 256,
+    "w640": 640,
+    "w1280": 1280,
+}
+
+
+def image_variant_urls(image_refs: List[str]) -> List[Dict[str, str]]:
+    """이미지 참조마다 파생 이미지 종류별 URL(dict)을 만듭니다. (요청 컨텍스트 안에서 호출)"""
+    return [
+        {
+            variant: url_for('content_routes.serve_image_derivative', variant=variant, image_ref=image_ref.lstrip('/'))
+            for variant in IMAGE_VARIANTS
+        }
+        for image_ref in image_refs
+    ]
+
+
+class ImageDerivativeError(Exception):
+    """파생 이미지 생성 관련 예외"""
+    pass
+
+
+class ImageDerivativeStore:
+    """
+    생성 이미지의 WebP 파생본(썸네일, 너비별 축소본)을 처음 요청될 때 만들어 디스크에 캐시하는 클래스.
+    원본 이미지는 키(파일명)가 바뀌지 않는 한 내용이 변하지 않으므로,
+    (원본 참조, 종류, 품질)의 해시를 파일명과 강한 ETag로 함께 사용합니다.
+    """
+
+    def __init__(self, cache_dir: str = IMAGE_DERIVATIVE_CACHE_DIR, quality: int = IMAGE_WEBP_QUALITY):
+        self.cache_dir = cache_dir
+        self.quality = quality
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def derivative_etag(self, image_ref: str, variant: str) -> str:
+        """원본 참조와 파생 종류로 결정되는 ETag(= 캐시 파일명)를 반환합니다."""
+        return hashlib.sha256(f"{image_ref}|{variant}|webp|{self.quality}".encode("utf-8")).hexdigest()
+
+    def _lock_for(self, etag: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(etag, threading.Lock())
+
+    def _render(self, source_bytes: bytes, max_width: int) -> bytes:
+        """원본 이미지를 max_width 이하로 축소하고 WebP로 인코딩합니다."""
+        try:
+            with Image.open(io.BytesIO(source_bytes)) as image:
+                image.load()
+                if image.mode not in ("RGB", "RGBA"):
+                    image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+                if image.width > max_width:
+                    height = max(1, round(image.height * max_width / image.width))
+                    image = image.resize((max_width, height), Image.LANCZOS)
+                output = io.BytesIO()
+                image.save(output, format="WEBP", quality=self.quality, method=4)
+                return output.getvalue()
+        except Exception as e:
+            raise ImageDerivativeError(f"파생 이미지 생성 실패: {e}") from e
+
+    def get_or_create(self, image_ref: str, variant: str, load_source: Callable[[], bytes]) -> Tuple[str, str]:
+        """
+        파생 이미지 파일 경로와 ETag를 반환합니다. 캐시에 없으면 원본을 불러와 한 번만 생성합니다.
+        Args:
+            image_ref: 원본 이미지 참조 (S3 키 또는 로컬 URL)
+            variant: IMAGE_VARIANTS의 키
+            load_source: 원본 이미지 바이트를 반환하는 함수 (캐시 미스일 때만 호출)
+        """
+        if variant not in IMAGE_VARIANTS:
+            raise ImageDerivativeError(f"지원하지 않는 이미지 종류입니다: {variant}")
+        etag = self.derivative_etag(image_ref, variant)
+        path = os.path.join(self.cache_dir, etag[:2], f"{etag}.webp")
+        if os.path.exists(path):
+            return path, etag
+        # 같은 파생본을 동시에 여러 번 만들지 않도록 ETag별로 잠급니다.
+        with self._lock_for(etag):
+            if os.path.exists(path):
+                return path, etag
+            derivative_bytes = self._render(load_source(), IMAGE_VARIANTS[variant])
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(derivative_bytes)
+            os.replace(tmp_path, path)
+            logger.info(f"Image derivative created: {image_ref} [{variant}] -> {path} ({len(derivative_bytes)} bytes)")
+        return path, etag
@@ -6,11 +6,15 @@ import base64
 import uuid
 import os
 import json
-from dataclasses import dataclass
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
 
 from ..utils.prompt_manager import PromptManager
-from services.utils.constants import IMAGE_SAVE_PATH
+from services.utils.constants import IMAGE_SAVE_PATH, IMAGE_STORAGE_BACKEND
+from services.utils.metrics import observe_stage, STAGE_IMAGE_GENERATION
+from services.utils.bedrock_gateway import get_model_concurrency
+from .image_storage import upload_image_bytes, image_key_to_url
 
 logger = logging.getLogger(__name__)
 
@@ -24,49 +28,119 @@ class ImageGenerationInput:
     topic: str
     cut_count: int = 1
 
+@dataclass
+class ImageGenerationResult:
+    """이미지 생성 결과 (컷 순서대로 정렬된 성공 URL과 실패한 컷 번호)"""
+    image_urls: List[str] = field(default_factory=list)  # 응답용 URL (presigned/CDN 또는 로컬 URL)
+    image_refs: List[str] = field(default_factory=list)  # DB 저장용 참조 (S3 객체 키 또는 로컬 URL)
+    failed_cuts: List[int] = field(default_factory=list)  # 실패한 컷 번호 (1부터 시작)
+    errors: Dict[int, str] = field(default_factory=dict)  # 컷 번호별 실패 사유
+
+    @property
+    def is_partial(self) -> bool:
+        return bool(self.image_urls) and bool(self.failed_cuts)
+
 class ImageGenerator:
     """이미지 생성 및 저장을 담당하는 클래스"""
-    def __init__(self, prompt_manager: PromptManager, image_bedrock_client, s3_client, image_model_id: str):
+    def __init__(self, prompt_manager: PromptManager, image_bedrock_client, s3_client, image_model_id: str,
+                 s3_bucket_name: Optional[str] = None):
         self.prompt_manager = prompt_manager
         self.bedrock_client = image_bedrock_client
         self.s3_client = s3_client
         self.image_model_id = image_model_id
+        self.s3_bucket_name = s3_bucket_name
         logger.info("ImageGenerator 인스턴스가 성공적으로 초기화되었습니다.")
 
+    @property
+    def uses_s3_storage(self) -> bool:
+        """생성 이미지를 S3에 저장하는지 여부 (S3 설정이 없으면 로컬 디스크에 저장)"""
+        return IMAGE_STORAGE_BACKEND == 's3' and bool(self.s3_client) and bool(self.s3_bucket_name)
+
+    def _store_image(self, image_bytes: bytes) -> Tuple[str, str]:
+        """
+        생성된 이미지를 저장하고 (DB 저장용 참조, 응답용 URL)을 반환합니다.
+        S3 저장소에서는 객체 키와 presigned(또는 CDN) URL을, 로컬 저장소에서는 로컬 URL을 반환합니다.
+        """
+        if not self.uses_s3_storage:
+            image_url = self._save_image_to_file(image_bytes)
+            return image_url, image_url
+        image_key = upload_image_bytes(self.s3_client, self.s3_bucket_name, image_bytes)
+        image_url = image_key_to_url(self.s3_client, self.s3_bucket_name, image_key)
+        if not image_url:
+            raise ImageGenerationError(f"이미지 URL 생성 실패: {image_key}")
+        return image_key, image_url
+
+    def _generate_cut(self, request_body: Dict, cut_number: int) -> Tuple[str, str]:
+        """
+        이미지 한 컷을 생성하고 저장한 뒤 (DB 저장용 참조, 응답용 URL)을 반환합니다.
+        컷마다 별도 스레드에서 실행되므로 한 컷의 업로드와 다른 컷의 생성이 겹쳐 진행됩니다.
+        모델별 동시 호출 상한은 BedrockGateway가 적용합니다.
+        """
+        with observe_stage(STAGE_IMAGE_GENERATION):
+            # Bedrock 모델을 호출하여 이미지 생성
+            response = self.bedrock_client.invoke_model(
+                body=json.dumps(request_body),
+                modelId=self.image_model_id,
+                accept="application/json",
+                contentType="application/json"
+            )
+            response_body = json.loads(response.get("body").read())
+        images_list = response_body.get("images")
+        if not images_list:
+            logger.warning(f"이미지 생성 응답에 images 리스트가 없습니다. (컷 {cut_number})")
+            raise ImageGenerationError("이미지 생성 응답에 images 리스트가 없습니다.")
+        image_bytes = base64.b64decode(images_list[0])
+        # 생성된 이미지를 S3(또는 로컬 디스크)에 저장
+        return self._store_image(image_bytes)
+
+    def generate_images(self, image_input: ImageGenerationInput) -> ImageGenerationResult:
+        """
+        요청한 컷 수만큼 이미지를 동시에 생성합니다.
+        일부 컷이 실패해도 성공한 컷은 컷 순서대로 반환하고, 실패한 컷 번호를 함께 보고합니다.
+        """
+        num_images = max(1, int(image_input.cut_count or 1))
+        request_body = {"prompt": image_input.topic}
+        outcomes: Dict[int, object] = {}
+
+        def run_cut(cut_number: int) -> None:
+            try:
+                outcomes[cut_number] = self._generate_cut(request_body, cut_number)
+            except Exception as e:
+                logger.error(f"이미지 컷 {cut_number} 생성 실패: {e}", exc_info=True)
+                outcomes[cut_number] = e
+
+        cut_numbers = range(1, num_images + 1)
+        if num_images == 1:
+            run_cut(1)
+        else:
+            max_workers = min(num_images, get_model_concurrency(self.image_model_id))
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='image-cut') as executor:
+                list(executor.map(run_cut, cut_numbers))
+
+        result = ImageGenerationResult()
+        for cut_number in cut_numbers:
+            outcome = outcomes.get(cut_number)
+            if isinstance(outcome, tuple):
+                image_ref, image_url = outcome
+                result.image_refs.append(image_ref)
+                result.image_urls.append(image_url)
+            else:
+                result.failed_cuts.append(cut_number)
+                result.errors[cut_number] = str(outcome)
+        if result.failed_cuts:
+            logger.warning(f"이미지 생성 {len(result.image_urls)}/{num_images}컷 성공, 실패한 컷: {result.failed_cuts}")
+        return result
+
     def create_image(self, image_input: ImageGenerationInput) -> List[str]:
         """
         입력값을 받아 이미지를 생성하고 파일로 저장한 뒤, 이미지 URL 리스트를 반환합니다.
+        (성공한 컷만 컷 순서대로 반환하며, 모든 컷이 실패하면 ImageGenerationError를 발생시킵니다.)
         """
-        image_prompt = image_input.topic
-        num_images = image_input.cut_count
-        request_body = {"prompt": image_prompt}
-        image_urls: List[str] = []
-        try:
-            for _ in range(num_images):
-                # Bedrock 모델을 호출하여 이미지 생성
-                response = self.bedrock_client.invoke_model(
-                    body=json.dumps(request_body),
-                    modelId=self.image_model_id,
-                    accept="application/json",
-                    contentType="application/json"
-                )
-                response_body = json.loads(response.get("body").read())
-                images_list = response_body.get("images")
-                if not images_list:
-                    logger.warning("이미지 생성 응답에 images 리스트가 없습니다.")
-                    continue
-                base64_image_data = images_list[0]
-                image_bytes = base64.b64decode(base64_image_data)
-                # 생성된 이미지를 파일로 저장
-                image_url = self._save_image_to_file(image_bytes)
-                image_urls.append(image_url)
-            if not image_urls:
-                logger.error("이미지 생성 결과가 비어 있습니다.")
-                raise ImageGenerationError("이미지 생성 결과가 비어 있습니다.")
-            return image_urls
-        except Exception as e:
-            logger.error(f"이미지 생성 중 예외 발생: {e}", exc_info=True)
-            raise ImageGenerationError(f"이미지 생성 중 예외 발생: {e}")
+        result = self.generate_images(image_input)
+        if not result.image_urls:
+            logger.error("이미지 생성 결과가 비어 있습니다.")
+            raise ImageGenerationError("이미지 생성 결과가 비어 있습니다.")
+        return result.image_urls
 
     def _save_image_to_file(self, image_bytes: bytes) -> str:
         """
@@ -84,8 +158,9 @@ class ImageGenerator:
         return image_url
 
 
-def create_image_generator(prompt_manager: PromptManager, image_bedrock_client: boto3.client, s3_client: boto3.client, image_model_id: str) -> ImageGenerator:
+def create_image_generator(prompt_manager: PromptManager, image_bedrock_client: boto3.client, s3_client: boto3.client, image_model_id: str,
+                           s3_bucket_name: Optional[str] = None) -> ImageGenerator:
     """
     ImageGenerator 인스턴스를 생성합니다.
     """
-    return ImageGenerator(prompt_manager, image_bedrock_client, s3_client, image_model_id)
\ No newline at end of file
+    return ImageGenerator(prompt_manager, image_bedrock_client, s3_client, image_model_id, s3_bucket_name)
\ No newline at end of file
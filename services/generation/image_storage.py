@@ -0,0 +1,119 @@
+# ai-content-marketing-tool/services/generation/image_storage.py
+
+import io
+import os
+import uuid
+import logging
+from typing import Any, List, Optional
+
+from boto3.s3.transfer import TransferConfig
+
+from services.utils.constants import (
+    IMAGE_S3_PREFIX,
+    IMAGE_PRESIGNED_URL_EXPIRES,
+    IMAGE_CDN_BASE_URL,
+    IMAGE_MULTIPART_THRESHOLD
+)
+from services.utils.metrics import observe_stage, STAGE_S3_WRITE
+
+logger = logging.getLogger(__name__)
+
+# 큰 이미지는 멀티파트로 나누어 병렬 업로드합니다.
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=IMAGE_MULTIPART_THRESHOLD,
+    multipart_chunksize=IMAGE_MULTIPART_THRESHOLD,
+    max_concurrency=4,
+    use_threads=True
+)
+
+
+def build_image_key(extension: str = "png") -> str:
+    """생성 이미지의 S3 객체 키를 만듭니다. (키가 곧 버전이므로 객체는 변경되지 않습니다)"""
+    return f"{IMAGE_S3_PREFIX.rstrip('/')}/sns_image_{uuid.uuid4().hex}.{extension}"
+
+
+def is_legacy_image_ref(image_ref: str) -> bool:
+    """로컬 디스크에 저장된 이전 방식의 이미지 URL(/content/generated_images/...)인지 확인합니다."""
+    return image_ref.startswith("/") or image_ref.startswith("http://") or image_ref.startswith("https://")
+
+
+def upload_image_bytes(s3_client: Any, bucket_name: str, image_bytes: bytes, content_type: str = "image/png") -> str:
+    """
+    이미지 바이트를 S3에 업로드하고 객체 키를 반환합니다.
+    IMAGE_MULTIPART_THRESHOLD보다 크면 멀티파트 업로드를 사용합니다.
+    """
+    image_key = build_image_key(content_type.split("/")[-1])
+    with observe_stage(STAGE_S3_WRITE):
+        s3_client.upload_fileobj(
+            io.BytesIO(image_bytes),
+            bucket_name,
+            image_key,
+            ExtraArgs={
+                "ContentType": content_type,
+                "CacheControl": "private, max-age=31536000, immutable"
+            },
+            Config=_TRANSFER_CONFIG
+        )
+    logger.info(f"Image uploaded to s3://{bucket_name}/{image_key} ({len(image_bytes)} bytes)")
+    return image_key
+
+
+def image_key_to_url(s3_client: Any, bucket_name: Optional[str], image_key: str,
+                     expires_in: int = IMAGE_PRESIGNED_URL_EXPIRES) -> Optional[str]:
+    """
+    S3 객체 키를 브라우저가 직접 받을 수 있는 URL로 변환합니다.
+    IMAGE_CDN_BASE_URL이 설정되어 있으면 CDN URL을, 아니면 짧은 유효기간의 presigned URL을 반환합니다.
+    """
+    if IMAGE_CDN_BASE_URL:
+        return f"{IMAGE_CDN_BASE_URL.rstrip('/')}/{image_key}"
+    if not s3_client or not bucket_name:
+        logger.warning(f"S3 설정이 없어 이미지 URL을 만들 수 없습니다: {image_key}")
+        return None
+    try:
+        return s3_client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": bucket_name, "Key": image_key},
+            ExpiresIn=expires_in
+        )
+    except Exception as e:
+        logger.error(f"Presigned URL 생성 실패 ({image_key}): {e}", exc_info=True)
+        return None
+
+
+def split_image_refs(stored_value: Optional[str]) -> List[str]:
+    """Content.generated_image_url에 저장된 값(쉼표 구분)을 이미지 참조 목록으로 나눕니다."""
+    if not stored_value:
+        return []
+    return [ref.strip() for ref in stored_value.split(",") if ref.strip()]
+
+
+def resolve_image_urls(stored_value: Optional[str], s3_client: Any, bucket_name: Optional[str]) -> List[str]:
+    """
+    저장된 이미지 참조(S3 키 또는 이전 방식의 로컬 URL)를 응답에 쓸 URL 목록으로 변환합니다.
+    """
+    urls: List[str] = []
+    for image_ref in split_image_refs(stored_value):
+        if is_legacy_image_ref(image_ref):
+            urls.append(image_ref)
+            continue
+        url = image_key_to_url(s3_client, bucket_name, image_ref)
+        if url:
+            urls.append(url)
+    return urls
+
+
+def read_image_bytes(image_ref: str, s3_client: Any, bucket_name: Optional[str], local_image_dir: str) -> bytes:
+    """
+    이미지 참조의 원본 바이트를 읽습니다. (파생 이미지 생성용)
+    이전 방식의 로컬 URL은 local_image_dir에서 파일명만 사용해 읽고, 그 외에는 S3 객체로 읽습니다.
+    """
+    if is_legacy_image_ref(image_ref):
+        if image_ref.startswith("http://") or image_ref.startswith("https://"):
+            raise FileNotFoundError(f"외부 URL 이미지는 읽을 수 없습니다: {image_ref}")
+        # 경로 조작을 막기 위해 파일명만 사용합니다.
+        with open(os.path.join(local_image_dir, os.path.basename(image_ref)), "rb") as f:
+            return f.read()
+    if not s3_client or not bucket_name:
+        raise FileNotFoundError(f"S3 설정이 없어 이미지를 읽을 수 없습니다: {image_ref}")
+    response = s3_client.get_object(Bucket=bucket_name, Key=image_ref)
+    return response["Body"].read()
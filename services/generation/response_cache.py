@@ -0,0 +1,244 @@
+# ai-content-marketing-tool/services/generation/response_cache.py
+
+import re
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field, asdict, is_dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+import numpy as np
+
+from services.utils.constants import (
+    TEXT_RESPONSE_CACHE_TTL_SECONDS,
+    TEXT_RESPONSE_CACHE_MAX_ENTRIES,
+    TEXT_RESPONSE_CACHE_SIMILARITY
+)
+
+logger = logging.getLogger(__name__)
+
+# 캐시 키에 포함되는 생성 요청 필드 (TextGenerationInput과 동일)
+CACHE_KEY_FIELDS = (
+    "topic", "industry", "content_type", "blog_style", "tone", "length_option",
+    "seo_keywords", "email_subject", "target_audience", "email_type", "key_points",
+    "landing_page_url", "brand_style_tone", "product_category", "ad_purpose"
+)
+# 의미 유사도로 비교하는 자유 입력 필드. 나머지 필드는 정확히 일치해야 유사도 후보가 됩니다.
+SEMANTIC_FIELDS = ("topic", "key_points", "target_audience")
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _normalize_value(name: str, value: Any) -> Optional[str]:
+    """필드 값을 비교 가능한 형태로 정규화합니다. (공백 정리, 대소문자 무시, 빈 값은 None)"""
+    if value is None:
+        return None
+    text = _WHITESPACE_RE.sub(" ", str(value)).strip()
+    if not text:
+        return None
+    if name == "landing_page_url":
+        return text.rstrip("/")
+    if name == "seo_keywords":
+        keywords = {keyword.strip().casefold() for keyword in text.split(",") if keyword.strip()}
+        return ",".join(sorted(keywords)) or None
+    return text.casefold()
+
+
+def canonicalize_request(fields: Any) -> Dict[str, Optional[str]]:
+    """
+    TextGenerationInput(또는 같은 필드를 가진 dict/모델)을 캐시 비교용 정규형 dict로 변환합니다.
+    """
+    if is_dataclass(fields):
+        fields = asdict(fields)
+    if isinstance(fields, Mapping):
+        getter = fields.get
+    else:
+        getter = lambda name: getattr(fields, name, None)
+    return {name: _normalize_value(name, getter(name)) for name in CACHE_KEY_FIELDS}
+
+
+def _digest(payload: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CachedResponse:
+    """캐시에 저장된 생성 결과"""
+    text: str
+    source: str  # 'exact' | 'semantic' | 'history'
+    created_at: float
+    similarity: float = 1.0
+    content_id: Optional[int] = None
+
+
+@dataclass
+class _CacheEntry:
+    text: str
+    user_id: Optional[int]
+    group_key: str
+    semantic_text: str
+    created_at: float
+    embedding: Optional[np.ndarray] = None
+
+
+@dataclass
+class ResponseCacheStats:
+    """캐시 적중률 지표"""
+    exact_hits: int = 0
+    semantic_hits: int = 0
+    history_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.exact_hits + self.semantic_hits + self.history_hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        hits = self.exact_hits + self.semantic_hits + self.history_hits
+        return round(hits / self.lookups, 4) if self.lookups else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "lookups": self.lookups, "hit_rate": self.hit_rate}
+
+
+class TextResponseCache:
+    """
+    텍스트 생성 결과 캐시.
+    - 키: 정규화된 생성 입력 + RAG 인덱스 세대 + 사용자 ID (사용자 간 결과를 공유하지 않습니다)
+    - 정확히 일치하는 요청이 없으면, 구조 필드(업종/종류/스타일/톤 등)가 같은 최근 요청 중
+      자유 입력 필드의 임베딩 유사도가 similarity_threshold 이상인 결과를 반환합니다. (embed_fn 설정 시)
+    - 메모리에 없으면 history_loader로 Content 이력에서 TTL 안의 동일 요청을 찾습니다.
+    """
+
+    def __init__(self,
+                 ttl_seconds: float = TEXT_RESPONSE_CACHE_TTL_SECONDS,
+                 max_entries: int = TEXT_RESPONSE_CACHE_MAX_ENTRIES,
+                 similarity_threshold: Optional[float] = TEXT_RESPONSE_CACHE_SIMILARITY,
+                 embed_fn: Optional[Callable[[str], Optional[np.ndarray]]] = None,
+                 history_loader: Optional[Callable[[int, Dict[str, Optional[str]], datetime], Optional[Any]]] = None):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.embed_fn = embed_fn if similarity_threshold is not None else None
+        self.history_loader = history_loader
+        self.stats = ResponseCacheStats()
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _keys(self, input_data: Any, user_id: Optional[int], index_generation: int):
+        canonical = canonicalize_request(input_data)
+        structural = {name: value for name, value in canonical.items() if name not in SEMANTIC_FIELDS}
+        scope = {"user_id": user_id, "index_generation": index_generation}
+        exact_key = _digest({**scope, "input": canonical})
+        group_key = _digest({**scope, "input": structural})
+        semantic_text = " | ".join(canonical[name] or "" for name in SEMANTIC_FIELDS)
+        return canonical, exact_key, group_key, semantic_text
+
+    def _is_fresh(self, entry: _CacheEntry, now: float) -> bool:
+        return now - entry.created_at <= self.ttl_seconds
+
+    def _embed(self, semantic_text: str) -> Optional[np.ndarray]:
+        if self.embed_fn is None:
+            return None
+        try:
+            embedding = self.embed_fn(semantic_text)
+        except Exception as e:
+            logger.warning(f"응답 캐시 임베딩 생성 실패: {e}")
+            return None
+        if embedding is None:
+            return None
+        embedding = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm else None
+
+    def lookup(self, input_data: Any, user_id: Optional[int], index_generation: int = 0,
+               index_loaded_at: Optional[datetime] = None) -> Optional[CachedResponse]:
+        """
+        캐시된 생성 결과를 찾습니다. 정확 일치 → 임베딩 유사도 → Content 이력 순서로 확인합니다.
+        """
+        canonical, exact_key, group_key, semantic_text = self._keys(input_data, user_id, index_generation)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(exact_key)
+            if entry is not None and self._is_fresh(entry, now):
+                self._entries.move_to_end(exact_key)
+                self.stats.exact_hits += 1
+                return CachedResponse(text=entry.text, source="exact", created_at=entry.created_at)
+            candidates = [
+                e for e in self._entries.values()
+                if e.group_key == group_key and e.embedding is not None and self._is_fresh(e, now)
+            ]
+
+        if candidates and self.embed_fn is not None:
+            query_embedding = self._embed(semantic_text)
+            if query_embedding is not None:
+                best = max(candidates, key=lambda e: float(np.dot(e.embedding, query_embedding)))
+                similarity = float(np.dot(best.embedding, query_embedding))
+                if similarity >= self.similarity_threshold:
+                    with self._lock:
+                        self.stats.semantic_hits += 1
+                    return CachedResponse(text=best.text, source="semantic", created_at=best.created_at,
+                                          similarity=round(similarity, 4))
+
+        if self.history_loader is not None and user_id is not None:
+            since = datetime.now(timezone.utc) - timedelta(seconds=self.ttl_seconds)
+            # 인덱스가 다시 로드된 이후의 이력만 같은 세대의 결과로 인정합니다.
+            if index_loaded_at is not None and index_loaded_at > since:
+                since = index_loaded_at
+            try:
+                content = self.history_loader(user_id, canonical, since)
+            except Exception as e:
+                logger.warning(f"Content 이력 캐시 조회 실패: {e}")
+                content = None
+            if content is not None and content.generated_text:
+                self.store(input_data, user_id, content.generated_text, index_generation, embed=False)
+                with self._lock:
+                    self.stats.history_hits += 1
+                return CachedResponse(text=content.generated_text, source="history", created_at=now,
+                                      content_id=content.id)
+
+        with self._lock:
+            self.stats.misses += 1
+        return None
+
+    def store(self, input_data: Any, user_id: Optional[int], text: str, index_generation: int = 0,
+              embed: bool = True) -> None:
+        """생성 결과를 캐시에 저장합니다. 최대 항목 수를 넘으면 가장 오래 사용하지 않은 항목부터 제거합니다."""
+        if not text:
+            return
+        _, exact_key, group_key, semantic_text = self._keys(input_data, user_id, index_generation)
+        embedding = self._embed(semantic_text) if embed else None
+        with self._lock:
+            self._entries[exact_key] = _CacheEntry(
+                text=text,
+                user_id=user_id,
+                group_key=group_key,
+                semantic_text=semantic_text,
+                created_at=time.time(),
+                embedding=embedding
+            )
+            self._entries.move_to_end(exact_key)
+            self.stats.stores += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def invalidate_user(self, user_id: Optional[int]) -> int:
+        """특정 사용자의 캐시 항목을 모두 제거합니다. 제거한 항목 수를 반환합니다."""
+        with self._lock:
+            keys = [key for key, entry in self._entries.items() if entry.user_id == user_id]
+            for key in keys:
+                del self._entries[key]
+        return len(keys)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """캐시 크기와 적중률 지표를 dict로 반환합니다."""
+        with self._lock:
+            return {"entries": len(self._entries), **self.stats.to_dict()}
@@ -1,17 +1,26 @@
 # ai-content-marketing-tool/services/ai_rag/text_generator.py
 
 import logging
-from dataclasses import dataclass
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
 from services.utils.constants import (
-    DEFAULT_LLM_MAX_TOKENS,
-    INDUSTRIES, PROMPT_TEMPLATE_RELATIVE_PATH,
+    PROMPT_TEMPLATE_RELATIVE_PATH,
     DEFAULT_LLM_TEMPERATURE, DEFAULT_LLM_TOP_P,
     RAG_TOP_K
 )
-from ..utils.prompt_manager import PromptManager
-from ..utils.llm_invoker import BedrockClaudeProvider
-from services.ai_rag.embedding_generator import EmbeddingManager
+from ..utils.prompt_manager import PromptManager, PromptInput
+from ..utils.llm_invoker import (
+    ModelRouter, RoutedClaudeProvider, LLMCallUsage, collect_llm_usage,
+    TIER_STANDARD, TIER_FAST, ROUTE_LONG_FORM, ROUTE_SHORT_FORM
+)
+from ..utils.metrics import observe_stage, STAGE_PROMPT_RENDER, STAGE_LLM, STAGE_LLM_STREAM
+from ..utils.bedrock_gateway import get_model_concurrency
+from ..utils.single_flight import get_single_flight, make_flight_key
+from .context_builder import ContextBuilder
+from .response_cache import TextResponseCache, CachedResponse, canonicalize_request
+from services.ai_rag.embedding_generator import init_embedding_manager
 
 logger = logging.getLogger(__name__)
 
@@ -38,39 +47,88 @@ class TextGenerationInput:
     product_category: Optional[str] = None
     ad_purpose: Optional[str] = None
 
+@dataclass
+class TextGenerationResult:
+    """
+    텍스트 생성 결과 (cache_source: 캐시 적중 시 'exact' | 'semantic' | 'history',
+    처리 중인 같은 요청의 결과를 공유하면 'inflight', 새로 생성하면 None)
+    usage: 이 결과를 만드는 데 사용한 LLM 호출별 토큰 사용량 (캐시 적중이거나 결과를 공유했으면 빈 목록)
+    """
+    text: str
+    cache_source: Optional[str] = None
+    usage: List[LLMCallUsage] = field(default_factory=list)
+
+@dataclass
+class BatchItemResult:
+    """일괄 생성의 항목별 결과 (index: 요청 순서, 실패 시 result는 None이고 error에 예외가 담깁니다)"""
+    index: int
+    result: Optional[TextGenerationResult] = None
+    error: Optional[Exception] = None
+
 class TextGenerator:
     """
     AI 텍스트 콘텐츠 생성을 담당하는 클래스
     """
-    PROVIDERS = {
-        'text': BedrockClaudeProvider
-    }
+    # 템플릿별 LLM 경로 (경로마다 모델 티어, max_tokens, 데드라인이 다름)
     TASK_MAPPING = {
-        'email_newsletter': 'text',
-        'email_promotion': 'text',
-        'blog_list': 'text',
-        'blog_review': 'text'
+        'email_newsletter': ROUTE_SHORT_FORM,
+        'email_promotion': ROUTE_SHORT_FORM,
+        'blog_list': ROUTE_LONG_FORM,
+        'blog_review': ROUTE_LONG_FORM
     }
 
-    def __init__(self, bedrock_runtime_client, rag_system_instance, app_root_path, model_id: str):
+    def __init__(self, bedrock_runtime_client, rag_system_instance, app_root_path, model_id: str,
+                 response_cache: Optional[TextResponseCache] = None, fast_model_id: Optional[str] = None):
         self.rag_system = rag_system_instance
+        # 응답 캐시는 선택 사항입니다. (None이면 항상 새로 생성)
+        self.response_cache = response_cache
         self.prompt_manager = PromptManager(app_root_path, PROMPT_TEMPLATE_RELATIVE_PATH)
-        self.embedding_manager = EmbeddingManager(bedrock_runtime_client)
-        self.embedding_manager.precompute_industry_embeddings(INDUSTRIES)
+        # RAGSystem과 같은 프로세스 공유 EmbeddingManager를 사용합니다. (업종 임베딩은 디스크 캐시에서 로드)
+        self.embedding_manager = init_embedding_manager(bedrock_runtime_client)
+        self.context_builder = ContextBuilder()
+        # 번역 등 가벼운 작업은 fast 티어 모델(fast_model_id, 미설정 시 model_id)로 라우팅합니다.
+        self.model_router = ModelRouter(bedrock_runtime_client, {TIER_STANDARD: model_id, TIER_FAST: fast_model_id or model_id})
         self.provider_instances = {
-            key: provider_cls(bedrock_runtime_client, model_id)
-            for key, provider_cls in self.PROVIDERS.items()
+            route_name: self.model_router.provider(route_name)
+            for route_name in set(self.TASK_MAPPING.values())
         }
+        # 같은 사용자의 같은 요청(중복 클릭, 프론트엔드 재시도)이 동시에 들어오면 한 번만 생성합니다.
+        self.single_flight = get_single_flight("text_generation")
         logger.info("TextGenerator 인스턴스가 성공적으로 초기화되었습니다.")
 
-    def generate_content(self, input_data: TextGenerationInput) -> str:
+    @staticmethod
+    def _rag_query(input_data: TextGenerationInput) -> str:
+        """RAG 검색에 사용할 쿼리 텍스트를 만듭니다."""
+        return f"주제: {input_data.topic}, 업종: {input_data.industry}, 콘텐츠 종류: {input_data.content_type}"
+
+    def _retrieve_documents(self, input_data: TextGenerationInput) -> Tuple[list, bool]:
         """
-        입력값과 RAG를 활용해 AI 텍스트 콘텐츠를 생성합니다.
+        RAG 검색 결과와 검색 생략(no-RAG) 여부를 반환합니다.
+        임베딩 회로가 열려 있거나 검색이 실패하면 컨텍스트 없이 생성하도록 빈 목록을 반환합니다.
+        """
+        if self.embedding_manager.is_degraded:
+            logger.warning("임베딩 회로가 열려 있어 RAG 검색 없이 생성합니다.")
+            return [], True
+        try:
+            return self.rag_system.retrieve(self._rag_query(input_data), k=RAG_TOP_K, industry=input_data.industry), False
+        except Exception as e:
+            logger.warning(f"RAG 검색 실패, 검색 없이 생성합니다: {e}", exc_info=True)
+            return [], True
+
+    def _prepare_generation(self, input_data: TextGenerationInput) -> Tuple[PromptInput, RoutedClaudeProvider, bool]:
+        """
+        RAG 검색과 템플릿 렌더링을 수행하여 최종 프롬프트, 호출할 Provider, RAG 생략 여부를 반환합니다.
         """
         # 1. RAG 검색
-        query = f"주제: {input_data.topic}, 업종: {input_data.industry}, 콘텐츠 종류: {input_data.content_type}"
-        retrieved_docs = self.rag_system.retrieve(query, k=RAG_TOP_K)
-        context_str = "\n".join([f"관련 문서 {i+1}: {doc}" for i, doc in enumerate(retrieved_docs)])
+        retrieved_docs, rag_degraded = self._retrieve_documents(input_data)
+        return (*self._build_prompt(input_data, retrieved_docs), rag_degraded)
+
+    def _build_prompt(self, input_data: TextGenerationInput, retrieved_docs) -> Tuple[PromptInput, RoutedClaudeProvider]:
+        """
+        검색된 문서로 컨텍스트를 구성하고 템플릿을 렌더링하여 최종 프롬프트와 호출할 Provider를 반환합니다.
+        """
+        built_context = self.context_builder.build(retrieved_docs)
+        context_str = built_context.text
         if not context_str:
             context_str = "참조할 관련 정보 없음."
 
@@ -79,27 +137,7 @@ class TextGenerator:
             input_data.content_type, input_data.blog_style, input_data.email_type
         )
 
-        # 3. 프롬프트 구성
-        final_prompt = self.prompt_manager.generate_text_prompt(
-            content_type=template_key,
-            topic=input_data.topic,
-            industry=input_data.industry,
-            context=context_str,
-            target_audience=input_data.target_audience,
-            key_points=input_data.key_points,
-            blog_style=input_data.blog_style,
-            tone=input_data.tone,
-            length=input_data.length_option,
-            seo_keywords=input_data.seo_keywords,
-            email_subject=input_data.email_subject,
-            email_type=input_data.email_type,
-            landing_page_url=input_data.landing_page_url,
-            brand_style_tone=input_data.brand_style_tone,
-            product_category=input_data.product_category,
-            ad_purpose=input_data.ad_purpose
-        )
-
-        # 4. 작업 유형 결정 및 Provider 선택
+        # 3. 작업 유형 결정 및 Provider 선택
         task_type = self.TASK_MAPPING.get(template_key)
         if not task_type:
             logger.error(f"지원하지 않는 콘텐츠 유형입니다: {template_key}")
@@ -109,21 +147,233 @@ class TextGenerator:
             logger.error(f"'{task_type}' 작업을 처리할 Provider를 찾을 수 없습니다.")
             raise TextGenerationError(f"'{task_type}' 작업을 처리할 Provider를 찾을 수 없습니다.")
 
+        # 4. 프롬프트 구성 (프롬프트 캐시를 지원하는 모델이면 고정 지침과 입력값을 나눔)
+        with observe_stage(STAGE_PROMPT_RENDER):
+            final_prompt = self.prompt_manager.generate_text_prompt(
+                content_type=template_key,
+                topic=input_data.topic,
+                industry=input_data.industry,
+                context=context_str,
+                target_audience=input_data.target_audience,
+                key_points=input_data.key_points,
+                blog_style=input_data.blog_style,
+                tone=input_data.tone,
+                length=input_data.length_option,
+                seo_keywords=input_data.seo_keywords,
+                email_subject=input_data.email_subject,
+                email_type=input_data.email_type,
+                landing_page_url=input_data.landing_page_url,
+                brand_style_tone=input_data.brand_style_tone,
+                product_category=input_data.product_category,
+                ad_purpose=input_data.ad_purpose,
+                split=provider.supports_prompt_cache
+            )
+        return final_prompt, provider
+
+    def _index_scope(self) -> Tuple[int, Optional[datetime]]:
+        """캐시 키에 사용할 RAG 인덱스 세대와 마지막 로드 시각을 반환합니다."""
+        generation = getattr(self.rag_system, 'index_generation', 0)
+        loaded_at = getattr(self.rag_system, 'index_loaded_at', None)
+        return (
+            generation if isinstance(generation, int) else 0,
+            loaded_at if isinstance(loaded_at, datetime) else None
+        )
+
+    def lookup_cached_content(self, input_data: TextGenerationInput, user_id: Optional[int]) -> Optional[CachedResponse]:
+        """
+        같은 사용자의 동일(또는 유사한) 요청에 대한 이전 생성 결과를 찾습니다. 캐시가 없으면 None을 반환합니다.
+        """
+        if self.response_cache is None:
+            return None
+        index_generation, index_loaded_at = self._index_scope()
+        cached = self.response_cache.lookup(input_data, user_id, index_generation, index_loaded_at)
+        if cached is not None:
+            logger.info(f"Text response cache hit ({cached.source}, similarity={cached.similarity}) for user {user_id}.")
+        return cached
+
+    def _store_cached_content(self, input_data: TextGenerationInput, user_id: Optional[int], generated_text: str) -> None:
+        if self.response_cache is None:
+            return
+        index_generation, _ = self._index_scope()
+        self.response_cache.store(input_data, user_id, generated_text, index_generation)
+
+    def generate_content_result(self, input_data: TextGenerationInput, user_id: Optional[int] = None,
+                                use_cache: bool = True) -> TextGenerationResult:
+        """
+        캐시를 먼저 확인하고, 없으면 RAG와 LLM으로 새로 생성합니다. 캐시 적중 여부를 함께 반환합니다.
+        같은 사용자의 정규화한 요청이 같은 생성이 처리 중이면 새로 호출하지 않고 그 결과를 기다려 공유합니다.
+        """
+        key = make_flight_key(user_id, use_cache, sorted(canonicalize_request(input_data).items()))
+        result, shared = self.single_flight.do(key, self._generate_content_result, input_data, user_id, use_cache)
+        if shared:
+            # 토큰 사용량은 실제로 호출한 요청에만 기록합니다.
+            return TextGenerationResult(text=result.text, cache_source=result.cache_source or "inflight")
+        return result
+
+    def _generate_content_result(self, input_data: TextGenerationInput, user_id: Optional[int],
+                                 use_cache: bool) -> TextGenerationResult:
+        cached = self.lookup_cached_content(input_data, user_id) if use_cache else None
+        if cached is not None:
+            return TextGenerationResult(text=cached.text, cache_source=cached.source)
+
+        final_prompt, provider, rag_degraded = self._prepare_generation(input_data)
+
         # 5. LLM 호출
         try:
-            generated_text = provider.invoke(
-                prompt=final_prompt,
-                max_tokens=DEFAULT_LLM_MAX_TOKENS,
-                temperature=DEFAULT_LLM_TEMPERATURE,
-                top_p=DEFAULT_LLM_TOP_P
-            )
+            with collect_llm_usage() as usage, observe_stage(STAGE_LLM):
+                generated_text = provider.invoke(
+                    prompt=final_prompt,
+                    temperature=DEFAULT_LLM_TEMPERATURE,
+                    top_p=DEFAULT_LLM_TOP_P
+                )
         except Exception as e:
             logger.error(f"텍스트 생성 중 예외 발생: {e}", exc_info=True)
             raise TextGenerationError(f"텍스트 생성 중 예외 발생: {e}")
-        return generated_text
+        # RAG 없이 만든 결과는 캐시하지 않습니다. (회로가 닫히면 컨텍스트를 포함해 다시 생성)
+        if not rag_degraded:
+            self._store_cached_content(input_data, user_id, generated_text)
+        return TextGenerationResult(text=generated_text, usage=usage)
+
+    def generate_batch(self, inputs: List[TextGenerationInput], user_id: Optional[int] = None,
+                       use_cache: bool = True) -> Iterator[BatchItemResult]:
+        """
+        여러 입력을 한 번에 생성하고, 완료되는 순서대로 항목별 결과를 반환합니다. (캠페인 일괄 생성용)
+        - 정규화한 요청이 같은 항목은 한 번만 생성해 결과를 공유합니다.
+        - 캐시에 없는 항목의 RAG 검색은 retrieve_many로 묶어서 한 번에 수행합니다.
+        - LLM 호출은 병렬로 실행하므로 전체 시간은 가장 느린 항목에 가까워집니다. (모델별 동시 호출 상한은 BedrockGateway가 적용)
+        - 소비자가 중간에 생성기를 닫으면(클라이언트 연결 종료) 아직 시작하지 않은 LLM 호출은 취소합니다.
+        - 토큰 사용량은 같은 요청 묶음의 첫 항목 결과에만 담습니다. (호출은 한 번이므로)
+        """
+        # 1. 동일 요청 묶기
+        groups: Dict[str, List[int]] = {}
+        for index, input_data in enumerate(inputs):
+            key = repr(sorted(canonicalize_request(input_data).items()))
+            groups.setdefault(key, []).append(index)
+        group_indices = list(groups.values())
+
+        # 2. 캐시 적중 항목은 바로 반환
+        pending: List[List[int]] = []
+        for indices in group_indices:
+            cached = self.lookup_cached_content(inputs[indices[0]], user_id) if use_cache else None
+            if cached is None:
+                pending.append(indices)
+                continue
+            for index in indices:
+                yield BatchItemResult(index, TextGenerationResult(text=cached.text, cache_source=cached.source))
+        if not pending:
+            return
+
+        # 3. 남은 항목의 RAG 검색을 한 번에 수행하고 프롬프트 구성
+        representatives = [inputs[indices[0]] for indices in pending]
+        rag_degraded = self.embedding_manager.is_degraded
+        if rag_degraded:
+            logger.warning("임베딩 회로가 열려 있어 RAG 검색 없이 일괄 생성합니다.")
+            retrieved = [[] for _ in representatives]
+        else:
+            retrieved = self.rag_system.retrieve_many(
+                [(self._rag_query(input_data), input_data.industry) for input_data in representatives], k=RAG_TOP_K
+            )
+        prepared = []
+        for indices, input_data, retrieved_docs in zip(pending, representatives, retrieved):
+            try:
+                prepared.append((indices, input_data, *self._build_prompt(input_data, retrieved_docs)))
+            except Exception as e:
+                for index in indices:
+                    yield BatchItemResult(index, error=e)
+
+        # 4. LLM 호출을 병렬 실행 (모델별 동시 호출 상한은 BedrockGateway에서 적용)
+        def invoke(input_data: TextGenerationInput, final_prompt: PromptInput,
+                   provider: RoutedClaudeProvider) -> Tuple[str, List[LLMCallUsage]]:
+            with collect_llm_usage() as usage, observe_stage(STAGE_LLM):
+                generated_text = provider.invoke(
+                    prompt=final_prompt,
+                    temperature=DEFAULT_LLM_TEMPERATURE,
+                    top_p=DEFAULT_LLM_TOP_P
+                )
+            if not rag_degraded:
+                self._store_cached_content(input_data, user_id, generated_text)
+            return generated_text, usage
+
+        if not prepared:
+            return
+        # 게이트웨이 상한보다 많은 스레드는 슬롯을 기다리기만 하므로 풀 크기도 상한에 맞춥니다.
+        model_ids = {provider.model_id for _, _, _, provider in prepared}
+        max_workers = min(sum(get_model_concurrency(model_id) for model_id in model_ids), len(prepared))
+        # with 블록 안에서 yield하면 클라이언트 연결이 끊겨 생성기가 닫힐 때 shutdown(wait=True)이
+        # 남은 호출을 모두 기다리므로, 끝까지 소비하지 않으면 대기 중인 호출을 취소하고 기다리지 않습니다.
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="text-batch")
+        futures = {
+            executor.submit(invoke, input_data, final_prompt, provider): indices
+            for indices, input_data, final_prompt, provider in prepared
+        }
+        completed = False
+        try:
+            for future in as_completed(futures):
+                indices = futures[future]
+                try:
+                    generated_text, usage = future.result()
+                except Exception as e:
+                    logger.error(f"일괄 텍스트 생성 항목 {indices} 실패: {e}", exc_info=True)
+                    error = TextGenerationError(f"텍스트 생성 중 예외 발생: {e}")
+                    for index in indices:
+                        yield BatchItemResult(index, error=error)
+                    continue
+                for position, index in enumerate(indices):
+                    yield BatchItemResult(index, TextGenerationResult(text=generated_text, usage=usage if position == 0 else []))
+            completed = True
+        finally:
+            if completed:
+                executor.shutdown(wait=True)
+            else:
+                cancelled = sum(1 for future in futures if future.cancel())
+                logger.info(f"일괄 텍스트 생성이 중단되어 대기 중인 LLM 호출 {cancelled}건을 취소했습니다.")
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def generate_content(self, input_data: TextGenerationInput, user_id: Optional[int] = None,
+                         use_cache: bool = True) -> str:
+        """
+        입력값과 RAG를 활용해 AI 텍스트 콘텐츠를 생성합니다.
+        """
+        return self.generate_content_result(input_data, user_id, use_cache).text
+
+    def generate_content_stream(self, input_data: TextGenerationInput, user_id: Optional[int] = None,
+                                use_cache: bool = True) -> Iterator[str]:
+        """
+        입력값과 RAG를 활용해 AI 텍스트 콘텐츠를 생성하면서, 생성되는 텍스트 조각을 순서대로 반환합니다.
+        캐시에 적중하면 이전 생성 결과를 한 번에 반환합니다.
+        같은 사용자의 정규화한 요청이 같은 스트림이 처리 중이면 새로 호출하지 않고 그 스트림의 조각을 처음부터 함께 받습니다.
+        (토큰 사용량은 실제로 호출한 요청에만 기록)
+        """
+        key = make_flight_key(user_id, use_cache, sorted(canonicalize_request(input_data).items()))
+        yield from self.single_flight.do_stream(key, self._generate_content_stream, input_data, user_id, use_cache)
+
+    def _generate_content_stream(self, input_data: TextGenerationInput, user_id: Optional[int],
+                                 use_cache: bool) -> Iterator[str]:
+        cached = self.lookup_cached_content(input_data, user_id) if use_cache else None
+        if cached is not None:
+            yield cached.text
+            return
+
+        final_prompt, provider, rag_degraded = self._prepare_generation(input_data)
+        generated_parts: List[str] = []
+        try:
+            with observe_stage(STAGE_LLM_STREAM):
+                for text_delta in provider.invoke_stream(
+                    prompt=final_prompt,
+                    temperature=DEFAULT_LLM_TEMPERATURE,
+                    top_p=DEFAULT_LLM_TOP_P
+                ):
+                    generated_parts.append(text_delta)
+                    yield text_delta
+        except Exception as e:
+            logger.error(f"텍스트 스트리밍 생성 중 예외 발생: {e}", exc_info=True)
+            raise TextGenerationError(f"텍스트 스트리밍 생성 중 예외 발생: {e}")
+        if not rag_degraded:
+            self._store_cached_content(input_data, user_id, "".join(generated_parts))
 
-def create_text_generator(bedrock_runtime_client, rag_system_instance, app_root_path, model_id: str):
+def create_text_generator(bedrock_runtime_client, rag_system_instance, app_root_path, model_id: str,
+                          response_cache: Optional[TextResponseCache] = None, fast_model_id: Optional[str] = None):
     """
     TextGenerator 인스턴스를 생성합니다.
     """
-    return TextGenerator(bedrock_runtime_client, rag_system_instance, app_root_path, model_id)
\ No newline at end of file
+    return TextGenerator(bedrock_runtime_client, rag_system_instance, app_root_path, model_id, response_cache, fast_model_id)
\ No newline at end of file
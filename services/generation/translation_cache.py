@@ -0,0 +1,134 @@
+# ai-content-marketing-tool/services/generation/translation_cache.py
+
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from services.utils.constants import TRANSLATION_CACHE_PATH, TRANSLATION_CACHE_MAX_ENTRIES
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_translation_field(value: Any) -> str:
+    """번역 입력 필드를 정규화합니다. (연속 공백을 하나로, 앞뒤 공백 제거, None/빈 값은 빈 문자열)"""
+    if value is None:
+        return ""
+    return _WHITESPACE_RE.sub(" ", str(value)).strip()
+
+
+class TranslationCache:
+    """
+    이미지 프롬프트 번역 결과를 저장하는 SQLite 기반 영구 LRU 캐시.
+    - 키: 모델 ID + 렌더링된 번역 프롬프트의 해시 (템플릿이 바뀌면 자동으로 새 키가 됩니다)
+    - 여러 워커 프로세스가 같은 파일을 공유하며, max_entries를 넘으면 가장 오래 사용하지 않은 항목부터 제거합니다.
+    """
+
+    def __init__(self, db_path: str = TRANSLATION_CACHE_PATH, max_entries: int = TRANSLATION_CACHE_MAX_ENTRIES):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS translations (
+                    cache_key TEXT PRIMARY KEY,
+                    image_prompt TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used_at REAL NOT NULL,
+                    hit_count INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_translations_last_used_at ON translations (last_used_at)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """트랜잭션 단위로 연결을 열고, 커밋(또는 롤백) 후 닫습니다."""
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(model_id: Optional[str], translation_prompt: str) -> str:
+        """모델 ID와 렌더링된 번역 프롬프트로 캐시 키를 만듭니다."""
+        return hashlib.sha256(f"{model_id or ''}\n{translation_prompt}".encode("utf-8")).hexdigest()
+
+    def get(self, cache_key: str) -> Optional[str]:
+        """캐시된 번역 결과를 반환하고 마지막 사용 시각을 갱신합니다. 없으면 None을 반환합니다."""
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT image_prompt FROM translations WHERE cache_key = ?", (cache_key,)
+                ).fetchone()
+                if row is not None:
+                    conn.execute(
+                        "UPDATE translations SET last_used_at = ?, hit_count = hit_count + 1 WHERE cache_key = ?",
+                        (time.time(), cache_key)
+                    )
+        except sqlite3.Error as e:
+            logger.warning(f"번역 캐시 조회 실패: {e}")
+            row = None
+        with self._stats_lock:
+            if row is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return row[0] if row is not None else None
+
+    def set(self, cache_key: str, image_prompt: str) -> None:
+        """번역 결과를 저장하고, 최대 항목 수를 넘으면 오래 사용하지 않은 항목을 제거합니다."""
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    """
+                    INSERT INTO translations (cache_key, image_prompt, created_at, last_used_at)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(cache_key) DO UPDATE SET image_prompt = excluded.image_prompt,
+                                                         last_used_at = excluded.last_used_at
+                    """,
+                    (cache_key, image_prompt, now, now)
+                )
+                conn.execute(
+                    """
+                    DELETE FROM translations WHERE cache_key IN (
+                        SELECT cache_key FROM translations ORDER BY last_used_at DESC LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (self.max_entries,)
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"번역 캐시 저장 실패: {e}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """캐시 크기와 적중률을 dict로 반환합니다."""
+        try:
+            with self._connect() as conn:
+                entries = conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        except sqlite3.Error:
+            entries = None
+        with self._stats_lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
@@ -4,9 +4,10 @@ import logging
 from dataclasses import dataclass
 from typing import Optional, Dict, Any
 from ..utils.prompt_manager import PromptManager
-from ..utils.llm_invoker import BedrockClaudeProvider
+from ..utils.llm_invoker import LLMProvider
+from ..utils.metrics import observe_stage, STAGE_TRANSLATION
+from .translation_cache import TranslationCache, normalize_translation_field
 from services.utils.constants import (
-    DEFAULT_LLM_MAX_TOKENS,
     DEFAULT_LLM_TEMPERATURE,
     DEFAULT_LLM_TOP_P
 )
@@ -30,18 +31,19 @@ class TranslationPromptInput:
 
 class TranslationGenerator:
     """이미지 프롬프트용 영어 번역 생성기"""
-    def __init__(self, prompt_manager: PromptManager, text_provider: BedrockClaudeProvider):
+    def __init__(self, prompt_manager: PromptManager, text_provider: LLMProvider,
+                 translation_cache: Optional[TranslationCache] = None):
         self.prompt_manager = prompt_manager
         self.text_provider = text_provider
+        # 번역 캐시는 선택 사항입니다. (None이면 항상 LLM을 호출)
+        self.translation_cache = translation_cache
         logger.info("TranslationGenerator 인스턴스가 성공적으로 초기화되었습니다.")
 
     def translate_for_image_prompt(self, prompt_input: TranslationPromptInput) -> Dict[str, Any]:
         """
         입력값을 받아 영어 이미지 프롬프트로 번역합니다.
+        입력값을 정규화(공백 정리, 빈 값 통일)한 뒤 같은 번역 프롬프트의 결과가 캐시에 있으면 LLM을 호출하지 않습니다.
         """
-        if not prompt_input.topic:
-            raise TranslationPromptError("번역할 주제(topic)가 없습니다.")
-
         translation_kwargs = {
             'topic': prompt_input.topic,
             'brand_style_tone': prompt_input.brand_style_tone,
@@ -51,31 +53,46 @@ class TranslationGenerator:
             'key_points': prompt_input.key_points,
             'other_requirements': prompt_input.other_requirements,
         }
+        translation_kwargs = {key: normalize_translation_field(value) for key, value in translation_kwargs.items()}
+        if not translation_kwargs['topic']:
+            raise TranslationPromptError("번역할 주제(topic)가 없습니다.")
+
         # 프롬프트 템플릿 생성
         translation_prompt = self.prompt_manager.generate_translate_prompt(
             **translation_kwargs
         )
 
+        cache_key = None
+        if self.translation_cache is not None:
+            cache_key = TranslationCache.make_key(getattr(self.text_provider, 'model_id', None), translation_prompt)
+            cached_output = self.translation_cache.get(cache_key)
+            if cached_output:
+                logger.info(f"Translation cache hit for '{translation_kwargs['topic']}'.")
+                return {"image_prompt": cached_output}
+
         try:
             # LLM 호출로 번역 수행
-            translated_output = self.text_provider.invoke(
-                prompt=translation_prompt,
-                max_tokens=DEFAULT_LLM_MAX_TOKENS,
-                temperature=DEFAULT_LLM_TEMPERATURE,
-                top_p=DEFAULT_LLM_TOP_P
-            ).strip()
+            with observe_stage(STAGE_TRANSLATION):
+                translated_output = self.text_provider.invoke(
+                    prompt=translation_prompt,
+                    temperature=DEFAULT_LLM_TEMPERATURE,
+                    top_p=DEFAULT_LLM_TOP_P
+                ).strip()
         except Exception as e:
             logger.error(f"LLM 번역 호출 실패: {e}", exc_info=True)
             raise TranslationPromptError(f"LLM 번역 호출 실패: {e}")
 
         if not translated_output:
             raise TranslationPromptError("번역 결과가 비어있습니다.")
+        if cache_key is not None:
+            self.translation_cache.set(cache_key, translated_output)
         logger.info(f"Translated '{prompt_input.topic}' to English prompt: {translated_output}")
         return {"image_prompt": translated_output}
 
 
-def create_translation_generator(prompt_manager: PromptManager, text_provider: BedrockClaudeProvider, translate_model_id: Optional[str] = None) -> TranslationGenerator:
+def create_translation_generator(prompt_manager: PromptManager, text_provider: LLMProvider, translate_model_id: Optional[str] = None,
+                                 translation_cache: Optional[TranslationCache] = None) -> TranslationGenerator:
     """
     TranslationGenerator 인스턴스를 생성합니다.
     """
-    return TranslationGenerator(prompt_manager, text_provider)
\ No newline at end of file
+    return TranslationGenerator(prompt_manager, text_provider, translation_cache)
\ No newline at end of file
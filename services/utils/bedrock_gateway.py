@@ -0,0 +1,304 @@
+# ai-content-marketing-tool/services/utils/bedrock_gateway.py
+
+import time
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, asdict
+from typing import Any, ContextManager, Dict, Iterator, Optional
+
+from botocore.config import Config as BotoConfig
+from botocore.exceptions import ClientError
+
+from services.utils.constants import (
+    BEDROCK_MAX_POOL_CONNECTIONS,
+    BEDROCK_MAX_ATTEMPTS,
+    BEDROCK_CONNECT_TIMEOUT,
+    BEDROCK_READ_TIMEOUT,
+    BEDROCK_DEFAULT_MODEL_CONCURRENCY,
+    BEDROCK_MODEL_CONCURRENCY,
+    BEDROCK_ACQUIRE_TIMEOUT
+)
+from services.utils.rate_limiter import BedrockRateLimiter
+
+logger = logging.getLogger(__name__)
+
+# 스로틀링으로 집계할 Bedrock 오류 코드
+THROTTLING_ERROR_CODES = frozenset({
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "ServiceQuotaExceededException",
+    "ModelNotReadyException",
+})
+
+
+class BedrockCapacityError(RuntimeError):
+    """모델별 동시 호출 상한에 걸려 BEDROCK_ACQUIRE_TIMEOUT 안에 호출 슬롯을 얻지 못한 경우"""
+    pass
+
+
+def build_bedrock_client_config() -> BotoConfig:
+    """
+    Bedrock 런타임 클라이언트용 botocore 설정을 만듭니다.
+    (커넥션 풀 크기, adaptive 재시도 모드, 연결/읽기 타임아웃)
+    """
+    return BotoConfig(
+        max_pool_connections=BEDROCK_MAX_POOL_CONNECTIONS,
+        retries={"mode": "adaptive", "max_attempts": BEDROCK_MAX_ATTEMPTS},
+        connect_timeout=BEDROCK_CONNECT_TIMEOUT,
+        read_timeout=BEDROCK_READ_TIMEOUT,
+        tcp_keepalive=True
+    )
+
+
+def is_throttling_error(error: Exception) -> bool:
+    """Bedrock 스로틀링 오류인지 확인합니다."""
+    if isinstance(error, ClientError):
+        return error.response.get("Error", {}).get("Code") in THROTTLING_ERROR_CODES
+    return False
+
+
+@dataclass
+class ModelCallStats:
+    """모델별 호출 지표"""
+    in_flight: int = 0
+    calls: int = 0
+    errors: int = 0
+    throttles: int = 0
+    capacity_timeouts: int = 0
+    total_latency_ms: float = 0.0
+    max_latency_ms: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        completed = self.calls - self.in_flight
+        return {
+            **asdict(self),
+            "avg_latency_ms": round(self.total_latency_ms / completed, 1) if completed > 0 else 0.0,
+        }
+
+
+class _ModelLimiter:
+    """모델 하나의 동시 호출 세마포어와 호출 지표"""
+
+    def __init__(self, max_concurrency: int):
+        self.max_concurrency = max(1, max_concurrency)
+        self.semaphore = threading.BoundedSemaphore(self.max_concurrency)
+        self.stats = ModelCallStats()
+        self.lock = threading.Lock()
+
+
+# 프로세스 전체에서 모델 ID별로 하나의 제한기를 공유합니다. (텍스트/이미지 클라이언트가 달라도 같은 모델이면 같은 상한)
+_model_limiters: Dict[str, _ModelLimiter] = {}
+_model_limiters_lock = threading.Lock()
+
+
+def get_model_concurrency(model_id: str) -> int:
+    """모델 ID의 동시 호출 상한을 반환합니다. (병렬 호출용 스레드 풀 크기를 정할 때 사용)"""
+    return max(1, BEDROCK_MODEL_CONCURRENCY.get(model_id, BEDROCK_DEFAULT_MODEL_CONCURRENCY))
+
+
+def _get_model_limiter(model_id: str) -> _ModelLimiter:
+    with _model_limiters_lock:
+        limiter = _model_limiters.get(model_id)
+        if limiter is None:
+            limiter = _ModelLimiter(get_model_concurrency(model_id))
+            _model_limiters[model_id] = limiter
+        return limiter
+
+
+def get_bedrock_call_stats() -> Dict[str, Dict[str, Any]]:
+    """모델 ID별 호출 지표(진행 중, 호출/오류/스로틀 수, 지연 시간)를 반환합니다."""
+    with _model_limiters_lock:
+        limiters = dict(_model_limiters)
+    stats = {}
+    for model_id, limiter in limiters.items():
+        with limiter.lock:
+            stats[model_id] = {"max_concurrency": limiter.max_concurrency, **limiter.stats.to_dict()}
+    return stats
+
+
+class _Reservation:
+    """
+    reserve()로 미리 얻은 호출 한도와 동시 호출 슬롯.
+    블록 안의 첫 번째 같은 모델 호출이 슬롯을 넘겨받아 호출이 실제로 끝날 때 반환하고,
+    호출하지 않고 블록을 나가면 reserve()가 반환합니다.
+    """
+
+    def __init__(self, model_id: str, limiter: "_ModelLimiter"):
+        self.model_id = model_id
+        self.limiter = limiter
+        self._claimed = False
+        self._lock = threading.Lock()
+
+    def claim(self, model_id: str) -> Optional["_ModelLimiter"]:
+        with self._lock:
+            if self._claimed or model_id != self.model_id:
+                return None
+            self._claimed = True
+            return self.limiter
+
+    def release_unclaimed(self) -> None:
+        with self._lock:
+            if self._claimed:
+                return
+            self._claimed = True
+        self.limiter.semaphore.release()
+
+
+# 현재 컨텍스트에서 미리 얻어 둔 호출 슬롯 (ResilientInvoker의 실행 스레드에도 contextvars로 전달됩니다)
+_current_reservation: contextvars.ContextVar[Optional[_Reservation]] = contextvars.ContextVar(
+    "bedrock_call_reservation", default=None
+)
+
+
+def bedrock_call_slot(client: Any, model_id: str, body: Any = None) -> ContextManager[None]:
+    """
+    client가 BedrockGateway이면 호출 한도와 동시 호출 슬롯을 미리 얻는 컨텍스트 매니저를, 아니면 아무것도 하지 않는 컨텍스트 매니저를 반환합니다.
+    데드라인/회로 차단기를 적용하는 호출을 이 블록 안에서 실행하면, 자체 한도 대기 시간이 데드라인과 회로 차단기 실패에 포함되지 않습니다.
+    """
+    if isinstance(client, BedrockGateway):
+        return client.reserve(model_id, body)
+    return nullcontext()
+
+
+class _StreamingBody:
+    """
+    스트리밍 응답 본문을 감싸서, 스트림을 끝까지 읽거나 닫을 때 모델 호출 슬롯을 반환합니다.
+    """
+
+    def __init__(self, body: Any, release):
+        self._body = body
+        self._release = release
+
+    def __iter__(self) -> Iterator[Any]:
+        try:
+            for event in self._body:
+                yield event
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        release, self._release = self._release, None
+        if release is not None:
+            release()
+
+    def __del__(self):
+        self.close()
+
+
+class BedrockGateway:
+    """
+    Bedrock 런타임 클라이언트를 감싸는 공용 호출 계층.
+    boto3 클라이언트와 같은 invoke_model / invoke_model_with_response_stream 인터페이스를 제공하므로
+    EmbeddingManager, BedrockClaudeProvider, ImageGenerator에 클라이언트 대신 그대로 전달할 수 있습니다.
+    - 모델 ID별 세마포어로 동시 호출 수를 제한해 순간적인 호출 폭주를 대기열로 흡수합니다.
+    - 호출 수, 진행 중인 호출, 스로틀링, 지연 시간을 모델별로 집계합니다.
+    - rate_limiter가 있으면 호출 전에 계정 한도(분당 요청/토큰 수)를 우선순위 클래스에 따라 기다립니다.
+    그 밖의 속성(meta, exceptions 등)은 원래 클라이언트로 위임합니다.
+    """
+
+    def __init__(self, client: Any, acquire_timeout: Optional[float] = BEDROCK_ACQUIRE_TIMEOUT,
+                 rate_limiter: Optional[BedrockRateLimiter] = None):
+        self._client = client
+        self.acquire_timeout = acquire_timeout
+        self.rate_limiter = rate_limiter
+
+    @property
+    def client(self) -> Any:
+        """감싸고 있는 boto3 클라이언트"""
+        return self._client
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+    def _admit(self, model_id: str, body: Any = None) -> _ModelLimiter:
+        """호출 한도(rate limiter)와 모델별 동시 호출 슬롯을 얻을 때까지 기다립니다."""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire_for_request(model_id, body)
+        limiter = _get_model_limiter(model_id)
+        if not limiter.semaphore.acquire(timeout=self.acquire_timeout):
+            with limiter.lock:
+                limiter.stats.capacity_timeouts += 1
+            raise BedrockCapacityError(
+                f"모델 '{model_id}'의 동시 호출 상한({limiter.max_concurrency})으로 {self.acquire_timeout}초 안에 호출하지 못했습니다."
+            )
+        return limiter
+
+    def _acquire(self, model_id: str, body: Any = None) -> _ModelLimiter:
+        """미리 얻어 둔 슬롯이 있으면 넘겨받고, 없으면 한도와 슬롯을 기다린 뒤 진행 중 호출로 집계합니다."""
+        reservation = _current_reservation.get()
+        limiter = reservation.claim(model_id) if reservation is not None else None
+        if limiter is None:
+            limiter = self._admit(model_id, body)
+        with limiter.lock:
+            limiter.stats.in_flight += 1
+            limiter.stats.calls += 1
+        return limiter
+
+    @staticmethod
+    def _release(limiter: _ModelLimiter, started: float, error: Optional[Exception] = None) -> None:
+        latency_ms = (time.monotonic() - started) * 1000
+        with limiter.lock:
+            stats = limiter.stats
+            stats.in_flight -= 1
+            stats.total_latency_ms += latency_ms
+            stats.max_latency_ms = max(stats.max_latency_ms, latency_ms)
+            if error is not None:
+                stats.errors += 1
+                if is_throttling_error(error):
+                    stats.throttles += 1
+        limiter.semaphore.release()
+
+    @contextmanager
+    def reserve(self, model_id: str, body: Any = None) -> Iterator[None]:
+        """
+        호출 한도와 동시 호출 슬롯을 미리 얻어 둡니다.
+        블록 안의 첫 번째 같은 모델 호출은 다시 기다리지 않고 이 슬롯을 사용하며, 그 밖의 호출(헤징 요청 등)은 평소처럼 기다립니다.
+        Raises:
+            RateLimitTimeout, BedrockCapacityError: 대기 시간 안에 한도나 슬롯을 얻지 못한 경우
+        """
+        reservation = _Reservation(model_id, self._admit(model_id, body))
+        token = _current_reservation.set(reservation)
+        try:
+            yield
+        finally:
+            _current_reservation.reset(token)
+            reservation.release_unclaimed()
+
+    def invoke_model(self, **kwargs) -> Dict[str, Any]:
+        """boto3 invoke_model과 같은 인자로 모델을 호출합니다."""
+        model_id = kwargs.get("modelId", "")
+        limiter = self._acquire(model_id, kwargs.get("body"))
+        started = time.monotonic()
+        try:
+            response = self._client.invoke_model(**kwargs)
+        except Exception as e:
+            self._release(limiter, started, e)
+            if is_throttling_error(e):
+                logger.warning(f"Bedrock throttled after retries (model={model_id}): {e}")
+            raise
+        self._release(limiter, started)
+        return response
+
+    def invoke_model_with_response_stream(self, **kwargs) -> Dict[str, Any]:
+        """
+        boto3 invoke_model_with_response_stream과 같은 인자로 모델을 호출합니다.
+        호출 슬롯은 응답 스트림을 끝까지 읽거나 닫을 때 반환됩니다.
+        """
+        model_id = kwargs.get("modelId", "")
+        limiter = self._acquire(model_id, kwargs.get("body"))
+        started = time.monotonic()
+        try:
+            response = self._client.invoke_model_with_response_stream(**kwargs)
+        except Exception as e:
+            self._release(limiter, started, e)
+            raise
+        released = threading.Event()
+
+        def release() -> None:
+            if not released.is_set():
+                released.set()
+                self._release(limiter, started)
+
+        return {**response, "body": _StreamingBody(response.get("body"), release)}
@@ -17,6 +17,131 @@ DEFAULT_LLM_TOP_P = 0.9        # LLM 생성 시 샘플링 다양성(1=최대 다
 
 # RAG/임베딩 옵션
 RAG_TOP_K = 5  # RAG 검색 시 반환할 문서(청크) 개수(Top-K, 검색 다양성/정확도 트레이드오프)
+RAG_CONTEXT_TOKEN_BUDGET = int(os.getenv('RAG_CONTEXT_TOKEN_BUDGET', '1500'))  # 프롬프트에 넣을 RAG 컨텍스트 최대 토큰 수
+RAG_ROUTING_TOP_N = int(os.getenv('RAG_ROUTING_TOP_N', '2'))  # 쿼리를 라우팅할 업종 파티션 수 (업종 중심 벡터 기준 상위 N개)
+# FAISS 결과로 인정할 최대 L2 거리 (미설정 시 거리 필터 없이 FAISS 결과를 그대로 사용)
+RAG_FAISS_MAX_DISTANCE = float(os.getenv('RAG_FAISS_MAX_DISTANCE')) if os.getenv('RAG_FAISS_MAX_DISTANCE') else None
+EMBEDDING_BATCH_MAX_CONCURRENCY = int(os.getenv('EMBEDDING_BATCH_MAX_CONCURRENCY', '4'))  # 여러 쿼리 임베딩을 병렬로 계산할 때 최대 동시 호출 수
+
+# Bedrock 호출 계층 설정 (텍스트/임베딩/이미지 공용)
+BEDROCK_MAX_POOL_CONNECTIONS = int(os.getenv('BEDROCK_MAX_POOL_CONNECTIONS', '50'))  # 클라이언트당 HTTP 커넥션 풀 크기 (botocore 기본 10)
+BEDROCK_MAX_ATTEMPTS = int(os.getenv('BEDROCK_MAX_ATTEMPTS', '5'))  # adaptive 재시도 모드의 최대 시도 횟수 (첫 호출 포함)
+BEDROCK_CONNECT_TIMEOUT = float(os.getenv('BEDROCK_CONNECT_TIMEOUT', '5'))  # 연결 타임아웃(초)
+BEDROCK_READ_TIMEOUT = float(os.getenv('BEDROCK_READ_TIMEOUT', '120'))  # 응답 읽기 타임아웃(초, 긴 생성 응답 고려)
+BEDROCK_DEFAULT_MODEL_CONCURRENCY = int(os.getenv('BEDROCK_DEFAULT_MODEL_CONCURRENCY', '8'))  # 모델별 기본 동시 호출 상한 (프로세스 단위)
+# 모델별 동시 호출 상한 덮어쓰기 (예: "anthropic.claude-3-5-sonnet-20240620-v1:0=4,amazon.titan-embed-text-v2:0=16")
+BEDROCK_MODEL_CONCURRENCY = {
+    model_id.strip(): int(limit)
+    for model_id, _, limit in (
+        item.rpartition('=') for item in os.getenv('BEDROCK_MODEL_CONCURRENCY', '').split(',') if '=' in item
+    )
+}
+BEDROCK_ACQUIRE_TIMEOUT = float(os.getenv('BEDROCK_ACQUIRE_TIMEOUT', '60'))  # 호출 슬롯을 기다리는 최대 시간(초)
+
+# Bedrock 계정 한도(분당 요청/토큰 수) 제한기 설정 (워커 프로세스와 스케줄러가 SQLite 파일로 공유)
+# 모델별 한도: "모델ID=RPM:TPM,..." (예: "anthropic.claude-3-5-sonnet-20240620-v1:0=50:200000"), 비어 있으면 제한하지 않음
+BEDROCK_RATE_LIMITS = os.getenv('BEDROCK_RATE_LIMITS', '')
+BEDROCK_RATE_LIMIT_PATH = os.getenv('BEDROCK_RATE_LIMIT_PATH', 'rate_limits/bedrock_buckets.sqlite3')
+BEDROCK_BATCH_RESERVE_FRACTION = float(os.getenv('BEDROCK_BATCH_RESERVE_FRACTION', '0.3'))  # batch 호출이 남겨 둬야 하는 버킷 비율 (interactive 전용 여유분)
+BEDROCK_RATE_LIMIT_WAIT_TIMEOUT = {  # 우선순위별 한도 대기 최대 시간(초)
+    'interactive': float(os.getenv('BEDROCK_RATE_LIMIT_INTERACTIVE_WAIT', '30')),
+    'batch': float(os.getenv('BEDROCK_RATE_LIMIT_BATCH_WAIT', '600')),
+}
+
+# 호출 데드라인/헤징/회로 차단기 설정
+LLM_CALL_TIMEOUT = float(os.getenv('LLM_CALL_TIMEOUT', '90'))  # Claude 호출 최대 대기 시간(초)
+EMBEDDING_CALL_TIMEOUT = float(os.getenv('EMBEDDING_CALL_TIMEOUT', '10'))  # 임베딩 호출 최대 대기 시간(초)
+EMBEDDING_HEDGE_ENABLED = os.getenv('EMBEDDING_HEDGE_ENABLED', 'true').lower() == 'true'  # 느린 임베딩 호출에 두 번째 요청을 보낼지 여부
+EMBEDDING_HEDGE_MIN_DELAY = float(os.getenv('EMBEDDING_HEDGE_MIN_DELAY', '0.5'))  # 헤징 요청 최소 대기 시간(초, 이후 최근 p95 지연 사용)
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', '5'))  # 회로를 여는 연속 실패 횟수
+CIRCUIT_RESET_TIMEOUT = float(os.getenv('CIRCUIT_RESET_TIMEOUT', '30'))  # 회로가 열린 뒤 시험 호출까지의 시간(초)
+CIRCUIT_TRIAL_TIMEOUT = float(os.getenv('CIRCUIT_TRIAL_TIMEOUT', '300'))  # 결과가 기록되지 않은 시험 호출을 포기하고 새 시험 호출을 허용하기까지의 시간(초)
+RESILIENCE_MAX_WORKERS = int(os.getenv('RESILIENCE_MAX_WORKERS', '32'))  # 데드라인/헤징 호출 실행 스레드 수
+
+# LLM 작업 유형별 라우팅: 경로 -> (모델 티어, 최대 출력 토큰 수, 호출 데드라인(초))
+# 티어 "standard"는 CLAUDE_MODEL_ID, "fast"는 FAST_CLAUDE_MODEL_ID(미설정 시 CLAUDE_MODEL_ID)를 사용합니다.
+LLM_ROUTES = {
+    'long_form': ('standard', DEFAULT_LLM_MAX_TOKENS, LLM_CALL_TIMEOUT),  # 블로그
+    'short_form': ('standard', DEFAULT_LLM_MAX_TOKENS, 60.0),  # 이메일
+    'translation': ('fast', DEFAULT_LLM_MAX_TOKENS, 20.0),  # 이미지 프롬프트 영어 번역
+    'summarization': ('fast', DEFAULT_LLM_MAX_TOKENS, 30.0),  # 요약
+}
+# 경로별 덮어쓰기: "경로=티어:최대토큰:데드라인,..." (비운 값은 기본값 유지, 예: "translation=standard::30")
+LLM_ROUTE_OVERRIDES = os.getenv('LLM_ROUTE_OVERRIDES', '')
+
+# 프롬프트 캐시 설정 (템플릿의 고정 지침을 시스템 프롬프트로 분리하고 캐시 체크포인트를 지정)
+PROMPT_CACHE_ENABLED = os.getenv('PROMPT_CACHE_ENABLED', 'true').lower() == 'true'
+# 프롬프트 캐시를 지원하는 모델 ID 부분 문자열 (쉼표 구분)
+PROMPT_CACHE_MODELS = [
+    model.strip() for model in os.getenv(
+        'PROMPT_CACHE_MODELS',
+        'claude-3-5-haiku,claude-3-7-sonnet,claude-sonnet-4,claude-opus-4,claude-haiku-4'
+    ).split(',') if model.strip()
+]
+
+# 동일 요청 합치기(single-flight) 설정: 처리 중인 같은 요청(임베딩, RAG 검색, 텍스트 생성)은 첫 호출의 결과를 기다려 공유합니다.
+SINGLE_FLIGHT_ENABLED = os.getenv('SINGLE_FLIGHT_ENABLED', 'true').lower() == 'true'
+SINGLE_FLIGHT_WAIT_TIMEOUT = float(os.getenv('SINGLE_FLIGHT_WAIT_TIMEOUT', '120'))  # 첫 호출을 기다리는 최대 시간(초, 넘으면 직접 호출)
+
+# 캠페인 일괄 텍스트 생성 설정
+TEXT_BATCH_MAX_ITEMS = int(os.getenv('TEXT_BATCH_MAX_ITEMS', '20'))  # 한 번에 요청할 수 있는 최대 항목 수
+
+# 텍스트 생성 응답 캐시 설정 (기본 비활성화)
+TEXT_RESPONSE_CACHE_ENABLED = os.getenv('TEXT_RESPONSE_CACHE_ENABLED', 'false').lower() == 'true'
+TEXT_RESPONSE_CACHE_TTL_SECONDS = float(os.getenv('TEXT_RESPONSE_CACHE_TTL_SECONDS', '21600'))  # 캐시된 생성 결과 유효 시간(초)
+TEXT_RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('TEXT_RESPONSE_CACHE_MAX_ENTRIES', '1000'))  # 프로세스당 메모리 캐시 최대 항목 수
+# 자유 입력 필드(주제/핵심 메시지/타겟) 임베딩 코사인 유사도 임계값 (미설정 시 정확히 일치하는 요청만 캐시 적중)
+TEXT_RESPONSE_CACHE_SIMILARITY = float(os.getenv('TEXT_RESPONSE_CACHE_SIMILARITY')) if os.getenv('TEXT_RESPONSE_CACHE_SIMILARITY') else None
+
+# 앱 시작/워밍업 설정
+AI_SERVICES_READY_TIMEOUT = float(os.getenv('AI_SERVICES_READY_TIMEOUT', '30'))  # 생성 요청이 워밍업 완료를 기다리는 최대 시간(초)
+
+# 이미지 프롬프트 번역 캐시 설정 (SQLite 파일, 워커 프로세스 간 공유)
+TRANSLATION_CACHE_ENABLED = os.getenv('TRANSLATION_CACHE_ENABLED', 'true').lower() == 'true'
+TRANSLATION_CACHE_PATH = os.getenv('TRANSLATION_CACHE_PATH', os.path.join('translation_cache', 'translations.sqlite3'))
+TRANSLATION_CACHE_MAX_ENTRIES = int(os.getenv('TRANSLATION_CACHE_MAX_ENTRIES', '5000'))  # 최대 항목 수 (초과 시 오래 사용하지 않은 항목부터 제거)
+
+# 이미지 생성 설정
+IMAGE_STORAGE_BACKEND = os.getenv('IMAGE_STORAGE_BACKEND', 's3')  # 생성 이미지 저장소: 's3' 또는 'local'(IMAGE_SAVE_PATH 디스크)
+IMAGE_S3_PREFIX = os.getenv('IMAGE_S3_PREFIX', 'generated-images/')  # S3_BUCKET_NAME 안의 생성 이미지 경로
+IMAGE_PRESIGNED_URL_EXPIRES = int(os.getenv('IMAGE_PRESIGNED_URL_EXPIRES', '900'))  # 이미지 presigned URL 유효 시간(초)
+IMAGE_CDN_BASE_URL = os.getenv('IMAGE_CDN_BASE_URL', '')  # 설정 시 presigned URL 대신 CDN URL({base}/{key})을 반환
+IMAGE_MULTIPART_THRESHOLD = int(os.getenv('IMAGE_MULTIPART_THRESHOLD', str(8 * 1024 * 1024)))  # 이 크기 이상이면 멀티파트 업로드
+IMAGE_DERIVATIVE_CACHE_DIR = os.getenv('IMAGE_DERIVATIVE_CACHE_DIR', 'image_derivatives')  # WebP 썸네일/축소본 디스크 캐시
+IMAGE_WEBP_QUALITY = int(os.getenv('IMAGE_WEBP_QUALITY', '80'))  # 파생 WebP 이미지 품질 (0-100)
+IMAGE_CACHE_MAX_AGE = int(os.getenv('IMAGE_CACHE_MAX_AGE', str(365 * 24 * 3600)))  # 이미지 응답 브라우저 캐시 시간(초, 파일명이 바뀌지 않으므로 immutable)
+
+# 비동기 생성 작업 큐 설정 (generation_jobs 테이블 기반)
+JOB_WORKER_ENABLED = os.getenv('JOB_WORKER_ENABLED', 'true').lower() == 'true'  # 이 프로세스에서 작업 워커를 실행할지 여부
+JOB_WORKER_COUNT = int(os.getenv('JOB_WORKER_COUNT', '2'))  # 프로세스당 동시에 실행할 생성 작업 수
+JOB_POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', '1.0'))  # 대기 중인 작업을 확인하는 주기(초)
+JOB_HEARTBEAT_INTERVAL = float(os.getenv('JOB_HEARTBEAT_INTERVAL', '30'))  # 실행 중인 작업의 heartbeat_at을 갱신하는 주기(초)
+JOB_STALE_SECONDS = float(os.getenv('JOB_STALE_SECONDS', '600'))  # 이 시간 이상 heartbeat가 없는 running 작업은 워커 중단으로 보고 복구
+JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', '2'))  # 워커 중단 시 작업을 다시 시도하는 최대 횟수
+JOB_PROGRESS_INTERVAL = float(os.getenv('JOB_PROGRESS_INTERVAL', '1.0'))  # 텍스트 작업의 중간 결과를 기록하는 최소 간격(초)
+
+# 크롤링 엔진 설정 (목록 페이지 탐색 → 기사 가져오기 → 본문 추출 → S3 저장/RAG 적재를 공용 워커 풀에서 동시에 실행)
+CRAWLER_MAX_WORKERS = int(os.getenv('CRAWLER_MAX_WORKERS', '8'))  # 크롤링 작업 전체의 동시 실행 수
+CRAWLER_PER_DOMAIN_CONCURRENCY = int(os.getenv('CRAWLER_PER_DOMAIN_CONCURRENCY', '2'))  # 도메인별 동시 요청 수 기본 상한
+# 도메인별 동시 요청 수 덮어쓰기 (예: "fashionbiz.co.kr=1,itworld.co.kr=4")
+CRAWLER_DOMAIN_CONCURRENCY = {
+    domain.strip().lower(): int(limit)
+    for domain, _, limit in (
+        item.rpartition('=') for item in os.getenv('CRAWLER_DOMAIN_CONCURRENCY', '').split(',') if '=' in item
+    )
+}
+CRAWLER_MAX_ARTICLES_PER_LIST = int(os.getenv('CRAWLER_MAX_ARTICLES_PER_LIST', '10'))  # 목록 페이지당 처리할 최대 기사 수
+CRAWLER_HTTP_POOL_SIZE = int(os.getenv('CRAWLER_HTTP_POOL_SIZE', '4'))  # 호스트별 HTTP 커넥션 풀 크기 (keep-alive 재사용)
+CRAWLER_HTTP_CACHE_ENABLED = os.getenv('CRAWLER_HTTP_CACHE_ENABLED', 'true').lower() == 'true'  # 조건부 요청용 응답 디스크 캐시 사용 여부
+CRAWLER_HTTP_CACHE_DIR = os.getenv('CRAWLER_HTTP_CACHE_DIR', 'crawler_http_cache')  # ETag/Last-Modified 응답 보관 디렉토리 (gzip)
+CRAWLER_HTTP_CACHE_TTL = float(os.getenv('CRAWLER_HTTP_CACHE_TTL', str(30 * 24 * 3600)))  # 마지막으로 확인한 뒤 응답을 보관하는 기간(초)
+CRAWLER_SELENIUM_POOL_SIZE = int(os.getenv('CRAWLER_SELENIUM_POOL_SIZE', '2'))  # 동시에 띄울 headless ChromeDriver 수
+CRAWLER_SELENIUM_MAX_USES = int(os.getenv('CRAWLER_SELENIUM_MAX_USES', '50'))  # 드라이버 하나로 처리할 최대 페이지 수 (넘으면 새로 띄움)
+CRAWLER_SELENIUM_CHECKOUT_TIMEOUT = float(os.getenv('CRAWLER_SELENIUM_CHECKOUT_TIMEOUT', '120'))  # 드라이버를 빌리기까지 최대 대기 시간(초)
+CRAWLER_SELENIUM_PAGE_LOAD_TIMEOUT = float(os.getenv('CRAWLER_SELENIUM_PAGE_LOAD_TIMEOUT', '30'))  # 페이지 로드 최대 시간(초)
+
+# 임베딩 캐시 설정 (업종/카테고리 라벨 임베딩을 모델 ID별로 디스크에 보관)
+EMBEDDING_CACHE_DIR = os.getenv('EMBEDDING_CACHE_DIR', 'embedding_cache')
 
 # 업종(산업군) 목록
 INDUSTRIES = [
@@ -29,4 +154,5 @@ INDUSTRIES = [
 
 # 경로 설정
 PROMPT_TEMPLATE_RELATIVE_PATH = os.path.join('templates', 'prompts')
+PROMPT_TEMPLATE_RELOAD_INTERVAL = float(os.getenv('PROMPT_TEMPLATE_RELOAD_INTERVAL', '5'))  # 템플릿 파일 변경 확인 주기(초, 0이면 매번, 음수이면 확인 안 함)
 IMAGE_SAVE_PATH = os.getenv('IMAGE_SAVE_PATH', 'generated_images')
\ No newline at end of file
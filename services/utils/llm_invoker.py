@@ -1,14 +1,130 @@
 # ai-content-marketing-tool/services/ai_rag/llm_invoker.py
 
 import json
+import time
 import base64
 import logging
+import threading
+import contextvars
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Iterator, List, Optional
 import boto3
+from services.utils.constants import (
+    LLM_CALL_TIMEOUT,
+    PROMPT_CACHE_ENABLED,
+    PROMPT_CACHE_MODELS,
+    LLM_ROUTES,
+    LLM_ROUTE_OVERRIDES,
+    DEFAULT_LLM_TEMPERATURE,
+    DEFAULT_LLM_TOP_P
+)
+from services.utils.prompt_manager import PromptInput, SplitPrompt
+from services.utils.resilience import get_resilient_invoker, CircuitOpenError, DeadlineExceeded, LatencyTracker
+from services.utils.bedrock_gateway import bedrock_call_slot
 
 logger = logging.getLogger(__name__)
 
+
+def supports_prompt_cache(model_id: str) -> bool:
+    """모델이 프롬프트 캐시 체크포인트(cache_control)를 지원하는지 확인합니다."""
+    return PROMPT_CACHE_ENABLED and any(model in (model_id or "") for model in PROMPT_CACHE_MODELS)
+
+
+@dataclass
+class LLMUsageStats:
+    """모델별 토큰 사용량(프롬프트 캐시 읽기/쓰기 포함)과 스트리밍 첫 토큰 지연"""
+    calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_input_tokens: int = 0
+    cache_creation_input_tokens: int = 0
+    stream_calls: int = 0
+    total_first_token_ms: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        prompt_tokens = self.input_tokens + self.cache_read_input_tokens + self.cache_creation_input_tokens
+        return {
+            **asdict(self),
+            "cache_hit_ratio": round(self.cache_read_input_tokens / prompt_tokens, 3) if prompt_tokens else 0.0,
+            "avg_first_token_ms": round(self.total_first_token_ms / self.stream_calls, 1) if self.stream_calls else 0.0,
+        }
+
+
+# 모델 ID별 토큰 사용량 (프로세스 공유)
+_usage_stats: Dict[str, LLMUsageStats] = {}
+_usage_stats_lock = threading.Lock()
+
+
+@dataclass
+class LLMCallUsage:
+    """LLM 호출 한 번의 토큰 사용량과 지연 시간 (생성 결과별 사용량 저장용)"""
+    model_id: str
+    route: Optional[str] = None
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_input_tokens: int = 0
+    cache_creation_input_tokens: int = 0
+    latency_ms: float = 0.0
+
+
+# collect_llm_usage 블록 안에서 일어난 호출의 사용량을 모으는 목록 (없으면 수집하지 않음)
+_usage_collector: contextvars.ContextVar[Optional[List[LLMCallUsage]]] = contextvars.ContextVar(
+    "llm_usage_collector", default=None
+)
+
+
+@contextmanager
+def collect_llm_usage() -> Iterator[List[LLMCallUsage]]:
+    """
+    블록 안에서 일어난 LLM 호출의 사용량(LLMCallUsage)을 목록으로 모읍니다.
+    같은 스레드(또는 컨텍스트를 복사해 실행한 작업)에서 호출한 것만 모입니다.
+    """
+    collected: List[LLMCallUsage] = []
+    token = _usage_collector.set(collected)
+    try:
+        yield collected
+    finally:
+        _usage_collector.reset(token)
+
+
+def _record_usage(model_id: str, usage: Optional[Dict[str, Any]], first_token_ms: Optional[float] = None,
+                  route: Optional[str] = None, latency_ms: float = 0.0) -> None:
+    """
+    Claude 응답의 usage(입력/출력/캐시 읽기/캐시 쓰기 토큰 수)를 모델별로 누적하고,
+    collect_llm_usage 블록 안이면 호출별 사용량도 함께 남깁니다.
+    """
+    usage = usage or {}
+    call_usage = LLMCallUsage(
+        model_id=model_id,
+        route=route,
+        input_tokens=int(usage.get("input_tokens") or 0),
+        output_tokens=int(usage.get("output_tokens") or 0),
+        cache_read_input_tokens=int(usage.get("cache_read_input_tokens") or 0),
+        cache_creation_input_tokens=int(usage.get("cache_creation_input_tokens") or 0),
+        latency_ms=round(latency_ms, 1)
+    )
+    with _usage_stats_lock:
+        stats = _usage_stats.setdefault(model_id, LLMUsageStats())
+        stats.calls += 1
+        stats.input_tokens += call_usage.input_tokens
+        stats.output_tokens += call_usage.output_tokens
+        stats.cache_read_input_tokens += call_usage.cache_read_input_tokens
+        stats.cache_creation_input_tokens += call_usage.cache_creation_input_tokens
+        if first_token_ms is not None:
+            stats.stream_calls += 1
+            stats.total_first_token_ms += first_token_ms
+    collected = _usage_collector.get()
+    if collected is not None:
+        collected.append(call_usage)
+
+
+def get_llm_usage_stats() -> Dict[str, Dict[str, Any]]:
+    """모델 ID별 토큰 사용량, 프롬프트 캐시 적중 비율, 평균 첫 토큰 지연을 반환합니다."""
+    with _usage_stats_lock:
+        return {model_id: stats.to_dict() for model_id, stats in _usage_stats.items()}
+
 class LLMProvider(ABC):
     """
     LLM(텍스트/이미지 생성) Provider의 공통 인터페이스.
@@ -27,29 +143,60 @@ class BedrockClaudeProvider(LLMProvider):
     def __init__(self, bedrock_runtime_client: boto3.client, model_id: str):
         self.bedrock_runtime = bedrock_runtime_client
         self.model_id = model_id
+        # 생성 호출은 멱등이 아니므로 헤징 없이 데드라인과 회로 차단기만 적용합니다.
+        self.invoker = get_resilient_invoker(f"claude:{model_id}", LLM_CALL_TIMEOUT)
+        self.supports_prompt_cache = supports_prompt_cache(model_id)
 
-    def invoke(self, prompt: str, max_tokens: int, temperature: float, top_p: float, **kwargs) -> str:
+    def _build_request_body(self, prompt: PromptInput, max_tokens: int, temperature: float, top_p: float) -> str:
         """
-        Claude LLM을 호출하여 텍스트를 생성합니다.
+        Claude Messages API 요청 본문을 생성합니다.
+        SplitPrompt이면 고정 지침을 시스템 프롬프트로 보내고, 지원 모델에서는 그 끝에 캐시 체크포인트를 둡니다.
         """
-        messages = [
-            {"role": "user", "content": [{"type": "text", "text": prompt}]}
-        ]
-        body = json.dumps({
+        body: Dict[str, Any] = {
             "anthropic_version": "bedrock-2023-05-31",
             "max_tokens": max_tokens,
             "temperature": temperature,
             "top_p": top_p,
-            "messages": messages
-        })
+        }
+        if isinstance(prompt, SplitPrompt):
+            system_block: Dict[str, Any] = {"type": "text", "text": prompt.prefix}
+            if self.supports_prompt_cache:
+                system_block["cache_control"] = {"type": "ephemeral"}
+            body["system"] = [system_block]
+            user_text = prompt.suffix
+        else:
+            user_text = prompt
+        body["messages"] = [
+            {"role": "user", "content": [{"type": "text", "text": user_text}]}
+        ]
+        return json.dumps(body)
+
+    def _invoke_model(self, body: str) -> dict:
+        """Claude 모델을 한 번 호출하고 응답 본문을 반환합니다."""
+        response = self.bedrock_runtime.invoke_model(
+            body=body,
+            modelId=self.model_id,
+            accept="application/json",
+            contentType="application/json"
+        )
+        return json.loads(response.get('body').read())
+
+    def invoke(self, prompt: PromptInput, max_tokens: int, temperature: float, top_p: float,
+               timeout: Optional[float] = None, route: Optional[str] = None, **kwargs) -> str:
+        """
+        Claude LLM을 호출하여 텍스트를 생성합니다.
+        timeout(기본 LLM_CALL_TIMEOUT) 안에 응답이 없거나 회로가 열려 있으면 즉시 실패합니다.
+        호출 한도/동시 호출 슬롯 대기는 데드라인과 회로 차단기 집계에 포함하지 않습니다.
+        route는 토큰 사용량 기록에 남길 작업 유형 이름입니다.
+        """
+        body = self._build_request_body(prompt, max_tokens, temperature, top_p)
         try:
-            response = self.bedrock_runtime.invoke_model(
-                body=body,
-                modelId=self.model_id,
-                accept="application/json",
-                contentType="application/json"
-            )
-            response_body = json.loads(response.get('body').read())
+            self.invoker.ensure_closed()
+            with bedrock_call_slot(self.bedrock_runtime, self.model_id, body):
+                started = time.monotonic()
+                response_body = self.invoker.call_with_timeout(timeout or self.invoker.timeout, self._invoke_model, body)
+            _record_usage(self.model_id, response_body.get('usage'), route=route,
+                          latency_ms=(time.monotonic() - started) * 1000)
             # Claude 응답에서 텍스트 추출
             if 'content' in response_body and response_body['content']:
                 return response_body['content'][0]['text']
@@ -59,6 +206,241 @@ class BedrockClaudeProvider(LLMProvider):
             logger.error(f"LLM 호출 실패: {e}", exc_info=True)
             raise RuntimeError(f"콘텐츠 생성 중 LLM 호출 오류 발생: {e}")
 
+    def invoke_stream(self, prompt: PromptInput, max_tokens: int, temperature: float, top_p: float,
+                      timeout: Optional[float] = None, route: Optional[str] = None, **kwargs) -> Iterator[str]:
+        """
+        Bedrock response-stream API로 Claude LLM을 호출하여 생성되는 텍스트 조각을 순서대로 반환합니다.
+        스트림이 끝나면 토큰 사용량과 첫 토큰까지의 지연 시간을 기록합니다.
+        호출 시작부터 timeout(기본 LLM_CALL_TIMEOUT)이 지나도 스트림이 끝나지 않으면 DeadlineExceeded로 실패합니다.
+        (이벤트 사이의 무응답은 Bedrock 클라이언트의 읽기 타임아웃으로 끊깁니다)
+        호출자가 스트림을 끝까지 읽지 않고 닫으면(클라이언트 연결 종료 등) 회로 상태를 바꾸지 않고 시험 호출 권한만 돌려줍니다.
+        """
+        body = self._build_request_body(prompt, max_tokens, temperature, top_p)
+        deadline_seconds = timeout or self.invoker.timeout
+        breaker = self.invoker.breaker
+        self.invoker.ensure_closed()
+        # 호출 한도/동시 호출 슬롯은 회로 차단기 시험 호출 권한을 얻기 전에 기다립니다.
+        with bedrock_call_slot(self.bedrock_runtime, self.model_id, body):
+            if not breaker.allow():
+                raise CircuitOpenError(f"'{self.invoker.name}' 회로가 열려 있어 호출하지 않습니다.")
+            started = time.monotonic()
+            try:
+                response = self.bedrock_runtime.invoke_model_with_response_stream(
+                    body=body,
+                    modelId=self.model_id,
+                    accept="application/json",
+                    contentType="application/json"
+                )
+            except Exception as e:
+                breaker.record_error(e)
+                logger.error(f"LLM 스트리밍 호출 실패: {e}", exc_info=True)
+                raise RuntimeError(f"콘텐츠 생성 중 LLM 스트리밍 호출 오류 발생: {e}")
+            except BaseException:
+                breaker.release_trial()
+                raise
+        stream = response.get('body')
+        first_token_ms: Optional[float] = None
+        usage: Dict[str, Any] = {}
+        resolved = False
+        try:
+            for event in stream:
+                if deadline_seconds is not None and time.monotonic() - started > deadline_seconds:
+                    raise DeadlineExceeded(f"'{self.invoker.name}' 스트리밍 호출이 {deadline_seconds}초 안에 끝나지 않았습니다.")
+                chunk = event.get('chunk')
+                if not chunk:
+                    continue
+                payload = json.loads(chunk.get('bytes'))
+                if payload.get('type') == 'message_start':
+                    usage.update(payload.get('message', {}).get('usage') or {})
+                elif payload.get('type') == 'content_block_delta':
+                    delta = payload.get('delta', {})
+                    if delta.get('type') == 'text_delta' and delta.get('text'):
+                        if first_token_ms is None:
+                            first_token_ms = (time.monotonic() - started) * 1000
+                        yield delta['text']
+                elif payload.get('type') == 'message_delta':
+                    usage.update(payload.get('usage') or {})
+                elif payload.get('type') == 'message_stop':
+                    break
+            resolved = True
+            breaker.record_success()
+            _record_usage(self.model_id, usage, first_token_ms if first_token_ms is not None else 0.0,
+                          route=route, latency_ms=(time.monotonic() - started) * 1000)
+        except Exception as e:
+            resolved = True
+            breaker.record_error(e)
+            logger.error(f"LLM 스트리밍 호출 실패: {e}", exc_info=True)
+            raise RuntimeError(f"콘텐츠 생성 중 LLM 스트리밍 호출 오류 발생: {e}")
+        finally:
+            if not resolved:
+                # GeneratorExit 등으로 중단된 경우: 엔드포인트 상태를 알 수 없으므로 시험 호출 권한만 돌려줍니다.
+                breaker.release_trial()
+            close = getattr(stream, 'close', None)
+            if close is not None:
+                close()
+
+# 모델 티어
+TIER_STANDARD = "standard"
+TIER_FAST = "fast"
+
+# 작업 유형별 경로 이름
+ROUTE_LONG_FORM = "long_form"
+ROUTE_SHORT_FORM = "short_form"
+ROUTE_TRANSLATION = "translation"
+ROUTE_SUMMARIZATION = "summarization"
+
+
+@dataclass(frozen=True)
+class ModelRoute:
+    """작업 유형 하나의 라우팅 설정 (모델 티어, 최대 출력 토큰 수, 호출 데드라인(초))"""
+    name: str
+    tier: str
+    max_tokens: int
+    timeout: float
+
+
+def parse_model_routes(overrides: str = LLM_ROUTE_OVERRIDES) -> Dict[str, ModelRoute]:
+    """
+    LLM_ROUTES 기본값에 "경로=티어:최대토큰:데드라인,..." 형식의 덮어쓰기를 적용한 경로 설정을 반환합니다.
+    비운 값은 기본값을 유지합니다. (예: "translation=standard::30")
+    """
+    routes = {
+        name: ModelRoute(name, tier, int(max_tokens), float(timeout))
+        for name, (tier, max_tokens, timeout) in LLM_ROUTES.items()
+    }
+    for item in overrides.split(","):
+        if "=" not in item:
+            continue
+        name, _, values = item.partition("=")
+        name = name.strip()
+        base = routes.get(name) or ModelRoute(name, TIER_STANDARD, *LLM_ROUTES[ROUTE_SHORT_FORM][1:])
+        tier, max_tokens, timeout = (values.split(":") + ["", "", ""])[:3]
+        routes[name] = ModelRoute(
+            name,
+            tier.strip() or base.tier,
+            int(max_tokens) if max_tokens.strip() else base.max_tokens,
+            float(timeout) if timeout.strip() else base.timeout
+        )
+    return routes
+
+
+class RoutedClaudeProvider(LLMProvider):
+    """
+    경로 설정(max_tokens, 데드라인)을 적용해 티어 모델의 BedrockClaudeProvider를 호출하고, 경로별 호출 수/오류/지연 시간을 기록합니다.
+    BedrockClaudeProvider와 같은 invoke / invoke_stream 인터페이스를 제공하며, max_tokens를 생략하면 경로 설정을 사용합니다.
+    """
+
+    def __init__(self, route: ModelRoute, provider: BedrockClaudeProvider):
+        self.route = route
+        self.provider = provider
+        self.latency = LatencyTracker()
+        self.calls = 0
+        self.errors = 0
+        self._stats_lock = threading.Lock()
+
+    @property
+    def model_id(self) -> str:
+        return self.provider.model_id
+
+    @property
+    def supports_prompt_cache(self) -> bool:
+        return self.provider.supports_prompt_cache
+
+    def _record(self, started: float, failed: bool) -> None:
+        if not failed:
+            self.latency.record(time.monotonic() - started)
+        with self._stats_lock:
+            self.calls += 1
+            if failed:
+                self.errors += 1
+
+    def invoke(self, prompt: PromptInput, max_tokens: Optional[int] = None, temperature: float = DEFAULT_LLM_TEMPERATURE,
+               top_p: float = DEFAULT_LLM_TOP_P, **kwargs) -> str:
+        started = time.monotonic()
+        try:
+            result = self.provider.invoke(
+                prompt, max_tokens or self.route.max_tokens, temperature, top_p,
+                timeout=self.route.timeout, route=self.route.name, **kwargs
+            )
+        except Exception:
+            self._record(started, failed=True)
+            raise
+        self._record(started, failed=False)
+        return result
+
+    def invoke_stream(self, prompt: PromptInput, max_tokens: Optional[int] = None, temperature: float = DEFAULT_LLM_TEMPERATURE,
+                      top_p: float = DEFAULT_LLM_TOP_P, **kwargs) -> Iterator[str]:
+        started = time.monotonic()
+        try:
+            yield from self.provider.invoke_stream(
+                prompt, max_tokens or self.route.max_tokens, temperature, top_p,
+                timeout=self.route.timeout, route=self.route.name, **kwargs
+            )
+        except Exception:
+            self._record(started, failed=True)
+            raise
+        self._record(started, failed=False)
+
+    def snapshot(self) -> Dict[str, Any]:
+        p50 = self.latency.percentile(0.5)
+        p95 = self.latency.percentile(0.95)
+        with self._stats_lock:
+            return {
+                "model_id": self.model_id,
+                "tier": self.route.tier,
+                "max_tokens": self.route.max_tokens,
+                "timeout": self.route.timeout,
+                "calls": self.calls,
+                "errors": self.errors,
+                "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+                "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            }
+
+
+class ModelRouter:
+    """
+    작업 유형(경로)을 모델 티어에 연결하는 라우팅 계층.
+    같은 모델을 쓰는 경로는 BedrockClaudeProvider(회로 차단기, 토큰 사용량 집계)를 공유하고,
+    경로별 max_tokens/데드라인과 지연 시간은 RoutedClaudeProvider가 따로 관리합니다.
+    """
+
+    def __init__(self, bedrock_runtime_client: Any, tier_models: Dict[str, str],
+                 routes: Optional[Dict[str, ModelRoute]] = None):
+        self.bedrock_runtime = bedrock_runtime_client
+        self.tier_models = tier_models
+        self.routes = routes if routes is not None else parse_model_routes()
+        self._model_providers: Dict[str, BedrockClaudeProvider] = {}
+        self._route_providers: Dict[str, RoutedClaudeProvider] = {}
+        self._lock = threading.Lock()
+
+    def provider(self, route_name: str) -> RoutedClaudeProvider:
+        """경로의 Provider를 반환합니다. 모르는 경로나 모델이 없는 티어면 ValueError를 발생시킵니다."""
+        with self._lock:
+            routed = self._route_providers.get(route_name)
+            if routed is not None:
+                return routed
+            route = self.routes.get(route_name)
+            if route is None:
+                raise ValueError(f"알 수 없는 LLM 경로입니다: {route_name}")
+            model_id = self.tier_models.get(route.tier) or self.tier_models.get(TIER_STANDARD)
+            if not model_id:
+                raise ValueError(f"'{route.tier}' 티어에 설정된 모델이 없습니다. (경로: {route_name})")
+            provider = self._model_providers.get(model_id)
+            if provider is None:
+                provider = BedrockClaudeProvider(self.bedrock_runtime, model_id)
+                self._model_providers[model_id] = provider
+            routed = RoutedClaudeProvider(route, provider)
+            self._route_providers[route_name] = routed
+            logger.info(f"LLM route '{route_name}' -> {model_id} (max_tokens={route.max_tokens}, timeout={route.timeout}s)")
+            return routed
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """사용 중인 경로별 모델, 설정, 호출 수, 오류 수, 지연 백분위를 반환합니다."""
+        with self._lock:
+            routed = dict(self._route_providers)
+        return {name: provider.snapshot() for name, provider in routed.items()}
+
+
 class BedrockImageGeneratorProvider(LLMProvider):
     """
     Stable Image Core 모델을 호출하는 Provider.
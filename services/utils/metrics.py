@@ -0,0 +1,86 @@
+# ai-content-marketing-tool/services/utils/metrics.py
+
+import os
+import time
+import logging
+from contextlib import contextmanager
+from typing import Iterator, Tuple
+
+# 멀티프로세스 모드(PROMETHEUS_MULTIPROC_DIR)에서는 prometheus_client를 불러오기 전에 디렉토리가 있어야 합니다.
+_multiproc_dir = os.getenv('PROMETHEUS_MULTIPROC_DIR')
+if _multiproc_dir:
+    os.makedirs(_multiproc_dir, exist_ok=True)
+
+from prometheus_client import (  # noqa: E402
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess
+)
+
+logger = logging.getLogger(__name__)
+
+# 파이프라인 단계 이름 (stage 레이블 값)
+STAGE_EMBEDDING = "embedding"
+STAGE_RETRIEVAL_FAISS = "retrieval_faiss"
+STAGE_RETRIEVAL_PGVECTOR = "retrieval_pgvector"
+STAGE_PROMPT_RENDER = "prompt_render"
+STAGE_LLM = "llm"
+STAGE_LLM_STREAM = "llm_stream"
+STAGE_TRANSLATION = "translation"
+STAGE_IMAGE_GENERATION = "image_generation"
+STAGE_S3_WRITE = "s3_write"
+STAGE_DB_COMMIT = "db_commit"
+STAGE_CRAWL_LIST_PAGE = "crawl_list_page"
+STAGE_CRAWL_ARTICLE = "crawl_article"
+STAGE_RAG_INGEST = "rag_ingest"
+
+# 수 ms(임베딩 캐시, 렌더링)부터 수십 초(LLM, 이미지 생성)까지 담는 버킷
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0, 60.0, 120.0)
+
+STAGE_DURATION = Histogram(
+    "content_stage_duration_seconds", "Duration of content generation pipeline stages",
+    ["stage"], buckets=LATENCY_BUCKETS
+)
+STAGE_ERRORS = Counter(
+    "content_stage_errors_total", "Failed content generation pipeline stages", ["stage"]
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request duration until the response is returned by the view",
+    ["method", "endpoint"], buckets=LATENCY_BUCKETS
+)
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by endpoint and status", ["method", "endpoint", "status"]
+)
+CRAWLED_ARTICLES = Counter(
+    "crawler_articles_total", "Crawled articles by result", ["result"]
+)
+
+
+@contextmanager
+def observe_stage(stage: str) -> Iterator[None]:
+    """블록의 소요 시간을 단계별 히스토그램에 기록하고, 예외가 나면 오류 수도 함께 올립니다."""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.labels(stage).inc()
+        raise
+    finally:
+        STAGE_DURATION.labels(stage).observe(time.perf_counter() - started)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Prometheus 텍스트 형식의 지표와 Content-Type을 반환합니다.
+    PROMETHEUS_MULTIPROC_DIR이 설정되어 있으면 모든 워커 프로세스의 지표 파일을 합쳐서 반환합니다.
+    """
+    if _multiproc_dir:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
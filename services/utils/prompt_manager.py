@@ -1,32 +1,267 @@
 import os
+import sys
+import time
+import string
 import logging
-from typing import Dict, Any
+import threading
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+from services.utils.constants import PROMPT_TEMPLATE_RELOAD_INTERVAL
 
 logger = logging.getLogger(__name__)
 
+_formatter = string.Formatter()
+
+# 분리된 프롬프트에서 입력값 블록 앞에 붙이는 안내문
+PROMPT_INPUT_HEADER = "위 지침의 {필드} 자리에는 아래 <입력값>의 같은 이름 항목을 사용하세요."
+
+
+@dataclass(frozen=True)
+class SplitPrompt:
+    """
+    고정 지침(prefix)과 요청별 입력값(suffix)으로 나눈 프롬프트.
+    prefix는 템플릿이 바뀌지 않는 한 항상 같으므로 시스템 프롬프트로 보내 모델의 프롬프트 캐시를 적용할 수 있습니다.
+    """
+    prefix: str
+    suffix: str
+
+    @property
+    def text(self) -> str:
+        """하나의 문자열로 합친 프롬프트"""
+        return f"{self.prefix}\n\n{self.suffix}"
+
+    def __str__(self) -> str:
+        return self.text
+
+
+PromptInput = Union[str, SplitPrompt]
+
+
+class CompiledTemplate:
+    """
+    str.format 문법의 템플릿을 고정 문자열 조각과 치환 슬롯으로 미리 분해해 둔 템플릿.
+    렌더링 시 템플릿 문자열을 다시 파싱하지 않고 슬롯 값만 채워 이어 붙이며, 결과는 str.format과 같습니다.
+    """
+
+    def __init__(self, name: str, source: str):
+        self.name = name
+        self.source = source
+        self._segments: List[str] = []
+        # (조각 위치, 필드 이름, 변환 문자, 서식 지정자)
+        self._slots: List[Tuple[int, str, Optional[str], str]] = []
+        # 서식 지정자 안에 중첩 필드가 있으면 str.format으로 처리합니다.
+        self._needs_format = False
+        for literal, field_name, format_spec, conversion in _formatter.parse(source):
+            if literal:
+                self._segments.append(literal)
+            if field_name is None:
+                continue
+            if not field_name or field_name.isdigit():
+                raise ValueError(f"프롬프트 템플릿 '{name}'에 이름 없는 치환 필드가 있습니다.")
+            if format_spec and "{" in format_spec:
+                self._needs_format = True
+            self._slots.append((len(self._segments), field_name, conversion, format_spec or ""))
+            self._segments.append("")
+        # 슬롯 자리에 {필드} 표시를 남긴 고정 지침 (render_split의 prefix)
+        placeholders = self._segments.copy()
+        for index, field_name, _, _ in self._slots:
+            placeholders[index] = f"{{{field_name}}}"
+        self.static_prefix = "".join(placeholders)
+
+    @property
+    def fields(self) -> List[str]:
+        """템플릿이 사용하는 필드 이름 목록 (등장 순서, 중복 제거)"""
+        return list(dict.fromkeys(slot[1] for slot in self._slots))
+
+    @property
+    def memory_bytes(self) -> int:
+        """원본과 분해된 조각이 차지하는 대략적인 메모리(바이트)"""
+        return (sys.getsizeof(self.source) + sys.getsizeof(self.static_prefix)
+                + sum(sys.getsizeof(segment) for segment in self._segments))
+
+    @staticmethod
+    def _format_slot(variables: Dict[str, Any], field_name: str, conversion: Optional[str], format_spec: str) -> str:
+        if field_name in variables:
+            value = variables[field_name]
+        else:
+            value, _ = _formatter.get_field(field_name, (), variables)
+        if conversion:
+            value = _formatter.convert_field(value, conversion)
+        return format(value, format_spec)
+
+    def render(self, variables: Dict[str, Any]) -> str:
+        """variables로 슬롯을 채운 문자열을 반환합니다. 필드가 없으면 str.format과 같이 KeyError가 발생합니다."""
+        if self._needs_format:
+            return self.source.format(**variables)
+        parts = self._segments.copy()
+        for index, field_name, conversion, format_spec in self._slots:
+            parts[index] = self._format_slot(variables, field_name, conversion, format_spec)
+        return "".join(parts)
+
+    def render_split(self, variables: Dict[str, Any]) -> SplitPrompt:
+        """
+        고정 지침(슬롯 자리는 {필드} 표시)과 필드별 입력값 블록으로 나눈 프롬프트를 반환합니다.
+        같은 필드가 여러 번 나와도 입력값은 한 번만 넣습니다.
+        """
+        if self._needs_format:
+            return SplitPrompt(self.render(variables), "")
+        values: Dict[str, str] = {}
+        for _, field_name, conversion, format_spec in self._slots:
+            if field_name not in values:
+                values[field_name] = self._format_slot(variables, field_name, conversion, format_spec)
+        lines = [PROMPT_INPUT_HEADER, "<입력값>"]
+        lines.extend(f"<{field_name}>\n{value}\n</{field_name}>" for field_name, value in values.items())
+        lines.append("</입력값>")
+        return SplitPrompt(self.static_prefix, "\n".join(lines))
+
+
+class PromptTemplateRegistry:
+    """
+    템플릿 디렉토리의 .md 프롬프트를 한 번만 읽어 CompiledTemplate으로 보관하는 프로세스 공용 레지스트리.
+    reload_interval(초)마다 파일 수정 시각/크기를 확인해 바뀐 파일만 다시 컴파일하므로, 재시작 없이 템플릿 수정이 반영됩니다.
+    (reload_interval이 0이면 매 조회마다, 음수이면 확인하지 않습니다.)
+    """
+
+    def __init__(self, templates_dir: str, reload_interval: float = PROMPT_TEMPLATE_RELOAD_INTERVAL):
+        self.templates_dir = templates_dir
+        self.reload_interval = reload_interval
+        self._templates: Dict[str, CompiledTemplate] = {}
+        self._file_stamps: Dict[str, Tuple[int, int]] = {}
+        self._last_checked = 0.0
+        self._reloads = 0
+        self._render_stats: Dict[str, List[float]] = {}  # 템플릿별 [렌더링 횟수, 누적 시간(초)]
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        with self._lock:
+            self._refresh()
+        if not self._templates:
+            raise FileNotFoundError("No prompt templates (.md) found in the directory.")
+
+    def _refresh(self) -> None:
+        """디렉토리를 확인해 새로 생기거나 바뀐 템플릿을 컴파일하고, 삭제된 템플릿을 제거합니다. (_lock 안에서 호출)"""
+        self._last_checked = time.monotonic()
+        seen = set()
+        for entry in os.scandir(self.templates_dir):
+            if not entry.name.endswith(".md") or not entry.is_file():
+                continue
+            template_key = os.path.splitext(entry.name)[0]
+            seen.add(template_key)
+            stat = entry.stat()
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            if self._file_stamps.get(template_key) == stamp:
+                continue
+            with open(entry.path, 'r', encoding='utf-8') as f:
+                source = f.read()
+            try:
+                compiled = CompiledTemplate(template_key, source)
+            except ValueError as e:
+                # 편집 중인 잘못된 템플릿은 건너뛰고 이전 버전을 계속 사용합니다.
+                logger.error(f"Failed to compile prompt template {entry.name}: {e}")
+                continue
+            reloaded = template_key in self._templates
+            self._templates[template_key] = compiled
+            self._file_stamps[template_key] = stamp
+            if reloaded:
+                self._reloads += 1
+                logger.info(f"Reloaded prompt template: {template_key} from {entry.name}")
+            else:
+                logger.info(f"Loaded prompt template: {template_key} from {entry.name}")
+        for template_key in set(self._templates) - seen:
+            del self._templates[template_key]
+            self._file_stamps.pop(template_key, None)
+            logger.info(f"Removed prompt template: {template_key}")
+
+    def _maybe_reload(self) -> None:
+        if self.reload_interval < 0 or time.monotonic() - self._last_checked < self.reload_interval:
+            return
+        with self._lock:
+            if time.monotonic() - self._last_checked < self.reload_interval:
+                return
+            try:
+                self._refresh()
+            except OSError as e:
+                logger.error(f"Failed to check prompt templates in {self.templates_dir}: {e}")
+
+    def get(self, template_key: str) -> Optional[CompiledTemplate]:
+        """컴파일된 템플릿을 반환합니다. 없으면 None을 반환합니다."""
+        self._maybe_reload()
+        return self._templates.get(template_key)
+
+    def sources(self) -> Dict[str, str]:
+        """템플릿 키별 원본 문자열"""
+        self._maybe_reload()
+        return {key: template.source for key, template in self._templates.items()}
+
+    def render(self, template_key: str, variables: Dict[str, Any], split: bool = False) -> PromptInput:
+        """
+        template_key 템플릿을 variables로 렌더링합니다. 템플릿이 없으면 ValueError를 발생시킵니다.
+        split이 True이면 고정 지침과 입력값으로 나눈 SplitPrompt를 반환합니다.
+        """
+        template = self.get(template_key)
+        if template is None:
+            raise ValueError(f"'{template_key}'에 해당하는 프롬프트 템플릿(.md) 파일을 찾을 수 없습니다.")
+        started = time.perf_counter()
+        result = template.render_split(variables) if split else template.render(variables)
+        elapsed = time.perf_counter() - started
+        with self._stats_lock:
+            stats = self._render_stats.setdefault(template_key, [0, 0.0])
+            stats[0] += 1
+            stats[1] += elapsed
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        """템플릿 수, 메모리 사용량, 재로드 횟수, 템플릿별 렌더링 횟수/평균 시간을 반환합니다."""
+        templates = dict(self._templates)
+        with self._stats_lock:
+            render_stats = {key: list(value) for key, value in self._render_stats.items()}
+        return {
+            "templates": len(templates),
+            "memory_bytes": sum(template.memory_bytes for template in templates.values()),
+            "reloads": self._reloads,
+            "renders": {
+                key: {"count": int(count), "avg_us": round(total / count * 1_000_000, 1) if count else 0.0}
+                for key, (count, total) in render_stats.items()
+            },
+        }
+
+
+# 템플릿 디렉토리별 공용 레지스트리 (프로세스 공유)
+_registries: Dict[str, PromptTemplateRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_prompt_registry(templates_dir: str) -> PromptTemplateRegistry:
+    """템플릿 디렉토리의 공용 PromptTemplateRegistry를 반환합니다. 처음 요청될 때 한 번만 템플릿을 읽습니다."""
+    key = os.path.realpath(templates_dir)
+    with _registries_lock:
+        registry = _registries.get(key)
+        if registry is None:
+            registry = PromptTemplateRegistry(key)
+            _registries[key] = registry
+        return registry
+
+
+def get_prompt_template_stats() -> Dict[str, Dict[str, Any]]:
+    """템플릿 디렉토리별 레지스트리 지표를 반환합니다."""
+    with _registries_lock:
+        registries = dict(_registries)
+    return {templates_dir: registry.snapshot() for templates_dir, registry in registries.items()}
+
+
 class PromptManager:
     """
     프롬프트 템플릿을 관리하고, 입력값에 맞는 프롬프트를 동적으로 생성합니다.
+    템플릿은 디렉토리별 공용 PromptTemplateRegistry에서 가져오므로 여러 번 생성해도 파일을 다시 읽지 않습니다.
     """
     def __init__(self, app_root_path: str, templates_dir_relative_path: str):
         self.templates_dir = os.path.join(app_root_path, templates_dir_relative_path)
-        self.templates = self._load_all_templates()
+        self.registry = get_prompt_registry(self.templates_dir)
 
-    def _load_all_templates(self) -> Dict[str, str]:
-        """
-        템플릿 디렉토리에서 모든 .md 프롬프트 파일을 로드합니다.
-        """
-        templates = {}
-        for filename in os.listdir(self.templates_dir):
-            if filename.endswith(".md"):
-                template_key = os.path.splitext(filename)[0]
-                file_path = os.path.join(self.templates_dir, filename)
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    templates[template_key] = f.read()
-                logger.info(f"Loaded prompt template: {template_key} from {filename}")
-        if not templates:
-            raise FileNotFoundError("No prompt templates (.md) found in the directory.")
-        return templates
+    @property
+    def templates(self) -> Dict[str, str]:
+        """템플릿 키별 원본 문자열"""
+        return self.registry.sources()
 
     def get_template_key(self, content_type: str, blog_style: str = None, email_type: str = None) -> str:
         """
@@ -67,15 +302,14 @@ class PromptManager:
         brand_style_tone: str = None,
         product_category: str = None,
         ad_purpose: str = None,
+        split: bool = False,
         **kwargs
-    ) -> str:
+    ) -> PromptInput:
         """
         텍스트 콘텐츠(블로그, 이메일) 생성을 위한 최종 프롬프트를 생성합니다.
+        split이 True이면 프롬프트 캐시용으로 고정 지침과 입력값을 나눈 SplitPrompt를 반환합니다.
         """
         template_key = self.get_template_key(content_type, blog_style, email_type)
-        if template_key not in self.templates:
-            raise ValueError(f"'{template_key}'에 해당하는 프롬프트 템플릿(.md) 파일을 찾을 수 없습니다.")
-        selected_template = self.templates[template_key]
 
         # 길이 옵션에 따른 안내문 생성
         length_instruction_text = ""
@@ -104,7 +338,7 @@ class PromptManager:
             "product_category": product_category or "",
             "ad_purpose": ad_purpose or "",
         }
-        final_prompt = selected_template.format(**all_vars)
+        final_prompt = self.registry.render(template_key, all_vars, split=split)
         logger.info(f"Text-based LLM Prompt for '{topic}' ({content_type}) generated.")
         return final_prompt
 
@@ -126,9 +360,6 @@ class PromptManager:
         번역 프롬프트를 생성합니다.
         """
         template_key = "translate_to_english"
-        if template_key not in self.templates:
-            raise ValueError(f"'{template_key}'에 해당하는 프롬프트 템플릿(.md) 파일을 찾을 수 없습니다.")
-        selected_template = self.templates[template_key]
         prompt_parts = {
             "topic": topic,
             "brand_style_tone": brand_style_tone or "",
@@ -141,6 +372,6 @@ class PromptManager:
             "cut_count": cut_count or "",
             "aspect_ratio_sns": aspect_ratio_sns or "",
         }
-        final_prompt = selected_template.format(**prompt_parts)
+        final_prompt = self.registry.render(template_key, prompt_parts)
         logger.info(f"Translation LLM Prompt for '{topic}' generated.")
         return final_prompt
\ No newline at end of file
@@ -0,0 +1,315 @@
+# ai-content-marketing-tool/services/utils/rate_limiter.py
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+import contextvars
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from services.utils.constants import (
+    ENCODER,
+    BEDROCK_RATE_LIMITS,
+    BEDROCK_RATE_LIMIT_PATH,
+    BEDROCK_BATCH_RESERVE_FRACTION,
+    BEDROCK_RATE_LIMIT_WAIT_TIMEOUT
+)
+
+logger = logging.getLogger(__name__)
+
+# 우선순위 클래스: interactive(사용자 요청)는 버킷 전체를, batch(크롤링/문서 적재)는 예약분을 뺀 나머지만 사용합니다.
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BATCH = "batch"
+
+_current_priority: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "bedrock_rate_limit_priority", default=PRIORITY_INTERACTIVE
+)
+
+
+@contextmanager
+def rate_limit_priority(priority: str) -> Iterator[None]:
+    """블록 안에서 발생하는 Bedrock 호출의 우선순위 클래스를 지정합니다."""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_rate_limit_priority() -> str:
+    """현재 컨텍스트의 우선순위 클래스를 반환합니다. (기본 interactive)"""
+    return _current_priority.get()
+
+
+class RateLimitTimeout(RuntimeError):
+    """우선순위 클래스의 대기 시간 안에 호출 한도를 얻지 못한 경우"""
+    pass
+
+
+@dataclass(frozen=True)
+class ModelQuota:
+    """모델 하나의 분당 요청 수/토큰 수 한도 (None이면 해당 항목은 제한하지 않음)"""
+    requests_per_minute: Optional[float] = None
+    tokens_per_minute: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class BucketDraw:
+    """버킷 하나에서 차감할 양 (floor: 차감 후에도 남아 있어야 하는 최소 잔량)"""
+    key: str
+    capacity: float
+    refill_per_second: float
+    amount: float
+    floor: float = 0.0
+
+
+def parse_model_quotas(spec: str) -> Dict[str, ModelQuota]:
+    """
+    "모델ID=RPM:TPM,..." 형식의 문자열을 모델별 한도로 변환합니다. (RPM 또는 TPM은 비워둘 수 있습니다)
+    예: "anthropic.claude-3-5-sonnet-20240620-v1:0=50:200000,amazon.titan-embed-text-v2:0=2000:"
+    """
+    quotas: Dict[str, ModelQuota] = {}
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        model_id, _, limits = item.rpartition("=")
+        rpm, _, tpm = limits.partition(":")
+        quotas[model_id.strip()] = ModelQuota(
+            requests_per_minute=float(rpm) if rpm.strip() else None,
+            tokens_per_minute=float(tpm) if tpm.strip() else None
+        )
+    return quotas
+
+
+def estimate_request_tokens(body: Any) -> int:
+    """
+    Bedrock 요청 본문(JSON 문자열)으로 소비할 토큰 수를 추정합니다. (입력 토큰 + 최대 출력 토큰)
+    실제 사용량이 아닌 추정치이므로 한도는 여유 있게 설정하세요.
+    """
+    try:
+        payload = json.loads(body) if isinstance(body, (str, bytes)) else (body or {})
+    except (TypeError, ValueError):
+        return 0
+    if not isinstance(payload, dict):
+        return 0
+    texts = []
+    if payload.get("inputText"):
+        texts.append(str(payload["inputText"]))
+    if payload.get("prompt"):
+        texts.append(str(payload["prompt"]))
+    system = payload.get("system")
+    if isinstance(system, str):
+        texts.append(system)
+    elif isinstance(system, list):
+        texts.extend(str(part.get("text", "")) for part in system if isinstance(part, dict))
+    for message in payload.get("messages") or []:
+        content = message.get("content") if isinstance(message, dict) else None
+        if isinstance(content, str):
+            texts.append(content)
+        elif isinstance(content, list):
+            texts.extend(str(part.get("text", "")) for part in content if isinstance(part, dict))
+    input_tokens = sum(len(ENCODER.encode(text, disallowed_special=())) for text in texts)
+    return input_tokens + int(payload.get("max_tokens") or 0)
+
+
+class TokenBucketStore(ABC):
+    """
+    토큰 버킷 상태 저장소의 공통 인터페이스.
+    여러 프로세스가 같은 한도를 나눠 쓰려면 프로세스 간 공유되는 저장소를 사용합니다.
+    """
+
+    @abstractmethod
+    def take(self, draws: List[BucketDraw]) -> float:
+        """
+        각 버킷을 경과 시간만큼 채운 뒤, 모든 버킷에서 차감할 수 있으면 한꺼번에 차감하고 0을 반환합니다.
+        하나라도 부족하면 아무것도 차감하지 않고 다시 시도할 때까지 기다려야 할 시간(초)을 반환합니다.
+        """
+        pass
+
+
+def _apply_draws(levels: Dict[str, float], draws: List[BucketDraw]) -> float:
+    """채워진 잔량(levels)에 차감을 적용합니다. 모두 가능하면 levels를 갱신하고 0을, 아니면 필요한 대기 시간을 반환합니다."""
+    wait = 0.0
+    for draw in draws:
+        shortfall = draw.amount + draw.floor - levels[draw.key]
+        if shortfall > 0:
+            wait = max(wait, shortfall / draw.refill_per_second if draw.refill_per_second > 0 else float("inf"))
+    if wait == 0.0:
+        for draw in draws:
+            levels[draw.key] -= draw.amount
+    return wait
+
+
+class InMemoryTokenBucketStore(TokenBucketStore):
+    """프로세스 메모리 기반 저장소 (단일 프로세스/테스트용)"""
+
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def take(self, draws: List[BucketDraw]) -> float:
+        now = time.time()
+        with self._lock:
+            levels = {}
+            for draw in draws:
+                level, updated_at = self._buckets.get(draw.key, (draw.capacity, now))
+                levels[draw.key] = min(draw.capacity, level + max(0.0, now - updated_at) * draw.refill_per_second)
+            wait = _apply_draws(levels, draws)
+            for key, level in levels.items():
+                self._buckets[key] = (level, now)
+            return wait
+
+
+class SqliteTokenBucketStore(TokenBucketStore):
+    """
+    SQLite 파일 기반 저장소. 같은 호스트의 gunicorn 워커와 스케줄러가 하나의 파일로 버킷을 공유합니다.
+    BEGIN IMMEDIATE로 쓰기 잠금을 잡아 채우기/차감을 원자적으로 수행합니다.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(db_path, timeout=5)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS token_buckets (
+                    bucket_key TEXT PRIMARY KEY,
+                    level REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def take(self, draws: List[BucketDraw]) -> float:
+        conn = sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            levels = {}
+            for draw in draws:
+                row = conn.execute(
+                    "SELECT level, updated_at FROM token_buckets WHERE bucket_key = ?", (draw.key,)
+                ).fetchone()
+                level, updated_at = row if row is not None else (draw.capacity, now)
+                levels[draw.key] = min(draw.capacity, level + max(0.0, now - updated_at) * draw.refill_per_second)
+            wait = _apply_draws(levels, draws)
+            conn.executemany(
+                """
+                INSERT INTO token_buckets (bucket_key, level, updated_at) VALUES (?, ?, ?)
+                ON CONFLICT(bucket_key) DO UPDATE SET level = excluded.level, updated_at = excluded.updated_at
+                """,
+                [(key, level, now) for key, level in levels.items()]
+            )
+            conn.execute("COMMIT")
+            return wait
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+
+class BedrockRateLimiter:
+    """
+    모델 ID별 분당 요청 수(RPM)/토큰 수(TPM) 토큰 버킷 제한기.
+    - batch 우선순위 호출은 버킷 용량의 reserve_fraction을 남겨 두어야 통과하므로, 한도가 빠듯할 때 interactive 호출이 먼저 통과합니다.
+    - 한도를 넘으면 예외 대신 필요한 시간만큼 대기(backoff)하며, 우선순위별 최대 대기 시간을 넘으면 RateLimitTimeout을 발생시킵니다.
+    한도가 설정되지 않은 모델은 제한하지 않습니다.
+    """
+
+    def __init__(self, store: TokenBucketStore, quotas: Dict[str, ModelQuota],
+                 reserve_fraction: float = BEDROCK_BATCH_RESERVE_FRACTION,
+                 wait_timeouts: Optional[Dict[str, float]] = None):
+        self.store = store
+        self.quotas = quotas
+        self.reserve_fraction = reserve_fraction
+        self.wait_timeouts = wait_timeouts or dict(BEDROCK_RATE_LIMIT_WAIT_TIMEOUT)
+        self.waits: Dict[str, int] = {PRIORITY_INTERACTIVE: 0, PRIORITY_BATCH: 0}
+        self.total_wait_seconds: Dict[str, float] = {PRIORITY_INTERACTIVE: 0.0, PRIORITY_BATCH: 0.0}
+        self._stats_lock = threading.Lock()
+
+    def _draws(self, model_id: str, quota: ModelQuota, tokens: int, priority: str) -> List[BucketDraw]:
+        """모델 한도와 우선순위로 요청/토큰 버킷 차감 목록을 만듭니다."""
+        reserve = self.reserve_fraction if priority == PRIORITY_BATCH else 0.0
+        draws: List[BucketDraw] = []
+        if quota.requests_per_minute:
+            capacity = quota.requests_per_minute
+            draws.append(BucketDraw(f"{model_id}:requests", capacity, capacity / 60.0, 1, capacity * reserve))
+        if quota.tokens_per_minute and tokens > 0:
+            capacity = quota.tokens_per_minute
+            # 용량보다 큰 요청은 용량만큼만 차감합니다. (영원히 대기하지 않도록, batch는 예약분을 제외한 만큼)
+            amount = min(tokens, capacity * (1 - reserve))
+            draws.append(BucketDraw(f"{model_id}:tokens", capacity, capacity / 60.0, amount, capacity * reserve))
+        return draws
+
+    def acquire_for_request(self, model_id: str, body: Any, priority: Optional[str] = None) -> float:
+        """Bedrock 요청 본문으로 토큰 수를 추정해 acquire()를 호출합니다. (토큰 한도가 있는 모델만 추정)"""
+        quota = self.quotas.get(model_id)
+        if quota is None:
+            return 0.0
+        tokens = estimate_request_tokens(body) if quota.tokens_per_minute else 0
+        return self.acquire(model_id, tokens, priority)
+
+    def acquire(self, model_id: str, tokens: int = 0, priority: Optional[str] = None) -> float:
+        """
+        모델 호출 한도를 얻을 때까지 대기합니다. 대기한 시간(초)을 반환합니다.
+        Raises:
+            RateLimitTimeout: 우선순위 클래스의 최대 대기 시간을 넘은 경우
+        """
+        quota = self.quotas.get(model_id)
+        if quota is None:
+            return 0.0
+        priority = priority or current_rate_limit_priority()
+        timeout = self.wait_timeouts.get(priority, self.wait_timeouts.get(PRIORITY_INTERACTIVE, 30.0))
+        draws = self._draws(model_id, quota, tokens, priority)
+        if not draws:
+            return 0.0
+        started = time.monotonic()
+        while True:
+            wait = self.store.take(draws)
+            waited = time.monotonic() - started
+            if wait == 0.0:
+                if waited > 0:
+                    with self._stats_lock:
+                        self.waits[priority] = self.waits.get(priority, 0) + 1
+                        self.total_wait_seconds[priority] = self.total_wait_seconds.get(priority, 0.0) + waited
+                return waited
+            if waited + wait > timeout:
+                raise RateLimitTimeout(
+                    f"모델 '{model_id}' 호출 한도 대기 시간 초과 (우선순위: {priority}, {timeout}초)"
+                )
+            # 다른 워커와 동시에 깨어나지 않도록 짧은 간격으로 나누어 다시 확인합니다.
+            time.sleep(min(wait, 1.0))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """우선순위별 대기 횟수와 누적 대기 시간을 반환합니다."""
+        with self._stats_lock:
+            return {
+                "models": sorted(self.quotas),
+                "waits": dict(self.waits),
+                "total_wait_seconds": {key: round(value, 3) for key, value in self.total_wait_seconds.items()},
+            }
+
+
+def create_bedrock_rate_limiter(spec: str = BEDROCK_RATE_LIMITS,
+                                db_path: str = BEDROCK_RATE_LIMIT_PATH) -> Optional[BedrockRateLimiter]:
+    """
+    설정된 모델 한도로 SQLite 기반 BedrockRateLimiter를 만듭니다. 한도가 없으면 None을 반환합니다.
+    """
+    quotas = parse_model_quotas(spec)
+    if not quotas:
+        return None
+    return BedrockRateLimiter(SqliteTokenBucketStore(db_path), quotas)
@@ -0,0 +1,290 @@
+# ai-content-marketing-tool/services/utils/resilience.py
+
+import time
+import logging
+import threading
+import contextvars
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, TimeoutError as FutureTimeoutError, wait
+from typing import Any, Callable, Deque, Dict, Optional
+
+from botocore.exceptions import ClientError
+
+from services.utils.constants import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_TIMEOUT,
+    CIRCUIT_TRIAL_TIMEOUT,
+    RESILIENCE_MAX_WORKERS
+)
+
+logger = logging.getLogger(__name__)
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+class DeadlineExceeded(TimeoutError):
+    """호출이 지정된 시간 안에 끝나지 않은 경우"""
+    pass
+
+
+class CircuitOpenError(RuntimeError):
+    """회로 차단기가 열려 있어 호출하지 않고 즉시 실패한 경우"""
+    pass
+
+
+def is_breaker_failure(error: Exception) -> bool:
+    """
+    회로 차단기 실패로 집계할 오류인지 확인합니다.
+    잘못된 입력 등 요청 자체의 4xx 오류는 엔드포인트 상태와 무관하므로 제외합니다. (스로틀링은 포함)
+    """
+    if isinstance(error, ClientError):
+        error_info = error.response.get("Error", {})
+        status = error.response.get("ResponseMetadata", {}).get("HTTPStatusCode") or 0
+        return status >= 500 or status == 429 or "Throttl" in error_info.get("Code", "")
+    return True
+
+
+class CircuitBreaker:
+    """
+    연속 실패가 failure_threshold에 도달하면 reset_timeout 동안 호출을 막는 회로 차단기.
+    reset_timeout이 지나면 한 번의 시험 호출(half-open)을 허용하고, 성공하면 다시 닫습니다.
+    시험 호출의 결과가 trial_timeout 안에 기록되지 않으면(호출자 중단 등) 새 시험 호출을 허용합니다.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+                 reset_timeout: float = CIRCUIT_RESET_TIMEOUT, trial_timeout: float = CIRCUIT_TRIAL_TIMEOUT):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.trial_timeout = trial_timeout
+        self.state = CIRCUIT_CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.rejected = 0
+        self._trial_in_progress = False
+        self._trial_started_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        """호출이 차단된 상태(open, 또는 시험 호출 대기 전의 half-open 포함)인지 반환합니다."""
+        with self._lock:
+            if self.state == CIRCUIT_OPEN:
+                return time.monotonic() - self.opened_at < self.reset_timeout
+            return False
+
+    def allow(self) -> bool:
+        """호출을 허용할지 결정합니다. open 상태에서 reset_timeout이 지나면 시험 호출 하나만 허용합니다."""
+        with self._lock:
+            if self.state == CIRCUIT_CLOSED:
+                return True
+            if self.state == CIRCUIT_OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = CIRCUIT_HALF_OPEN
+                self._trial_in_progress = False
+            if self.state == CIRCUIT_HALF_OPEN and self._trial_in_progress \
+                    and time.monotonic() - self._trial_started_at >= self.trial_timeout:
+                logger.warning(f"Circuit '{self.name}' trial call did not report a result within {self.trial_timeout}s. Allowing a new trial.")
+                self._trial_in_progress = False
+            if self.state == CIRCUIT_HALF_OPEN and not self._trial_in_progress:
+                self._trial_in_progress = True
+                self._trial_started_at = time.monotonic()
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != CIRCUIT_CLOSED:
+                logger.info(f"Circuit '{self.name}' closed after successful trial call.")
+            self.state = CIRCUIT_CLOSED
+            self.consecutive_failures = 0
+            self._trial_in_progress = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            self._trial_in_progress = False
+            if self.state == CIRCUIT_HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != CIRCUIT_OPEN:
+                    logger.warning(f"Circuit '{self.name}' opened after {self.consecutive_failures} consecutive failures.")
+                self.state = CIRCUIT_OPEN
+                self.opened_at = time.monotonic()
+
+    def record_error(self, error: BaseException) -> None:
+        """호출 오류를 회로 상태에 반영합니다. 데드라인 초과와 엔드포인트 오류만 실패로 집계합니다."""
+        if isinstance(error, (FutureTimeoutError, DeadlineExceeded)) or \
+                (isinstance(error, Exception) and is_breaker_failure(error)):
+            self.record_failure()
+        else:
+            self.record_success()
+
+    def release_trial(self) -> None:
+        """
+        결과 없이 끝난 호출(클라이언트 연결 종료 등)의 시험 호출 권한을 돌려줍니다.
+        엔드포인트 상태를 알 수 없으므로 회로 상태와 연속 실패 수는 바꾸지 않습니다.
+        """
+        with self._lock:
+            self._trial_in_progress = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "rejected": self.rejected,
+            }
+
+
+class LatencyTracker:
+    """최근 window개 호출의 지연 시간(초)으로 백분위수를 계산합니다."""
+
+    def __init__(self, window: int = 200):
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """q(0~1) 백분위 지연 시간을 반환합니다. 표본이 20개 미만이면 None을 반환합니다."""
+        with self._lock:
+            if len(self._samples) < 20:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+# 데드라인/헤징 호출을 실행하는 공용 스레드 풀 (데드라인을 넘긴 호출은 백그라운드에서 끝까지 실행된 뒤 버려집니다)
+_executor = ThreadPoolExecutor(max_workers=RESILIENCE_MAX_WORKERS, thread_name_prefix="resilient-call")
+
+
+class ResilientInvoker:
+    """
+    외부 호출을 데드라인, 선택적 헤징, 회로 차단기로 감싸는 호출 래퍼.
+    - timeout: 호출 하나의 최대 대기 시간(초). 넘으면 DeadlineExceeded를 발생시킵니다.
+    - hedge: True이면 첫 호출이 최근 p95 지연(최소 hedge_min_delay)보다 오래 걸릴 때 같은 호출을 한 번 더 보내
+      먼저 끝난 결과를 사용합니다. 멱등 호출(임베딩 등)에만 사용하세요.
+    - 회로가 열려 있으면 호출하지 않고 CircuitOpenError를 발생시킵니다.
+    호출은 contextvars를 복사해 실행하므로 우선순위 클래스 등 호출자 컨텍스트가 유지됩니다.
+    """
+
+    def __init__(self, name: str, timeout: Optional[float], hedge: bool = False, hedge_min_delay: float = 0.0,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.name = name
+        self.timeout = timeout
+        self.hedge = hedge
+        self.hedge_min_delay = hedge_min_delay
+        self.breaker = breaker or CircuitBreaker(name)
+        self.latency = LatencyTracker()
+        self.deadline_exceeded = 0
+        self.hedged = 0
+        self._stats_lock = threading.Lock()
+
+    def _submit(self, fn: Callable[..., Any], *args, **kwargs):
+        context = contextvars.copy_context()
+        return _executor.submit(context.run, fn, *args, **kwargs)
+
+    def hedge_delay(self) -> float:
+        """헤징 요청을 보내기까지 기다릴 시간(초): 최근 p95 지연과 hedge_min_delay 중 큰 값"""
+        p95 = self.latency.percentile(0.95)
+        return max(self.hedge_min_delay, p95 if p95 is not None else self.hedge_min_delay)
+
+    def _run(self, timeout: Optional[float], fn: Callable[..., Any], *args, **kwargs) -> Any:
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        primary = self._submit(fn, *args, **kwargs)
+        futures = [primary]
+        if self.hedge:
+            delay = self.hedge_delay()
+            if deadline is not None:
+                delay = min(delay, max(0.0, deadline - time.monotonic()))
+            done, _ = wait(futures, timeout=delay)
+            if not done:
+                with self._stats_lock:
+                    self.hedged += 1
+                futures.append(self._submit(fn, *args, **kwargs))
+        last_error: Optional[BaseException] = None
+        pending = set(futures)
+        while pending:
+            remaining = max(0.0, deadline - time.monotonic()) if deadline is not None else None
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                last_error = future.exception()
+        if last_error is not None and not pending:
+            raise last_error
+        with self._stats_lock:
+            self.deadline_exceeded += 1
+        raise DeadlineExceeded(f"'{self.name}' 호출이 {timeout}초 안에 끝나지 않았습니다.")
+
+    def ensure_closed(self) -> None:
+        """
+        회로가 열려 있으면 CircuitOpenError를 발생시킵니다.
+        호출 한도/동시 호출 슬롯을 기다리기 전에 확인해, 어차피 거부될 호출이 대기열을 차지하지 않게 합니다.
+        """
+        if self.breaker.is_open:
+            raise CircuitOpenError(f"'{self.name}' 회로가 열려 있어 호출하지 않습니다.")
+
+    def call(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """fn(*args, **kwargs)를 데드라인/헤징/회로 차단기를 적용해 호출합니다."""
+        return self.call_with_timeout(self.timeout, fn, *args, **kwargs)
+
+    def call_with_timeout(self, timeout: Optional[float], fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """call과 같지만, 이 호출에만 timeout(초) 데드라인을 적용합니다. (작업 유형별 데드라인용)"""
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"'{self.name}' 회로가 열려 있어 호출하지 않습니다.")
+        started = time.monotonic()
+        try:
+            if timeout is None and not self.hedge:
+                result = fn(*args, **kwargs)
+            else:
+                result = self._run(timeout, fn, *args, **kwargs)
+        except Exception as e:
+            self.breaker.record_error(e)
+            raise
+        except BaseException:
+            self.breaker.release_trial()
+            raise
+        self.latency.record(time.monotonic() - started)
+        self.breaker.record_success()
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        p50 = self.latency.percentile(0.5)
+        p95 = self.latency.percentile(0.95)
+        with self._stats_lock:
+            return {
+                "circuit": self.breaker.snapshot(),
+                "deadline_exceeded": self.deadline_exceeded,
+                "hedged": self.hedged,
+                "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+                "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            }
+
+
+# 이름별 공용 호출 래퍼 (프로세스 공유)
+_invokers: Dict[str, ResilientInvoker] = {}
+_invokers_lock = threading.Lock()
+
+
+def get_resilient_invoker(name: str, timeout: Optional[float], hedge: bool = False,
+                          hedge_min_delay: float = 0.0) -> ResilientInvoker:
+    """이름별 ResilientInvoker를 반환합니다. 처음 요청될 때 주어진 설정으로 만듭니다."""
+    with _invokers_lock:
+        invoker = _invokers.get(name)
+        if invoker is None:
+            invoker = ResilientInvoker(name, timeout, hedge=hedge, hedge_min_delay=hedge_min_delay)
+            _invokers[name] = invoker
+        return invoker
+
+
+def get_resilience_stats() -> Dict[str, Dict[str, Any]]:
+    """호출 래퍼별 회로 상태, 데드라인 초과/헤징 횟수, 지연 백분위를 반환합니다."""
+    with _invokers_lock:
+        invokers = dict(_invokers)
+    return {name: invoker.snapshot() for name, invoker in invokers.items()}
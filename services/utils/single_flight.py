@@ -0,0 +1,230 @@
+# ai-content-marketing-tool/services/utils/single_flight.py
+
+import hashlib
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from services.utils.constants import SINGLE_FLIGHT_ENABLED, SINGLE_FLIGHT_WAIT_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+
+def make_flight_key(*parts: Any) -> str:
+    """요청을 구분하는 값들로 single-flight 키(SHA-256 해시)를 만듭니다."""
+    return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()
+
+
+class _Flight:
+    """처리 중인 호출 하나 (결과 또는 예외, 완료 이벤트)"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class _StreamFlight:
+    """처리 중인 스트림 하나 (지금까지 나온 조각, 완료 여부, 예외, 함께 받는 호출 수)"""
+
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.items: List[Any] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.followers = 0  # SingleFlight._lock으로 보호
+
+
+class SingleFlight:
+    """
+    같은 키의 호출이 동시에 들어오면 첫 호출(leader)만 실행하고, 나머지는 그 결과(또는 예외)를 기다려 공유합니다.
+    결과를 보관하지 않으므로 캐시가 아니라 처리 중인 중복 호출만 합칩니다. (프로세스 안에서만 동작)
+    wait_timeout 안에 첫 호출이 끝나지 않으면 기다리던 호출은 직접 실행합니다.
+    스트림(do_stream)은 첫 호출이 만드는 조각을 같은 키의 호출들에 순서대로 나눠 줍니다.
+    """
+
+    def __init__(self, name: str, wait_timeout: Optional[float] = SINGLE_FLIGHT_WAIT_TIMEOUT,
+                 enabled: bool = SINGLE_FLIGHT_ENABLED):
+        self.name = name
+        self.wait_timeout = wait_timeout
+        self.enabled = enabled
+        self.leaders = 0
+        self.coalesced = 0
+        self.wait_timeouts = 0
+        self._flights: Dict[str, _Flight] = {}
+        self._stream_flights: Dict[str, _StreamFlight] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable[..., Any], *args, **kwargs) -> Tuple[Any, bool]:
+        """
+        fn(*args, **kwargs)를 키별로 한 번만 실행합니다.
+        Returns:
+            Tuple[Any, bool]: 결과, 다른 호출의 결과를 공유했는지 여부
+        """
+        if not self.enabled:
+            return fn(*args, **kwargs), False
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._flights[key] = flight
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            if flight.done.wait(self.wait_timeout):
+                if flight.error is not None:
+                    raise flight.error
+                return flight.result, True
+            with self._lock:
+                self.wait_timeouts += 1
+            logger.warning(f"'{self.name}' 처리 중인 동일 요청이 {self.wait_timeout}초 안에 끝나지 않아 직접 호출합니다.")
+            return fn(*args, **kwargs), False
+        try:
+            flight.result = fn(*args, **kwargs)
+            return flight.result, False
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+            flight.done.set()
+
+    def do_stream(self, key: str, fn: Callable[..., Iterator[Any]], *args, **kwargs) -> Iterator[Any]:
+        """
+        fn(*args, **kwargs)가 반환하는 이터레이터를 키별로 한 번만 실행하고, 나온 조각을 같은 키의 모든 호출에 순서대로 전달합니다.
+        - 나중에 합쳐진 호출도 첫 조각부터 받습니다.
+        - 첫 호출의 소비자가 중간에 닫혀도 함께 받는 호출이 남아 있으면 끝까지 실행합니다.
+        - 기다리는 호출은 wait_timeout 안에 첫 조각이 나오지 않으면 직접 실행합니다.
+        """
+        if not self.enabled:
+            yield from fn(*args, **kwargs)
+            return
+        with self._lock:
+            flight = self._stream_flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _StreamFlight()
+                self._stream_flights[key] = flight
+                self.leaders += 1
+            else:
+                flight.followers += 1
+                self.coalesced += 1
+        if leader:
+            yield from self._lead_stream(key, flight, fn, args, kwargs)
+        else:
+            yield from self._follow_stream(flight, fn, args, kwargs)
+
+    def _release_if_unwatched(self, key: str, flight: _StreamFlight) -> bool:
+        """함께 받는 호출이 없으면 키를 비워 새로 합쳐지지 않게 하고 True를 반환합니다."""
+        with self._lock:
+            if flight.followers > 0:
+                return False
+            if self._stream_flights.get(key) is flight:
+                del self._stream_flights[key]
+            return True
+
+    def _lead_stream(self, key: str, flight: _StreamFlight, fn: Callable[..., Iterator[Any]],
+                     args: tuple, kwargs: dict) -> Iterator[Any]:
+        iterator = None
+        consumer_closed = False
+        try:
+            iterator = iter(fn(*args, **kwargs))
+            for item in iterator:
+                with flight.cond:
+                    flight.items.append(item)
+                    flight.cond.notify_all()
+                if consumer_closed:
+                    # 소비자가 닫힌 뒤에는 함께 받는 호출을 위해서만 계속 실행합니다.
+                    if self._release_if_unwatched(key, flight):
+                        break
+                    continue
+                try:
+                    yield item
+                except GeneratorExit:
+                    if self._release_if_unwatched(key, flight):
+                        raise
+                    consumer_closed = True
+                    logger.info(f"'{self.name}' 스트림 소비자가 닫혔지만 함께 받는 호출을 위해 끝까지 생성합니다.")
+        except GeneratorExit:
+            raise
+        except BaseException as e:
+            flight.error = e
+            if not consumer_closed:
+                raise
+            logger.warning(f"'{self.name}' 소비자가 닫힌 뒤 스트림 생성이 실패했습니다: {e}")
+        finally:
+            if iterator is not None and hasattr(iterator, "close"):
+                iterator.close()
+            with self._lock:
+                if self._stream_flights.get(key) is flight:
+                    del self._stream_flights[key]
+            with flight.cond:
+                flight.done = True
+                flight.cond.notify_all()
+
+    def _follow_stream(self, flight: _StreamFlight, fn: Callable[..., Iterator[Any]],
+                       args: tuple, kwargs: dict) -> Iterator[Any]:
+        position = 0
+        following = True
+        try:
+            while True:
+                with flight.cond:
+                    # 첫 조각만 wait_timeout까지 기다립니다. 이후에는 스트림 자체의 제한 시간을 따릅니다.
+                    flight.cond.wait_for(lambda: position < len(flight.items) or flight.done,
+                                         self.wait_timeout if position == 0 else None)
+                    items = flight.items[position:]
+                    done, error = flight.done, flight.error
+                if not items and not done:
+                    with self._lock:
+                        flight.followers -= 1
+                        following = False
+                        self.wait_timeouts += 1
+                    logger.warning(f"'{self.name}' 처리 중인 동일 스트림이 {self.wait_timeout}초 안에 시작되지 않아 직접 호출합니다.")
+                    yield from fn(*args, **kwargs)
+                    return
+                for item in items:
+                    yield item
+                position += len(items)
+                if done:
+                    if error is not None:
+                        raise error
+                    return
+        finally:
+            if following:
+                with self._lock:
+                    flight.followers -= 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "in_flight": len(self._flights) + len(self._stream_flights),
+                "leaders": self.leaders,
+                "coalesced": self.coalesced,
+                "wait_timeouts": self.wait_timeouts,
+            }
+
+
+# 이름별 공용 SingleFlight (프로세스 공유)
+_flights: Dict[str, SingleFlight] = {}
+_flights_lock = threading.Lock()
+
+
+def get_single_flight(name: str) -> SingleFlight:
+    """이름별 SingleFlight를 반환합니다. 처음 요청될 때 만듭니다."""
+    with _flights_lock:
+        flight = _flights.get(name)
+        if flight is None:
+            flight = SingleFlight(name)
+            _flights[name] = flight
+        return flight
+
+
+def get_single_flight_stats() -> Dict[str, Dict[str, Any]]:
+    """이름별 처리 중인 호출 수, 실행/합쳐진 호출 수, 대기 시간 초과 수를 반환합니다."""
+    with _flights_lock:
+        flights = dict(_flights)
+    return {name: flight.snapshot() for name, flight in flights.items()}
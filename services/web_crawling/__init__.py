@@ -6,11 +6,14 @@
 이 패키지는 다음과 같은 웹 크롤링 관련 기능들을 포함합니다:
 
 - crawler_tasks.py: 크롤링 작업 관리 및 실행
+- crawl_engine.py: 도메인별 동시 실행 상한을 적용하는 크롤링 엔진
+- http_fetcher.py: 호스트별 커넥션 풀, 조건부 요청, 응답 디스크 캐시
+- fetch_strategy.py: 도메인별 가져오기 전략(정적/렌더링) 결과 기록
 - web_utils.py: 웹 크롤링 유틸리티 함수들
 - web_content_extractor.py: 웹 페이지 콘텐츠 추출
 - title_extractor.py: 웹 페이지 제목 추출
 - html_decoder.py: HTML 디코딩 및 정제
-- driver_manager.py: 웹 드라이버 관리
+- driver_manager.py: 웹 드라이버 관리 (ChromeDriver 풀)
 - extractors/: 특정 사이트별 콘텐츠 추출기들
 """
 
@@ -19,7 +22,7 @@ from .web_utils import sanitize_filename, decode_html_content, clean_beautynury_
 from .web_content_extractor import get_specific_extractor, extract_text_from_url
 from .title_extractor import TitleExtractor
 from .html_decoder import HTMLDecoder
-from .driver_manager import ChromeDriverManager
+from .driver_manager import ChromeDriverManager, ChromeDriverPool, get_driver_pool
 
 __all__ = [
     'perform_marketing_crawl_task',
@@ -30,5 +33,7 @@ __all__ = [
     'extract_text_from_url',
     'TitleExtractor',
     'HTMLDecoder',
-    'ChromeDriverManager'
+    'ChromeDriverManager',
+    'ChromeDriverPool',
+    'get_driver_pool'
 ]
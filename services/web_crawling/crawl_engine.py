@@ -0,0 +1,172 @@
+# ai-content-marketing-tool/services/web_crawling/crawl_engine.py
+
+import time
+import logging
+import threading
+import contextvars
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Iterator, Optional, Tuple
+from urllib.parse import urlparse
+
+from flask import Flask
+
+from services.utils.constants import (
+    CRAWLER_MAX_WORKERS,
+    CRAWLER_PER_DOMAIN_CONCURRENCY,
+    CRAWLER_DOMAIN_CONCURRENCY
+)
+
+logger = logging.getLogger(__name__)
+
+# 크롤링 단계 이름 (단계별 소요 시간 집계용)
+CRAWL_STAGE_DISCOVERY = "discovery"  # 목록 페이지에서 기사 URL 탐색
+CRAWL_STAGE_FETCH = "fetch"  # 기사 HTML 가져오기
+CRAWL_STAGE_EXTRACT = "extract"  # 기사 본문 추출
+CRAWL_STAGE_PERSIST = "persist"  # S3 지식 베이스 저장
+CRAWL_STAGE_INGEST = "ingest"  # RAG(PgVector) 적재
+CRAWL_STAGE_INDEX_RELOAD = "index_reload"  # 크롤링 후 FAISS 인덱스 재로드
+
+
+def url_domain(url: str) -> str:
+    """도메인별 동시 실행 상한에 사용할 도메인(소문자, www. 제외)을 반환합니다."""
+    domain = urlparse(url).netloc.lower()
+    return domain[4:] if domain.startswith("www.") else domain
+
+
+@dataclass
+class StageTiming:
+    """단계 하나의 실행 횟수와 소요 시간"""
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_seconds": round(self.total_seconds, 3),
+            "avg_ms": round(self.total_seconds * 1000 / self.count, 1) if self.count else 0.0,
+            "max_ms": round(self.max_seconds * 1000, 1),
+        }
+
+
+class CrawlStageTimer:
+    """여러 워커 스레드에서 기록하는 단계별 소요 시간을 모읍니다."""
+
+    def __init__(self):
+        self._timings: Dict[str, StageTiming] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            timing = self._timings.setdefault(stage, StageTiming())
+            timing.count += 1
+            timing.total_seconds += seconds
+            timing.max_seconds = max(timing.max_seconds, seconds)
+
+    @contextmanager
+    def time(self, stage: str) -> Iterator[None]:
+        """블록의 소요 시간을 stage에 기록합니다. (예외가 나도 기록)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - started)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {stage: timing.to_dict() for stage, timing in self._timings.items()}
+
+
+class CrawlEngine:
+    """
+    공용 워커 풀과 도메인별 동시 실행 상한으로 크롤링 작업을 실행하는 엔진.
+    - submit(fn, ..., domain=도메인)으로 넣은 작업은 그 도메인에서 실행 중인 작업이 상한보다 적을 때만 워커에 넘기고,
+      나머지는 도메인별 대기열에서 기다립니다. (대기 중인 작업은 워커 스레드를 차지하지 않으므로 다른 도메인이 먼저 실행됩니다)
+    - domain 없이 넣은 작업(본문 추출, 저장 등)은 워커 풀 크기만 적용됩니다.
+    - 작업 안에서 다음 단계 작업을 submit할 수 있으며, wait()는 이후에 추가된 작업까지 모두 끝날 때까지 기다립니다.
+    - 작업은 호출자의 contextvars(Bedrock 우선순위 클래스 등)를 복사하고, 작업마다 새 Flask 앱 컨텍스트(DB 세션)에서 실행됩니다.
+    with 문으로 사용합니다.
+    """
+
+    def __init__(self, app: Flask, max_workers: int = CRAWLER_MAX_WORKERS,
+                 per_domain_concurrency: int = CRAWLER_PER_DOMAIN_CONCURRENCY,
+                 domain_concurrency: Optional[Dict[str, int]] = None):
+        self.app = app
+        self.max_workers = max(1, max_workers)
+        self.per_domain_concurrency = max(1, per_domain_concurrency)
+        self.domain_concurrency = domain_concurrency if domain_concurrency is not None else CRAWLER_DOMAIN_CONCURRENCY
+        self.timer = CrawlStageTimer()
+        self.task_errors = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._context: Optional[contextvars.Context] = None
+        self._pending: Dict[str, Deque[Tuple[Callable[..., Any], tuple, dict]]] = {}
+        self._running: Dict[str, int] = {}
+        self._outstanding = 0
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+
+    def __enter__(self) -> "CrawlEngine":
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="crawler")
+        self._context = contextvars.copy_context()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is None:
+            self.wait()
+        else:
+            # 예외로 빠져나가면 아직 시작하지 않은 작업은 버립니다.
+            with self._lock:
+                self._outstanding -= sum(len(queue) for queue in self._pending.values())
+                self._pending.clear()
+        self._executor.shutdown(wait=True)
+
+    def domain_limit(self, domain: str) -> int:
+        """도메인의 동시 실행 상한을 반환합니다."""
+        return max(1, self.domain_concurrency.get(domain, self.per_domain_concurrency))
+
+    def submit(self, fn: Callable[..., Any], *args, domain: Optional[str] = None, **kwargs) -> None:
+        """작업을 추가합니다. domain이 있으면 도메인별 동시 실행 상한을 적용합니다."""
+        with self._lock:
+            self._outstanding += 1
+            if domain is None:
+                self._start(None, fn, args, kwargs)
+                return
+            self._pending.setdefault(domain, deque()).append((fn, args, kwargs))
+            self._dispatch(domain)
+
+    def _dispatch(self, domain: str) -> None:
+        """(잠금 보유 상태) 도메인의 상한 안에서 대기 중인 작업을 워커에 넘깁니다."""
+        queue = self._pending.get(domain)
+        while queue and self._running.get(domain, 0) < self.domain_limit(domain):
+            fn, args, kwargs = queue.popleft()
+            self._running[domain] = self._running.get(domain, 0) + 1
+            self._start(domain, fn, args, kwargs)
+
+    def _start(self, domain: Optional[str], fn: Callable[..., Any], args: tuple, kwargs: dict) -> None:
+        self._executor.submit(self._context.copy().run, self._run, domain, fn, args, kwargs)
+
+    def _run(self, domain: Optional[str], fn: Callable[..., Any], args: tuple, kwargs: dict) -> None:
+        try:
+            with self.app.app_context():
+                fn(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"크롤링 작업 실패 ({getattr(fn, '__name__', fn)}, domain={domain}): {e}", exc_info=True)
+            with self._lock:
+                self.task_errors += 1
+        finally:
+            with self._lock:
+                if domain is not None:
+                    self._running[domain] -= 1
+                    self._dispatch(domain)
+                self._outstanding -= 1
+                if self._outstanding == 0:
+                    self._idle.notify_all()
+
+    def wait(self) -> None:
+        """추가된 모든 작업(작업 안에서 추가된 다음 단계 작업 포함)이 끝날 때까지 기다립니다."""
+        with self._idle:
+            while self._outstanding:
+                self._idle.wait()
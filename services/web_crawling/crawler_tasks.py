@@ -1,8 +1,10 @@
 # ai-content-marketing-tool/services/web_crawling/crawler_tasks.py
 
 import os
+import time
 import logging
 import json
+import threading
 from urllib.parse import urlparse
 import boto3
 from botocore.exceptions import ClientError
@@ -12,6 +14,18 @@ from flask import current_app
 from services.ai_rag.rag_system import get_rag_system 
 from services.web_crawling.web_utils import sanitize_filename
 from services.web_crawling.web_content_extractor import get_specific_extractor
+from services.web_crawling.extractors.base_extractor import BaseExtractor
+from services.web_crawling.http_fetcher import get_http_fetcher
+from services.web_crawling.driver_manager import get_driver_pool
+from services.web_crawling.crawl_engine import (
+    CrawlEngine, url_domain,
+    CRAWL_STAGE_DISCOVERY, CRAWL_STAGE_FETCH, CRAWL_STAGE_EXTRACT,
+    CRAWL_STAGE_PERSIST, CRAWL_STAGE_INGEST, CRAWL_STAGE_INDEX_RELOAD
+)
+from services.utils.constants import CRAWLER_MAX_ARTICLES_PER_LIST
+from services.utils.metrics import (
+    observe_stage, CRAWLED_ARTICLES, STAGE_S3_WRITE, STAGE_CRAWL_LIST_PAGE, STAGE_CRAWL_ARTICLE
+)
 
 logger = logging.getLogger(__name__)
 
@@ -111,7 +125,8 @@ def _save_article_to_s3_knowledge_base(
         except Exception as e:
             logger.error(f"S3 HeadObject 예상치 못한 오류 발생 for '{final_s3_object_key}': {e}", exc_info=True)
             raise
-        s3_client.put_object(Bucket=bucket_name, Key=final_s3_object_key, Body=article_content_str.encode('utf-8'))
+        with observe_stage(STAGE_S3_WRITE):
+            s3_client.put_object(Bucket=bucket_name, Key=final_s3_object_key, Body=article_content_str.encode('utf-8'))
         logger.info(f"URL '{url}'의 콘텐츠가 S3에 '{bucket_name}/{final_s3_object_key}'으로 저장되었습니다.")
         return final_s3_object_key
     except Exception as e:
@@ -119,20 +134,161 @@ def _save_article_to_s3_knowledge_base(
         return None
 
 
+def _is_valid_article(extracted_data: dict | None) -> bool:
+    """추출 결과에 본문(또는 레시피의 재료와 조리순서)이 있는지 확인합니다."""
+    if not extracted_data:
+        return False
+    if extracted_data.get('content'):
+        return True
+    return bool(extracted_data.get('ingredients') and extracted_data.get('steps'))
+
+
+class _MarketingCrawl:
+    """
+    크롤링 작업 한 번의 단계별 작업과 결과 집계.
+    목록 페이지 탐색 → 기사 HTML 가져오기(도메인별 동시 요청 상한 적용) → 본문 추출 → S3 저장과 RAG 적재를
+    각각 CrawlEngine 작업으로 실행하며, 작업은 여러 워커 스레드에서 동시에 실행됩니다.
+    지난 크롤링 이후 바뀌지 않은(304) 기사 중 이미 RAG에 적재한 기사는 파싱/저장 없이 건너뜁니다.
+    """
+
+    def __init__(self, engine: CrawlEngine, s3_client, bucket_name: str, rag_system, system_user_id: int):
+        self.engine = engine
+        self.s3_client = s3_client
+        self.bucket_name = bucket_name
+        self.rag_system = rag_system
+        self.system_user_id = system_user_id
+        self.crawled_count = 0
+        self.ingested_count = 0
+        self.unchanged_count = 0
+        self.total_urls_processed = 0
+        self.failed_urls: list[str] = []
+        self._seen_urls: set[str] = set()
+        self._lock = threading.Lock()
+
+    def _fail(self, message: str) -> None:
+        with self._lock:
+            self.failed_urls.append(message)
+
+    def submit_list_page(self, target_category: str, list_page_url: str) -> None:
+        extractor = get_specific_extractor(list_page_url)
+        if not extractor:
+            logger.warning(f"URL '{list_page_url}'에 대한 특정 크롤러를 찾을 수 없습니다. 건너뜀.")
+            self._fail(f"크롤러 없음: {list_page_url}")
+            return
+        self.engine.submit(self.discover, target_category, list_page_url, extractor, domain=url_domain(list_page_url))
+
+    def discover(self, target_category: str, list_page_url: str, extractor: BaseExtractor) -> None:
+        """목록 페이지에서 기사 URL을 찾아 기사별 가져오기 작업을 추가합니다."""
+        logger.info(f"뉴스 목록 페이지 크롤링 시작: {list_page_url} (대상 카테고리: {target_category}, Extractor: {type(extractor).__name__})")
+        try:
+            with self.engine.timer.time(CRAWL_STAGE_DISCOVERY), observe_stage(STAGE_CRAWL_LIST_PAGE):
+                article_urls = extractor.get_list_page_urls(list_page_url)
+        except Exception as e:
+            logger.error(f"뉴스 목록 페이지 '{list_page_url}' 크롤링 중 오류 발생: {e}", exc_info=True)
+            self._fail(f"목록 페이지 '{list_page_url}' 처리 실패: {e}")
+            return
+        if not article_urls:
+            logger.warning(f"'{list_page_url}'에서 추출할 기사 URL이 없습니다.")
+            return
+        for url in article_urls[:CRAWLER_MAX_ARTICLES_PER_LIST]:
+            # 여러 목록 페이지에 같은 기사가 있으면 한 번만 처리합니다.
+            with self._lock:
+                if url in self._seen_urls:
+                    continue
+                self._seen_urls.add(url)
+                self.total_urls_processed += 1
+            self.engine.submit(self.fetch_article, target_category, url, extractor, domain=url_domain(url))
+
+    def fetch_article(self, target_category: str, url: str, extractor: BaseExtractor) -> None:
+        """기사 HTML을 가져와 본문 추출 작업을 추가합니다. (도메인 상한 안에서 실행)"""
+        try:
+            with self.engine.timer.time(CRAWL_STAGE_FETCH), observe_stage(STAGE_CRAWL_ARTICLE):
+                html_content = extractor.fetch_article_html(url)
+        except Exception as e:
+            CRAWLED_ARTICLES.labels("extract_failed").inc()
+            logger.error(f"개별 기사 크롤링 실패: {url} - {e}", exc_info=True)
+            self._fail(f"{url} (상세 콘텐츠 추출 실패 - Extractor: {type(extractor).__name__})")
+            return
+        if not html_content:
+            CRAWLED_ARTICLES.labels("empty").inc()
+            self._fail(f"{url} (콘텐츠 추출 실패)")
+            return
+        self.engine.submit(self.extract_article, target_category, url, extractor, html_content)
+
+    def extract_article(self, target_category: str, url: str, extractor: BaseExtractor, html_content: str) -> None:
+        """HTML에서 본문을 추출하고, 유효하면 같은 작업에서 S3 저장과 RAG 적재를 이어서 실행합니다."""
+        if get_http_fetcher().get_extra(url, "ingested", html_content):
+            CRAWLED_ARTICLES.labels("unchanged").inc()
+            with self._lock:
+                self.unchanged_count += 1
+            logger.debug(f"변경되지 않은 기사(이미 적재됨) 건너뜀: {url}")
+            return
+        try:
+            with self.engine.timer.time(CRAWL_STAGE_EXTRACT):
+                extracted_data = extractor.parse_article_cached(html_content, url)
+        except Exception as e:
+            CRAWLED_ARTICLES.labels("extract_failed").inc()
+            logger.error(f"개별 기사 본문 추출 실패: {url} - {e}", exc_info=True)
+            self._fail(f"{url} (상세 콘텐츠 추출 실패 - Extractor: {type(extractor).__name__})")
+            return
+        if not _is_valid_article(extracted_data):
+            logger.warning(f"URL '{url}'에서 유효한 콘텐츠를 추출하지 못했습니다. (제목: {(extracted_data or {}).get('title', 'N/A')})")
+            CRAWLED_ARTICLES.labels("empty").inc()
+            self._fail(f"{url} (콘텐츠 추출 실패)")
+            return
+        self.persist_article(target_category, url, extracted_data, html_content)
+
+    def persist_article(self, target_category: str, url: str, extracted_data: dict, html_content: str) -> None:
+        """기사를 S3 지식 베이스에 저장하고 RAG(PgVector)에 적재합니다. (FAISS 인덱스는 크롤링이 끝난 뒤 한 번 재로드)"""
+        with self.engine.timer.time(CRAWL_STAGE_PERSIST):
+            s3_key_saved = _save_article_to_s3_knowledge_base(
+                self.s3_client,
+                self.bucket_name,
+                extracted_data.get('title', '제목 없음'),
+                _format_article_content(extracted_data),
+                url,
+                target_category
+            )
+        if not s3_key_saved:
+            CRAWLED_ARTICLES.labels("store_failed").inc()
+            self._fail(f"{url} (S3 파일 저장 실패)")
+            return
+        with self._lock:
+            self.crawled_count += 1
+        try:
+            with self.engine.timer.time(CRAWL_STAGE_INGEST):
+                self.rag_system.add_document_to_rag_system(
+                    s3_key=s3_key_saved,
+                    user_id=self.system_user_id,
+                    reload_index=False
+                )
+        except Exception as e:
+            CRAWLED_ARTICLES.labels("ingest_failed").inc()
+            logger.error(f"크롤링된 기사 '{s3_key_saved}'의 RAG 시스템 추가 중 오류 발생: {e}", exc_info=True)
+            self._fail(f"{url} (RAG 시스템 추가 실패)")
+            return
+        with self._lock:
+            self.ingested_count += 1
+        CRAWLED_ARTICLES.labels("ingested").inc()
+        # 다음 크롤링에서 이 본문이 그대로(304)면 다시 저장/적재하지 않도록 표시합니다.
+        get_http_fetcher().set_extra(url, "ingested", html_content, True)
+        logger.info(f"크롤링된 기사 '{s3_key_saved}'가 RAG 시스템에 성공적으로 추가되었습니다. (User ID: {self.system_user_id})")
+
+
 def perform_marketing_crawl_task(system_user_id: int) -> dict:
     """
     사전 정의된 뉴스 목록 URL들을 크롤링하여 기사들을 S3 지식 베이스에 자동으로 추가하고
     RAG 시스템에 반영합니다. (Flask 앱 컨텍스트 내에서 호출)
+    목록 페이지 탐색, 기사 가져오기, 본문 추출, 저장/적재는 CrawlEngine의 공용 워커 풀에서 동시에 실행되며,
+    같은 도메인에 대한 요청 수는 도메인별 상한(CRAWLER_PER_DOMAIN_CONCURRENCY)으로 제한됩니다.
     Args:
         system_user_id (int): 크롤링된 데이터를 귀속시킬 시스템 사용자(크롤러)의 ID.
     Returns:
-        dict: 크롤링 결과 요약
+        dict: 크롤링 결과 요약 (message, crawled_count, failed_urls, 건너뛴 변경 없는 기사 수 unchanged_count, 단계별 소요 시간 stage_timings, 전체 소요 시간 elapsed_seconds)
     """
     logger.info(f"--- 뉴스 크롤링 작업 시작 (스케줄러 호출, 시스템 User ID: {system_user_id}) ---")
+    started = time.monotonic()
     s3_client, knowledge_base_bucket_name = _get_s3_info()
-    crawled_count = 0
-    total_urls_processed = 0
-    failed_urls: list[str] = []
     # 크롤러 설정 파일 S3에서 로드
     crawler_configs_s3_key = current_app.config.get('CRAWLER_CONFIG_S3_KEY', '_system_configs/crawler_urls.json')
     crawler_configs_bucket_name = current_app.config.get('CRAWLER_CONFIG_BUCKET_NAME', knowledge_base_bucket_name)
@@ -144,74 +300,34 @@ def perform_marketing_crawl_task(system_user_id: int) -> dict:
     if not rag_system_instance:
         logger.critical("RAGSystem 인스턴스를 찾을 수 없습니다. 크롤링된 콘텐츠를 벡터 DB에 추가할 수 없습니다.")
         return {"message": "RAG 시스템 초기화 오류", "crawled_count": 0, "failed_urls": []}
-    # 카테고리별로 반복
-    for target_category, urls_list_for_category in category_to_urls_map.items():
-        # 각 카테고리의 URL 목록 반복
-        for url_to_crawl_entry in urls_list_for_category:
-            extractor = get_specific_extractor(url_to_crawl_entry)
-            if not extractor:
-                logger.warning(f"URL '{url_to_crawl_entry}'에 대한 특정 크롤러를 찾을 수 없습니다. 건너뜀.")
-                failed_urls.append(f"크롤러 없음: {url_to_crawl_entry}")
-                continue
-            logger.info(f"뉴스 목록 페이지 크롤링 시작: {url_to_crawl_entry} (대상 카테고리: {target_category}, Extractor: {type(extractor).__name__})")
-            try:
-                article_urls_to_crawl_from_list = extractor.get_list_page_urls(url_to_crawl_entry)
-                if not article_urls_to_crawl_from_list:
-                    logger.warning(f"'{url_to_crawl_entry}'에서 추출할 기사 URL이 없습니다.")
-                    continue
-                # 기사 URL별로 반복 (테스트: 5개 제한)
-                for url in article_urls_to_crawl_from_list[:10]:
-                    total_urls_processed += 1
-                    try:
-                        extracted_data = extractor.get_article_details(url)
-                    except Exception as e:
-                        logger.error(f"개별 기사 크롤링 실패: {url} - {e}", exc_info=True)
-                        failed_urls.append(f"{url} (상세 콘텐츠 추출 실패 - Extractor: {type(extractor).__name__})")
-                        continue
-                    # 기사 데이터 유효성 체크
-                    is_valid_article_content = False
-                    if extracted_data:
-                        if extracted_data.get('content'):
-                            is_valid_article_content = True
-                        elif extracted_data.get('ingredients') and extracted_data.get('steps'):
-                            is_valid_article_content = True
-                    if not is_valid_article_content:
-                        logger.warning(f"URL '{url}'에서 유효한 콘텐츠를 추출하지 못했습니다. (제목: {extracted_data.get('title', 'N/A')})")
-                        failed_urls.append(f"{url} (콘텐츠 추출 실패)")
-                        continue
-                    article_title = extracted_data.get('title', '제목 없음')
-                    article_content_str = _format_article_content(extracted_data)
-                    # S3에 기사 저장
-                    s3_key_saved = _save_article_to_s3_knowledge_base(
-                        s3_client,
-                        knowledge_base_bucket_name,
-                        article_title,
-                        article_content_str,
-                        url,
-                        target_category
-                    )
-                    if s3_key_saved:
-                        crawled_count += 1
-                        try:
-                            # RAG 시스템에 문서 추가
-                            rag_system_instance.add_document_to_rag_system(
-                                s3_key=s3_key_saved,
-                                user_id=system_user_id
-                            )
-                            logger.info(f"크롤링된 기사 '{s3_key_saved}'가 RAG 시스템에 성공적으로 추가되었습니다. (User ID: {system_user_id})")
-                        except Exception as e:
-                            logger.error(f"크롤링된 기사 '{s3_key_saved}'의 RAG 시스템 추가 중 오류 발생: {e}", exc_info=True)
-                            failed_urls.append(f"{url} (RAG 시스템 추가 실패)")
-                    else:
-                        failed_urls.append(f"{url} (S3 파일 저장 실패)")
-            except Exception as e:
-                logger.error(f"뉴스 목록 페이지 '{url_to_crawl_entry}' 크롤링 중 오류 발생: {e}", exc_info=True)
-                failed_urls.append(f"목록 페이지 '{url_to_crawl_entry}' 처리 실패: {e}")
-                continue
+    with CrawlEngine(current_app._get_current_object()) as engine:
+        crawl = _MarketingCrawl(engine, s3_client, knowledge_base_bucket_name, rag_system_instance, system_user_id)
+        # 모든 카테고리의 목록 페이지를 한 번에 작업으로 추가합니다.
+        for target_category, urls_list_for_category in category_to_urls_map.items():
+            for url_to_crawl_entry in urls_list_for_category:
+                crawl.submit_list_page(target_category, url_to_crawl_entry)
+    # 주간 크롤링 사이에 Chrome 프로세스를 남겨 두지 않도록 쉬고 있는 드라이버를 종료합니다.
+    get_driver_pool().close()
+    # 적재한 문서가 있으면 FAISS 인덱스를 한 번만 재로드합니다.
+    if crawl.ingested_count:
+        with engine.timer.time(CRAWL_STAGE_INDEX_RELOAD):
+            rag_system_instance._load_faiss_from_pgvector()
+        logger.info(f"크롤링된 기사 {crawl.ingested_count}개를 반영하여 FAISS 인덱스를 재로드했습니다.")
+    elapsed_seconds = round(time.monotonic() - started, 3)
+    stage_timings = engine.timer.snapshot()
     # 결과 요약 메시지 생성
-    message = f"총 {total_urls_processed}개의 기사 URL을 처리하여 {crawled_count}개의 기사가 성공적으로 크롤링되어 S3 지식 베이스에 추가 및 RAG 시스템에 반영되었습니다."
-    if failed_urls:
-        message += f" 다음 URL들은 실패했습니다: {'; '.join(failed_urls)}"
+    message = f"총 {crawl.total_urls_processed}개의 기사 URL을 처리하여 {crawl.crawled_count}개의 기사가 성공적으로 크롤링되어 S3 지식 베이스에 추가 및 RAG 시스템에 반영되었습니다."
+    if crawl.unchanged_count:
+        message += f" 이미 적재된 변경 없는 기사 {crawl.unchanged_count}개는 건너뛰었습니다."
+    if crawl.failed_urls:
+        message += f" 다음 URL들은 실패했습니다: {'; '.join(crawl.failed_urls)}"
         logger.warning(message)
-    logger.info(f"--- 뉴스 크롤링 작업 완료. {crawled_count}개 기사 크롤링 성공. (S3 및 RAG 시스템) ---")
-    return {"message": message, "crawled_count": crawled_count, "failed_urls": failed_urls}
+    logger.info(f"--- 뉴스 크롤링 작업 완료. {crawl.crawled_count}개 기사 크롤링 성공. (S3 및 RAG 시스템, {elapsed_seconds}초) 단계별 소요 시간: {stage_timings} ---")
+    return {
+        "message": message,
+        "crawled_count": crawl.crawled_count,
+        "failed_urls": crawl.failed_urls,
+        "unchanged_count": crawl.unchanged_count,
+        "stage_timings": stage_timings,
+        "elapsed_seconds": elapsed_seconds
+    }
@@ -1,12 +1,92 @@
 import os
+import time
+import atexit
 import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, Optional
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import WebDriverException
 
+from services.utils.constants import (
+    CRAWLER_SELENIUM_POOL_SIZE,
+    CRAWLER_SELENIUM_MAX_USES,
+    CRAWLER_SELENIUM_CHECKOUT_TIMEOUT,
+    CRAWLER_SELENIUM_PAGE_LOAD_TIMEOUT
+)
+
 logger = logging.getLogger(__name__)
 
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+# 본문/목록 추출에 필요 없는 리소스(이미지, 폰트, 미디어)는 요청하지 않습니다.
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.bmp", "*.avif",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3", "*.m4a", "*.ogg", "*.wav", "*.m3u8",
+]
+
+
+def resolve_driver_path(driver_path: str | None) -> str:
+    """
+    드라이버 경로를 결정합니다. 인자로 주어지지 않으면 프로젝트 루트의 drivers 폴더 기준 기본 경로를 계산합니다.
+    """
+    if driver_path:
+        if not os.path.exists(driver_path):
+            logger.error(f"Provided driver path does not exist: {driver_path}")
+            raise FileNotFoundError(f"ChromeDriver not found at: {driver_path}")
+        return driver_path
+    # 프로젝트 루트의 drivers 폴더 기준 기본 경로 계산
+    current_file_abs_path = os.path.abspath(__file__)
+    web_crawling_dir = os.path.dirname(current_file_abs_path)
+    project_root_abs_path = os.path.abspath(os.path.join(web_crawling_dir, '..', '..'))
+    default_driver_path = os.path.join(project_root_abs_path, 'drivers', 'chromedriver.exe')
+    if not os.path.exists(default_driver_path):
+        logger.error(f"Default ChromeDriver path does not exist: {default_driver_path}")
+        raise FileNotFoundError(f"ChromeDriver not found at: {default_driver_path}. Please ensure it's in your project's 'drivers' folder.")
+    return default_driver_path
+
+
+def build_chrome_options(headless: bool = True) -> Options:
+    """
+    크롤링용 Chrome 옵션을 만듭니다.
+    DOMContentLoaded까지만 기다리는 eager 로드 전략을 쓰고, 이미지는 브라우저 설정으로 끕니다.
+    """
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument("--headless=new")
+    chrome_options.page_load_strategy = "eager"
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--window-size=1920,1080")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument(f"user-agent={USER_AGENT}")
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+    chrome_options.add_argument("--autoplay-policy=user-gesture-required")
+    chrome_options.add_experimental_option('prefs', {"profile.managed_default_content_settings.images": 2})
+    chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
+    chrome_options.add_argument("--ignore-certificate-errors")
+    chrome_options.add_argument("--allow-insecure-localhost")
+    chrome_options.add_argument("--ignore-ssl-errors")
+    return chrome_options
+
+
+def create_chrome_driver(driver_path: str, headless: bool = True,
+                         page_load_timeout: float = CRAWLER_SELENIUM_PAGE_LOAD_TIMEOUT) -> webdriver.Chrome:
+    """크롤링용 ChromeDriver를 만들고 폰트/미디어 등 불필요한 리소스 요청을 차단합니다."""
+    service = Service(executable_path=driver_path)
+    driver = webdriver.Chrome(service=service, options=build_chrome_options(headless))
+    driver.set_page_load_timeout(page_load_timeout)
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    except WebDriverException as e:
+        logger.warning(f"Failed to enable resource blocking on ChromeDriver: {e}")
+    return driver
+
 class ChromeDriverManager:
     """
     Selenium ChromeDriver의 생명주기를 관리하는 싱글톤 클래스입니다.
@@ -33,20 +113,7 @@ class ChromeDriverManager:
         """
         드라이버 경로를 결정합니다. 인자로 주어지지 않으면 기본 경로를 계산합니다.
         """
-        if driver_path:
-            if not os.path.exists(driver_path):
-                logger.error(f"Provided driver path does not exist: {driver_path}")
-                raise FileNotFoundError(f"ChromeDriver not found at: {driver_path}")
-            return driver_path
-        # 프로젝트 루트의 drivers 폴더 기준 기본 경로 계산
-        current_file_abs_path = os.path.abspath(__file__)
-        web_crawling_dir = os.path.dirname(current_file_abs_path)
-        project_root_abs_path = os.path.abspath(os.path.join(web_crawling_dir, '..', '..'))
-        default_driver_path = os.path.join(project_root_abs_path, 'drivers', 'chromedriver.exe')
-        if not os.path.exists(default_driver_path):
-            logger.error(f"Default ChromeDriver path does not exist: {default_driver_path}")
-            raise FileNotFoundError(f"ChromeDriver not found at: {default_driver_path}. Please ensure it's in your project's 'drivers' folder.")
-        return default_driver_path
+        return resolve_driver_path(driver_path)
 
     def get_driver(self) -> webdriver.Chrome:
         """
@@ -56,21 +123,7 @@ class ChromeDriverManager:
         if self._driver is None or not self._is_driver_alive():
             logger.info(f"Initializing new ChromeDriver instance. Headless: {self.headless}")
             try:
-                chrome_options = Options()
-                if self.headless:
-                    chrome_options.add_argument("--headless")
-                chrome_options.add_argument("--no-sandbox")
-                chrome_options.add_argument("--disable-dev-shm-usage")
-                chrome_options.add_argument("--window-size=1920,1080")
-                chrome_options.add_argument("--disable-gpu")
-                chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
-                chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
-                chrome_options.add_argument("--ignore-certificate-errors")
-                chrome_options.add_argument("--allow-insecure-localhost")
-                chrome_options.add_argument("--ignore-ssl-errors")
-                chrome_options.add_argument("--disable-features=NetworkService")
-                service = Service(executable_path=self.driver_path)
-                self._driver = webdriver.Chrome(service=service, options=chrome_options)
+                self._driver = create_chrome_driver(self.driver_path, self.headless)
                 logger.debug("ChromeDriver initialized successfully.")
             except WebDriverException as e:
                 logger.critical(f"Failed to initialize ChromeDriver: {e}")
@@ -120,4 +173,176 @@ class ChromeDriverManager:
         """
         with 문 사용을 위한 컨텍스트 매니저 종료점.
         """
-        self.quit_driver()
\ No newline at end of file
+        self.quit_driver()
+
+class DriverPoolTimeout(TimeoutError):
+    """대기 시간 안에 사용할 수 있는 드라이버가 없는 경우"""
+    pass
+
+
+class ChromeDriverPool:
+    """
+    재사용 가능한 headless ChromeDriver 풀.
+    - 최대 size개의 드라이버를 필요할 때 만들고, driver() 컨텍스트 매니저로 빌려 쓴 뒤 반납합니다.
+    - 빌려줄 때 드라이버가 살아 있는지 확인하고, 죽었으면 새로 만듭니다.
+    - max_uses번 사용한 드라이버와 사용 중 WebDriver 오류가 난 드라이버는 반납할 때 종료합니다. (메모리 누적 방지)
+    드라이버 경로는 첫 드라이버를 만들 때 확인하므로, Selenium을 쓰지 않는 추출기는 드라이버 없이도 동작합니다.
+    """
+
+    def __init__(self, size: int = CRAWLER_SELENIUM_POOL_SIZE, max_uses: int = CRAWLER_SELENIUM_MAX_USES,
+                 checkout_timeout: float = CRAWLER_SELENIUM_CHECKOUT_TIMEOUT,
+                 driver_path: Optional[str] = None, headless: bool = True):
+        self.size = max(1, size)
+        self.max_uses = max(1, max_uses)
+        self.checkout_timeout = checkout_timeout
+        self.headless = headless
+        self._driver_path = driver_path
+        self._resolved_driver_path: Optional[str] = None
+        self._idle: Deque[webdriver.Chrome] = deque()
+        self._uses: Dict[int, int] = {}
+        self._total = 0
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._stats = {"created": 0, "recycled": 0, "unhealthy": 0, "checkouts": 0, "waits": 0}
+
+    def _create(self) -> webdriver.Chrome:
+        if self._resolved_driver_path is None:
+            self._resolved_driver_path = resolve_driver_path(self._driver_path)
+        logger.info(f"Initializing pooled ChromeDriver instance. Headless: {self.headless}")
+        driver = create_chrome_driver(self._resolved_driver_path, self.headless)
+        with self._lock:
+            self._stats["created"] += 1
+        return driver
+
+    @staticmethod
+    def _is_alive(driver: webdriver.Chrome) -> bool:
+        try:
+            driver.current_url
+            return True
+        except WebDriverException:
+            return False
+
+    @staticmethod
+    def _quit(driver: webdriver.Chrome) -> None:
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"Error quitting pooled ChromeDriver: {e}")
+
+    def _release_slot(self, driver: webdriver.Chrome) -> None:
+        """드라이버를 풀에서 빼고 대기 중인 요청에 자리를 알립니다."""
+        with self._lock:
+            self._uses.pop(id(driver), None)
+            self._total -= 1
+            self._available.notify()
+
+    def checkout(self) -> webdriver.Chrome:
+        """
+        드라이버를 빌립니다. 쉬는 드라이버가 없고 풀이 가득 차 있으면 checkout_timeout초까지 기다립니다.
+        Raises:
+            DriverPoolTimeout: 대기 시간 안에 드라이버를 빌리지 못한 경우
+        """
+        deadline = time.monotonic() + self.checkout_timeout
+        while True:
+            with self._lock:
+                driver = None
+                waited = False
+                while not self._idle and self._total >= self.size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise DriverPoolTimeout(f"{self.checkout_timeout}초 안에 사용할 수 있는 ChromeDriver가 없습니다.")
+                    if not waited:
+                        self._stats["waits"] += 1
+                        waited = True
+                    self._available.wait(remaining)
+                if self._idle:
+                    driver = self._idle.popleft()
+                else:
+                    self._total += 1
+                self._stats["checkouts"] += 1
+            if driver is None:
+                try:
+                    driver = self._create()
+                except Exception:
+                    with self._lock:
+                        self._total -= 1
+                        self._available.notify()
+                    raise
+                with self._lock:
+                    self._uses[id(driver)] = 0
+                return driver
+            if self._is_alive(driver):
+                return driver
+            logger.warning("Pooled ChromeDriver instance is no longer alive. Replacing it.")
+            with self._lock:
+                self._stats["unhealthy"] += 1
+            self._quit(driver)
+            self._release_slot(driver)
+
+    def checkin(self, driver: webdriver.Chrome, broken: bool = False) -> None:
+        """드라이버를 반납합니다. 오류가 났거나 max_uses번 사용했으면 종료하고 자리를 비웁니다."""
+        with self._lock:
+            uses = self._uses.get(id(driver), 0) + 1
+            self._uses[id(driver)] = uses
+            recycle = broken or uses >= self.max_uses
+            if not recycle:
+                self._idle.append(driver)
+                self._available.notify()
+                return
+            self._stats["recycled"] += 1
+        self._quit(driver)
+        self._release_slot(driver)
+
+    @contextmanager
+    def driver(self) -> Iterator[webdriver.Chrome]:
+        """with 문으로 드라이버를 빌려 쓰고 반납합니다. WebDriver 오류가 나면 그 드라이버는 종료합니다."""
+        driver = self.checkout()
+        broken = False
+        try:
+            yield driver
+        except WebDriverException:
+            broken = True
+            raise
+        finally:
+            self.checkin(driver, broken=broken)
+
+    def close(self) -> None:
+        """쉬고 있는 드라이버를 모두 종료합니다. (빌려준 드라이버는 반납될 때 풀에 다시 들어갑니다)"""
+        with self._lock:
+            idle = list(self._idle)
+            self._idle.clear()
+        for driver in idle:
+            self._quit(driver)
+            self._release_slot(driver)
+        if idle:
+            logger.info(f"Closed {len(idle)} idle pooled ChromeDriver instance(s).")
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": self.size,
+                "open": self._total,
+                "idle": len(self._idle),
+                "in_use": self._total - len(self._idle),
+                **self._stats,
+            }
+
+
+# 프로세스 공용 ChromeDriver 풀
+_driver_pool: Optional[ChromeDriverPool] = None
+_driver_pool_lock = threading.Lock()
+
+
+def get_driver_pool() -> ChromeDriverPool:
+    """공용 ChromeDriverPool을 반환합니다. 처음 요청될 때 만들고, 프로세스 종료 시 드라이버를 정리합니다."""
+    global _driver_pool
+    with _driver_pool_lock:
+        if _driver_pool is None:
+            _driver_pool = ChromeDriverPool()
+            atexit.register(_driver_pool.close)
+        return _driver_pool
+
+
+def get_driver_pool_stats() -> Dict[str, Any]:
+    """드라이버 풀 크기, 열린/쉬는/사용 중 드라이버 수, 생성/교체/대기 횟수를 반환합니다."""
+    return get_driver_pool().snapshot()
@@ -1,14 +1,19 @@
+import json
 import requests
 from bs4 import BeautifulSoup
 import logging
+from typing import Any, Iterator
 from trafilatura import extract
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException, InvalidSessionIdException
 from ..web_utils import clean_beautynury_title
-from ..driver_manager import ChromeDriverManager
+from ..driver_manager import get_driver_pool
 from ..html_decoder import HTMLDecoder
+from ..http_fetcher import get_http_fetcher
+from ..crawl_engine import url_domain
+from ..fetch_strategy import STRATEGY_STATIC, STRATEGY_RENDERED, record_fetch_strategy
 from ..title_extractor import TitleExtractor
 import urllib3
 import requests.packages.urllib3
@@ -21,7 +26,7 @@ logger = logging.getLogger(__name__)
 class BaseExtractor:
     """
     모든 웹 콘텐츠 추출기의 기본 클래스.
-    - HTTP 요청, Trafilatura 기반 텍스트 추출, Selenium 드라이버 관리 등 공통 기능 제공
+    - HTTP 요청, Trafilatura 기반 텍스트 추출, Selenium 드라이버 풀 사용 등 공통 기능 제공
     """
     BASE_URL = ""
     HEADERS = {
@@ -33,9 +38,11 @@ class BaseExtractor:
         "news.hidoc.co.kr": "utf-8",
     }
     CUSTOM_TITLE_SELECTORS = None
+    # True이면 정적 전략(HTTP)으로 기사 URL을 찾지 못했을 때 Selenium 렌더링으로 다시 시도합니다.
+    RENDERED_LIST_FALLBACK = False
 
     def __init__(self):
-        self.driver_manager = ChromeDriverManager(headless=True)
+        self.driver_pool = get_driver_pool()
 
     def _fetch_html(self, url: str, use_selenium: bool = False) -> str | None:
         """
@@ -46,28 +53,28 @@ class BaseExtractor:
         Returns:
             str | None: HTML 문자열 또는 실패 시 None
         """
-        driver = None
         try:
             if use_selenium:
-                driver = self.driver_manager.get_driver()
-                logger.info(f"Fetching {url} using Selenium...")
-                driver.get(url)
-                if "fashionbiz.co.kr" in url:
-                    try:
-                        WebDriverWait(driver, self.TIMEOUT).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, 'div.sc-53c9553f-0.ksjCKq'))
-                        )
-                        driver.implicitly_wait(2)
-                        logger.debug(f"Fashionbiz specific element found on {url}.")
-                    except TimeoutException:
-                        logger.warning(f"Fashionbiz: Timeout waiting for specific element on {url}. Proceeding anyway.")
-                    except (WebDriverException, Exception) as e:
-                        logger.warning(f"Fashionbiz: Error waiting for element on {url}: {e}")
-                return driver.page_source
+                # 공용 드라이버 풀에서 드라이버를 빌려 쓰고 반납합니다. (동시 크롤링 시 풀 크기만큼 병렬 렌더링)
+                with self.driver_pool.driver() as driver:
+                    logger.info(f"Fetching {url} using Selenium...")
+                    driver.get(url)
+                    if "fashionbiz.co.kr" in url:
+                        try:
+                            WebDriverWait(driver, self.TIMEOUT).until(
+                                EC.presence_of_element_located((By.CSS_SELECTOR, 'div.sc-53c9553f-0.ksjCKq'))
+                            )
+                            driver.implicitly_wait(2)
+                            logger.debug(f"Fashionbiz specific element found on {url}.")
+                        except TimeoutException:
+                            logger.warning(f"Fashionbiz: Timeout waiting for specific element on {url}. Proceeding anyway.")
+                        except (WebDriverException, Exception) as e:
+                            logger.warning(f"Fashionbiz: Error waiting for element on {url}: {e}")
+                    return driver.page_source
             else:
                 logger.info(f"Fetching {url} using requests...")
-                response = requests.get(url, headers=self.HEADERS, timeout=self.TIMEOUT, verify=False)
-                response.raise_for_status()
+                # 호스트별 커넥션 풀과 조건부 요청(304면 디스크 캐시 본문)을 사용합니다.
+                response = get_http_fetcher().get(url, headers=self.HEADERS, timeout=self.TIMEOUT, verify=False)
                 forced_encoding = None
                 for domain, encoding in self.FORCED_ENCODING_MAP.items():
                     if domain in url:
@@ -90,8 +97,7 @@ class BaseExtractor:
         except (WebDriverException, InvalidSessionIdException) as e:
             logger.error(f"Selenium WebDriver error for URL '{url}': {e}", exc_info=True)
             if isinstance(e, InvalidSessionIdException):
-                logger.warning("Selenium session became invalid. Forcing driver re-initialization.")
-                self.driver_manager.quit_driver()
+                logger.warning("Selenium session became invalid. The pooled driver has been discarded.")
             return None
         except Exception as e:
             logger.error(f"Error fetching HTML from '{url}': {e}", exc_info=True)
@@ -137,12 +143,100 @@ class BaseExtractor:
             logger.warning(f"No significant text found from URL: {url} after all extraction attempts.")
             return None
 
+    @staticmethod
+    def _load_embedded_json(html_content: str, script_id: str = "__NEXT_DATA__") -> Any | None:
+        """서버 렌더링 페이지에 포함된 JSON(<script id="__NEXT_DATA__"> 등)을 읽습니다. 없거나 잘못된 JSON이면 None"""
+        soup = BeautifulSoup(html_content, 'html.parser')
+        script_tag = soup.find('script', id=script_id)
+        if not script_tag or not script_tag.string:
+            return None
+        try:
+            return json.loads(script_tag.string)
+        except ValueError:
+            logger.warning(f"Embedded JSON '{script_id}' could not be parsed.")
+            return None
+
+    @staticmethod
+    def _iter_json_strings(data: Any) -> Iterator[str]:
+        """JSON 값 안의 모든 문자열을 순회합니다. (링크/경로 탐색용)"""
+        stack = [data]
+        while stack:
+            value = stack.pop()
+            if isinstance(value, str):
+                yield value
+            elif isinstance(value, dict):
+                stack.extend(value.values())
+            elif isinstance(value, list):
+                stack.extend(value)
+
+    def fetch_list_html(self, list_page_url: str) -> str | None:
+        """
+        기사 목록 페이지를 정적 전략(일반 HTTP 요청)으로 가져옵니다.
+        사이트가 목록 JSON API를 제공하면 하위 클래스에서 API 응답을 반환하도록 재정의합니다.
+        """
+        return self._fetch_html(list_page_url)
+
+    def fetch_rendered_list_html(self, list_page_url: str) -> str | None:
+        """기사 목록 페이지를 Selenium으로 렌더링해 가져옵니다. (RENDERED_LIST_FALLBACK일 때만 사용)"""
+        return self._fetch_html(list_page_url, use_selenium=True)
+
+    def parse_list_page(self, html_content: str, list_page_url: str) -> list[str]:
+        """
+        기사 목록 페이지 HTML에서 기사 URL 리스트를 추출합니다.
+        하위 클래스에서 반드시 구현해야 합니다.
+        """
+        raise NotImplementedError("Subclasses must implement parse_list_page method.")
+
+    def parse_list_page_static(self, content: str, list_page_url: str) -> list[str]:
+        """
+        정적 전략으로 가져온 응답(서버 렌더링 JSON, 마크업, API 응답)에서 기사 URL 리스트를 추출합니다.
+        기본은 parse_list_page이며, 내장 JSON이나 API를 읽는 추출기는 재정의합니다.
+        """
+        return self.parse_list_page(content, list_page_url)
+
     def get_list_page_urls(self, list_page_url: str) -> list[str]:
         """
         기사 목록 페이지에서 기사 URL 리스트를 추출합니다.
-        하위 클래스에서 반드시 구현해야 합니다.
+        정적 전략을 먼저 시도하고(페이지가 바뀌지 않았으면(304) 지난번 추출 결과를 재사용),
+        기사 URL을 찾지 못했고 RENDERED_LIST_FALLBACK이면 Selenium 렌더링으로 다시 시도합니다.
+        도메인별로 어떤 전략이 성공했는지 기록합니다.
+        """
+        domain = url_domain(list_page_url)
+        content = self.fetch_list_html(list_page_url)
+        article_urls = get_http_fetcher().parse_once(
+            list_page_url, "article_urls", content,
+            lambda text: self.parse_list_page_static(text, list_page_url)
+        ) if content else []
+        record_fetch_strategy(domain, STRATEGY_STATIC, bool(article_urls))
+        if article_urls or not self.RENDERED_LIST_FALLBACK:
+            return article_urls
+        logger.info(f"No article URLs found statically on {list_page_url}. Falling back to rendered fetch.")
+        html_content = self.fetch_rendered_list_html(list_page_url)
+        article_urls = self.parse_list_page(html_content, list_page_url) if html_content else []
+        record_fetch_strategy(domain, STRATEGY_RENDERED, bool(article_urls))
+        return article_urls
+
+    def fetch_article_html(self, article_url: str) -> str | None:
+        """
+        기사 상세 페이지의 HTML을 가져옵니다. (크롤링 엔진의 fetch 단계)
+        사이트별로 가져오는 방식이 다르면 하위 클래스에서 재정의합니다.
         """
-        raise NotImplementedError("Subclasses must implement get_list_page_urls method.")
+        return self._fetch_html(article_url)
+
+    def parse_article(self, html_content: str, article_url: str) -> dict | None:
+        """
+        기사 상세 페이지 HTML에서 본문/제목 등 주요 정보를 추출합니다. (크롤링 엔진의 extract 단계)
+        Returns:
+            dict | None: {'title': ..., 'content': ...} 또는 None
+        """
+        return self._extract_main_content(html_content, article_url)
+
+    def parse_article_cached(self, html_content: str, article_url: str) -> dict | None:
+        """parse_article과 같지만, 페이지가 바뀌지 않았으면(304) 지난번 추출 결과를 재사용합니다."""
+        return get_http_fetcher().parse_once(
+            article_url, "article", html_content,
+            lambda html: self.parse_article(html, article_url)
+        )
 
     def get_article_details(self, article_url: str) -> dict | None:
         """
@@ -152,11 +246,7 @@ class BaseExtractor:
         Returns:
             dict | None: {'title': ..., 'content': ...} 또는 None
         """
-        html_content = self._fetch_html(article_url)
+        html_content = self.fetch_article_html(article_url)
         if not html_content:
             return None
-        return self._extract_main_content(html_content, article_url)
-
-    def __del__(self):
-        if hasattr(self, 'driver_manager') and self.driver_manager:
-            self.driver_manager.quit_driver()
\ No newline at end of file
+        return self.parse_article_cached(html_content, article_url)
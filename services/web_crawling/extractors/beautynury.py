@@ -7,15 +7,10 @@ class BeautynuryExtractor(BaseExtractor):
     """beautynury.com 웹사이트에서 콘텐츠를 추출하는 클래스."""
     BASE_URL = "https://www.beautynury.com"
 
-    def get_list_page_urls(self, list_page_url: str) -> list[str]:
+    def parse_list_page(self, html_content: str, list_page_url: str) -> list[str]:
         """beautynury.com의 뉴스 목록 페이지에서 기사 URL들을 추출합니다."""
         article_urls = []
-        
         # BaseExtractor의 _fetch_html에서 디코딩을 처리하므로, 여기서는 그냥 HTML 문자열을 받습니다.
-        html_content = self._fetch_html(list_page_url, use_selenium=False)
-        if not html_content:
-            return []
-        
         soup = BeautifulSoup(html_content, 'html.parser')
 
         for li_tag in soup.find_all('li'):
@@ -30,13 +25,8 @@ class BeautynuryExtractor(BaseExtractor):
         logger.info(f"Successfully extracted {len(article_urls)} URLs from {list_page_url} (Beautynury)")
         return article_urls
 
-    def get_article_details(self, article_url: str) -> dict | None:
+    def parse_article(self, html_content: str, article_url: str) -> dict | None:
         """beautynury.com의 기사 상세 페이지에서 제목, 본문, 작성자, 작성 날짜를 추출합니다."""
-        # BaseExtractor의 _fetch_html에서 디코딩을 처리하므로, 여기서는 그냥 HTML 문자열을 받습니다.
-        html_content = self._fetch_html(article_url, use_selenium=False)
-        if not html_content:
-            return None
-
         soup = BeautifulSoup(html_content, 'html.parser')
 
         # 1. 기사 제목 추출
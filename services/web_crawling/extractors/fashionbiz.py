@@ -6,13 +6,30 @@ class FashionbizExtractor(BaseExtractor):
     """Fashionbiz.co.kr 웹사이트에서 콘텐츠를 추출하는 클래스."""
     BASE_URL = "https://fashionbiz.co.kr"
 
-    def get_list_page_urls(self, list_page_url: str) -> list[str]:
-        """Fashionbiz.co.kr의 뉴스 목록 페이지에서 기사 URL들을 추출합니다. Selenium 사용."""
-        article_urls = []
-        html_content = self._fetch_html(list_page_url, use_selenium=True) # Selenium 사용
-        if not html_content:
-            return []
+    # 목록 페이지는 서버 렌더링 JSON(__NEXT_DATA__)/마크업을 먼저 읽고, 기사 링크가 없을 때만 Selenium으로 렌더링합니다.
+    RENDERED_LIST_FALLBACK = True
+    ARTICLE_PATH_PATTERN = re.compile(r'^(?:https?://(?:www\.)?fashionbiz\.co\.kr)?(/article/\d+)$')
+
+    def parse_list_page_static(self, content: str, list_page_url: str) -> list[str]:
+        """
+        HTTP로 받은 Fashionbiz 목록 페이지에서 기사 URL들을 추출합니다.
+        Next.js가 페이지에 넣어 둔 __NEXT_DATA__ JSON의 기사 경로를 먼저 찾고, 없으면 서버 렌더링 마크업을 파싱합니다.
+        """
+        next_data = self._load_embedded_json(content)
+        if next_data is not None:
+            article_urls = set()
+            for value in self._iter_json_strings(next_data):
+                match = self.ARTICLE_PATH_PATTERN.match(value.strip())
+                if match:
+                    article_urls.add(self.BASE_URL + match.group(1))
+            if article_urls:
+                logger.info(f"Successfully extracted {len(article_urls)} URLs from {list_page_url} (Fashionbiz, __NEXT_DATA__)")
+                return list(article_urls)
+        return self.parse_list_page(content, list_page_url)
 
+    def parse_list_page(self, html_content: str, list_page_url: str) -> list[str]:
+        """Fashionbiz.co.kr의 뉴스 목록 페이지 마크업(서버 렌더링 또는 Selenium 렌더링)에서 기사 URL들을 추출합니다."""
+        article_urls = []
         soup = BeautifulSoup(html_content, 'html.parser')
         
         for article_div in soup.find_all('div', class_='sc-53c9553f-0 ksjCKq'):
@@ -24,15 +41,11 @@ class FashionbizExtractor(BaseExtractor):
                     article_urls.append(full_url)
         
         article_urls = list(set(article_urls))
-        logger.info(f"Successfully extracted {len(article_urls)} URLs from {list_page_url} (Fashionbiz, Selenium)")
+        logger.info(f"Successfully extracted {len(article_urls)} URLs from {list_page_url} (Fashionbiz)")
         return article_urls
 
-    def get_article_details(self, article_url: str) -> dict | None:
+    def parse_article(self, html_content: str, article_url: str) -> dict | None:
         """Fashionbiz 기사 상세 페이지에서 제목, 본문 등을 추출합니다."""
-        html_content = self._fetch_html(article_url, use_selenium=False) # 상세 페이지는 Requests로 시도
-        if not html_content:
-            return None
-
         # BaseExtractor의 범용 추출 로직을 사용합니다.
         extracted_data = self._extract_main_content(html_content, article_url)
 
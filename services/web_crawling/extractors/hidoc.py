@@ -1,6 +1,7 @@
 # services/web_crawling/extractors/hidoc.py (최종 수정안)
 import re 
 from .base_extractor import BaseExtractor, BeautifulSoup, logger, requests, extract # requests 임포트 추가
+from ..http_fetcher import get_http_fetcher
 
 class HidocExtractor(BaseExtractor):
     """news.hidoc.co.kr 웹사이트에서 콘텐츠를 추출하는 클래스."""
@@ -16,8 +17,8 @@ class HidocExtractor(BaseExtractor):
         """
         logger.info(f"Fetching {url} for HiDoc using direct requests.text strategy...")
         try:
-            response = requests.get(url, headers=self.HEADERS, timeout=self.TIMEOUT, verify=False)
-            response.raise_for_status()
+            # 호스트별 커넥션 풀과 조건부 요청(304면 디스크 캐시 본문)을 사용합니다.
+            response = get_http_fetcher().get(url, headers=self.HEADERS, timeout=self.TIMEOUT, verify=False)
             
             # 여기서 requests의 기본 인코딩 추론인 response.text를 그대로 사용합니다.
             # 이 방식이 HiDoc에서 과거에 깨지지 않고 잘 작동했다고 하셨으므로.
@@ -38,15 +39,18 @@ class HidocExtractor(BaseExtractor):
             logger.error(f"Error fetching HiDoc HTML from '{url}': {e}", exc_info=True)
             return None
 
+    def fetch_article_html(self, article_url: str) -> str | None:
+        """HiDoc 기사 상세 페이지도 HiDoc 전용 _fetch_html_for_hidoc로 가져옵니다."""
+        return self._fetch_html_for_hidoc(article_url)
 
-    def get_list_page_urls(self, list_page_url: str) -> list[str]:
+
+    def fetch_list_html(self, list_page_url: str) -> str | None:
+        """HiDoc 목록 페이지도 HiDoc 전용 _fetch_html_for_hidoc로 가져옵니다."""
+        return self._fetch_html_for_hidoc(list_page_url)
+
+    def parse_list_page(self, html_content: str, list_page_url: str) -> list[str]:
         """news.hidoc.co.kr의 뉴스 목록 페이지에서 기사 URL들을 추출합니다."""
-        # 이 메서드도 이제 HiDoc 전용 _fetch_html_for_hidoc를 호출합니다.
         article_urls = []
-        html_content = self._fetch_html_for_hidoc(list_page_url) # 변경!
-        if not html_content:
-            return []
-
         soup = BeautifulSoup(html_content, 'html.parser')
 
         for a_tag in soup.find_all('a', class_='thumb', href=True):
@@ -59,13 +63,8 @@ class HidocExtractor(BaseExtractor):
         return article_urls
 
 
-    def get_article_details(self, article_url: str) -> dict | None:
+    def parse_article(self, html_content: str, article_url: str) -> dict | None:
         """news.hidoc.co.kr의 기사 상세 페이지에서 제목, 본문, 작성자, 작성 날짜를 추출합니다."""
-        # 이 메서드도 이제 HiDoc 전용 _fetch_html_for_hidoc를 호출합니다.
-        html_content = self._fetch_html_for_hidoc(article_url) # 변경!
-        if not html_content:
-            return None
-
         soup = BeautifulSoup(html_content, 'html.parser')
 
         # 1. 기사 제목 추출 (h1.heading 사용)
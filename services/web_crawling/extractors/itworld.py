@@ -6,13 +6,9 @@ class ITWorldExtractor(BaseExtractor):
     """ITWorld Korea 웹사이트에서 콘텐츠를 추출하는 클래스."""
     BASE_URL = "https://www.itworld.co.kr"
 
-    def get_list_page_urls(self, list_page_url: str) -> list[str]:
-        """ITWorld Korea의 뉴스 목록 페이지에서 기사 URL들을 추출합니다."""
+    def parse_list_page(self, html_content: str, list_page_url: str) -> list[str]:
+        """ITWorld Korea의 뉴스 목록 페이지에서 기사 URL들을 추출합니다. (ITWorld는 Selenium 필요 없음)"""
         article_urls = []
-        html_content = self._fetch_html(list_page_url, use_selenium=False) # ITWorld는 Selenium 필요 없음
-        if not html_content:
-            return []
-
         soup = BeautifulSoup(html_content, 'html.parser')
 
         for a_tag in soup.find_all('a', class_='grid content-row-article', href=True):
@@ -30,12 +26,8 @@ class ITWorldExtractor(BaseExtractor):
         logger.info(f"Successfully extracted {len(article_urls)} URLs from {list_page_url} (ITWorld)")
         return article_urls
 
-    def get_article_details(self, article_url: str) -> dict | None:
+    def parse_article(self, html_content: str, article_url: str) -> dict | None:
         """ITWorld 기사 상세 페이지에서 제목, 본문, 작성자, 작성 날짜를 추출합니다."""
-        html_content = self._fetch_html(article_url, use_selenium=False)
-        if not html_content:
-            return None
-
         soup = BeautifulSoup(html_content, 'html.parser')
 
         # 1. 기사 제목 추출
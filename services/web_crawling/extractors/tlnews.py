@@ -6,13 +6,9 @@ class TLNewsExtractor(BaseExtractor):
     """tlnews.co.kr 웹사이트에서 콘텐츠를 추출하는 클래스."""
     BASE_URL = "https://www.tlnews.co.kr"
 
-    def get_list_page_urls(self, list_page_url: str) -> list[str]:
+    def parse_list_page(self, html_content: str, list_page_url: str) -> list[str]:
         """tlnews.co.kr의 뉴스 목록 페이지에서 기사 URL들을 추출합니다."""
         article_urls = []
-        html_content = self._fetch_html(list_page_url, use_selenium=False)
-        if not html_content:
-            return []
-
         soup = BeautifulSoup(html_content, 'html.parser')
 
         for li_tag in soup.find_all('li'):
@@ -26,12 +22,8 @@ class TLNewsExtractor(BaseExtractor):
         logger.info(f"Successfully extracted {len(article_urls)} URLs from {list_page_url} (TLNews)")
         return article_urls
 
-    def get_article_details(self, article_url: str) -> dict | None:
+    def parse_article(self, html_content: str, article_url: str) -> dict | None:
         """tlnews.co.kr의 기사 상세 페이지에서 제목, 본문, 작성자, 작성 날짜를 추출합니다."""
-        html_content = self._fetch_html(article_url, use_selenium=False)
-        if not html_content:
-            return None
-
         soup = BeautifulSoup(html_content, 'html.parser')
 
         # 1. 기사 제목 추출
@@ -0,0 +1,45 @@
+# ai-content-marketing-tool/services/web_crawling/fetch_strategy.py
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict
+
+# 페이지 가져오기 전략 이름
+STRATEGY_STATIC = "static"  # 일반 HTTP 요청 (서버 렌더링 JSON, 마크업, API 응답)
+STRATEGY_RENDERED = "rendered"  # Selenium 렌더링 (정적 결과가 없을 때만 사용)
+
+
+@dataclass
+class StrategyOutcome:
+    """도메인 하나의 전략별 성공/실패 횟수"""
+    success: int = 0
+    failure: int = 0
+
+
+# 도메인별 전략 결과 (프로세스 공유)
+_strategy_outcomes: Dict[str, Dict[str, StrategyOutcome]] = {}
+_last_success: Dict[str, str] = {}
+_strategy_lock = threading.Lock()
+
+
+def record_fetch_strategy(domain: str, strategy: str, success: bool) -> None:
+    """도메인에서 전략을 시도한 결과를 기록합니다."""
+    with _strategy_lock:
+        outcome = _strategy_outcomes.setdefault(domain, {}).setdefault(strategy, StrategyOutcome())
+        if success:
+            outcome.success += 1
+            _last_success[domain] = strategy
+        else:
+            outcome.failure += 1
+
+
+def get_fetch_strategy_stats() -> Dict[str, Dict[str, Any]]:
+    """도메인별 마지막 성공 전략과 전략별 성공/실패 횟수를 반환합니다."""
+    with _strategy_lock:
+        return {
+            domain: {
+                "last_success": _last_success.get(domain),
+                **{strategy: {"success": o.success, "failure": o.failure} for strategy, o in outcomes.items()},
+            }
+            for domain, outcomes in _strategy_outcomes.items()
+        }
@@ -0,0 +1,253 @@
+# ai-content-marketing-tool/services/web_crawling/http_fetcher.py
+
+import os
+import gzip
+import json
+import time
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from services.utils.constants import (
+    CRAWLER_HTTP_POOL_SIZE,
+    CRAWLER_HTTP_CACHE_ENABLED,
+    CRAWLER_HTTP_CACHE_DIR,
+    CRAWLER_HTTP_CACHE_TTL
+)
+
+logger = logging.getLogger(__name__)
+
+
+def content_digest(text: str) -> str:
+    """파싱 결과를 응답 본문에 묶어 두기 위한 본문 해시"""
+    return hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+@dataclass
+class FetchResponse:
+    """
+    HTTP GET 결과. 304 응답이면 디스크 캐시의 본문을 담고 not_modified=True입니다.
+    requests.Response와 같은 이름의 content/encoding/apparent_encoding/text를 제공합니다.
+    """
+    url: str
+    status_code: int
+    content: bytes
+    encoding: Optional[str]
+    apparent_encoding: Optional[str]
+    not_modified: bool = False
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def text(self) -> str:
+        """requests.Response.text와 같은 방식(encoding, 없으면 apparent_encoding)으로 디코딩한 본문"""
+        encoding = self.encoding or self.apparent_encoding or "utf-8"
+        try:
+            return str(self.content, encoding, errors="replace")
+        except LookupError:
+            return str(self.content, "utf-8", errors="replace")
+
+
+class HttpFetcher:
+    """
+    크롤러 공용 HTTP 가져오기 계층.
+    - 호스트별 requests.Session(커넥션 풀 CRAWLER_HTTP_POOL_SIZE)을 재사용해 keep-alive로 TLS 핸드셰이크를 줄입니다.
+    - ETag/Last-Modified가 있는 200 응답은 디스크(gzip)에 CRAWLER_HTTP_CACHE_TTL초 동안 보관하고,
+      다음 요청에 If-None-Match/If-Modified-Since를 보내 304면 보관한 본문을 돌려줍니다. (304를 받을 때마다 보관 기간 연장)
+    - 본문에서 만든 파싱 결과(기사 URL 목록, 기사 본문 등)를 extras로 함께 보관해 바뀌지 않은 페이지는 다시 파싱하지 않습니다.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = CRAWLER_HTTP_CACHE_DIR, ttl: float = CRAWLER_HTTP_CACHE_TTL,
+                 pool_size: int = CRAWLER_HTTP_POOL_SIZE):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.pool_size = max(1, pool_size)
+        self._sessions: Dict[str, requests.Session] = {}
+        self._sessions_lock = threading.Lock()
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._stats = {"requests": 0, "not_modified": 0, "stored": 0, "parse_reused": 0, "errors": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def session_for(self, url: str) -> requests.Session:
+        """URL 호스트의 공용 Session을 반환합니다. 처음 요청될 때 만듭니다."""
+        host = urlparse(url).netloc.lower()
+        with self._sessions_lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._sessions[host] = session
+            return session
+
+    def _cache_path(self, url: str) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, key[:2], f"{key}.gz")
+
+    def _lock_for(self, path: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(path, threading.Lock())
+
+    def _read_entry(self, path: Optional[str]) -> Optional[tuple]:
+        """(메타데이터, 본문)을 읽습니다. 없거나 보관 기간이 지났거나 읽을 수 없으면 None"""
+        if not path:
+            return None
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                return None
+            with gzip.open(path, "rb") as f:
+                meta = json.loads(f.readline().decode("utf-8"))
+                body = f.read()
+            return meta, body
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"크롤러 HTTP 캐시 파일 읽기 실패 ({path}): {e}")
+            return None
+
+    def _write_entry(self, path: str, meta: Dict[str, Any], body: bytes) -> None:
+        """임시 파일에 쓴 뒤 교체합니다."""
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with gzip.open(tmp_path, "wb", compresslevel=6) as f:
+                f.write(json.dumps(meta, ensure_ascii=False).encode("utf-8") + b"\n")
+                f.write(body)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"크롤러 HTTP 캐시 파일 저장 실패 ({path}): {e}")
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: float = 15,
+            verify: bool = True) -> FetchResponse:
+        """
+        url을 GET합니다. 보관한 응답이 있으면 조건부 요청을 보내고, 304면 보관한 본문을 반환합니다.
+        Raises:
+            requests.exceptions.RequestException: 네트워크 오류 또는 4xx/5xx 응답
+        """
+        path = self._cache_path(url)
+        entry = self._read_entry(path)
+        request_headers = dict(headers or {})
+        if entry:
+            meta = entry[0]
+            if meta.get("etag"):
+                request_headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                request_headers["If-Modified-Since"] = meta["last_modified"]
+        self._count("requests")
+        try:
+            response = self.session_for(url).get(url, headers=request_headers, timeout=timeout, verify=verify)
+            if response.status_code == 304 and entry:
+                meta, body = entry
+                self._count("not_modified")
+                try:
+                    os.utime(path)
+                except OSError:
+                    pass
+                logger.debug(f"Not modified (304): {url}")
+                return FetchResponse(url=url, status_code=304, content=body, encoding=meta.get("encoding"),
+                                     apparent_encoding=meta.get("apparent_encoding"), not_modified=True,
+                                     headers=dict(response.headers))
+            response.raise_for_status()
+        except requests.exceptions.RequestException:
+            self._count("errors")
+            raise
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        result = FetchResponse(url=url, status_code=response.status_code, content=response.content,
+                               encoding=response.encoding, apparent_encoding=response.apparent_encoding,
+                               headers=dict(response.headers))
+        if path and (etag or last_modified):
+            meta = {"url": url, "etag": etag, "last_modified": last_modified, "encoding": result.encoding,
+                    "apparent_encoding": result.apparent_encoding, "extras": {}}
+            with self._lock_for(path):
+                self._write_entry(path, meta, result.content)
+            self._count("stored")
+        return result
+
+    def get_extra(self, url: str, name: str, text: str) -> Any:
+        """
+        url의 보관 응답에 저장한 파싱 결과를 반환합니다.
+        text(이번에 파싱하려는 본문)가 저장할 때의 본문과 같을 때만 반환하고, 아니면 None을 반환합니다.
+        """
+        entry = self._read_entry(self._cache_path(url))
+        if not entry:
+            return None
+        stored = entry[0].get("extras", {}).get(name)
+        if not stored or stored.get("digest") != content_digest(text):
+            return None
+        self._count("parse_reused")
+        return stored.get("value")
+
+    def set_extra(self, url: str, name: str, text: str, value: Any) -> None:
+        """url의 보관 응답에 text에서 만든 파싱 결과(JSON 직렬화 가능)를 저장합니다. 보관 응답이 없으면 무시합니다."""
+        path = self._cache_path(url)
+        if not path:
+            return
+        with self._lock_for(path):
+            entry = self._read_entry(path)
+            if not entry:
+                return
+            meta, body = entry
+            meta.setdefault("extras", {})[name] = {"digest": content_digest(text), "value": value}
+            self._write_entry(path, meta, body)
+
+    def parse_once(self, url: str, name: str, text: str, parse) -> Any:
+        """보관한 파싱 결과가 있으면 반환하고, 없으면 parse(text)를 실행해 결과를 저장합니다. (None 결과는 저장하지 않음)"""
+        value = self.get_extra(url, name, text)
+        if value is not None:
+            return value
+        value = parse(text)
+        if value is not None:
+            self.set_extra(url, name, text, value)
+        return value
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._sessions_lock:
+            hosts = len(self._sessions)
+        with self._stats_lock:
+            return {"hosts": hosts, "cache_enabled": bool(self.cache_dir), **self._stats}
+
+
+# 프로세스 공용 HTTP 가져오기 계층
+_http_fetcher: Optional[HttpFetcher] = None
+_http_fetcher_lock = threading.Lock()
+
+
+def init_http_fetcher(cache_dir: Optional[str]) -> HttpFetcher:
+    """
+    공용 HttpFetcher를 cache_dir(None이면 디스크 캐시 없음)로 초기화합니다. 이미 존재하면 기존 인스턴스를 반환합니다.
+    앱 시작 시 app.root_path 기준 경로로 호출해 작업 디렉토리와 상관없이 같은 캐시를 사용합니다.
+    """
+    global _http_fetcher
+    with _http_fetcher_lock:
+        if _http_fetcher is None:
+            _http_fetcher = HttpFetcher(cache_dir=cache_dir)
+            logger.info(f"Crawler HTTP cache directory: {cache_dir}")
+        return _http_fetcher
+
+
+def get_http_fetcher() -> HttpFetcher:
+    """공용 HttpFetcher를 반환합니다. init_http_fetcher 전에 요청되면 기본 설정으로 만듭니다."""
+    global _http_fetcher
+    with _http_fetcher_lock:
+        if _http_fetcher is None:
+            _http_fetcher = HttpFetcher(cache_dir=CRAWLER_HTTP_CACHE_DIR if CRAWLER_HTTP_CACHE_ENABLED else None)
+        return _http_fetcher
+
+
+def get_http_fetcher_stats() -> Dict[str, Any]:
+    """호스트별 세션 수, 요청/304/저장/파싱 재사용/오류 횟수를 반환합니다."""
+    return get_http_fetcher().snapshot()
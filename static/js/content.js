@@ -108,12 +108,12 @@ document.addEventListener('DOMContentLoaded', function() {
             
             let apiUrl = '';
             if (payload.content_type === 'blog' || payload.content_type === 'email') {
-                apiUrl = '/content/generate_content';
+                apiUrl = '/content/jobs';
                 delete payload.cut_count;
                 delete payload.aspect_ratio_sns;
                 delete payload.other_requirements;
             } else if (payload.content_type === 'sns') {
-                apiUrl = '/content/generate-image';
+                apiUrl = '/content/jobs';
                 delete payload.blog_style;
                 delete payload.email_type;
                 delete payload.email_subject;
@@ -136,8 +136,22 @@ document.addEventListener('DOMContentLoaded', function() {
                     headers: { 'Content-Type': 'application/json' },
                     body: JSON.stringify(payload)
                 });
-                const responseData = await response.json();
-                if (response.ok) {
+                let responseData = await response.json();
+                let isSuccess = response.ok;
+                // 생성은 작업 큐에 등록되므로 완료될 때까지 작업 상태를 조회합니다.
+                // 텍스트는 생성 중인 부분 결과(result.partial)를 도착하는 대로 렌더링합니다.
+                if (response.status === 202 && responseData.status_url) {
+                    const renderPartial = (partialResult) => {
+                        if (!generatedContentDiv || !partialResult.content) return;
+                        generatedContentDiv.innerHTML = marked.parse(formatGeneratedText(partialResult.content));
+                        generatedContentDiv.style.display = 'block';
+                    };
+                    const pollIntervalMs = payload.content_type === 'sns' ? 1500 : 1000;
+                    const job = await waitForJob(responseData.status_url, pollIntervalMs, renderPartial);
+                    isSuccess = job.status === 'succeeded';
+                    responseData = isSuccess ? job.result : { error: job.error };
+                }
+                if (isSuccess) {
                     if (responseData.status === "info") {
                         showGuideMessage(responseData.message);
                         if (generatedContentDiv) generatedContentDiv.style.display = 'none';
@@ -210,7 +224,30 @@ document.addEventListener('DOMContentLoaded', function() {
     }
 });
 
-// --- 5. 안내 메시지(가이드) 모달 함수 ---
+// --- 5. 생성 텍스트 서식 함수 ---
+function formatGeneratedText(content) {
+    return content.replace(/(✔[^✔\n]*)(?= ✔)/g, '$1<br>');
+}
+
+// --- 6. 생성 작업 상태 조회(폴링) 함수 ---
+async function waitForJob(statusUrl, intervalMs = 1500, onPartial = null) {
+    while (true) {
+        const response = await fetch(statusUrl, { headers: { 'Accept': 'application/json' } });
+        const job = await response.json();
+        if (!response.ok) {
+            return { status: 'failed', error: job.error || '작업 상태를 확인할 수 없습니다.' };
+        }
+        if (job.status === 'succeeded' || job.status === 'failed') {
+            return job;
+        }
+        if (onPartial && job.result && job.result.partial) {
+            onPartial(job.result);
+        }
+        await new Promise(resolve => setTimeout(resolve, intervalMs));
+    }
+}
+
+// --- 7. 안내 메시지(가이드) 모달 함수 ---
 function showGuideMessage(message) {
     const modalBody = document.getElementById('guideModalBody');
     if (modalBody) {
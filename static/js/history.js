@@ -32,10 +32,15 @@ document.addEventListener('DOMContentLoaded', function() {
                 let iconChar = '📄';
                 if (item.content_type.includes('SNS')) iconChar = '📱';
                 if (item.content_type.includes('이메일')) iconChar = '✉️';
+                // 이미지가 있는 SNS 항목은 WebP 썸네일을 아이콘 자리에 표시합니다.
+                const thumbUrl = (item.image_variants && item.image_variants.length > 0) ? item.image_variants[0].thumb : null;
+                const iconHtml = thumbUrl
+                    ? `<img src="${thumbUrl}" alt="" loading="lazy" width="40" height="40" style="object-fit:cover; border-radius:8px;">`
+                    : `<span>${iconChar}</span>`;
                 const date = new Date(item.timestamp);
                 const formattedDate = `${date.getFullYear()}. ${String(date.getMonth() + 1).padStart(2, '0')}. ${String(date.getDate()).padStart(2, '0')}.`;
                 historyItem.innerHTML = `
-                    <div class="icon"><span>${iconChar}</span></div>
+                    <div class="icon">${iconHtml}</div>
                     <div class="content">
                         <p class="topic">${item.topic}</p>
                         <p class="meta">${item.content_type} &middot; ${item.industry}</p>
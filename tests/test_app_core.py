@@ -0,0 +1,411 @@
+import time
+import pytest
+import threading
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock
+from flask import Flask
+from extensions import db
+from models import User, GenerationJob
+from services.app_core.readiness import ServiceReadiness, ai_services_required
+from services.app_core.job_queue import GenerationJobQueue, report_job_progress
+from routes.health_routes import health_bp
+from services.app_core.app_factory_utils import init_request_metrics
+from services.utils.metrics import observe_stage
+from services.utils.llm_invoker import LLMCallUsage
+from services.content_service import create_text_content, aggregate_llm_usage
+
+
+class TestServiceReadiness:
+    """AI 서비스 준비 상태 테스트 클래스"""
+
+    def test_initial_state_is_pending(self):
+        """초기 상태 테스트"""
+        readiness = ServiceReadiness()
+        assert readiness.state == "pending"
+        assert readiness.is_ready is False
+        assert readiness.wait(timeout=0) is False
+
+    def test_wait_returns_when_ready(self):
+        """다른 스레드에서 준비 완료 시 대기 해제 테스트"""
+        readiness = ServiceReadiness()
+        readiness.mark_warming()
+        threading.Timer(0.05, readiness.mark_ready).start()
+
+        assert readiness.wait(timeout=2) is True
+        assert readiness.snapshot()["state"] == "ready"
+
+    def test_failed_state_releases_waiters(self):
+        """실패 시 대기자가 즉시 해제되는지 테스트"""
+        readiness = ServiceReadiness()
+        readiness.mark_warming()
+        readiness.mark_failed("boom")
+
+        assert readiness.wait(timeout=2) is False
+        assert readiness.snapshot()["error"] == "boom"
+
+
+class TestHealthRoutes:
+    """/healthz, /readyz 라우트 테스트 클래스"""
+
+    @pytest.fixture
+    def health_app(self):
+        """헬스 체크 블루프린트만 등록한 테스트 앱"""
+        app = Flask(__name__)
+        app.register_blueprint(health_bp)
+
+        @app.route('/generate')
+        @ai_services_required
+        def generate():
+            return "ok"
+
+        return app
+
+    def test_healthz_always_ok(self, health_app):
+        """liveness 체크 테스트"""
+        response = health_app.test_client().get('/healthz')
+        assert response.status_code == 200
+
+    def test_readyz_not_ready_while_warming(self, health_app):
+        """워밍업 중 readiness 503 테스트"""
+        readiness = ServiceReadiness()
+        readiness.mark_warming()
+        health_app.extensions['service_readiness'] = readiness
+
+        response = health_app.test_client().get('/readyz')
+        assert response.status_code == 503
+        assert response.json["state"] == "warming"
+        assert response.json["index_loaded"] is False
+
+    def test_readyz_reports_index_info(self, health_app):
+        """준비 완료 후 인덱스 정보 반환 테스트"""
+        readiness = ServiceReadiness()
+        readiness.mark_ready()
+        rag_system = Mock(is_index_loaded=True, index_generation=2, vector_count=42)
+        health_app.extensions['service_readiness'] = readiness
+        health_app.extensions['rag_system'] = rag_system
+
+        response = health_app.test_client().get('/readyz')
+        assert response.status_code == 200
+        assert response.json["index_generation"] == 2
+        assert response.json["vector_count"] == 42
+        assert "bedrock" not in response.json
+        assert "crawler_http" not in response.json
+
+    def test_metrics_exposes_stage_and_request_metrics(self, health_app):
+        """/metrics가 단계별 소요 시간과 엔드포인트별 요청 지표를 Prometheus 형식으로 반환하는지 테스트"""
+        init_request_metrics(health_app)
+        with pytest.raises(RuntimeError):
+            with observe_stage("test_stage"):
+                raise RuntimeError("boom")
+        client = health_app.test_client()
+        client.get('/healthz')
+
+        response = client.get('/metrics')
+        body = response.get_data(as_text=True)
+        assert response.status_code == 200
+        assert response.content_type.startswith("text/plain")
+        assert 'content_stage_duration_seconds_count{stage="test_stage"}' in body
+        assert 'content_stage_errors_total{stage="test_stage"}' in body
+        assert 'http_requests_total{endpoint="/healthz",method="GET",status="200"}' in body
+
+    def test_generation_route_returns_503_when_failed(self, health_app):
+        """워밍업 실패 시 생성 라우트 503 테스트"""
+        readiness = ServiceReadiness()
+        readiness.mark_failed("index load failed")
+        health_app.extensions['service_readiness'] = readiness
+
+        response = health_app.test_client().get('/generate')
+        assert response.status_code == 503
+
+
+class TestGenerationJobQueue:
+    """DB 기반 생성 작업 큐 테스트 클래스"""
+
+    @pytest.fixture
+    def job_app(self, tmp_path):
+        """SQLite DB를 사용하는 테스트 앱"""
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'jobs.db'}"
+        app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        db.init_app(app)
+        with app.app_context():
+            db.create_all()
+            user = User(username="jobuser", email="job@example.com")
+            user.set_password("password")
+            db.session.add(user)
+            db.session.commit()
+        return app
+
+    @pytest.fixture
+    def job_queue(self, job_app):
+        """텍스트 작업 핸들러를 등록한 작업 큐"""
+        job_queue = GenerationJobQueue(job_app, max_workers=2, poll_interval=0.05, stale_after=60, max_attempts=2)
+        job_queue.register_handler('text', lambda job: {"content": f"생성: {job.payload['topic']}"})
+        return job_queue
+
+    def _submit(self, job_app, job_queue, topic="AI 마케팅"):
+        with job_app.app_context():
+            return job_queue.submit(1, 'text', {"topic": topic}).id
+
+    def test_claim_is_exclusive(self, job_app, job_queue):
+        """한 작업은 한 번만 가져가는지 테스트"""
+        job_id = self._submit(job_app, job_queue)
+        with job_app.app_context():
+            assert job_queue._claim_next_job() == job_id
+            assert job_queue._claim_next_job() is None
+            job = db.session.get(GenerationJob, job_id)
+            assert job.status == "running"
+            assert job.attempts == 1
+
+    def test_run_job_records_result(self, job_app, job_queue):
+        """작업 성공 시 결과 기록 테스트"""
+        job_id = self._submit(job_app, job_queue)
+        with job_app.app_context():
+            job_queue._claim_next_job()
+        job_queue.run_job(job_id)
+
+        with job_app.app_context():
+            job = db.session.get(GenerationJob, job_id)
+            assert job.status == "succeeded"
+            assert job.result == {"content": "생성: AI 마케팅"}
+            assert job.finished_at is not None
+
+    def test_run_job_records_failure(self, job_app, job_queue):
+        """핸들러 예외 시 실패 기록 테스트"""
+        job_queue.register_handler('text', Mock(side_effect=RuntimeError("bedrock down")))
+        job_id = self._submit(job_app, job_queue)
+        with job_app.app_context():
+            job_queue._claim_next_job()
+        job_queue.run_job(job_id)
+
+        with job_app.app_context():
+            job = db.session.get(GenerationJob, job_id)
+            assert job.status == "failed"
+            assert job.error == "콘텐츠 생성 중 오류가 발생했습니다."
+
+    def test_report_job_progress_records_partial_result(self, job_app, job_queue):
+        """실행 중 중간 결과 기록 후 최종 결과로 교체되는지 테스트"""
+        job_id = self._submit(job_app, job_queue)
+        partial_results = []
+        def streaming_handler(job):
+            assert report_job_progress({"content": "생성 중", "partial": True}) is True
+            partial_results.append(db.session.query(GenerationJob.result).filter_by(id=job_id).scalar())
+            return {"content": "생성 완료"}
+        job_queue.register_handler('text', streaming_handler)
+        with job_app.app_context():
+            job_queue._claim_next_job()
+        job_queue.run_job(job_id)
+
+        assert partial_results == [{"content": "생성 중", "partial": True}]
+        with job_app.app_context():
+            job = db.session.get(GenerationJob, job_id)
+            assert job.status == "succeeded"
+            assert job.result == {"content": "생성 완료"}
+            # 작업 밖에서는 기록하지 않음
+            assert report_job_progress({"content": "무시"}) is False
+
+    def test_reclaimed_job_result_is_not_overwritten(self, job_app, job_queue):
+        """실행 중 복구되어 다시 가져간 작업은 이전 시도의 결과로 덮어쓰지 않는지 테스트"""
+        job_id = self._submit(job_app, job_queue)
+        def slow_handler(job):
+            # 실행 도중 하트비트가 끊긴 것으로 보고 복구된 뒤 다시 가져간 상황
+            with job_app.app_context():
+                reclaimed = db.session.get(GenerationJob, job_id)
+                reclaimed.status, reclaimed.worker_id = "queued", None
+                db.session.commit()
+                assert job_queue._claim_next_job() == job_id
+            return {"content": "이전 시도 결과"}
+        job_queue.register_handler('text', slow_handler)
+        with job_app.app_context():
+            job_queue._claim_next_job()
+        job_queue.run_job(job_id)
+
+        with job_app.app_context():
+            job = db.session.get(GenerationJob, job_id)
+            assert job.status == "running"
+            assert job.attempts == 2
+            assert job.result is None
+
+    def test_recover_stale_jobs(self, job_app, job_queue):
+        """중단된 running 작업 복구 테스트 (재시도 가능하면 queued, 아니면 failed)"""
+        retry_id = self._submit(job_app, job_queue, "재시도")
+        exhausted_id = self._submit(job_app, job_queue, "소진")
+        stale_time = datetime.now(timezone.utc) - timedelta(seconds=120)
+        with job_app.app_context():
+            for job_id, attempts in ((retry_id, 1), (exhausted_id, 2)):
+                job = db.session.get(GenerationJob, job_id)
+                job.status, job.started_at, job.heartbeat_at, job.attempts = "running", stale_time, stale_time, attempts
+            db.session.commit()
+
+            assert job_queue.recover_stale_jobs() == 2
+            assert db.session.get(GenerationJob, retry_id).status == "queued"
+            assert db.session.get(GenerationJob, retry_id).heartbeat_at is None
+            assert db.session.get(GenerationJob, exhausted_id).status == "failed"
+
+    def test_long_running_job_with_heartbeat_is_not_recovered(self, job_app, job_queue):
+        """started_at이 오래되어도 하트비트가 갱신되는 작업은 복구하지 않는지 테스트"""
+        job_id = self._submit(job_app, job_queue)
+        stale_time = datetime.now(timezone.utc) - timedelta(seconds=120)
+        with job_app.app_context():
+            assert job_queue._claim_next_job() == job_id
+            job = db.session.get(GenerationJob, job_id)
+            job.started_at, job.heartbeat_at = stale_time, stale_time
+            db.session.commit()
+            job_queue._running_ids.add(job_id)
+
+            assert job_queue.send_heartbeat() == 1
+            assert job_queue.recover_stale_jobs() == 0
+            db.session.expire_all()
+            assert db.session.get(GenerationJob, job_id).status == "running"
+
+    def test_workers_process_queued_jobs(self, job_app, job_queue):
+        """워커 풀이 대기 중인 작업을 처리하는지 테스트"""
+        job_ids = [self._submit(job_app, job_queue, f"주제 {i}") for i in range(3)]
+        job_queue.start()
+        try:
+            deadline = time.time() + 5
+            while time.time() < deadline:
+                with job_app.app_context():
+                    statuses = {db.session.get(GenerationJob, job_id).status for job_id in job_ids}
+                if statuses == {"succeeded"}:
+                    break
+                time.sleep(0.05)
+        finally:
+            job_queue.stop(timeout=2)
+        assert statuses == {"succeeded"}
+
+
+class TestLLMUsageAccounting:
+    """생성 결과별 LLM 토큰 사용량 저장/집계 테스트 클래스"""
+
+    @pytest.fixture
+    def usage_app(self, tmp_path):
+        """SQLite DB를 사용하는 테스트 앱"""
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'usage.db'}"
+        app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        db.init_app(app)
+        with app.app_context():
+            db.create_all()
+            for username in ("alice", "bob"):
+                user = User(username=username, email=f"{username}@example.com")
+                user.set_password("password")
+                db.session.add(user)
+            db.session.commit()
+        return app
+
+    def test_usage_is_saved_with_content_and_aggregated(self, usage_app):
+        """콘텐츠와 함께 저장한 사용량을 콘텐츠 종류/사용자별로 집계하는지 테스트"""
+        blog = {"topic": "AI 마케팅", "industry": "IT", "content_type": "blog"}
+        email = {"topic": "가을 세일", "industry": "패션", "content_type": "email"}
+        with usage_app.app_context():
+            create_text_content(1, "블로그", blog, [LLMCallUsage("claude", "long_form", 1000, 800, latency_ms=3000.0)])
+            create_text_content(1, "블로그", blog, [LLMCallUsage("claude", "long_form", 1200, 600, latency_ms=1000.0)])
+            content = create_text_content(2, "이메일", email, [LLMCallUsage("claude", "short_form", 300, 100, latency_ms=500.0)])
+            create_text_content(2, "캐시 적중", email)
+
+            assert [usage.route for usage in content.llm_usage] == ["short_form"]
+            by_type = {group["key"]: group for group in aggregate_llm_usage("content_type")}
+            assert by_type["blog"]["calls"] == 2
+            assert by_type["blog"]["input_tokens"] == 2200
+            assert by_type["blog"]["avg_output_tokens"] == 700.0
+            assert by_type["blog"]["avg_latency_ms"] == 2000.0
+            by_user = {group["username"]: group for group in aggregate_llm_usage("user")}
+            assert by_user["bob"]["output_tokens"] == 100
+            assert aggregate_llm_usage("industry", since=datetime.now(timezone.utc) + timedelta(days=1)) == []
+            with pytest.raises(ValueError):
+                aggregate_llm_usage("unknown")
+
+
+
+class TestImageDerivativeRoute:
+    """파생 이미지 라우트의 소유권 확인 테스트 클래스"""
+
+    @pytest.fixture
+    def image_app(self, tmp_path):
+        """로그인한 사용자와 이미지 참조 콘텐츠가 있는 테스트 앱"""
+        from flask_login import LoginManager
+        from models import Content
+        from routes.content_routes import content_bp
+        app = Flask(__name__)
+        app.config['SECRET_KEY'] = 'test'
+        app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'images.db'}"
+        app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        db.init_app(app)
+        login_manager = LoginManager(app)
+        login_manager.user_loader(lambda user_id: db.session.get(User, int(user_id)))
+        app.register_blueprint(content_bp, url_prefix='/content')
+        store = Mock()
+        store.get_or_create.side_effect = FileNotFoundError("no source")
+        app.extensions['image_derivative_store'] = store
+        with app.app_context():
+            db.create_all()
+            user = User(username="imageuser", email="image@example.com")
+            user.set_password("password")
+            db.session.add(user)
+            db.session.flush()
+            db.session.add(Content(user_id=user.id, topic="AI", industry="IT", content_type="sns",
+                                   generated_image_url="generated-images/sns_image_abc.png"))
+            db.session.commit()
+        return app
+
+    def _client(self, image_app):
+        client = image_app.test_client()
+        with client.session_transaction() as session:
+            session['_user_id'] = '1'
+            session['_fresh'] = True
+        return client
+
+    def test_partial_image_ref_is_rejected(self, image_app):
+        """저장된 참조의 일부 문자열만 일치하는 요청은 원본을 읽지 않고 404인지 테스트"""
+        client = self._client(image_app)
+        store = image_app.extensions['image_derivative_store']
+
+        for partial_ref in ("generated-images/sns_image_", "abc.png", "generated-images/sns_image_a%25"):
+            assert client.get(f'/content/images/thumb/{partial_ref}').status_code == 404
+        store.get_or_create.assert_not_called()
+
+        assert client.get('/content/images/thumb/generated-images/sns_image_abc.png').status_code == 404
+        assert store.get_or_create.call_args[0][:2] == ("generated-images/sns_image_abc.png", "thumb")
+
+
+class TestAdminDiagnostics:
+    """/admin/diagnostics 관리자 전용 운영 지표 테스트 클래스"""
+
+    @pytest.fixture
+    def admin_app(self, tmp_path):
+        """관리자와 일반 사용자가 있는 테스트 앱"""
+        from flask_login import LoginManager
+        from routes.admin_routes import admin_bp
+        app = Flask(__name__)
+        app.config['SECRET_KEY'] = 'test'
+        app.config['ADMIN_USERNAME'] = 'admin'
+        app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'admin.db'}"
+        app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        db.init_app(app)
+        login_manager = LoginManager(app)
+        login_manager.user_loader(lambda user_id: db.session.get(User, int(user_id)))
+        app.register_blueprint(admin_bp, url_prefix='/admin')
+        with app.app_context():
+            db.create_all()
+            for username in ("admin", "member"):
+                user = User(username=username, email=f"{username}@example.com")
+                user.set_password("password")
+                db.session.add(user)
+            db.session.commit()
+        return app
+
+    def _get(self, admin_app, user_id):
+        client = admin_app.test_client()
+        with client.session_transaction() as session:
+            session['_user_id'] = str(user_id)
+            session['_fresh'] = True
+        return client.get('/admin/diagnostics')
+
+    def test_diagnostics_require_admin(self, admin_app):
+        """관리자에게만 지표를 반환하는지 테스트"""
+        assert self._get(admin_app, 2).status_code == 403
+
+        response = self._get(admin_app, 1)
+        assert response.status_code == 200
+        assert {"bedrock", "circuits", "single_flight", "crawler_http", "crawler_strategies"} <= set(response.json)
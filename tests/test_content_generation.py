@@ -1,8 +1,30 @@
+import os
+import json
+import time
 import pytest
+import threading
+import numpy as np
 from unittest.mock import Mock, patch, MagicMock
 from services.generation.text_generator import TextGenerator, TextGenerationInput, TextGenerationError
 from services.generation.image_generator import ImageGenerator, ImageGenerationInput, ImageGenerationError
 from services.generation.translation_generator import TranslationGenerator, TranslationPromptInput, TranslationPromptError
+from services.generation.context_builder import ContextBuilder, count_tokens
+from services.generation.response_cache import TextResponseCache, canonicalize_request
+from services.generation.translation_cache import TranslationCache
+from services.generation.image_storage import resolve_image_urls
+from services.generation.image_derivatives import ImageDerivativeStore
+from services.utils.llm_invoker import (
+    BedrockClaudeProvider, ModelRouter, parse_model_routes, get_llm_usage_stats, collect_llm_usage
+)
+from services.utils.bedrock_gateway import BedrockGateway, BedrockCapacityError, get_bedrock_call_stats
+from services.utils.rate_limiter import (
+    BedrockRateLimiter, InMemoryTokenBucketStore, SqliteTokenBucketStore, ModelQuota, RateLimitTimeout,
+    rate_limit_priority, parse_model_quotas, PRIORITY_BATCH
+)
+from services.utils.resilience import ResilientInvoker, CircuitBreaker, CircuitOpenError, DeadlineExceeded
+from services.utils.single_flight import SingleFlight
+from services.utils.prompt_manager import PromptManager, PromptTemplateRegistry, CompiledTemplate, SplitPrompt
+from botocore.exceptions import ClientError
 
 
 class TestTextGenerator:
@@ -41,7 +63,7 @@ class TestTextGenerator:
         # Mock 설정
         mock_provider = Mock()
         mock_provider.invoke.return_value = "생성된 텍스트 콘텐츠"
-        text_generator.provider_instances = {"text": mock_provider}
+        text_generator.provider_instances = {"long_form": mock_provider}
 
         # 테스트 입력 데이터
         input_data = TextGenerationInput(
@@ -84,6 +106,534 @@ class TestTextGenerator:
         assert "AI 마케팅" in call_args[0][0]
         assert "IT" in call_args[0][0]
 
+    def test_generate_content_stream_yields_deltas(self, text_generator):
+        """스트리밍 생성 시 텍스트 조각을 순서대로 반환하는지 테스트"""
+        mock_provider = Mock()
+        mock_provider.invoke_stream.return_value = iter(["안녕", "하세요"])
+        text_generator.provider_instances = {"long_form": mock_provider}
+
+        input_data = TextGenerationInput(topic="AI 마케팅", industry="IT", content_type="blog")
+        result = list(text_generator.generate_content_stream(input_data))
+
+        assert result == ["안녕", "하세요"]
+        mock_provider.invoke.assert_not_called()
+
+
+    def test_generate_content_uses_response_cache(self, text_generator, mock_rag_system):
+        """같은 사용자의 동일 요청은 캐시에서 반환하는지 테스트"""
+        mock_provider = Mock()
+        mock_provider.invoke.return_value = "생성된 텍스트 콘텐츠"
+        text_generator.provider_instances = {"long_form": mock_provider}
+        text_generator.response_cache = TextResponseCache(ttl_seconds=60, similarity_threshold=None)
+        mock_rag_system.index_generation = 1
+
+        first = text_generator.generate_content_result(TextGenerationInput(topic="AI 마케팅", industry="IT", content_type="blog"), user_id=1)
+        second = text_generator.generate_content_result(TextGenerationInput(topic=" ai  마케팅 ", industry="IT", content_type="blog"), user_id=1)
+        other_user = text_generator.generate_content_result(TextGenerationInput(topic="AI 마케팅", industry="IT", content_type="blog"), user_id=2)
+
+        assert first.cache_source is None
+        assert second.cache_source == "exact"
+        assert second.text == "생성된 텍스트 콘텐츠"
+        assert other_user.cache_source is None
+        assert mock_provider.invoke.call_count == 2
+
+
+    def test_generate_batch_dedupes_and_runs_concurrently(self, text_generator, mock_rag_system):
+        """일괄 생성 시 같은 요청은 한 번만 생성하고, 검색은 한 번에, LLM 호출은 병렬로 수행하는지 테스트"""
+        barrier = threading.Barrier(2, timeout=5)
+        mock_provider = Mock(model_id="claude-3-sonnet")
+        def invoke(prompt, **kwargs):
+            barrier.wait()  # 두 호출이 동시에 실행되어야 통과합니다.
+            return "생성된 텍스트"
+        mock_provider.invoke.side_effect = invoke
+        text_generator.provider_instances = {"long_form": mock_provider}
+        mock_rag_system.retrieve_many.side_effect = lambda queries, k: [["관련 문서"] for _ in queries]
+        inputs = [
+            TextGenerationInput(topic="AI 마케팅", industry="IT", content_type="blog"),
+            TextGenerationInput(topic="신제품 출시", industry="IT", content_type="blog"),
+            TextGenerationInput(topic=" ai  마케팅 ", industry="IT", content_type="blog"),
+        ]
+
+        results = sorted(text_generator.generate_batch(inputs, user_id=1), key=lambda item: item.index)
+
+        assert [item.index for item in results] == [0, 1, 2]
+        assert all(item.error is None and item.result.text == "생성된 텍스트" for item in results)
+        assert mock_provider.invoke.call_count == 2
+        mock_rag_system.retrieve_many.assert_called_once()
+        mock_rag_system.retrieve.assert_not_called()
+
+
+    def test_generate_batch_close_cancels_pending_calls(self, text_generator, mock_rag_system):
+        """일괄 생성기를 중간에 닫으면 실행 중인 호출을 기다리지 않고 대기 중인 호출은 취소하는지 테스트"""
+        second_started, release = threading.Event(), threading.Event()
+        mock_provider = Mock(model_id="claude-3-sonnet")
+        def invoke(prompt, **kwargs):
+            if mock_provider.invoke.call_count == 2:
+                second_started.set()
+                release.wait(5)
+            return "생성된 텍스트"
+        mock_provider.invoke.side_effect = invoke
+        text_generator.provider_instances = {"long_form": mock_provider}
+        mock_rag_system.retrieve_many.side_effect = lambda queries, k: [["관련 문서"] for _ in queries]
+        inputs = [TextGenerationInput(topic=f"주제 {i}", industry="IT", content_type="blog") for i in range(3)]
+
+        with patch('services.generation.text_generator.get_model_concurrency', return_value=1):
+            batch = text_generator.generate_batch(inputs, user_id=1)
+            first = next(batch)
+            assert second_started.wait(5)
+            started = time.perf_counter()
+            batch.close()
+            elapsed = time.perf_counter() - started
+        release.set()
+        time.sleep(0.1)
+
+        assert first.error is None
+        assert elapsed < 1
+        assert mock_provider.invoke.call_count == 2
+
+
+    def test_generate_content_without_rag_when_embedding_circuit_open(self, text_generator, mock_rag_system):
+        """임베딩 회로가 열려 있으면 RAG 검색 없이 생성하고 결과를 캐시하지 않는지 테스트"""
+        mock_provider = Mock()
+        mock_provider.invoke.return_value = "생성된 텍스트 콘텐츠"
+        text_generator.provider_instances = {"long_form": mock_provider}
+        text_generator.embedding_manager = Mock(is_degraded=True)
+        text_generator.response_cache = TextResponseCache(ttl_seconds=60, similarity_threshold=None)
+
+        result = text_generator.generate_content_result(TextGenerationInput(topic="AI 마케팅", industry="IT", content_type="blog"), user_id=1)
+
+        assert result.text == "생성된 텍스트 콘텐츠"
+        mock_rag_system.retrieve.assert_not_called()
+        assert text_generator.response_cache.snapshot()["entries"] == 0
+
+    def test_text_generation_coalesces_duplicate_requests(self, text_generator):
+        """같은 사용자의 중복 생성 요청은 LLM을 한 번만 호출하고 결과를 공유하는지 테스트"""
+        text_generator.single_flight = SingleFlight("test-text", enabled=True)
+        provider = Mock()
+        provider.invoke.side_effect = lambda **kwargs: time.sleep(0.2) or "생성된 블로그"
+        text_generator.provider_instances = {"long_form": provider}
+        input_data = TextGenerationInput(topic="AI 마케팅", industry="IT", content_type="blog")
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(text_generator.generate_content_result(input_data, user_id=1)))
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert provider.invoke.call_count == 1
+        assert [result.text for result in results] == ["생성된 블로그"] * 3
+        assert sorted(str(result.cache_source) for result in results) == ["None", "inflight", "inflight"]
+
+    def test_text_stream_coalesces_duplicate_requests(self, text_generator):
+        """같은 사용자의 중복 스트리밍 요청은 스트림을 한 번만 열고 모든 요청에 같은 조각을 전달하는지 테스트"""
+        text_generator.single_flight = SingleFlight("test-text-stream", enabled=True)
+        def stream(**kwargs):
+            for part in ("AI ", "마케팅 ", "블로그"):
+                time.sleep(0.05)
+                yield part
+        provider = Mock()
+        provider.invoke_stream.side_effect = stream
+        text_generator.provider_instances = {"long_form": provider}
+        input_data = TextGenerationInput(topic="AI 마케팅", industry="IT", content_type="blog")
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(list(text_generator.generate_content_stream(input_data, user_id=1))))
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert provider.invoke_stream.call_count == 1
+        assert results == [["AI ", "마케팅 ", "블로그"]] * 3
+
+
+class TestBedrockClaudeProvider:
+    """Claude Provider 테스트 클래스"""
+
+    def test_invoke_stream_parses_text_deltas(self):
+        """response-stream 이벤트에서 텍스트 델타만 추출하는지 테스트"""
+        events = [
+            {"chunk": {"bytes": b'{"type": "message_start", "message": {}}'}},
+            {"chunk": {"bytes": '{"type": "content_block_delta", "delta": {"type": "text_delta", "text": "AI "}}'.encode()}},
+            {"chunk": {"bytes": '{"type": "content_block_delta", "delta": {"type": "text_delta", "text": "마케팅"}}'.encode()}},
+            {"chunk": {"bytes": b'{"type": "message_stop"}'}},
+        ]
+        mock_client = Mock()
+        mock_client.invoke_model_with_response_stream.return_value = {"body": events}
+        provider = BedrockClaudeProvider(mock_client, "claude-3-sonnet")
+
+        result = list(provider.invoke_stream("프롬프트", max_tokens=100, temperature=0.5, top_p=0.9))
+
+        assert result == ["AI ", "마케팅"]
+
+    def test_invoke_stream_wraps_errors(self):
+        """스트리밍 호출 오류를 RuntimeError로 감싸는지 테스트"""
+        mock_client = Mock()
+        mock_client.invoke_model_with_response_stream.side_effect = Exception("throttled")
+        provider = BedrockClaudeProvider(mock_client, "claude-3-sonnet")
+
+        with pytest.raises(RuntimeError):
+            list(provider.invoke_stream("프롬프트", max_tokens=100, temperature=0.5, top_p=0.9))
+
+    def test_closed_stream_releases_half_open_trial(self):
+        """시험 호출 스트림을 끝까지 읽지 않고 닫아도(클라이언트 연결 종료) 다음 시험 호출이 허용되는지 테스트"""
+        events = [
+            {"chunk": {"bytes": '{"type": "content_block_delta", "delta": {"type": "text_delta", "text": "AI "}}'.encode()}},
+            {"chunk": {"bytes": b'{"type": "message_stop"}'}},
+        ]
+        mock_client = Mock()
+        mock_client.invoke_model_with_response_stream.side_effect = Exception("endpoint down")
+        provider = BedrockClaudeProvider(mock_client, "claude-test-stream-close")
+        provider.invoker.breaker = CircuitBreaker("claude-test-stream-close", failure_threshold=1, reset_timeout=0.0)
+        with pytest.raises(RuntimeError):
+            list(provider.invoke_stream("프롬프트", max_tokens=100, temperature=0.5, top_p=0.9))
+
+        mock_client.invoke_model_with_response_stream.side_effect = None
+        mock_client.invoke_model_with_response_stream.return_value = {"body": events}
+        stream = provider.invoke_stream("프롬프트", max_tokens=100, temperature=0.5, top_p=0.9)
+        assert next(stream) == "AI "
+        stream.close()
+
+        assert provider.invoker.breaker.state == "half_open"
+        assert provider.invoker.breaker.allow()
+
+    def test_split_prompt_uses_cached_system_prefix(self):
+        """지원 모델에서 고정 지침을 캐시 체크포인트가 있는 시스템 프롬프트로 보내고 캐시 사용량을 기록하는지 테스트"""
+        model_id = "anthropic.claude-3-7-sonnet-20250219-v1:0"
+        usage = {"input_tokens": 40, "output_tokens": 12, "cache_read_input_tokens": 1500, "cache_creation_input_tokens": 0}
+        mock_client = Mock()
+        mock_client.invoke_model.return_value = {
+            "body": Mock(read=Mock(return_value=json.dumps({"content": [{"text": "결과"}], "usage": usage}).encode()))
+        }
+        provider = BedrockClaudeProvider(mock_client, model_id)
+        before = get_llm_usage_stats().get(model_id, {}).get("cache_read_input_tokens", 0)
+
+        result = provider.invoke(SplitPrompt("고정 지침 {topic}", "<입력값>가을</입력값>"), max_tokens=100, temperature=0.5, top_p=0.9)
+
+        body = json.loads(mock_client.invoke_model.call_args.kwargs["body"])
+        assert result == "결과"
+        assert body["system"] == [{"type": "text", "text": "고정 지침 {topic}", "cache_control": {"type": "ephemeral"}}]
+        assert body["messages"][0]["content"][0]["text"] == "<입력값>가을</입력값>"
+        assert get_llm_usage_stats()[model_id]["cache_read_input_tokens"] == before + 1500
+
+    def test_unsupported_model_sends_plain_prompt(self):
+        """캐시 미지원 모델에는 cache_control 없이 요청하는지 테스트"""
+        provider = BedrockClaudeProvider(Mock(), "anthropic.claude-3-sonnet-20240229-v1:0")
+        body = json.loads(provider._build_request_body(SplitPrompt("지침", "입력"), 100, 0.5, 0.9))
+        assert "cache_control" not in body["system"][0]
+        body = json.loads(provider._build_request_body("프롬프트", 100, 0.5, 0.9))
+        assert "system" not in body
+
+
+class TestModelRouter:
+    """작업 유형별 LLM 라우팅 테스트 클래스"""
+
+    def test_routes_use_tier_model_and_settings(self):
+        """번역 경로는 fast 티어 모델과 경로별 max_tokens로 호출하고 경로별 지표를 기록하는지 테스트"""
+        mock_client = Mock()
+        mock_client.invoke_model.return_value = {
+            "body": Mock(read=Mock(return_value=json.dumps({"content": [{"text": "ok"}]}).encode()))
+        }
+        router = ModelRouter(mock_client, {"standard": "claude-big", "fast": "claude-small"})
+
+        translation = router.provider("translation")
+        assert translation.invoke("번역해 주세요") == "ok"
+
+        call = mock_client.invoke_model.call_args.kwargs
+        assert call["modelId"] == "claude-small"
+        assert json.loads(call["body"])["max_tokens"] == router.routes["translation"].max_tokens
+        assert router.provider("long_form").model_id == "claude-big"
+        assert router.snapshot()["translation"]["calls"] == 1
+        with pytest.raises(ValueError):
+            router.provider("unknown")
+
+    def test_route_overrides(self):
+        """덮어쓰기 문자열에서 비운 값은 기본값을 유지하는지 테스트"""
+        routes = parse_model_routes("translation=standard::15, short_form=:800:")
+        assert routes["translation"].tier == "standard"
+        assert routes["translation"].timeout == 15.0
+        assert routes["short_form"].max_tokens == 800
+        assert routes["short_form"].tier == "standard"
+
+    def test_collect_llm_usage_records_route_and_tokens(self):
+        """collect_llm_usage 블록 안의 호출별 토큰 사용량과 경로 이름을 모으는지 테스트"""
+        usage = {"input_tokens": 120, "output_tokens": 30}
+        mock_client = Mock()
+        mock_client.invoke_model.return_value = {
+            "body": Mock(read=Mock(return_value=json.dumps({"content": [{"text": "ok"}], "usage": usage}).encode()))
+        }
+        router = ModelRouter(mock_client, {"standard": "claude-big", "fast": "claude-small"})
+
+        with collect_llm_usage() as collected:
+            router.provider("translation").invoke("번역해 주세요")
+        router.provider("translation").invoke("블록 밖 호출")
+
+        assert len(collected) == 1
+        assert collected[0].model_id == "claude-small"
+        assert collected[0].route == "translation"
+        assert (collected[0].input_tokens, collected[0].output_tokens) == (120, 30)
+        assert collected[0].latency_ms >= 0
+
+
+class TestBedrockGateway:
+    """Bedrock 공용 호출 계층 테스트 클래스"""
+
+    def test_invoke_model_respects_model_concurrency(self):
+        """모델별 동시 호출 상한을 넘지 않고 호출 지표를 집계하는지 테스트"""
+        model_id = "test-gateway-limit"
+        active = {"now": 0, "max": 0}
+        lock = threading.Lock()
+        def invoke_model(**kwargs):
+            with lock:
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+            time.sleep(0.05)
+            with lock:
+                active["now"] -= 1
+            return {"body": None}
+        client = Mock()
+        client.invoke_model.side_effect = invoke_model
+        gateway = BedrockGateway(client)
+
+        with patch.dict('services.utils.bedrock_gateway.BEDROCK_MODEL_CONCURRENCY', {model_id: 2}):
+            threads = [threading.Thread(target=gateway.invoke_model, kwargs={"modelId": model_id}) for _ in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        stats = get_bedrock_call_stats()[model_id]
+        assert active["max"] == 2
+        assert stats["calls"] == 5
+        assert stats["in_flight"] == 0
+        assert stats["max_concurrency"] == 2
+
+    def test_invoke_model_counts_throttles_and_capacity_timeouts(self):
+        """스로틀링 오류와 호출 슬롯 대기 시간 초과를 집계하는지 테스트"""
+        model_id = "test-gateway-throttle"
+        client = Mock()
+        client.invoke_model.side_effect = ClientError(
+            {"Error": {"Code": "ThrottlingException", "Message": "Too many requests"}}, "InvokeModel"
+        )
+        gateway = BedrockGateway(client, acquire_timeout=0.01)
+
+        with pytest.raises(ClientError):
+            gateway.invoke_model(modelId=model_id)
+        with patch.dict('services.utils.bedrock_gateway.BEDROCK_MODEL_CONCURRENCY', {"test-gateway-busy": 1}):
+            client.invoke_model_with_response_stream.return_value = {"body": iter([{"chunk": {}}])}
+            response = gateway.invoke_model_with_response_stream(modelId="test-gateway-busy")
+            with pytest.raises(BedrockCapacityError):
+                gateway.invoke_model(modelId="test-gateway-busy")
+            list(response["body"])  # 스트림을 다 읽으면 슬롯이 반환됩니다.
+            client.invoke_model.side_effect = None
+            gateway.invoke_model(modelId="test-gateway-busy")
+
+        stats = get_bedrock_call_stats()
+        assert stats[model_id]["throttles"] == 1
+        assert stats[model_id]["in_flight"] == 0
+        assert stats["test-gateway-busy"]["capacity_timeouts"] == 1
+        assert stats["test-gateway-busy"]["in_flight"] == 0
+
+    def test_rate_limit_wait_is_outside_call_deadline(self):
+        """호출 한도 대기 시간은 데드라인과 회로 차단기 실패에 포함되지 않고, 미리 얻은 슬롯을 실제 호출이 사용하는지 테스트"""
+        model_id = "test-gateway-admission"
+        rate_limiter = Mock()
+        rate_limiter.acquire_for_request.side_effect = lambda *args, **kwargs: time.sleep(0.2)
+        body = Mock()
+        body.read.return_value = b'{"content": [{"text": "ok"}], "usage": {}}'
+        client = Mock()
+        client.invoke_model.return_value = {"body": body}
+        gateway = BedrockGateway(client, acquire_timeout=0.01, rate_limiter=rate_limiter)
+        provider = BedrockClaudeProvider(gateway, model_id)
+
+        with patch.dict('services.utils.bedrock_gateway.BEDROCK_MODEL_CONCURRENCY', {model_id: 1}):
+            assert provider.invoke("프롬프트", max_tokens=10, temperature=0.5, top_p=0.9, timeout=0.1) == "ok"
+            with gateway.reserve(model_id):
+                pass  # 호출하지 않고 나가면 슬롯을 반환합니다.
+            gateway.invoke_model(modelId=model_id, body=b"{}")
+
+        assert rate_limiter.acquire_for_request.call_count == 3
+        assert provider.invoker.breaker.consecutive_failures == 0
+        assert provider.invoker.deadline_exceeded == 0
+        assert get_bedrock_call_stats()[model_id]["in_flight"] == 0
+
+
+class TestBedrockRateLimiter:
+    """Bedrock 계정 한도 제한기 테스트 클래스"""
+
+    def test_parse_model_quotas(self):
+        """모델ID(콜론 포함)=RPM:TPM 형식을 파싱하는지 테스트"""
+        quotas = parse_model_quotas("anthropic.claude-v2:1=50:200000, amazon.titan-embed-text-v2:0=2000:")
+        assert quotas["anthropic.claude-v2:1"] == ModelQuota(50, 200000)
+        assert quotas["amazon.titan-embed-text-v2:0"] == ModelQuota(2000, None)
+
+    def test_batch_leaves_reserve_for_interactive(self):
+        """batch 호출은 예약분을 남기고 대기하며, interactive 호출은 예약분을 사용할 수 있는지 테스트"""
+        limiter = BedrockRateLimiter(
+            InMemoryTokenBucketStore(), {"model": ModelQuota(requests_per_minute=10)},
+            reserve_fraction=0.3, wait_timeouts={"interactive": 0.01, "batch": 0.01}
+        )
+        with rate_limit_priority(PRIORITY_BATCH):
+            for _ in range(7):
+                limiter.acquire("model")
+            with pytest.raises(RateLimitTimeout):
+                limiter.acquire("model")
+        for _ in range(3):
+            limiter.acquire("model")
+        with pytest.raises(RateLimitTimeout):
+            limiter.acquire("model")
+        assert limiter.acquire("unlimited-model") == 0.0
+
+    def test_sqlite_store_is_shared_and_atomic_across_buckets(self, tmp_path):
+        """SQLite 저장소를 여러 인스턴스가 공유하고, 토큰이 부족하면 요청 버킷도 차감하지 않는지 테스트"""
+        db_path = str(tmp_path / "buckets.sqlite3")
+        quotas = {"model": ModelQuota(requests_per_minute=2, tokens_per_minute=100)}
+        worker_a = BedrockRateLimiter(SqliteTokenBucketStore(db_path), quotas, wait_timeouts={"interactive": 0.01})
+        worker_b = BedrockRateLimiter(SqliteTokenBucketStore(db_path), quotas, wait_timeouts={"interactive": 0.01})
+
+        worker_a.acquire("model", tokens=90)
+        with pytest.raises(RateLimitTimeout):
+            worker_b.acquire("model", tokens=50)  # 토큰 부족 → 요청 버킷도 그대로
+        worker_b.acquire("model", tokens=5)
+        with pytest.raises(RateLimitTimeout):
+            worker_a.acquire("model", tokens=1)  # 분당 요청 2건 소진
+
+    def test_app_init_resolves_bucket_path_against_root_path(self, tmp_path):
+        """앱 초기화 시 토큰 버킷 파일이 작업 디렉토리가 아닌 app.root_path 기준인지 테스트"""
+        from flask import Flask
+        from services.app_core.app_factory_utils import init_bedrock_rate_limiter
+        from services.utils.constants import BEDROCK_RATE_LIMIT_PATH
+        app = Flask(__name__, root_path=str(tmp_path))
+        with patch('services.app_core.app_factory_utils.create_bedrock_rate_limiter', return_value=None) as create:
+            init_bedrock_rate_limiter(app)
+
+        create.assert_called_once_with(db_path=os.path.join(str(tmp_path), BEDROCK_RATE_LIMIT_PATH))
+
+
+class TestResilientInvoker:
+    """데드라인/헤징/회로 차단기 호출 래퍼 테스트 클래스"""
+
+    def test_deadline_exceeded_fails_fast(self):
+        """데드라인을 넘긴 호출은 끝까지 기다리지 않고 실패하는지 테스트"""
+        invoker = ResilientInvoker("test-deadline", timeout=0.05)
+        started = time.monotonic()
+        with pytest.raises(DeadlineExceeded):
+            invoker.call(time.sleep, 0.5)
+        assert time.monotonic() - started < 0.4
+        assert invoker.deadline_exceeded == 1
+
+    def test_hedged_call_returns_faster_response(self):
+        """첫 호출이 느리면 두 번째 요청을 보내 먼저 끝난 결과를 사용하는지 테스트"""
+        calls = {"count": 0}
+        lock = threading.Lock()
+        def embed():
+            with lock:
+                calls["count"] += 1
+                attempt = calls["count"]
+            if attempt == 1:
+                time.sleep(1.0)
+                return "slow"
+            return "fast"
+        invoker = ResilientInvoker("test-hedge", timeout=2.0, hedge=True, hedge_min_delay=0.05)
+
+        started = time.monotonic()
+        assert invoker.call(embed) == "fast"
+        assert time.monotonic() - started < 0.5
+        assert invoker.hedged == 1
+
+    def test_circuit_opens_and_recovers(self):
+        """연속 실패 시 회로가 열려 즉시 실패하고, 대기 후 시험 호출이 성공하면 닫히는지 테스트"""
+        breaker = CircuitBreaker("test-circuit", failure_threshold=2, reset_timeout=0.05)
+        invoker = ResilientInvoker("test-circuit", timeout=None, breaker=breaker)
+        failing = Mock(side_effect=RuntimeError("endpoint down"))
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                invoker.call(failing)
+
+        with pytest.raises(CircuitOpenError):
+            invoker.call(failing)
+        assert failing.call_count == 2
+        assert breaker.is_open
+
+        time.sleep(0.06)
+        assert invoker.call(lambda: "ok") == "ok"
+        assert breaker.state == "closed"
+
+    def test_stuck_trial_times_out(self):
+        """결과가 기록되지 않은 시험 호출은 trial_timeout 뒤 새 시험 호출로 대체되는지 테스트"""
+        breaker = CircuitBreaker("test-trial-timeout", failure_threshold=1, reset_timeout=0.0, trial_timeout=0.05)
+        breaker.record_failure()
+        assert breaker.allow()
+        assert not breaker.allow()
+        time.sleep(0.06)
+        assert breaker.allow()
+
+    def test_client_errors_do_not_open_circuit(self):
+        """잘못된 요청(4xx) 오류는 회로 차단기 실패로 집계하지 않는지 테스트"""
+        invoker = ResilientInvoker("test-validation", timeout=None, breaker=CircuitBreaker("test-validation", failure_threshold=1))
+        error = ClientError({"Error": {"Code": "ValidationException"}, "ResponseMetadata": {"HTTPStatusCode": 400}}, "InvokeModel")
+        with pytest.raises(ClientError):
+            invoker.call(Mock(side_effect=error))
+        assert not invoker.breaker.is_open
+
+
+class TestPromptTemplateRegistry:
+    """컴파일된 프롬프트 템플릿 레지스트리 테스트 클래스"""
+
+    def test_compiled_render_matches_str_format(self):
+        """미리 분해한 템플릿의 렌더링 결과가 str.format과 같은지 테스트"""
+        source = "# {topic}\n{{고정 괄호}} {industry!r} - {count:>3}\n{topic} 끝"
+        variables = {"topic": "가을 세일", "industry": "Fashion", "count": 7}
+        compiled = CompiledTemplate("sample", source)
+        assert compiled.render(variables) == source.format(**variables)
+        assert compiled.fields == ["topic", "industry", "count"]
+        with pytest.raises(KeyError):
+            compiled.render({"topic": "x"})
+
+    def test_render_split_keeps_prefix_stable(self):
+        """입력값이 달라도 고정 지침(prefix)은 같고, 입력값은 필드별로 한 번씩만 들어가는지 테스트"""
+        compiled = CompiledTemplate("sample", "주제 {topic}, 다시 {topic} / {tone}")
+        first = compiled.render_split({"topic": "가을", "tone": "친근"})
+        second = compiled.render_split({"topic": "겨울", "tone": "격식"})
+        assert first.prefix == second.prefix == "주제 {topic}, 다시 {topic} / {tone}"
+        assert first.suffix.count("가을") == 1
+        assert "<tone>\n친근\n</tone>" in first.suffix
+
+    def test_reloads_changed_template(self, tmp_path):
+        """수정 시각이 바뀐 템플릿만 다시 컴파일해 반영하는지 테스트"""
+        template_path = tmp_path / "blog_list.md"
+        template_path.write_text("v1 {topic}", encoding="utf-8")
+        (tmp_path / "email_newsletter.md").write_text("메일 {topic}", encoding="utf-8")
+        registry = PromptTemplateRegistry(str(tmp_path), reload_interval=0)
+        assert registry.render("blog_list", {"topic": "A"}) == "v1 A"
+
+        template_path.write_text("v2 {topic}!", encoding="utf-8")
+        stat = template_path.stat()
+        os.utime(template_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert registry.render("blog_list", {"topic": "A"}) == "v2 A!"
+
+        snapshot = registry.snapshot()
+        assert snapshot["templates"] == 2
+        assert snapshot["reloads"] == 1
+        assert snapshot["renders"]["blog_list"]["count"] == 2
+        with pytest.raises(ValueError):
+            registry.render("missing", {})
+
+    def test_prompt_managers_share_registry(self, tmp_path):
+        """같은 디렉토리의 PromptManager들이 템플릿을 한 번만 로드해 공유하는지 테스트"""
+        (tmp_path / "translate_to_english.md").write_text("Translate: {topic} ({brand_style_tone})", encoding="utf-8")
+        first = PromptManager(str(tmp_path), "")
+        second = PromptManager(str(tmp_path), "")
+        assert first.registry is second.registry
+        assert second.generate_translate_prompt(topic="가을", brand_style_tone="친근한") == "Translate: 가을 (친근한)"
+
 
 class TestImageGenerator:
     """이미지 생성기 테스트 클래스"""
@@ -151,6 +701,95 @@ class TestImageGenerator:
             image_generator.create_image(input_data)
 
 
+    def test_generate_images_runs_cuts_concurrently_in_order(self, image_generator, mock_bedrock_client):
+        """여러 컷 동시 생성 및 컷 순서 유지 테스트"""
+        barrier = threading.Barrier(3, timeout=2)
+
+        def invoke_model(**kwargs):
+            # 세 컷이 모두 동시에 호출 중이어야 barrier를 통과합니다.
+            barrier.wait()
+            response = Mock()
+            response.get.return_value.read.return_value = json.dumps({"images": ["aW1n"]})
+            return response
+
+        mock_bedrock_client.invoke_model.side_effect = invoke_model
+        saved_urls = iter(["/content/generated_images/1.png", "/content/generated_images/2.png", "/content/generated_images/3.png"])
+        with patch.object(image_generator, '_save_image_to_file', side_effect=lambda _: next(saved_urls)):
+            result = image_generator.generate_images(ImageGenerationInput(topic="AI 마케팅 이미지", cut_count=3))
+
+        assert len(result.image_urls) == 3
+        assert result.failed_cuts == []
+        assert mock_bedrock_client.invoke_model.call_count == 3
+
+    def test_generate_images_reports_partial_failure(self, image_generator, mock_bedrock_client):
+        """일부 컷 실패 시 성공한 컷과 실패한 컷 번호 반환 테스트"""
+        calls = {"count": 0}
+        lock = threading.Lock()
+
+        def invoke_model(**kwargs):
+            with lock:
+                calls["count"] += 1
+                if calls["count"] == 1:
+                    raise RuntimeError("throttled")
+            response = Mock()
+            response.get.return_value.read.return_value = json.dumps({"images": ["aW1n"]})
+            return response
+
+        mock_bedrock_client.invoke_model.side_effect = invoke_model
+        with patch.object(image_generator, '_save_image_to_file', return_value="/content/generated_images/ok.png"), \
+                patch('services.generation.image_generator.get_model_concurrency', return_value=2):
+            result = image_generator.generate_images(ImageGenerationInput(topic="AI 마케팅 이미지", cut_count=2))
+
+        assert result.is_partial
+        assert result.image_urls == ["/content/generated_images/ok.png"]
+        assert len(result.failed_cuts) == 1
+
+
+    def test_generate_images_uploads_to_s3(self, mock_prompt_manager, mock_bedrock_client, mock_s3_client):
+        """S3 설정 시 이미지 업로드 후 객체 키를 저장하고 presigned URL을 반환하는지 테스트"""
+        mock_response = Mock()
+        mock_response.get.return_value.read.return_value = json.dumps({"images": ["aW1n"]})
+        mock_bedrock_client.invoke_model.return_value = mock_response
+        mock_s3_client.generate_presigned_url.side_effect = lambda op, Params, ExpiresIn: f"https://s3.example.com/{Params['Key']}?sig"
+        image_generator = ImageGenerator(mock_prompt_manager, mock_bedrock_client, mock_s3_client, "stable-diffusion", "test-bucket")
+
+        with patch.object(image_generator, '_save_image_to_file') as mock_save:
+            result = image_generator.generate_images(ImageGenerationInput(topic="AI 마케팅 이미지", cut_count=1))
+
+        mock_save.assert_not_called()
+        mock_s3_client.upload_fileobj.assert_called_once()
+        assert result.image_refs[0].startswith("generated-images/sns_image_")
+        assert result.image_urls == [f"https://s3.example.com/{result.image_refs[0]}?sig"]
+
+    def test_resolve_image_urls_keeps_legacy_local_urls(self, mock_s3_client):
+        """저장된 S3 키는 presigned URL로, 이전 로컬 URL은 그대로 반환하는지 테스트"""
+        mock_s3_client.generate_presigned_url.return_value = "https://s3.example.com/signed"
+        stored = "/content/generated_images/old.png, generated-images/sns_image_new.png"
+
+        urls = resolve_image_urls(stored, mock_s3_client, "test-bucket")
+
+        assert urls == ["/content/generated_images/old.png", "https://s3.example.com/signed"]
+
+    def test_image_derivative_created_once_as_webp(self, tmp_path):
+        """파생 이미지가 처음 한 번만 WebP로 생성되고 지정 너비 이하로 축소되는지 테스트"""
+        from PIL import Image
+        import io
+        source = io.BytesIO()
+        Image.new("RGB", (1024, 512), "red").save(source, format="PNG")
+        load_source = Mock(return_value=source.getvalue())
+        store = ImageDerivativeStore(str(tmp_path))
+
+        path, etag = store.get_or_create("generated-images/sns_image_a.png", "thumb", load_source)
+        path_again, etag_again = store.get_or_create("generated-images/sns_image_a.png", "thumb", load_source)
+
+        load_source.assert_called_once()
+        assert (path_again, etag_again) == (path, etag)
+        assert etag != store.derivative_etag("generated-images/sns_image_a.png", "w640")
+        with Image.open(path) as image:
+            assert image.format == "WEBP"
+            assert image.size == (256, 128)
+
+
 class TestTranslationGenerator:
     """번역 생성기 테스트 클래스"""
 
@@ -208,4 +847,215 @@ class TestTranslationGenerator:
         input_data = TranslationPromptInput(topic="AI 마케팅")
 
         with pytest.raises(TranslationPromptError):
-            translation_generator.translate_for_image_prompt(input_data) 
\ No newline at end of file
+            translation_generator.translate_for_image_prompt(input_data)
+
+    def test_translate_for_image_prompt_uses_cache(self, mock_prompt_manager, mock_text_provider, tmp_path):
+        """공백만 다른 반복 요청은 번역 캐시를 사용하는지 테스트"""
+        mock_prompt_manager.generate_translate_prompt.side_effect = lambda **kwargs: f"번역: {kwargs['topic']}|{kwargs['brand_style_tone']}"
+        mock_text_provider.model_id = "claude-3-sonnet"
+        mock_text_provider.invoke.return_value = "Translated AI marketing prompt"
+        cache = TranslationCache(db_path=str(tmp_path / "translations.sqlite3"))
+        translation_generator = TranslationGenerator(mock_prompt_manager, mock_text_provider, cache)
+
+        first = translation_generator.translate_for_image_prompt(TranslationPromptInput(topic="AI 마케팅", brand_style_tone=None))
+        second = translation_generator.translate_for_image_prompt(TranslationPromptInput(topic="  AI   마케팅 ", brand_style_tone=""))
+
+        assert first == second == {"image_prompt": "Translated AI marketing prompt"}
+        mock_text_provider.invoke.assert_called_once()
+        assert cache.snapshot()["hits"] == 1
+
+    def test_translation_cache_evicts_least_recently_used(self, tmp_path):
+        """최대 항목 수 초과 시 가장 오래 사용하지 않은 항목 제거 테스트"""
+        cache = TranslationCache(db_path=str(tmp_path / "translations.sqlite3"), max_entries=2)
+        cache.set("a", "prompt a")
+        time.sleep(0.01)
+        cache.set("b", "prompt b")
+        time.sleep(0.01)
+        assert cache.get("a") == "prompt a"
+        time.sleep(0.01)
+        cache.set("c", "prompt c")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "prompt a"
+        assert cache.get("c") == "prompt c"
+
+    def test_app_init_resolves_cache_path_against_root_path(self, tmp_path, monkeypatch):
+        """앱 초기화 시 번역 캐시 파일이 작업 디렉토리가 아닌 app.root_path 기준인지 테스트"""
+        from flask import Flask
+        from services.app_core.app_factory_utils import create_translation_cache
+        from services.utils.constants import TRANSLATION_CACHE_PATH
+        monkeypatch.setattr("services.utils.constants.TRANSLATION_CACHE_ENABLED", True)
+        app = Flask(__name__, root_path=str(tmp_path))
+
+        cache = create_translation_cache(app)
+
+        assert cache.db_path == os.path.join(str(tmp_path), TRANSLATION_CACHE_PATH)
+        assert os.path.isfile(cache.db_path)
+
+class TestTextResponseCache:
+    """텍스트 응답 캐시 테스트 클래스"""
+
+    def test_canonicalize_ignores_whitespace_case_and_keyword_order(self):
+        """요청 정규화 테스트"""
+        left = canonicalize_request({"topic": "AI  Marketing ", "seo_keywords": "SEO, AI", "tone": ""})
+        right = canonicalize_request({"topic": "ai marketing", "seo_keywords": "ai,seo"})
+        assert left == right
+
+    def test_index_generation_change_misses(self):
+        """인덱스 세대가 바뀌면 캐시가 적중하지 않는지 테스트"""
+        cache = TextResponseCache(ttl_seconds=60, similarity_threshold=None)
+        request = {"topic": "AI 마케팅", "industry": "IT", "content_type": "blog"}
+        cache.store(request, 1, "이전 결과", index_generation=1)
+
+        assert cache.lookup(request, 1, index_generation=1).text == "이전 결과"
+        assert cache.lookup(request, 1, index_generation=2) is None
+        assert cache.snapshot()["hit_rate"] == 0.5
+
+    def test_expired_entry_misses(self):
+        """TTL이 지난 항목은 적중하지 않는지 테스트"""
+        cache = TextResponseCache(ttl_seconds=0, similarity_threshold=None)
+        request = {"topic": "AI 마케팅", "industry": "IT", "content_type": "blog"}
+        cache.store(request, 1, "이전 결과")
+        time.sleep(0.01)
+
+        assert cache.lookup(request, 1) is None
+
+    def test_semantic_lookup_requires_same_structural_fields(self):
+        """유사도 조회는 구조 필드가 같은 요청만 대상으로 하는지 테스트"""
+        vectors = {"ai 마케팅 | |": [1.0, 0.0], "ai 마케팅 전략 | |": [0.99, 0.05]}
+        cache = TextResponseCache(ttl_seconds=60, similarity_threshold=0.95,
+                                  embed_fn=lambda text: np.array(vectors.get(text, [0.0, 1.0])))
+        cache.store({"topic": "AI 마케팅", "industry": "IT", "content_type": "blog"}, 1, "이전 결과")
+
+        hit = cache.lookup({"topic": "AI 마케팅 전략", "industry": "IT", "content_type": "blog"}, 1)
+        assert hit.source == "semantic"
+        assert cache.lookup({"topic": "AI 마케팅 전략", "industry": "IT", "content_type": "email"}, 1) is None
+
+    def test_history_loader_used_on_memory_miss(self):
+        """메모리에 없으면 Content 이력에서 찾는지 테스트"""
+        history_loader = Mock(return_value=Mock(id=7, generated_text="이력 결과"))
+        cache = TextResponseCache(ttl_seconds=60, similarity_threshold=None, history_loader=history_loader)
+        request = {"topic": "AI 마케팅", "industry": "IT", "content_type": "blog"}
+
+        hit = cache.lookup(request, 1)
+        assert (hit.source, hit.content_id, hit.text) == ("history", 7, "이력 결과")
+        assert cache.lookup(request, 1).source == "exact"
+        history_loader.assert_called_once()
+
+
+class TestContextBuilder:
+    """RAG 컨텍스트 조립기 테스트 클래스"""
+
+    def test_build_uses_chunk_text_not_tuple_repr(self):
+        """(청크, 거리, 메타데이터) 튜플에서 청크 텍스트만 사용하는지 테스트"""
+        built = ContextBuilder(token_budget=500).build([("첫 번째 청크", 0.1, {}), ("두 번째 청크", 0.2, {})])
+
+        assert built.text == "관련 문서 1: 첫 번째 청크\n관련 문서 2: 두 번째 청크"
+        assert "(" not in built.text
+        assert built.chunk_count == 2
+
+    def test_build_respects_token_budget(self):
+        """토큰 예산을 넘는 청크는 제외하는지 테스트"""
+        long_chunk = "마케팅 " * 200
+        built = ContextBuilder(token_budget=50).build([long_chunk, "짧은 청크"])
+
+        assert built.used_tokens <= 50
+        assert built.chunk_count == 1
+        assert built.dropped_count == 1
+        assert "짧은 청크" in built.text
+
+    def test_build_merges_adjacent_overlapping_chunks(self):
+        """같은 문서의 인접 청크를 겹침 없이 합치는지 테스트"""
+        first = "AI 마케팅은 데이터 기반 의사결정을 돕는다. 특히 개인화 추천이 핵심이다."
+        second = "특히 개인화 추천이 핵심이다. 캠페인 효율도 크게 개선된다."
+        retrieved = [
+            (second, 0.1, {"s3_key": "IT/a.txt", "chunk_index": 1}),
+            (first, 0.2, {"s3_key": "IT/a.txt", "chunk_index": 0}),
+        ]
+        built = ContextBuilder(token_budget=500).build(retrieved)
+
+        assert built.chunk_count == 1
+        assert built.text.count("특히 개인화 추천이 핵심이다.") == 1
+        assert built.text.endswith("캠페인 효율도 크게 개선된다.")
+
+    def test_used_tokens_matches_encoder(self):
+        """사용 토큰 수가 공유 인코더 기준과 일치하는지 테스트"""
+        built = ContextBuilder(token_budget=500).build(["테스트 문서"])
+        assert built.used_tokens == count_tokens("관련 문서 1: ") + count_tokens("테스트 문서")
+
+
+class TestSingleFlight:
+    """처리 중인 동일 요청 합치기 테스트 클래스"""
+
+    def _run_concurrently(self, flight, key, fn, count=5):
+        results = []
+        lock = threading.Lock()
+        def call():
+            try:
+                outcome = flight.do(key, fn)
+            except Exception as e:
+                outcome = e
+            with lock:
+                results.append(outcome)
+        threads = [threading.Thread(target=call) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_concurrent_duplicates_share_first_result(self):
+        """같은 키의 동시 호출은 한 번만 실행하고 결과를 공유하는지 테스트"""
+        flight = SingleFlight("test-shared", enabled=True)
+        calls = Mock(side_effect=lambda: time.sleep(0.2) or "임베딩")
+
+        results = self._run_concurrently(flight, "same", calls)
+
+        assert calls.call_count == 1
+        assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+        assert {value for value, _ in results} == {"임베딩"}
+        assert flight.snapshot() == {"in_flight": 0, "leaders": 1, "coalesced": 4, "wait_timeouts": 0}
+
+    def test_errors_are_shared_and_not_remembered(self):
+        """첫 호출의 예외를 기다리던 호출에도 전달하고, 이후 호출은 다시 실행하는지 테스트"""
+        flight = SingleFlight("test-errors", enabled=True)
+        def throttled():
+            time.sleep(0.2)
+            raise RuntimeError("throttled")
+        failing = Mock(side_effect=throttled)
+
+        results = self._run_concurrently(flight, "same", failing, count=3)
+
+        assert failing.call_count == 1
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert flight.do("same", lambda: "ok") == ("ok", False)
+
+    def test_stream_keeps_running_for_followers_after_leader_closes(self):
+        """첫 호출의 소비자가 닫혀도 함께 받는 호출은 스트림 끝까지 받고, 아무도 없으면 스트림을 닫는지 테스트"""
+        flight = SingleFlight("test-stream", enabled=True)
+        produced = []
+        def parts():
+            for part in ("a", "b", "c"):
+                produced.append(part)
+                yield part
+                time.sleep(0.05)
+
+        leader = flight.do_stream("same", parts)
+        assert next(leader) == "a"
+        follower_results = []
+        follower = threading.Thread(target=lambda: follower_results.extend(flight.do_stream("same", parts)))
+        follower.start()
+        while flight.snapshot()["coalesced"] == 0:
+            time.sleep(0.01)
+        leader.close()
+        follower.join()
+
+        assert follower_results == ["a", "b", "c"]
+        assert produced == ["a", "b", "c"]
+        assert flight.snapshot()["in_flight"] == 0
+
+        alone = flight.do_stream("other", parts)
+        produced.clear()
+        assert next(alone) == "a"
+        alone.close()
+        assert produced == ["a"]
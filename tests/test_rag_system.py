@@ -4,6 +4,7 @@ from unittest.mock import Mock, patch, MagicMock
 from services.ai_rag.rag_system import RAGSystem
 from services.ai_rag.chunker import chunk_text
 from services.ai_rag.embedding_generator import EmbeddingManager
+from services.ai_rag.faiss_indexer import FaissIndexer
 
 
 class TestRAGSystem:
@@ -51,6 +52,80 @@ class TestRAGSystem:
         assert filename == "article.txt"
 
 
+class TestFaissIndexer:
+    """FAISS 인덱서 업종 라우팅 테스트 클래스"""
+
+    @pytest.fixture
+    def faiss_indexer(self):
+        """업종 두 개로 구성된 인덱스"""
+        indexer = FaissIndexer()
+        embeddings = np.array([
+            [1.0, 0.0, 0.0],
+            [0.9, 0.1, 0.0],
+            [0.0, 1.0, 0.0],
+            [0.0, 0.9, 0.1],
+        ], dtype=np.float32)
+        metadatas = [
+            {"industry": "IT", "s3_key": "IT/a.txt", "chunk_index": 0},
+            {"industry": "IT", "s3_key": "IT/a.txt", "chunk_index": 1},
+            {"industry": "Beauty", "s3_key": "Beauty/b.txt", "chunk_index": 0},
+            {"industry": "Beauty", "s3_key": "Beauty/b.txt", "chunk_index": 1},
+        ]
+        indexer.build_index(["it-0", "it-1", "beauty-0", "beauty-1"], embeddings, metadatas)
+        return indexer
+
+    def test_build_index_creates_partitions(self, faiss_indexer):
+        """업종별 서브 인덱스와 중심 벡터 생성 테스트"""
+        assert set(faiss_indexer.partitions) == {"IT", "Beauty"}
+        assert faiss_indexer.partitions["IT"][0].ntotal == 2
+        assert set(faiss_indexer.centroids) == {"IT", "Beauty"}
+
+    def test_route_picks_nearest_industry(self, faiss_indexer):
+        """쿼리와 가장 가까운 업종으로 라우팅되는지 테스트"""
+        query = np.array([0.1, 1.0, 0.0], dtype=np.float32)
+        assert faiss_indexer.route(query, top_n=1) == ["Beauty"]
+
+    def test_search_with_distance_restricted_to_partition(self, faiss_indexer):
+        """라우팅된 파티션 안에서만 검색하고 메타데이터를 반환하는지 테스트"""
+        query = np.array([1.0, 0.0, 0.0], dtype=np.float32)
+        results = faiss_indexer.search_with_distance(query, k=3, partitions=["Beauty"])
+
+        assert [chunk for chunk, _, _ in results] == ["beauty-1", "beauty-0"]
+        assert all(metadata["industry"] == "Beauty" for _, _, metadata in results)
+
+    def test_search_with_distance_without_partitions(self, faiss_indexer):
+        """파티션 미지정 시 전체 인덱스 검색 테스트"""
+        query = np.array([1.0, 0.0, 0.0], dtype=np.float32)
+        results = faiss_indexer.search_with_distance(query, k=2)
+
+        assert [chunk for chunk, _, _ in results] == ["it-0", "it-1"]
+        assert results[0][1] <= results[1][1]
+
+    def test_search_batch_matches_single_searches(self, faiss_indexer):
+        """다중 쿼리 검색 결과가 쿼리별 단건 검색과 같은지 테스트"""
+        queries = np.array([[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [1.0, 0.0, 0.0]], dtype=np.float32)
+        partitions = [["IT"], ["Beauty"], None]
+
+        batch = faiss_indexer.search_batch_with_distance(queries, k=2, partitions_per_query=partitions)
+
+        assert batch == [
+            faiss_indexer.search_with_distance(query, k=2, partitions=routed)
+            for query, routed in zip(queries, partitions)
+        ]
+
+    def test_rebuild_swaps_whole_snapshot(self, faiss_indexer):
+        """다시 구축해도 이전 스냅샷으로 하는 검색은 이전 세대의 문서/메타데이터만 보는지 테스트"""
+        old_snapshot = faiss_indexer.snapshot
+        faiss_indexer.build_index(["new-0"], np.array([[1.0, 0.0, 0.0]], dtype=np.float32), [{"industry": "Food"}])
+
+        query = np.array([1.0, 0.0, 0.0], dtype=np.float32)
+        old_results = faiss_indexer.search_with_distance(query, k=2, partitions=["IT"], snapshot=old_snapshot)
+        assert [chunk for chunk, _, _ in old_results] == ["it-0", "it-1"]
+        assert [chunk for chunk, _, _ in faiss_indexer.search_with_distance(query, k=2)] == ["new-0"]
+        assert set(faiss_indexer.partitions) == {"Food"}
+        assert set(old_snapshot.partitions) == {"IT", "Beauty"}
+
+
 class TestChunker:
     """텍스트 청킹 테스트 클래스"""
 
@@ -116,6 +191,14 @@ class TestEmbeddingManager:
         assert result is not None
         mock_bedrock_client.invoke_model.assert_called_once()
 
+    def test_get_embeddings_dedupes_texts(self, embedding_manager):
+        """중복 텍스트는 한 번만 임베딩하고 입력 순서대로 반환하는지 테스트"""
+        with patch.object(embedding_manager, '_get_embedding', side_effect=lambda text: np.array([len(text)], dtype=np.float32)) as mock_embed:
+            result = embedding_manager.get_embeddings(["a", "bb", "a", ""])
+
+        assert mock_embed.call_count == 2
+        assert [None if r is None else float(r[0]) for r in result] == [1.0, 2.0, 1.0, None]
+
     def test_get_embedding_empty_text(self, embedding_manager):
         """빈 텍스트 임베딩 생성 테스트"""
         result = embedding_manager._get_embedding("")
@@ -136,4 +219,41 @@ class TestEmbeddingManager:
             
             assert len(embedding_manager.industry_embeddings) == 2
             assert "IT" in embedding_manager.industry_embeddings
-            assert "Fashion" in embedding_manager.industry_embeddings 
\ No newline at end of file
+            assert "Fashion" in embedding_manager.industry_embeddings 
+    def test_precompute_skips_cached_industries(self, embedding_manager):
+        """이미 캐시된 업종은 다시 계산하지 않는지 테스트"""
+        embedding_manager.industry_embeddings["IT"] = np.array([0.1, 0.2, 0.3], dtype=np.float32)
+        with patch.object(embedding_manager, '_get_embedding') as mock_get_embedding:
+            mock_get_embedding.return_value = np.array([0.4, 0.5, 0.6], dtype=np.float32)
+
+            embedding_manager.precompute_industry_embeddings(["IT", "Fashion"])
+
+            mock_get_embedding.assert_called_once_with("Fashion")
+
+    def test_industry_embeddings_persisted_and_reloaded(self, mock_bedrock_client, tmp_path):
+        """업종 임베딩이 디스크에 저장되고 새 인스턴스에서 Bedrock 호출 없이 로드되는지 테스트"""
+        manager = EmbeddingManager(mock_bedrock_client, cache_dir=str(tmp_path))
+        with patch.object(manager, '_get_embedding') as mock_get_embedding:
+            mock_get_embedding.return_value = np.array([0.1, 0.2, 0.3], dtype=np.float32)
+            manager.get_industry_embedding("Beauty")
+            manager.get_industry_embedding("Beauty")
+            mock_get_embedding.assert_called_once()
+
+        reloaded = EmbeddingManager(mock_bedrock_client, cache_dir=str(tmp_path))
+        assert reloaded.load_persisted_embeddings() == 1
+        np.testing.assert_allclose(reloaded.get_industry_embedding("Beauty"), [0.1, 0.2, 0.3])
+        mock_bedrock_client.invoke_model.assert_not_called()
+
+    def test_app_init_resolves_cache_dir_against_root_path(self, mock_bedrock_client, tmp_path, monkeypatch):
+        """앱 초기화 시 라벨 임베딩 캐시 디렉토리가 작업 디렉토리가 아닌 app.root_path 기준인지 테스트"""
+        from flask import Flask
+        from services.ai_rag import embedding_generator
+        from services.app_core.app_factory_utils import initialize_embedding_manager
+        monkeypatch.setattr(embedding_generator, "_embedding_manager_instance", None)
+        app = Flask(__name__, root_path=str(tmp_path))
+        app.extensions['rag_bedrock_runtime'] = mock_bedrock_client
+
+        manager = initialize_embedding_manager(app)
+
+        assert manager.cache_dir == str(tmp_path / "embedding_cache")
+        assert embedding_generator.get_embedding_manager() is manager
@@ -1,8 +1,13 @@
 import pytest
+import requests
 from unittest.mock import Mock, patch, MagicMock
 from services.web_crawling.web_content_extractor import extract_text_from_url, get_specific_extractor
-from services.web_crawling.driver_manager import ChromeDriverManager
+from services.web_crawling.driver_manager import ChromeDriverManager, ChromeDriverPool, DriverPoolTimeout
 from services.web_crawling.extractors.base_extractor import BaseExtractor
+from services.web_crawling.crawl_engine import CrawlEngine, url_domain
+from services.web_crawling.http_fetcher import HttpFetcher
+from services.web_crawling.fetch_strategy import get_fetch_strategy_stats
+from services.web_crawling.extractors.fashionbiz import FashionbizExtractor
 
 
 class TestWebContentExtractor:
@@ -178,6 +183,64 @@ class TestChromeDriverManager:
         mock_chrome.assert_called_once()
 
 
+class TestChromeDriverPool:
+    """ChromeDriver 풀 테스트 클래스"""
+
+    @pytest.fixture
+    def create_driver(self):
+        with patch('services.web_crawling.driver_manager.resolve_driver_path', return_value="/fake/chromedriver"), \
+                patch('services.web_crawling.driver_manager.create_chrome_driver', side_effect=lambda *a, **kw: Mock()) as mock_create:
+            yield mock_create
+
+    def test_checkin_reuses_driver_until_max_uses(self, create_driver):
+        """반납한 드라이버를 재사용하고 max_uses번 사용하면 교체하는지 테스트"""
+        pool = ChromeDriverPool(size=1, max_uses=2, checkout_timeout=1)
+        with pool.driver() as first:
+            pass
+        with pool.driver() as second:
+            pass
+        with pool.driver() as third:
+            pass
+
+        assert first is second
+        assert third is not first
+        first.quit.assert_called_once()
+        assert create_driver.call_count == 2
+        assert pool.snapshot()["recycled"] == 1
+
+    def test_webdriver_error_discards_driver(self, create_driver):
+        """사용 중 WebDriver 오류가 난 드라이버는 풀에 돌려놓지 않는지 테스트"""
+        from selenium.common.exceptions import WebDriverException
+        pool = ChromeDriverPool(size=1, checkout_timeout=1)
+        with pytest.raises(WebDriverException):
+            with pool.driver() as driver:
+                raise WebDriverException("session crashed")
+
+        driver.quit.assert_called_once()
+        assert pool.snapshot()["open"] == 0
+
+    def test_dead_idle_driver_is_replaced(self, create_driver):
+        """빌려줄 때 죽은 드라이버는 새 드라이버로 교체하는지 테스트"""
+        from selenium.common.exceptions import WebDriverException
+        pool = ChromeDriverPool(size=1, checkout_timeout=1)
+        with pool.driver() as dead:
+            pass
+        type(dead).current_url = property(lambda self: (_ for _ in ()).throw(WebDriverException("gone")))
+        with pool.driver() as replacement:
+            pass
+
+        assert replacement is not dead
+        assert pool.snapshot()["unhealthy"] == 1
+
+    def test_checkout_times_out_when_pool_is_exhausted(self, create_driver):
+        """풀이 모두 사용 중이면 대기 시간 뒤 DriverPoolTimeout이 발생하는지 테스트"""
+        pool = ChromeDriverPool(size=1, checkout_timeout=0.05)
+        driver = pool.checkout()
+        with pytest.raises(DriverPoolTimeout):
+            pool.checkout()
+        pool.checkin(driver)
+
+
 class TestBaseExtractor:
     """기본 추출기 테스트 클래스"""
 
@@ -188,55 +251,64 @@ class TestBaseExtractor:
 
     def test_base_extractor_initialization(self, base_extractor):
         """기본 추출기 초기화 테스트"""
-        assert base_extractor.driver_manager is not None
+        assert base_extractor.driver_pool is not None
         assert base_extractor.BASE_URL == ""
         assert base_extractor.HEADERS is not None
         assert base_extractor.TIMEOUT == 15
 
-    @patch('services.web_crawling.extractors.base_extractor.requests.get')
-    def test_fetch_html_with_requests_success(self, mock_get, base_extractor):
+    @pytest.fixture
+    def http_fetcher(self, tmp_path):
+        """임시 디렉토리에 응답을 보관하는 HttpFetcher로 교체"""
+        fetcher = HttpFetcher(cache_dir=str(tmp_path))
+        with patch('services.web_crawling.extractors.base_extractor.get_http_fetcher', return_value=fetcher):
+            yield fetcher
+
+    def test_fetch_html_with_requests_success(self, base_extractor, http_fetcher):
         """requests를 사용한 HTML 가져오기 성공 테스트"""
         # Mock 설정
         mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.headers = {}
         mock_response.raise_for_status.return_value = None
         mock_response.content = b"<html>Test HTML</html>"
         mock_response.encoding = "utf-8"
         mock_response.apparent_encoding = "utf-8"
-        mock_get.return_value = mock_response
+        mock_session = Mock()
+        mock_session.get.return_value = mock_response
 
-        with patch('services.web_crawling.extractors.base_extractor.HTMLDecoder.decode_html_content') as mock_decode:
+        with patch.object(http_fetcher, 'session_for', return_value=mock_session), \
+                patch('services.web_crawling.extractors.base_extractor.HTMLDecoder.decode_html_content') as mock_decode:
             mock_decode.return_value = "<html>테스트 HTML</html>"
             
             result = base_extractor._fetch_html("https://example.com", use_selenium=False)
             
             assert result == "<html>테스트 HTML</html>"
-            mock_get.assert_called_once()
+            mock_session.get.assert_called_once()
 
-    @patch('services.web_crawling.extractors.base_extractor.requests.get')
-    def test_fetch_html_with_requests_error(self, mock_get, base_extractor):
+    def test_fetch_html_with_requests_error(self, base_extractor, http_fetcher):
         """requests를 사용한 HTML 가져오기 오류 테스트"""
         # Mock 설정
-        mock_get.side_effect = Exception("Network error")
-        
-        result = base_extractor._fetch_html("https://example.com", use_selenium=False)
+        mock_session = Mock()
+        mock_session.get.side_effect = requests.exceptions.ConnectionError("Network error")
+
+        with patch.object(http_fetcher, 'session_for', return_value=mock_session):
+            result = base_extractor._fetch_html("https://example.com", use_selenium=False)
         
         assert result is None
 
-    @patch('services.web_crawling.extractors.base_extractor.webdriver.Chrome')
-    def test_fetch_html_with_selenium_success(self, mock_chrome, base_extractor):
+    def test_fetch_html_with_selenium_success(self, base_extractor):
         """Selenium을 사용한 HTML 가져오기 성공 테스트"""
         # Mock 설정
         mock_driver = Mock()
         mock_driver.page_source = "<html>Selenium HTML</html>"
-        mock_chrome.return_value = mock_driver
         
-        with patch.object(base_extractor.driver_manager, 'get_driver') as mock_get_driver:
-            mock_get_driver.return_value = mock_driver
-            
+        with patch.object(base_extractor.driver_pool, 'checkout', return_value=mock_driver), \
+                patch.object(base_extractor.driver_pool, 'checkin') as mock_checkin:
             result = base_extractor._fetch_html("https://example.com", use_selenium=True)
             
             assert result == "<html>Selenium HTML</html>"
             mock_driver.get.assert_called_once_with("https://example.com")
+            mock_checkin.assert_called_once_with(mock_driver, broken=False)
 
     def test_extract_main_content(self, base_extractor):
         """메인 콘텐츠 추출 테스트"""
@@ -256,4 +328,186 @@ class TestBaseExtractor:
             result = base_extractor._extract_main_content(html_content, "https://example.com")
             
             assert result is not None
-            mock_extract.assert_called_once() 
\ No newline at end of file
+            mock_extract.assert_called_once() 
+
+
+class TestCrawlEngine:
+    """동시 크롤링 엔진 테스트 클래스"""
+
+    @pytest.fixture
+    def app(self):
+        from flask import Flask
+        return Flask(__name__)
+
+    def test_url_domain_strips_www(self):
+        """도메인 정규화 테스트"""
+        assert url_domain("https://www.ITWorld.co.kr/news/1") == "itworld.co.kr"
+        assert url_domain("https://hidoc.co.kr/a") == "hidoc.co.kr"
+
+    def test_per_domain_limit_and_follow_up_tasks(self, app):
+        """도메인별 동시 실행 상한과 작업 안에서 추가한 다음 단계 작업 대기 테스트"""
+        import threading
+        import time
+        running = {}
+        peak = {}
+        lock = threading.Lock()
+        extracted = []
+
+        with CrawlEngine(app, max_workers=8, per_domain_concurrency=2, domain_concurrency={"slow.com": 1}) as engine:
+            def extract(url):
+                with engine.timer.time("extract"):
+                    extracted.append(url)
+
+            def fetch(domain, url):
+                with lock:
+                    running[domain] = running.get(domain, 0) + 1
+                    peak[domain] = max(peak.get(domain, 0), running[domain])
+                with engine.timer.time("fetch"):
+                    time.sleep(0.02)
+                with lock:
+                    running[domain] -= 1
+                engine.submit(extract, url)
+
+            for i in range(6):
+                for domain in ("fast.com", "slow.com"):
+                    engine.submit(fetch, domain, f"https://{domain}/{i}", domain=domain)
+
+        assert len(extracted) == 12
+        assert peak["fast.com"] <= 2
+        assert peak["slow.com"] == 1
+        timings = engine.timer.snapshot()
+        assert timings["fetch"]["count"] == 12
+        assert timings["extract"]["count"] == 12
+        assert engine.task_errors == 0
+
+    def test_failed_task_is_counted(self, app):
+        """실패한 작업이 다른 작업을 막지 않는지 테스트"""
+        done = []
+
+        def fail():
+            raise RuntimeError("boom")
+
+        with CrawlEngine(app, max_workers=2) as engine:
+            engine.submit(fail, domain="a.com")
+            engine.submit(done.append, 1, domain="a.com")
+
+        assert done == [1]
+        assert engine.task_errors == 1
+
+
+class TestHttpFetcher:
+    """조건부 요청과 응답 디스크 캐시 테스트 클래스"""
+
+    @staticmethod
+    def _response(status_code, content=b"", headers=None):
+        response = Mock()
+        response.status_code = status_code
+        response.content = content
+        response.headers = headers or {}
+        response.encoding = "utf-8"
+        response.apparent_encoding = "utf-8"
+        response.raise_for_status.return_value = None
+        return response
+
+    def test_conditional_get_returns_cached_body_on_304(self, tmp_path):
+        """두 번째 요청은 ETag로 조건부 요청을 보내고 304면 보관한 본문을 반환하는지 테스트"""
+        fetcher = HttpFetcher(cache_dir=str(tmp_path))
+        session = Mock()
+        session.get.side_effect = [
+            self._response(200, "<html>본문</html>".encode("utf-8"), {"ETag": '"v1"'}),
+            self._response(304),
+        ]
+        url = "https://example.com/list"
+        with patch.object(fetcher, 'session_for', return_value=session):
+            first = fetcher.get(url)
+            second = fetcher.get(url)
+
+        assert not first.not_modified
+        assert second.not_modified
+        assert second.text == "<html>본문</html>"
+        assert session.get.call_args_list[1].kwargs["headers"]["If-None-Match"] == '"v1"'
+        stats = fetcher.snapshot()
+        assert stats["requests"] == 2
+        assert stats["not_modified"] == 1
+
+    def test_parse_once_reuses_result_for_unchanged_body(self, tmp_path):
+        """같은 본문이면 파싱 결과를 재사용하고, 본문이 바뀌면 다시 파싱하는지 테스트"""
+        fetcher = HttpFetcher(cache_dir=str(tmp_path))
+        session = Mock()
+        session.get.return_value = self._response(200, b"<html>a</html>", {"Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+        url = "https://example.com/article/1"
+        with patch.object(fetcher, 'session_for', return_value=session):
+            html = fetcher.get(url).text
+        parse = Mock(return_value=["https://example.com/article/2"])
+
+        assert fetcher.parse_once(url, "article_urls", html, parse) == ["https://example.com/article/2"]
+        assert fetcher.parse_once(url, "article_urls", html, parse) == ["https://example.com/article/2"]
+        assert parse.call_count == 1
+        fetcher.parse_once(url, "article_urls", "<html>b</html>", parse)
+        assert parse.call_count == 2
+
+    def test_response_without_validators_is_not_stored(self, tmp_path):
+        """ETag/Last-Modified가 없는 응답은 보관하지 않고 매번 일반 요청을 보내는지 테스트"""
+        fetcher = HttpFetcher(cache_dir=str(tmp_path))
+        session = Mock()
+        session.get.return_value = self._response(200, b"<html>a</html>")
+        with patch.object(fetcher, 'session_for', return_value=session):
+            fetcher.get("https://example.com/")
+            fetcher.get("https://example.com/")
+
+        assert "If-None-Match" not in session.get.call_args_list[1].kwargs["headers"]
+        assert fetcher.snapshot()["stored"] == 0
+
+    def test_app_init_resolves_cache_dir_against_root_path(self, tmp_path, monkeypatch):
+        """앱 초기화 시 응답 캐시 디렉토리가 작업 디렉토리가 아닌 app.root_path 기준인지 테스트"""
+        from flask import Flask
+        from services.web_crawling import http_fetcher
+        from services.app_core.app_factory_utils import init_crawler_http_fetcher
+        monkeypatch.setattr(http_fetcher, "_http_fetcher", None)
+        monkeypatch.setattr("services.utils.constants.CRAWLER_HTTP_CACHE_ENABLED", True)
+        app = Flask(__name__, root_path=str(tmp_path))
+
+        init_crawler_http_fetcher(app)
+
+        assert http_fetcher.get_http_fetcher().cache_dir == str(tmp_path / "crawler_http_cache")
+
+
+class TestStaticFirstListPage:
+    """정적 전략 우선, 렌더링 폴백 테스트 클래스"""
+
+    @pytest.fixture
+    def extractor(self, tmp_path):
+        with patch('services.web_crawling.extractors.base_extractor.get_http_fetcher',
+                   return_value=HttpFetcher(cache_dir=str(tmp_path))):
+            yield FashionbizExtractor()
+
+    def test_fashionbiz_reads_next_data_without_selenium(self, extractor):
+        """__NEXT_DATA__에 기사 경로가 있으면 Selenium 없이 기사 URL을 추출하는지 테스트"""
+        html = (
+            '<html><body><div id="__next"></div>'
+            '<script id="__NEXT_DATA__" type="application/json">'
+            '{"props": {"pageProps": {"articles": [{"href": "/article/101"}, {"link": "https://fashionbiz.co.kr/article/102"}, {"href": "/news"}]}}}'
+            '</script></body></html>'
+        )
+        with patch.object(extractor, '_fetch_html', return_value=html) as mock_fetch:
+            urls = extractor.get_list_page_urls("https://fashionbiz.co.kr/list?category=1")
+
+        assert sorted(urls) == ["https://fashionbiz.co.kr/article/101", "https://fashionbiz.co.kr/article/102"]
+        mock_fetch.assert_called_once_with("https://fashionbiz.co.kr/list?category=1")
+        assert get_fetch_strategy_stats()["fashionbiz.co.kr"]["last_success"] == "static"
+
+    def test_fashionbiz_falls_back_to_rendered_fetch(self, extractor):
+        """정적 응답에 기사 링크가 없으면 Selenium 렌더링으로 다시 시도하는지 테스트"""
+        rendered = '<div class="sc-53c9553f-0 ksjCKq"><a href="/article/7">기사</a></div>'
+
+        def fetch(url, use_selenium=False):
+            return rendered if use_selenium else "<html><body>로딩 중</body></html>"
+
+        with patch.object(extractor, '_fetch_html', side_effect=fetch) as mock_fetch:
+            urls = extractor.get_list_page_urls("https://www.fashionbiz.co.kr/list?category=2")
+
+        assert urls == ["https://fashionbiz.co.kr/article/7"]
+        assert mock_fetch.call_count == 2
+        stats = get_fetch_strategy_stats()["fashionbiz.co.kr"]
+        assert stats["last_success"] == "rendered"
+        assert stats["static"]["failure"] >= 1